@@ -52,6 +52,8 @@ USE_ASYNC_SUPABASE = OperationsConfig.USE_ASYNC_SUPABASE
 ENABLE_SUPABASE_WRITE_CACHING = OperationsConfig.ENABLE_SUPABASE_WRITE_CACHING
 CONVERSATION_QUEUE_SIZE = OperationsConfig.CONVERSATION_QUEUE_SIZE
 CONVERSATION_QUEUE_WARNING_THRESHOLD = OperationsConfig.CONVERSATION_QUEUE_WARNING_THRESHOLD
+CONVERSATION_QUEUE_FLUSH_INTERVAL = OperationsConfig.CONVERSATION_QUEUE_FLUSH_INTERVAL
+CONVERSATION_QUEUE_MAX_BATCH = OperationsConfig.CONVERSATION_QUEUE_MAX_BATCH
 VALIDATE_API_KEYS = OperationsConfig.VALIDATE_API_KEYS
 SECURE_INPUTS_ENFORCED = OperationsConfig.SECURE_INPUTS_ENFORCED
 ACTIVITY_SINCE_UNTIL_ENABLED = OperationsConfig.ACTIVITY_SINCE_UNTIL_ENABLED
@@ -128,6 +130,8 @@ __all__ = [
     "ENABLE_SUPABASE_WRITE_CACHING",
     "CONVERSATION_QUEUE_SIZE",
     "CONVERSATION_QUEUE_WARNING_THRESHOLD",
+    "CONVERSATION_QUEUE_FLUSH_INTERVAL",
+    "CONVERSATION_QUEUE_MAX_BATCH",
     
     # Security
     "VALIDATE_API_KEYS",
@@ -54,6 +54,10 @@ class OperationsConfig(BaseConfig):
     # Replaces ThreadPoolExecutor with async queue to prevent resource exhaustion
     CONVERSATION_QUEUE_SIZE: int = BaseConfig.get_int("CONVERSATION_QUEUE_SIZE", 1000)
     CONVERSATION_QUEUE_WARNING_THRESHOLD: int = BaseConfig.get_int("CONVERSATION_QUEUE_WARNING_THRESHOLD", 500)
+    # Write-behind batching: turns queued within the flush window are coalesced
+    # per conversation and bulk-inserted in one round-trip
+    CONVERSATION_QUEUE_FLUSH_INTERVAL: float = BaseConfig.get_float("CONVERSATION_QUEUE_FLUSH_INTERVAL", 0.5)
+    CONVERSATION_QUEUE_MAX_BATCH: int = BaseConfig.get_int("CONVERSATION_QUEUE_MAX_BATCH", 100)
 
     # ============================================================================
     # SECURITY SETTINGS
@@ -18,11 +18,17 @@ Expected improvements:
 - Reduced memory usage (no thread stacks)
 - Better handling of high-throughput scenarios
 - Clearer queue depth monitoring
+
+Write-behind mode: with a batch_consumer_func the consumer collects items for
+up to flush_interval seconds (or max_batch_size items) and hands the whole
+window to the batch consumer, which coalesces turns per conversation and
+bulk-inserts them. Pending items are flushed on stop().
 """
 
 import asyncio
 import logging
-from typing import Callable, Any, Optional
+import threading
+from typing import Awaitable, Callable, Any, List, Optional
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -44,35 +50,52 @@ class ConversationQueue:
     - Bounded queue with configurable max size
     - Dedicated consumer task for processing
     - Queue depth monitoring
-    - Graceful shutdown handling
+    - Graceful shutdown handling (pending items are flushed)
     - Error handling with logging
+    - Optional batching (write-behind) via batch_consumer_func
     """
     
     def __init__(
         self,
         max_size: int = 1000,
         consumer_func: Optional[Callable] = None,
-        warning_threshold: int = 500
+        warning_threshold: int = 500,
+        batch_consumer_func: Optional[Callable[[List[QueueItem]], Awaitable[None]]] = None,
+        flush_interval: float = 0.5,
+        max_batch_size: int = 100,
+        shutdown_timeout: float = 10.0
     ):
         """
         Initialize conversation queue.
         
         Args:
             max_size: Maximum queue size (default 1000)
-            consumer_func: Async function to process queue items
+            consumer_func: Async function to process queue items one at a time
             warning_threshold: Log warning when queue exceeds this size
+            batch_consumer_func: Async function to process a window of items
+                (takes precedence over consumer_func)
+            flush_interval: Seconds to collect items before a batch flush
+            max_batch_size: Flush early once this many items are collected
+            shutdown_timeout: Seconds stop() waits for pending items to flush
         """
         self.queue = asyncio.Queue(maxsize=max_size)
         self.consumer_func = consumer_func
+        self.batch_consumer_func = batch_consumer_func
+        self.flush_interval = flush_interval
+        self.max_batch_size = max(1, max_batch_size)
+        self.shutdown_timeout = shutdown_timeout
         self.consumer_task = None
         self.running = False
         self.warning_threshold = warning_threshold
         self.max_size = max_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
         
         # Metrics
         self.total_processed = 0
         self.total_errors = 0
         self.total_dropped = 0
+        self.total_batches = 0
         
     async def start(self):
         """Start the consumer task."""
@@ -81,18 +104,31 @@ class ConversationQueue:
             return
             
         self.running = True
-        self.consumer_task = asyncio.create_task(self._consume())
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        consume = self._consume_batches if self.batch_consumer_func else self._consume
+        self.consumer_task = asyncio.create_task(consume())
         logger.info(f"[CONV_QUEUE] Consumer started (max_size={self.max_size}, warning_threshold={self.warning_threshold})")
         
     async def stop(self):
-        """Stop the consumer task gracefully."""
+        """Stop the consumer task gracefully, flushing pending items first."""
         logger.info("[CONV_QUEUE] Stopping consumer...")
         self.running = False
         
         if self.consumer_task:
-            self.consumer_task.cancel()
+            # The consumer drains the queue once running is cleared
             try:
-                await self.consumer_task
+                await asyncio.wait_for(asyncio.shield(self.consumer_task), timeout=self.shutdown_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"[CONV_QUEUE] Flush did not finish within {self.shutdown_timeout}s, "
+                    f"abandoning {self.queue.qsize()} queued items"
+                )
+                self.consumer_task.cancel()
+                try:
+                    await self.consumer_task
+                except asyncio.CancelledError:
+                    pass
             except asyncio.CancelledError:
                 pass
                 
@@ -130,8 +166,69 @@ class ConversationQueue:
                 continue
             except Exception as e:
                 logger.error(f"[CONV_QUEUE] Unexpected error in consumer loop: {e}", exc_info=True)
+        
+        # Flush whatever was queued before shutdown
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            try:
+                await self.consumer_func(item)
+                self.total_processed += 1
+            except Exception as e:
+                self.total_errors += 1
+                logger.error(f"[CONV_QUEUE] Error processing item during shutdown: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
                 
         logger.info("[CONV_QUEUE] Consumer loop exited")
+    
+    async def _consume_batches(self):
+        """Collect items for up to flush_interval and process them as one batch."""
+        logger.info(
+            f"[CONV_QUEUE] Batch consumer loop started "
+            f"(flush_interval={self.flush_interval}s, max_batch_size={self.max_batch_size})"
+        )
+        
+        while self.running or not self.queue.empty():
+            try:
+                try:
+                    first = await asyncio.wait_for(self.queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                
+                batch = [first]
+                deadline = asyncio.get_running_loop().time() + self.flush_interval
+                while len(batch) < self.max_batch_size:
+                    # Drain without waiting first, then wait out the window
+                    if not self.queue.empty():
+                        batch.append(self.queue.get_nowait())
+                        continue
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0 or not self.running:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await self._process_batch(batch)
+                
+            except Exception as e:
+                logger.error(f"[CONV_QUEUE] Unexpected error in batch consumer loop: {e}", exc_info=True)
+        
+        logger.info("[CONV_QUEUE] Batch consumer loop exited")
+    
+    async def _process_batch(self, batch: List[QueueItem]):
+        """Hand one window of items to the batch consumer."""
+        try:
+            await self.batch_consumer_func(batch)
+            self.total_processed += len(batch)
+            self.total_batches += 1
+        except Exception as e:
+            self.total_errors += len(batch)
+            logger.error(f"[CONV_QUEUE] Error processing batch of {len(batch)} items: {e}", exc_info=True)
+        finally:
+            for _ in batch:
+                self.queue.task_done()
         
     async def put(self, item: QueueItem):
         """
@@ -166,32 +263,55 @@ class ConversationQueue:
             # 2. Drop oldest item and add new one
             # 3. Store to disk as fallback
 
-    def put_sync(self, item: QueueItem):
+    def put_sync(self, item: QueueItem) -> bool:
         """
         Add an item to the queue (synchronous version for use from sync code).
 
         BUG FIX #11 (Phase 1b): Allows synchronous code to submit to async queue
         without requiring an event loop.
 
+        Safe to call from threads other than the queue's event loop (the item is
+        handed over with call_soon_threadsafe).
+
         Args:
             item: QueueItem to process
 
-        Note:
-            If queue is full, item will be dropped and logged
+        Returns:
+            True if the item was accepted, False if the queue is full (backpressure:
+            the caller should perform the write itself rather than lose it)
         """
+        current_size = self.queue.qsize()
+        if current_size >= self.max_size:
+            self.total_dropped += 1
+            logger.warning(
+                f"[CONV_QUEUE] Queue full ({self.max_size}), rejecting item for conversation {item.conversation_id} | "
+                f"Total rejected: {self.total_dropped}"
+            )
+            return False
+
+        if current_size > self.warning_threshold:
+            logger.warning(
+                f"[CONV_QUEUE] Queue depth high: {current_size}/{self.max_size} "
+                f"({current_size/self.max_size*100:.1f}%)"
+            )
+
+        if self._loop is not None and threading.get_ident() != self._loop_thread_id:
+            # asyncio.Queue is not thread-safe; enqueue on the owning loop
+            self._loop.call_soon_threadsafe(self._put_from_loop, item)
+            return True
+
         try:
-            # Try to put without blocking
             self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.total_dropped += 1
+            return False
 
-            # Check if we should warn about queue depth
-            current_size = self.queue.qsize()
-            if current_size > self.warning_threshold:
-                logger.warning(
-                    f"[CONV_QUEUE] Queue depth high: {current_size}/{self.max_size} "
-                    f"({current_size/self.max_size*100:.1f}%)"
-                )
-
+    def _put_from_loop(self, item: QueueItem):
+        try:
+            self.queue.put_nowait(item)
         except asyncio.QueueFull:
+            # Raced past the size check from another thread
             self.total_dropped += 1
             logger.error(
                 f"[CONV_QUEUE] Queue full ({self.max_size}), dropping item for conversation {item.conversation_id} | "
@@ -216,6 +336,7 @@ class ConversationQueue:
             "total_processed": self.total_processed,
             "total_errors": self.total_errors,
             "total_dropped": self.total_dropped,
+            "total_batches": self.total_batches,
             "running": self.running
         }
 
@@ -236,13 +357,24 @@ async def get_conversation_queue() -> ConversationQueue:
     if _conversation_queue is None:
         try:
             # Import here to avoid circular dependency
-            from config import CONVERSATION_QUEUE_SIZE, CONVERSATION_QUEUE_WARNING_THRESHOLD
-            from utils.conversation.supabase_memory import process_conversation_update
+            from config import (
+                CONVERSATION_QUEUE_SIZE,
+                CONVERSATION_QUEUE_WARNING_THRESHOLD,
+                CONVERSATION_QUEUE_FLUSH_INTERVAL,
+                CONVERSATION_QUEUE_MAX_BATCH,
+            )
+            from utils.conversation.supabase_memory import (
+                process_conversation_update,
+                process_conversation_batch,
+            )
 
             _conversation_queue = ConversationQueue(
                 max_size=CONVERSATION_QUEUE_SIZE,
                 consumer_func=process_conversation_update,
-                warning_threshold=CONVERSATION_QUEUE_WARNING_THRESHOLD
+                warning_threshold=CONVERSATION_QUEUE_WARNING_THRESHOLD,
+                batch_consumer_func=process_conversation_batch,
+                flush_interval=CONVERSATION_QUEUE_FLUSH_INTERVAL,
+                max_batch_size=CONVERSATION_QUEUE_MAX_BATCH
             )
             await _conversation_queue.start()
             logger.info("[CONV_QUEUE] Global queue initialized")
@@ -273,7 +405,7 @@ def get_conversation_queue_sync() -> Optional[ConversationQueue]:
 
 
 async def shutdown_conversation_queue():
-    """Shutdown the global conversation queue."""
+    """Shutdown the global conversation queue (flushes pending writes)."""
     global _conversation_queue
 
     if _conversation_queue:
@@ -411,12 +411,24 @@ async def get_current_metrics(request: web.Request) -> web.Response:
     Phase 0.4 (2025-10-24): Testing Dashboard Support
     """
     try:
-        # Calculate current metrics from recent events
-        # For now, return mock data - will be replaced with actual metrics
+        from utils.infrastructure.performance_metrics import get_collector
+        from utils.conversation.recent_turns import get_recent_turn_index
+
+        # Percentiles come from the merged recent-window latency sketch across tools
+        collector = get_collector()
+        latency = collector.get_overall_latency()
+        tool_metrics = collector.get_tool_metrics()
+        total_calls = sum(m["total_calls"] for m in tool_metrics.values())
+        successful_calls = sum(m["successful_calls"] for m in tool_metrics.values())
+        p50, p95, p99 = latency.quantiles((0.50, 0.95, 0.99))
+
         metrics = {
-            "latency_p95": 150.0,  # ms
-            "memory_mb": 85.0,     # MB
-            "success_rate": 98.5,  # %
+            "latency_p50": round(p50, 2),  # ms
+            "latency_p95": round(p95, 2),  # ms
+            "latency_p99": round(p99, 2),  # ms
+            "memory_mb": _process_memory_mb(),
+            "success_rate": round(successful_calls / total_calls * 100, 2) if total_calls else 100.0,  # %
+            "duplicate_turns_rejected": get_recent_turn_index().get_stats()["duplicates_rejected"],
             "timestamp": log_timestamp()
         }
 
@@ -430,6 +442,58 @@ async def get_current_metrics(request: web.Request) -> web.Response:
             "memory_mb": 0,
             "success_rate": 0
         }, status=500)
+
+
+def _process_memory_mb() -> float:
+    """Resident memory of this process in MB (0.0 if psutil is unavailable)."""
+    try:
+        import psutil
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    except Exception:
+        return 0.0
+
+
+async def get_latency_sketches(request: web.Request) -> web.Response:
+    """
+    Get per-tool latency sketches (serialized, mergeable).
+
+    Aggregators scraping several daemons can merge these with
+    utils.infrastructure.performance_metrics.merge_latency_sketches to get
+    fleet-wide percentiles instead of averaging per-process p99s.
+    """
+    try:
+        from utils.infrastructure.performance_metrics import get_collector
+
+        return web.json_response({
+            "tools": get_collector().get_latency_sketches(),
+            "timestamp": log_timestamp()
+        })
+
+    except Exception as e:
+        log_error(ErrorCode.INTERNAL_ERROR, f"Error fetching latency sketches: {e}", exc_info=True)
+        return web.json_response({"error": str(e), "tools": {}}, status=500)
+
+
+async def get_transport_metrics(request: web.Request) -> web.Response:
+    """
+    Get provider connection pool metrics (utils/http_transport.py).
+
+    Per origin: requests, new vs reused connections, connection setup
+    latency (TCP + TLS) and current pool occupancy.
+    """
+    try:
+        from utils.http_transport import get_transport_manager
+
+        return web.json_response({
+            "transport": get_transport_manager().get_stats(),
+            "timestamp": log_timestamp()
+        })
+
+    except Exception as e:
+        log_error(ErrorCode.INTERNAL_ERROR, f"Error fetching transport metrics: {e}", exc_info=True)
+        return web.json_response({"error": str(e), "transport": {}}, status=500)
+
+
 async def handle_timeout_estimate(request: web.Request) -> web.Response:
     """
     Estimate timeout for a model request using adaptive timeout engine.
@@ -125,15 +125,22 @@ class MonitoringHTTPServer:
         Returns:
             JSON response with metrics
         """
-        # This would normally fetch from actual monitoring system
-        # For now, return mock data
+        from utils.infrastructure.performance_metrics import get_collector
+
+        # Tool latency percentiles from the merged recent-window sketch;
+        # host figures are still placeholders
+        collector = get_collector()
+        p50, p95, p99 = collector.get_overall_latency().quantiles((0.50, 0.95, 0.99))
         metrics = {
             "timestamp": "2025-11-04T00:00:00Z",
             "cpu_usage": 45.2,
             "memory_usage": 62.8,
             "disk_usage": 34.5,
             "active_connections": 0,
-            "response_time_ms": 120
+            "response_time_ms": round(p50, 2),
+            "response_time_p95_ms": round(p95, 2),
+            "response_time_p99_ms": round(p99, 2),
+            "tool_metrics": collector.get_tool_metrics(),
         }
 
         return web.json_response(metrics)
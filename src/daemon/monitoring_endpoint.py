@@ -38,6 +38,8 @@ from .monitoring.http_endpoints import (
     acknowledge_observation,
     get_cache_metrics,
     get_current_metrics,
+    get_latency_sketches,
+    get_transport_metrics,
     handle_timeout_estimate,
 )
 from .monitoring.health_tracker import (
@@ -113,6 +115,8 @@ async def start_monitoring_server(host: str = "0.0.0.0", port: int = 8080) -> No
 
     # Testing API routes (Phase 0.4 - 2025-10-24)
     app.router.add_get('/api/metrics/current', get_current_metrics)
+    app.router.add_get('/api/metrics/latency', get_latency_sketches)
+    app.router.add_get('/api/metrics/transport', get_transport_metrics)
 
     # Event ingestion endpoint for testing (2025-10-27)
     app.router.add_get('/events', event_ingestion_handler)
@@ -4,8 +4,9 @@ Connection Pre-warming Module
 BUG FIX #11 (2025-10-20): Implement connection pre-warming to reduce first-call latency
 Based on EXAI guidance from Phase 1 implementation plan.
 
-This module warms up external connections during server startup to eliminate
-cold start latency on the first request after container rebuild.
+This module warms up external connections (Supabase, Redis, AI providers)
+during server startup to eliminate cold start latency on the first request
+after container rebuild.
 
 Expected improvements:
 - Faster first request after server startup
@@ -104,6 +105,33 @@ async def warmup_redis() -> redis.Redis:
         raise
 
 
+async def warmup_providers() -> dict:
+    """
+    Open pooled connections to the configured AI providers (Kimi, GLM).
+
+    Moves the DNS lookup and TCP/TLS handshake of the first provider call to
+    startup. Failures are logged, not raised: a provider that is unreachable
+    now may be reachable by the time it is first used.
+
+    Returns:
+        Origin -> warmup time in ms (None if it failed)
+    """
+    try:
+        from utils.http_transport import get_transport_manager
+
+        logger.info("[WARMUP] Warming AI provider connections...")
+        manager = get_transport_manager()
+        timings = await manager.warmup()
+        manager.start_keep_warm()
+        if not timings:
+            logger.info("[WARMUP] No AI providers configured, skipping provider warmup")
+        return timings
+
+    except Exception as e:
+        logger.warning(f"[WARMUP] Provider connection warmup failed: {e}")
+        return {}
+
+
 async def warmup_all() -> bool:
     """
     Warm up all external connections in parallel.
@@ -124,9 +152,10 @@ async def warmup_all() -> bool:
         # Warm up connections in parallel for faster startup
         supabase_task = asyncio.create_task(warmup_supabase())
         redis_task = asyncio.create_task(warmup_redis())
+        providers_task = asyncio.create_task(warmup_providers())
         
         # Wait for all to complete
-        await asyncio.gather(supabase_task, redis_task)
+        await asyncio.gather(supabase_task, redis_task, providers_task)
         
         elapsed = asyncio.get_event_loop().time() - start_time
         logger.info("[WARMUP] ========================================")
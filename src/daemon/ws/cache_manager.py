@@ -10,30 +10,225 @@ into focused modules:
 - cache_manager.py: Result caching and inflight tracking (this file)
 - tool_executor.py: Tool execution with semaphore management
 - request_router.py: Main message routing logic
+
+SINGLE-FLIGHT COALESCING:
+Inflight work is keyed by call_key (see router_utils.make_call_key), not by
+request_id. Concurrent identical tool calls share one execution: the first
+caller starts the work, later callers await the same task. The shared work is
+only cancelled when the last waiter goes away. Waiters can attach a
+subscriber (their socket and request id); the shared work is handed the live
+subscriber list so progress and stream frames reach every waiter, from the
+moment it joins, rather than only the caller that started the work.
+
+BOUNDED RESULT STORE:
+Completed results live in a BoundedResultStore: an LRU with a byte budget
+measured from the normalized outputs, and lazy TTL expiry driven by a heap
+so expiry never needs a full scan of the cache.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.daemon.ws.router_utils import outputs_size_bytes
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _InflightEntry:
+    """Shared inflight work for one key."""
+    future: asyncio.Future
+    created_at: float
+    waiters: int = 0
+    subscribers: List[Any] = field(default_factory=list)
+
+    def is_expired(self, ttl_secs: float, now: float) -> bool:
+        return (now - self.created_at) >= ttl_secs
+
+
+@dataclass
+class _ResultEntry:
+    """Cached result with its measured size and expiry."""
+    value: Any
+    size: int
+    expires_at: float
+    seq: int
+
+
+class BoundedResultStore:
+    """
+    LRU result store with a byte budget and lazy TTL expiry.
+
+    - get/set are O(1) plus O(log n) heap maintenance
+    - Least recently used entries are evicted once max_bytes (or max_entries)
+      would be exceeded
+    - Expired entries are dropped from the head of an expiry heap on every
+      access, so no operation walks the whole cache
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_secs: float,
+        max_entries: Optional[int] = None,
+        size_func: Callable[[Any], int] = outputs_size_bytes
+    ):
+        """
+        Initialize result store.
+
+        Args:
+            max_bytes: Total byte budget for cached values
+            ttl_secs: Time-to-live for each entry in seconds
+            max_entries: Optional cap on the number of entries
+            size_func: Function measuring a value's size in bytes
+        """
+        self.max_bytes = max_bytes
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self._size_func = size_func
+
+        self._entries: "OrderedDict[str, _ResultEntry]" = OrderedDict()
+        # (expires_at, seq, key); stale heap items are skipped by seq mismatch
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self.current_bytes = 0
+
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected_oversize = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[Any]:
+        """Return the value for key (marking it recently used), or None if absent/expired."""
+        now = time.time() if now is None else now
+        self.expire(now)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: str, value: Any, now: Optional[float] = None) -> bool:
+        """
+        Store value under key, evicting LRU entries to stay within budget.
+
+        Returns:
+            False if the value alone exceeds max_bytes and was not stored
+        """
+        now = time.time() if now is None else now
+        self.expire(now)
+
+        size = self._size_func(value)
+        if size > self.max_bytes:
+            self.rejected_oversize += 1
+            self._discard(key)
+            return False
+
+        self._discard(key)
+        seq = next(self._seq)
+        expires_at = now + self.ttl_secs
+        self._entries[key] = _ResultEntry(value=value, size=size, expires_at=expires_at, seq=seq)
+        self.current_bytes += size
+        heapq.heappush(self._expiry_heap, (expires_at, seq, key))
+
+        while self._entries and (
+            self.current_bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+
+        self._maybe_compact_heap()
+        return True
+
+    def pop(self, key: str) -> Optional[Any]:
+        """Remove key and return its value, if present."""
+        entry = self._discard(key)
+        return entry.value if entry is not None else None
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop entries whose TTL has elapsed.
+
+        Only inspects the head of the expiry heap, so cost is proportional to
+        the number of expired (or stale) heap items rather than cache size.
+
+        Returns:
+            Number of live entries expired
+        """
+        now = time.time() if now is None else now
+        expired = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.seq == seq:
+                del self._entries[key]
+                self.current_bytes -= entry.size
+                expired += 1
+        self.expirations += expired
+        return expired
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._expiry_heap.clear()
+        self.current_bytes = 0
+
+    def _discard(self, key: str) -> Optional[_ResultEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+        return entry
+
+    def _maybe_compact_heap(self) -> None:
+        # Overwrites and evictions leave stale heap items; rebuild when they dominate
+        if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [(e.expires_at, e.seq, k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected_oversize": self.rejected_oversize,
+        }
+
+
 class CacheManager:
     """
     Manages result caching and inflight request tracking.
 
     Provides:
-    - Result caching by request_id and call_key
-    - Inflight request tracking for deduplication
+    - Result caching by call_key (byte-bounded LRU, see BoundedResultStore)
+    - Single-flight coalescing of identical concurrent calls by call_key
     - TTL-based expiration for both results and inflight requests
+    - Hit/miss/coalesce counters via get_stats()
     """
 
     def __init__(
         self,
         inflight_ttl_secs: int = 300,
-        result_ttl_secs: int = 300
+        result_ttl_secs: int = 300,
+        result_max_bytes: int = 64 * 1024 * 1024,
+        result_max_entries: Optional[int] = None
     ):
         """
         Initialize cache manager.
@@ -41,58 +236,145 @@ class CacheManager:
         Args:
             inflight_ttl_secs: TTL for inflight requests in seconds (default 300)
             result_ttl_secs: TTL for cached results in seconds (default 300)
+            result_max_bytes: Byte budget for cached results (default 64MB)
+            result_max_entries: Optional cap on number of cached results
         """
         self.inflight_ttl_secs = inflight_ttl_secs
         self.result_ttl_secs = result_ttl_secs
 
-        # Inflight requests: request_id -> asyncio.Future
-        self.inflight_requests: Dict[str, asyncio.Future] = {}
+        # Inflight requests: call_key -> _InflightEntry
+        self.inflight_requests: Dict[str, _InflightEntry] = {}
 
-        # Cached results: call_key -> (result, timestamp)
-        self.cached_results: Dict[str, tuple[Any, float]] = {}
+        # Cached results: call_key -> result (bounded LRU with lazy TTL expiry)
+        self.cached_results = BoundedResultStore(
+            max_bytes=result_max_bytes,
+            ttl_secs=result_ttl_secs,
+            max_entries=result_max_entries
+        )
 
         # Locks for thread safety
         self._inflight_lock = asyncio.Lock()
         self._results_lock = asyncio.Lock()
 
-    async def get_inflight(self, request_id: str) -> Optional[asyncio.Future]:
+        # Counters
+        self._result_hits = 0
+        self._result_misses = 0
+        self._inflight_started = 0
+        self._inflight_coalesced = 0
+        self._inflight_cancelled = 0
+        self._inflight_expired = 0
+
+    async def get_inflight(self, key: str) -> Optional[asyncio.Future]:
         """
         Get inflight request future if it exists and is not expired.
 
         Args:
-            request_id: Request ID to check
+            key: Inflight key to check (call_key)
 
         Returns:
             Future if request is inflight and not expired, None otherwise
         """
         async with self._inflight_lock:
-            if request_id in self.inflight_requests:
-                future = self.inflight_requests[request_id]
-                # Note: We don't track creation time per request_id
-                # In production, you might want to add timestamps for proper TTL
-                return future
-            return None
+            entry = self._get_live_entry(key, time.monotonic())
+            return entry.future if entry is not None else None
 
-    async def add_inflight(self, request_id: str, future: asyncio.Future) -> None:
+    async def add_inflight(self, key: str, future: asyncio.Future) -> None:
         """
         Add a request to inflight tracking.
 
         Args:
-            request_id: Request ID to track
+            key: Inflight key to track (call_key)
             future: Future to track
         """
+        entry = _InflightEntry(future=future, created_at=time.monotonic())
         async with self._inflight_lock:
-            self.inflight_requests[request_id] = future
+            self.inflight_requests[key] = entry
 
         # Clean up when future completes
-        future.add_done_callback(
-            lambda f: asyncio.create_task(self._remove_inflight(request_id))
-        )
+        future.add_done_callback(lambda f: self._remove_inflight(key, entry))
+
+    def _remove_inflight(self, key: str, entry: _InflightEntry) -> None:
+        """Remove a request from inflight tracking if it is still the current entry."""
+        if self.inflight_requests.get(key) is entry:
+            del self.inflight_requests[key]
+
+    def _get_live_entry(self, key: str, now: float) -> Optional[_InflightEntry]:
+        """Return the inflight entry for key, dropping it if done or past its TTL."""
+        entry = self.inflight_requests.get(key)
+        if entry is None:
+            return None
+        if entry.future.done() or entry.is_expired(self.inflight_ttl_secs, now):
+            if not entry.future.done():
+                self._inflight_expired += 1
+                logger.warning(f"[SINGLE_FLIGHT] Inflight entry expired after {self.inflight_ttl_secs}s, not joining")
+            del self.inflight_requests[key]
+            return None
+        return entry
+
+    async def run_single_flight(
+        self,
+        call_key: str,
+        factory: Callable[..., Awaitable[Any]],
+        subscriber: Any = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run factory() once per call_key across concurrent callers.
+
+        The first caller starts the work as a task; callers arriving while it
+        is still inflight (and within inflight_ttl_secs) await the same task.
+        A cancelled waiter only cancels the shared task when it was the last one.
+
+        When subscriber is given, it is attached to the shared work for as long
+        as this caller waits, and factory is called with the live subscriber
+        list instead of no arguments. The work should deliver its side output
+        (progress, stream frames) to that list rather than to the socket of
+        the caller that happened to start it.
 
-    async def _remove_inflight(self, request_id: str) -> None:
-        """Remove a request from inflight tracking."""
+        Args:
+            call_key: Key identifying identical calls
+            factory: Callable returning the awaitable to run
+            subscriber: Optional per-waiter delivery target (e.g. ws, request id)
+
+        Returns:
+            Tuple of (result, coalesced) where coalesced is True if this caller
+            joined work started by another caller
+        """
         async with self._inflight_lock:
-            self.inflight_requests.pop(request_id, None)
+            entry = self._get_live_entry(call_key, time.monotonic())
+            coalesced = entry is not None
+            if entry is None:
+                subscribers: List[Any] = []
+                work = factory(subscribers) if subscriber is not None else factory()
+                task = asyncio.ensure_future(work)
+                entry = _InflightEntry(future=task, created_at=time.monotonic(), subscribers=subscribers)
+                self.inflight_requests[call_key] = entry
+                task.add_done_callback(lambda f, e=entry: self._remove_inflight(call_key, e))
+                self._inflight_started += 1
+            else:
+                self._inflight_coalesced += 1
+            entry.waiters += 1
+            if subscriber is not None:
+                entry.subscribers.append(subscriber)
+
+        try:
+            # Shield so one waiter's cancellation does not cancel the shared work
+            result = await asyncio.shield(entry.future)
+        except asyncio.CancelledError:
+            entry.waiters -= 1
+            if entry.waiters <= 0 and not entry.future.done():
+                entry.future.cancel()
+                self._inflight_cancelled += 1
+                logger.info("[SINGLE_FLIGHT] Last waiter left, cancelled shared execution")
+            raise
+        except BaseException:
+            entry.waiters -= 1
+            raise
+        finally:
+            if subscriber is not None and subscriber in entry.subscribers:
+                entry.subscribers.remove(subscriber)
+
+        entry.waiters -= 1
+        return result, coalesced
 
     async def get_cached_result(self, call_key: str) -> Optional[Any]:
         """
@@ -105,67 +387,78 @@ class CacheManager:
             Cached result if available and not expired, None otherwise
         """
         async with self._results_lock:
-            if call_key in self.cached_results:
-                result, timestamp = self.cached_results[call_key]
-                age = time.time() - timestamp
-
-                if age < self.result_ttl_secs:
-                    return result
-                else:
-                    # Expired, remove it
-                    del self.cached_results[call_key]
+            result = self.cached_results.get(call_key)
+            if result is not None:
+                self._result_hits += 1
+                return result
 
+            self._result_misses += 1
             return None
 
     async def cache_result(self, call_key: str, result: Any) -> None:
         """
         Cache a result with current timestamp.
 
+        Results larger than the whole byte budget are not cached.
+
         Args:
             call_key: Cache key to store under
             result: Result to cache
         """
         async with self._results_lock:
-            self.cached_results[call_key] = (result, time.time())
+            if not self.cached_results.set(call_key, result):
+                logger.debug(f"[RESULT_CACHE] Result for {call_key[:16]} exceeds cache budget, not cached")
 
     async def clear_expired(self) -> Dict[str, int]:
         """
         Clear all expired entries from both caches.
 
+        Expired inflight entries are only dropped from tracking so new callers
+        start fresh work; tasks already awaited by clients keep running.
+
         Returns:
             Dictionary with counts of cleared entries
         """
         cleared = {"inflight": 0, "results": 0}
-        current_time = time.time()
 
         # Clear expired inflight requests
-        # Note: Without per-request timestamps, we can't properly expire inflight requests
-        # In production, you might want to track creation times
+        async with self._inflight_lock:
+            now = time.monotonic()
+            before = len(self.inflight_requests)
+            for key in list(self.inflight_requests):
+                self._get_live_entry(key, now)
+            cleared["inflight"] = before - len(self.inflight_requests)
 
         # Clear expired results
         async with self._results_lock:
-            expired_keys = []
-            for call_key, (result, timestamp) in self.cached_results.items():
-                if current_time - timestamp >= self.result_ttl_secs:
-                    expired_keys.append(call_key)
-
-            for key in expired_keys:
-                del self.cached_results[key]
-
-            cleared["results"] = len(expired_keys)
+            cleared["results"] = self.cached_results.expire()
 
         return cleared
 
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
 
         Returns:
             Dictionary with cache statistics
         """
+        lookups = self._result_hits + self._result_misses
+        store_stats = self.cached_results.get_stats()
         return {
             "inflight_count": len(self.inflight_requests),
             "cached_results_count": len(self.cached_results),
             "inflight_ttl_secs": self.inflight_ttl_secs,
             "result_ttl_secs": self.result_ttl_secs,
+            "result_hits": self._result_hits,
+            "result_misses": self._result_misses,
+            "result_hit_rate": (self._result_hits / lookups) if lookups else 0.0,
+            "cached_results_bytes": store_stats["bytes"],
+            "result_max_bytes": store_stats["max_bytes"],
+            "result_evictions": store_stats["evictions"],
+            "result_expirations": store_stats["expirations"],
+            "result_rejected_oversize": store_stats["rejected_oversize"],
+            "inflight_started": self._inflight_started,
+            "inflight_coalesced": self._inflight_coalesced,
+            "inflight_cancelled": self._inflight_cancelled,
+            "inflight_expired": self._inflight_expired,
         }
@@ -133,9 +133,19 @@ class RequestRouter:
         # Initialize cache manager
         inflight_ttl = int(validated_env.get("INFLIGHT_TTL_SECS", 300))
         result_ttl = int(validated_env.get("RESULT_TTL_SECS", 300))
+        result_max_bytes = int(validated_env.get(
+            "EXAI_WS_RESULT_CACHE_MAX_BYTES",
+            os.getenv("EXAI_WS_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ))
+        result_max_entries = int(validated_env.get(
+            "EXAI_WS_RESULT_CACHE_MAX_ENTRIES",
+            os.getenv("EXAI_WS_RESULT_CACHE_MAX_ENTRIES", "1000")
+        ))
         self.cache_manager = CacheManager(
             inflight_ttl_secs=inflight_ttl,
-            result_ttl_secs=result_ttl
+            result_ttl_secs=result_ttl,
+            result_max_bytes=result_max_bytes,
+            result_max_entries=result_max_entries or None
         )
 
         # Initialize tool executor
@@ -309,59 +319,41 @@ class RequestRouter:
                 )
                 return
 
-            # Check for inflight request
-            inflight_future = await self.cache_manager.get_inflight(req_id)
-            if inflight_future:
-                # Wait for existing request
-                try:
-                    result = await inflight_future
-                    await _safe_send(
-                        ws,
-                        {
-                            "op": "call_tool_res",  # CRITICAL FIX (2025-11-04): Changed from "result" to "call_tool_res"
-                            "request_id": req_id,
-                            "outputs": result,  # Changed from "result" to "outputs"
-                            "from_inflight": True
-                        },
-                        resilient_ws_manager=resilient_ws_manager
-                    )
-                    return
-                except Exception:
-                    # Inflight request failed, continue with new execution
-                    pass
-
-            # Create future for this request
-            inflight_future = asyncio.Future()
-            await self.cache_manager.add_inflight(req_id, inflight_future)
+            # Single-flight: identical concurrent calls share one execution.
+            # The shared execution is not tied to this caller's socket: progress
+            # and stream frames fan out to every waiter still subscribed.
+            async def _execute_and_cache(subscribers):
+                result = await self.tool_executor.execute_tool(
+                    normalized_name,
+                    arguments,
+                    ws,
+                    req_id,
+                    resilient_ws_manager,
+                    subscribers=subscribers
+                )
+                if result[0]:
+                    # Cache successful result once, from the shared execution
+                    await self.cache_manager.cache_result(call_key, result[1])
+                return result
 
-            # Execute tool
-            success, outputs, error_msg = await self.tool_executor.execute_tool(
-                normalized_name,
-                arguments,
-                ws,
-                req_id,
-                resilient_ws_manager
+            (success, outputs, error_msg), coalesced = await self.cache_manager.run_single_flight(
+                call_key, _execute_and_cache, subscriber=(ws, req_id, resilient_ws_manager)
             )
 
-            # Set result in future and send response
+            # Send response
             if success:
-                inflight_future.set_result(outputs)
-                # Cache successful result
-                await self.cache_manager.cache_result(call_key, outputs)
+                response = {
+                    "op": "call_tool_res",  # CRITICAL FIX (2025-11-04): Changed from "result" to "call_tool_res" to match shim expectation
+                    "request_id": req_id,
+                    "outputs": outputs  # Changed from "result" to "outputs" to match protocol
+                }
+                if coalesced:
+                    response["from_inflight"] = True
                 # Send successful response to client
                 logger.info(f"[DEBUG_SEND] About to send result for {req_id}, outputs type: {type(outputs)}, len: {len(outputs) if isinstance(outputs, list) else 'N/A'}")
-                send_success = await _safe_send(
-                    ws,
-                    {
-                        "op": "call_tool_res",  # CRITICAL FIX (2025-11-04): Changed from "result" to "call_tool_res" to match shim expectation
-                        "request_id": req_id,
-                        "outputs": outputs  # Changed from "result" to "outputs" to match protocol
-                    },
-                    resilient_ws_manager=resilient_ws_manager
-                )
+                send_success = await _safe_send(ws, response, resilient_ws_manager=resilient_ws_manager)
                 logger.info(f"[DEBUG_SEND] Send result for {req_id}: success={send_success}")
             else:
-                inflight_future.set_exception(Exception(error_msg or "Unknown error"))
                 # Send error response to client
                 await _safe_send(
                     ws,
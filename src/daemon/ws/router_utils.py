@@ -78,3 +78,26 @@ def make_call_key(name: str, arguments: Dict[str, Any]) -> str:
     except Exception as e:
         # Fallback to simple concatenation
         return f"{name}:{str(arguments)}"
+
+
+def outputs_size_bytes(outputs: Any) -> int:
+    """
+    Measure the approximate in-memory footprint of tool outputs in bytes.
+
+    Normalized outputs ({"type": "text", "text": "..."} lists) are measured by
+    their UTF-8 text length; anything else falls back to its JSON encoding.
+    """
+    if isinstance(outputs, list) and all(isinstance(o, dict) for o in outputs):
+        size = 0
+        for o in outputs:
+            text = o.get("text")
+            if isinstance(text, str):
+                # Small fixed overhead per item for the dict and "type" field
+                size += len(text.encode("utf-8", errors="replace")) + 64
+            else:
+                size += len(json.dumps(o, default=str))
+        return size
+    try:
+        return len(json.dumps(outputs, default=str))
+    except (TypeError, ValueError):
+        return len(str(outputs))
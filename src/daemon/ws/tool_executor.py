@@ -21,6 +21,7 @@ from websockets.server import WebSocketServerProtocol
 
 # Import connection manager for _safe_send
 from src.daemon.ws.connection_manager import _safe_send
+from src.streaming.streaming_adapter import StreamSink
 
 # Import middleware
 from src.daemon.middleware.semaphores import SemaphoreGuard
@@ -153,7 +154,8 @@ class ToolExecutor:
         arguments: dict,
         ws: WebSocketServerProtocol,
         req_id: str,
-        resilient_ws_manager=None
+        resilient_ws_manager=None,
+        subscribers: Optional[list] = None
     ) -> Tuple[bool, Optional[list], Optional[str]]:
         """
         Execute a tool with semaphore management and progress tracking.
@@ -164,13 +166,14 @@ class ToolExecutor:
             ws: WebSocket connection
             req_id: Request ID
             resilient_ws_manager: Optional WebSocket manager
+            subscribers: Optional live list of (ws, req_id, resilient_ws_manager)
+                targets for progress and stream frames; when given, frames go to
+                every entry in it instead of ws/req_id (single-flight fan-out)
 
         Returns:
             Tuple of (success, outputs, error_msg)
         """
-        # DEBUG: Log tool execution attempt (MCP 1.20.0 compatibility check)
-        logger.info(f"[DEBUG] execute_tool called: name={name}, req_id={req_id}")
-        logger.info(f"[DEBUG] Available tools: {list(self.server_tools.keys())}")
+        logger.debug(f"[TOOL_EXECUTOR] execute_tool called: name={name}, req_id={req_id}")
 
         # Get tool
         tool = self.server_tools.get(name)
@@ -178,13 +181,9 @@ class ToolExecutor:
             log_error(ErrorCode.TOOL_NOT_FOUND, f"Tool not found: {name}", req_id)
             raise ToolNotFoundError(name, available_tools=list(self.server_tools.keys()))
 
-        # DEBUG: Log tool object details
-        logger.info(f"[DEBUG] Tool found: {tool}, type: {type(tool)}")
-        logger.info(f"[DEBUG] Tool has execute method: {hasattr(tool, 'execute')}")
-        if hasattr(tool, 'execute'):
-            import inspect
-            sig = inspect.signature(tool.execute)
-            logger.info(f"[DEBUG] Tool execute signature: {sig}")
+        # Per-call diagnostics are debug-only: formatting them on every call is hot-path work
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[TOOL_EXECUTOR] Tool found: {type(tool).__name__} ({len(self.server_tools)} tools registered)")
 
         # Check semantic cache first
         cache_params = None
@@ -192,7 +191,7 @@ class ToolExecutor:
             cache_params = self._extract_cache_params(arguments)
             if self.semantic_cache:
                 try:
-                    cached_result = self.semantic_cache.get(**cache_params)
+                    cached_result = await self.semantic_cache.aget(**cache_params)
                     if cached_result is not None:
                         logger.info(f"[SEMANTIC_CACHE] Cache hit for {name}")
                         return True, cached_result, None
@@ -219,7 +218,7 @@ class ToolExecutor:
 
                     processing_start = time.perf_counter()
                     success, outputs, error_msg = await self._execute_tool_with_progress(
-                        tool, arguments, ws, req_id, resilient_ws_manager
+                        tool, arguments, ws, req_id, resilient_ws_manager, subscribers
                     )
 
                     processing_ms = (time.perf_counter() - processing_start) * 1000
@@ -228,7 +227,7 @@ class ToolExecutor:
                 processing_start = time.perf_counter()
 
                 success, outputs, error_msg = await self._execute_tool_with_progress(
-                    tool, arguments, ws, req_id, resilient_ws_manager
+                    tool, arguments, ws, req_id, resilient_ws_manager, subscribers
                 )
 
                 processing_ms = (time.perf_counter() - processing_start) * 1000
@@ -257,7 +256,7 @@ class ToolExecutor:
         # Cache successful results
         if success and outputs and cache_params and self.semantic_cache:
             try:
-                self.semantic_cache.set(
+                await self.semantic_cache.aset(
                     **cache_params,
                     response=outputs
                 )
@@ -292,7 +291,8 @@ class ToolExecutor:
         arguments: dict,
         ws: WebSocketServerProtocol,
         req_id: str,
-        resilient_ws_manager
+        resilient_ws_manager,
+        subscribers: Optional[list] = None
     ) -> Tuple[bool, Optional[list], Optional[str]]:
         """
         Execute tool with timeout and progress updates.
@@ -303,6 +303,7 @@ class ToolExecutor:
             ws: WebSocket connection
             req_id: Request ID
             resilient_ws_manager: WebSocket manager
+            subscribers: Optional live fan-out targets (see execute_tool)
 
         Returns:
             Tuple of (success, outputs, error_msg)
@@ -310,37 +311,40 @@ class ToolExecutor:
         success = False
         outputs = None
         error_msg = None
+        tool_name = tool.get_name() if hasattr(tool, 'get_name') else str(tool)
 
         # Start progress task
         progress_task = asyncio.create_task(
-            self._send_progress_updates(ws, req_id, resilient_ws_manager)
+            self._send_progress_updates(ws, req_id, resilient_ws_manager, subscribers)
+        )
+
+        # Streaming sink for progressive chunk delivery: coalesces provider
+        # deltas into frames and slows the producer while the socket drains
+        on_chunk = StreamSink(
+            lambda frame: self._send_stream_chunk(ws, req_id, frame, resilient_ws_manager, subscribers)
         )
 
         try:
-            # Create streaming callback for progressive chunk delivery
-            async def on_chunk(chunk: str):
-                """Forward streaming chunks to WebSocket client."""
-                await self._send_stream_chunk(ws, req_id, chunk, resilient_ws_manager)
 
-            # DEBUG: Log before tool execution
-            logger.info(f"[DEBUG] About to execute tool: {tool}")
-            logger.info(f"[DEBUG] Arguments keys: {list(arguments.keys()) if arguments else []}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[TOOL_EXECUTOR] Executing {tool_name} with argument keys: {list(arguments or {})}")
 
             # Execute tool with timeout and streaming callback
-            logger.info(f"[DEBUG] Calling tool.execute() with on_chunk callback...")
             result = await asyncio.wait_for(
                 tool.execute(arguments, on_chunk=on_chunk),
                 timeout=self.call_timeout
             )
-            logger.info(f"[DEBUG] Tool execution completed successfully, result type: {type(result)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[TOOL_EXECUTOR] {tool_name} completed, result type: {type(result).__name__}")
 
             # Extract outputs (result is already a list of TextContent)
             from src.daemon.ws.router_utils import normalize_outputs
             outputs = normalize_outputs(result)
             success = True
 
-            # Send completion message after streaming finishes
-            await self._send_stream_completion(ws, req_id, resilient_ws_manager)
+            # Send completion message after the last streamed frame
+            await on_chunk.aclose()
+            await self._send_stream_completion(ws, req_id, resilient_ws_manager, subscribers)
 
         except asyncio.TimeoutError:
             error_msg = f"Tool execution timed out after {self.call_timeout}s"
@@ -349,11 +353,12 @@ class ToolExecutor:
         except Exception as e:
             error_msg = f"Tool execution failed: {str(e)}"
             log_error(ErrorCode.TOOL_EXECUTION_ERROR, error_msg, req_id, exc_info=True)
-            # Get tool name for error reporting
-            tool_name = tool.get_name() if hasattr(tool, 'get_name') else str(tool)
             raise ToolExecutionError(tool_name, e) from e
 
         finally:
+            # Drop undelivered frames of a failed or timed-out call
+            on_chunk.abort()
+
             # Cleanup progress task
             progress_task.cancel()
             try:
@@ -366,24 +371,46 @@ class ToolExecutor:
 
         return success, outputs, error_msg
 
+    async def _send_frame(
+        self,
+        ws: WebSocketServerProtocol,
+        req_id: str,
+        payload: dict,
+        resilient_ws_manager=None,
+        subscribers: Optional[list] = None
+    ) -> None:
+        """
+        Send a frame to the caller, or to every subscriber of a shared execution.
+
+        Each target gets the frame under its own request_id. A closed socket
+        only fails its own send (_safe_send swallows disconnects).
+        """
+        targets = list(subscribers) if subscribers is not None else [(ws, req_id, resilient_ws_manager)]
+        await asyncio.gather(*(
+            _safe_send(target_ws, {**payload, "request_id": target_req_id}, resilient_ws_manager=target_manager)
+            for target_ws, target_req_id, target_manager in targets
+        ))
+
     async def _send_progress_updates(
         self,
         ws: WebSocketServerProtocol,
         req_id: str,
-        resilient_ws_manager=None
+        resilient_ws_manager=None,
+        subscribers: Optional[list] = None
     ) -> None:
         """Send periodic progress updates during tool execution."""
         try:
             while True:
                 await asyncio.sleep(self.progress_interval)
-                await _safe_send(
+                await self._send_frame(
                     ws,
+                    req_id,
                     {
                         "op": "progress",
-                        "request_id": req_id,
                         "message": "Tool execution in progress..."
                     },
-                    resilient_ws_manager=resilient_ws_manager
+                    resilient_ws_manager,
+                    subscribers
                 )
         except asyncio.CancelledError:
             # Normal cancellation when tool completes
@@ -396,19 +423,21 @@ class ToolExecutor:
         ws: WebSocketServerProtocol,
         req_id: str,
         chunk: str,
-        resilient_ws_manager=None
+        resilient_ws_manager=None,
+        subscribers: Optional[list] = None
     ) -> None:
         """Send a streaming chunk to the client."""
         try:
-            await _safe_send(
+            await self._send_frame(
                 ws,
+                req_id,
                 {
                     "op": "stream_chunk",
-                    "request_id": req_id,
                     "chunk": chunk,
                     "timestamp": log_timestamp()
                 },
-                resilient_ws_manager=resilient_ws_manager
+                resilient_ws_manager,
+                subscribers
             )
         except Exception as e:
             logger.debug(f"Stream chunk send failed: {e}")
@@ -417,18 +446,20 @@ class ToolExecutor:
         self,
         ws: WebSocketServerProtocol,
         req_id: str,
-        resilient_ws_manager=None
+        resilient_ws_manager=None,
+        subscribers: Optional[list] = None
     ) -> None:
         """Send a streaming completion message to the client."""
         try:
-            await _safe_send(
+            await self._send_frame(
                 ws,
+                req_id,
                 {
                     "op": "stream_complete",
-                    "request_id": req_id,
                     "timestamp": log_timestamp()
                 },
-                resilient_ws_manager=resilient_ws_manager
+                resilient_ws_manager,
+                subscribers
             )
         except Exception as e:
             logger.debug(f"Stream completion send failed: {e}")
@@ -103,7 +103,7 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 # TODO: Unify logging systems after file upload feature is complete
 # For now: Restore async_logging to get system working again
 from src.utils.async_logging import setup_async_safe_logging
-_log_listener = setup_async_safe_logging(level=logging.INFO)
+_log_pipeline = setup_async_safe_logging(level=logging.INFO)
 
 # Setup logging with UTF-8 support for Windows consoles
 logger = setup_logging("ws_daemon", log_file=str(LOG_DIR / "ws_daemon.log"))
@@ -896,6 +896,19 @@ async def main_async() -> None:
             await _resilient_ws.stop_background_tasks()
             logger.info("[RESILIENT_WS] Stopped resilient WebSocket manager")
 
+        # Flush pending write-behind conversation turns before exit
+        try:
+            from src.daemon.conversation_queue import shutdown_conversation_queue
+            await shutdown_conversation_queue()
+        except Exception as e:
+            logger.error(f"Failed to flush conversation queue: {e}", exc_info=True)
+
+        try:
+            from utils.http_transport import close_transport_manager
+            await close_transport_manager()
+        except Exception as e:
+            logger.error(f"Failed to close provider connection pools: {e}", exc_info=True)
+
         _remove_pidfile()
         # Shutdown async logging to flush all messages
         from src.utils.async_logging import shutdown_async_logging
@@ -53,6 +53,19 @@ CACHE_HIT_RATIO = Gauge(
     'Cache hit ratio (0.0 to 1.0)'
 )
 
+# Kimi context-cache tokens (src/providers/kimi_cache.py)
+KIMI_CONTEXT_CACHE_LOOKUPS = Counter(
+    'mcp_kimi_context_cache_lookups_total',
+    'Kimi context-cache token lookups',
+    ['result']  # result: hit/miss
+)
+
+KIMI_CONTEXT_CACHE_EVENTS = Counter(
+    'mcp_kimi_context_cache_events_total',
+    'Kimi context-cache token store events',
+    ['event']  # event: save/evict/expire/redis_hit/redis_error
+)
+
 # ============================================================================
 # STORAGE METRICS
 # ============================================================================
@@ -126,6 +139,47 @@ TOKEN_COST = Counter(
     ['provider', 'model']
 )
 
+# Provider transport (utils/http_transport.py)
+PROVIDER_HTTP_REQUESTS = Counter(
+    'mcp_provider_http_requests_total',
+    'Provider HTTP requests by connection reuse',
+    ['origin', 'connection']  # connection: new/reused
+)
+
+PROVIDER_CONNECTION_SETUP = Histogram(
+    'mcp_provider_connection_setup_seconds',
+    'Provider connection setup time',
+    ['origin', 'phase'],  # phase: tcp/tls/total
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, float('inf')]
+)
+
+PROVIDER_POOL_CONNECTIONS = Gauge(
+    'mcp_provider_pool_connections',
+    'Open provider connections in the shared pools',
+    ['origin', 'state']  # state: active/idle
+)
+
+# Expert analysis provider calls (tools/workflow/expert_dispatch.py)
+EXPERT_CALLS = Counter(
+    'mcp_expert_calls_total',
+    'Expert analysis provider calls',
+    ['path', 'provider', 'outcome']  # path: async/executor, outcome: success/error/timeout/cancelled
+)
+
+EXPERT_CALL_QUEUE_WAIT = Histogram(
+    'mcp_expert_call_queue_wait_seconds',
+    'Time from dispatch until an expert analysis call starts running',
+    ['path', 'provider'],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, float('inf')]
+)
+
+EXPERT_CALL_RUNTIME = Histogram(
+    'mcp_expert_call_runtime_seconds',
+    'Expert analysis provider call runtime (excluding queue wait)',
+    ['path', 'provider'],
+    buckets=[0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, float('inf')]
+)
+
 # ============================================================================
 # SYSTEM METRICS
 # ============================================================================
@@ -291,6 +345,16 @@ def record_cache_operation(operation: str, result: str) -> None:
     CACHE_OPERATIONS.labels(operation=operation, result=result).inc()
 
 
+def record_kimi_cache_lookup(hit: bool) -> None:
+    """Record a Kimi context-cache token lookup"""
+    KIMI_CONTEXT_CACHE_LOOKUPS.labels(result='hit' if hit else 'miss').inc()
+
+
+def record_kimi_cache_event(event: str) -> None:
+    """Record a Kimi context-cache store event (save/evict/expire/redis_hit/redis_error)"""
+    KIMI_CONTEXT_CACHE_EVENTS.labels(event=event).inc()
+
+
 def record_storage_operation(
     operation: str,
     backend: str,
@@ -358,6 +422,32 @@ def record_api_error(provider: str, model: str, error_type: str) -> None:
     API_ERRORS.labels(provider=provider, model=model, error_type=error_type).inc()
 
 
+def record_provider_request(origin: str, reused: bool) -> None:
+    """Record a provider HTTP request and whether it reused a pooled connection"""
+    PROVIDER_HTTP_REQUESTS.labels(origin=origin, connection='reused' if reused else 'new').inc()
+
+
+def record_provider_connection(origin: str, tcp_seconds: float, tls_seconds: Optional[float] = None) -> None:
+    """Record the setup time of a new provider connection"""
+    PROVIDER_CONNECTION_SETUP.labels(origin=origin, phase='tcp').observe(tcp_seconds)
+    if tls_seconds is not None:
+        PROVIDER_CONNECTION_SETUP.labels(origin=origin, phase='tls').observe(tls_seconds)
+    PROVIDER_CONNECTION_SETUP.labels(origin=origin, phase='total').observe(tcp_seconds + (tls_seconds or 0.0))
+
+
+def update_provider_pool(origin: str, active: int, idle: int) -> None:
+    """Update open connection counts for a provider origin"""
+    PROVIDER_POOL_CONNECTIONS.labels(origin=origin, state='active').set(active)
+    PROVIDER_POOL_CONNECTIONS.labels(origin=origin, state='idle').set(idle)
+
+
+def record_expert_call(path: str, provider: str, outcome: str, queue_wait: float, runtime: float) -> None:
+    """Record an expert analysis provider call with its queue wait and runtime"""
+    EXPERT_CALLS.labels(path=path, provider=provider, outcome=outcome).inc()
+    EXPERT_CALL_QUEUE_WAIT.labels(path=path, provider=provider).observe(queue_wait)
+    EXPERT_CALL_RUNTIME.labels(path=path, provider=provider).observe(runtime)
+
+
 def record_token_usage(provider: str, model: str, input_tokens: int, output_tokens: int) -> None:
     """Record token usage"""
     TOKEN_USAGE.labels(provider=provider, model=model, type='input').inc(input_tokens)
@@ -1,4 +1,4 @@
-"""Async GLM (ZhipuAI) provider implementation using zhipuai.async_client.AsyncZhipuAI."""
+"""Async GLM (ZhipuAI) provider implementation using openai.AsyncOpenAI."""
 
 import logging
 import os
@@ -10,6 +10,7 @@ from .base import ModelCapabilities, ModelResponse, ProviderType
 from . import glm_config
 from . import async_glm_chat
 from config import TimeoutConfig
+from utils.http_transport import get_transport_manager
 
 # Import error handling framework
 from src.daemon.error_handling import ProviderError, ErrorCode, log_error
@@ -43,36 +44,40 @@ class AsyncGLMProvider(AsyncModelProvider):
         super().__init__(api_key, config, **kwargs)
         self.base_url = base_url or self.DEFAULT_BASE_URL
         
-        # NOTE: zhipuai SDK does NOT have async support (no AsyncZhipuAI or async_client)
-        # We use the sync ZhipuAI client and wrap calls with asyncio.to_thread()
+        # Provider-specific read timeout (connect/write/pool keep the config defaults)
+        self.config.read_timeout = float(TimeoutConfig.GLM_TIMEOUT_SECS)
+
+        # GLM exposes an OpenAI-compatible API, so the async OpenAI SDK gives a native
+        # async client: cancelling a call aborts its HTTP request (the zhipuai SDK is
+        # sync-only and could only be wrapped in asyncio.to_thread())
         try:
-            from zhipuai import ZhipuAI
+            from openai import AsyncOpenAI  # type: ignore
 
-            # Create HTTP client with timeout configuration
-            # TRACK 2 FIX (2025-10-16): Add timeout and retry logic to prevent indefinite hangs
-            http_client = httpx.Client(
-                timeout=TimeoutConfig.GLM_TIMEOUT_SECS,
-                transport=httpx.HTTPTransport(retries=3)
-            )
+            # Shared keep-alive pool for the GLM origin (utils/http_transport.py)
+            http_client = get_transport_manager().get_async_client(self.base_url)
+            self._http_client = http_client  # A no-op to close for the shared pool
 
-            # Use sync client with timeout configuration - we'll wrap calls with asyncio.to_thread()
-            self._sdk_client = ZhipuAI(
+            self._sdk_client = AsyncOpenAI(
                 api_key=self.api_key,
                 base_url=self.base_url,
-                timeout=TimeoutConfig.GLM_TIMEOUT_SECS,
-                max_retries=3,
                 http_client=http_client,
+                max_retries=3,
+                timeout=httpx.Timeout(
+                    connect=self.config.connect_timeout,
+                    read=self.config.read_timeout,
+                    write=self.config.write_timeout,
+                    pool=self.config.pool_timeout,
+                ),
             )
-            self._http_client = http_client  # Store for cleanup
 
             logger.info(
-                f"Async GLM provider initialized with sync SDK + asyncio.to_thread() "
+                f"Async GLM provider initialized with AsyncOpenAI "
                 f"(base_url={self.base_url}, timeout={TimeoutConfig.GLM_TIMEOUT_SECS}s, max_retries=3)"
             )
 
         except ImportError as e:
-            log_error(ErrorCode.PROVIDER_ERROR, "zhipuai not available", exc_info=True)
-            raise ProviderError("GLM", Exception("zhipuai not available. Install with: pip install zhipuai>=2.1.0")) from e
+            log_error(ErrorCode.PROVIDER_ERROR, "openai AsyncOpenAI not available", exc_info=True)
+            raise ProviderError("GLM", Exception("openai AsyncOpenAI not available. Install with: pip install openai>=1.55.2")) from e
         except Exception as e:
             log_error(ErrorCode.PROVIDER_ERROR, f"Failed to initialize async GLM provider: {e}", exc_info=True)
             raise ProviderError("GLM", e) from e
@@ -132,18 +137,14 @@ class AsyncGLMProvider(AsyncModelProvider):
         resolved = self._resolve_model_name(model_name, self.SUPPORTED_MODELS)
         effective_temp = self.get_effective_temperature(resolved, temperature)
 
-        # CRITICAL FIX (2025-10-17): Pass http_client and use_sdk to async chat module
-        # This fixes the signature mismatch error that was causing fallback to sync provider
         # Delegate to async chat module
         return await async_glm_chat.generate_content_async(
-            sdk_client=self._sdk_client,
-            http_client=self._http_client,
+            self._sdk_client,
             prompt=prompt,
             model_name=resolved,
             system_prompt=system_prompt,
             temperature=effective_temp,
             max_output_tokens=max_output_tokens,
-            use_sdk=True,  # We always use SDK in async provider
             **kwargs
         )
     
@@ -187,7 +188,7 @@ class AsyncGLMProvider(AsyncModelProvider):
         """
         # Delegate to async_glm_chat module which returns ModelResponse
         response = await async_glm_chat.chat_completions_create_async(
-            client=self._sdk_client,
+            self._sdk_client,
             model=model,
             messages=messages,
             temperature=temperature,
@@ -205,7 +206,5 @@ class AsyncGLMProvider(AsyncModelProvider):
     async def close(self):
         """Clean up resources."""
         await super().close()
-        # Close HTTP client if it exists
-        if self._http_client:
-            self._http_client.close()
+        # SDK client cleanup is handled by HTTP client closure in parent class
 
@@ -1,119 +1,159 @@
-"""Async GLM chat generation using asyncio.to_thread() wrapper around sync ZhipuAI SDK.
+"""Async GLM chat generation using openai.AsyncOpenAI against GLM's OpenAI-compatible API.
 
-NOTE: zhipuai SDK does NOT have native async support (no AsyncZhipuAI).
-We use asyncio.to_thread() to run the sync SDK in a thread pool.
+The request runs on the event loop (no worker thread), so cancelling the
+awaiting task aborts the HTTP request instead of leaving a thread blocked on it.
 """
 
-import asyncio
 import logging
 from typing import Any, Optional
 
 from .base import ModelResponse, ProviderType
-from .glm_chat import build_payload, generate_content, chat_completions_create  # Reuse sync implementation
+from . import glm_config
+
+from src.daemon.error_handling import ProviderError, ErrorCode, log_error
 
 logger = logging.getLogger(__name__)
 
+# Chat completion parameters forwarded to the API; other kwargs are provider-internal
+_API_PARAMS = ("tools", "tool_choice", "top_p", "stop", "response_format", "seed")
+
+
+def _supports_thinking(model: str) -> bool:
+    capabilities = glm_config.SUPPORTED_MODELS.get(model)
+    return bool(capabilities and capabilities.supports_extended_thinking)
+
 
 async def generate_content_async(
-    sdk_client: Any,  # ZhipuAI instance (sync client)
-    http_client: Any,  # HTTP client for fallback
+    client: Any,  # AsyncOpenAI instance
+    *,
     prompt: str,
     model_name: str,
     system_prompt: Optional[str],
     temperature: float,
     max_output_tokens: Optional[int],
-    use_sdk: bool = True,  # Whether SDK is available
     **kwargs
 ) -> ModelResponse:
-    """Generate content asynchronously by wrapping sync ZhipuAI SDK with asyncio.to_thread().
-
-    NOTE: This uses asyncio.to_thread() (Python 3.9+) to run the sync SDK in a thread pool.
-    This is the recommended approach since zhipuai SDK doesn't have native async support.
+    """Generate content asynchronously from a text prompt.
 
     Args:
-        sdk_client: ZhipuAI SDK client instance (sync)
-        http_client: HTTP client for fallback
+        client: AsyncOpenAI client configured for the GLM base URL
         prompt: User prompt
         model_name: Model name (already resolved)
         system_prompt: Optional system prompt
         temperature: Temperature value (already validated)
         max_output_tokens: Optional max output tokens
-        use_sdk: Whether SDK is available and should be used
-        **kwargs: Additional parameters (stream, tools, tool_choice, etc.)
+        **kwargs: Additional parameters (tools, tool_choice, thinking_mode, etc.)
 
     Returns:
         ModelResponse with generated content
-
-    Raises:
-        RuntimeError: If generation fails
     """
-    logger.debug(f"Async GLM generate_content called with kwargs keys: {list(kwargs.keys())}")
-
-    # CRITICAL FIX (2025-10-17): Pass http_client and use_sdk to sync generate_content
-    # This fixes the signature mismatch error that was causing fallback to sync provider
-    # Use asyncio.to_thread() to run sync generate_content in thread pool
-    # This is the modern Python 3.9+ way to run blocking code in async context
-    return await asyncio.to_thread(
-        generate_content,
-        sdk_client=sdk_client,
-        http_client=http_client,
-        prompt=prompt,
-        model_name=model_name,
-        system_prompt=system_prompt,
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+
+    return await chat_completions_create_async(
+        client,
+        model=model_name,
+        messages=messages,
         temperature=temperature,
         max_output_tokens=max_output_tokens,
-        use_sdk=use_sdk,
         **kwargs
     )
-# That's it! The entire async implementation is just wrapping the sync function with asyncio.to_thread()
-# No need to duplicate all the streaming/non-streaming logic - it's already in glm_chat.generate_content()
 
 
 async def chat_completions_create_async(
-    client: Any,  # ZhipuAI instance (sync client)
+    client: Any,  # AsyncOpenAI instance
+    *,
     model: str,
     messages: list[dict],
     temperature: float = 0.3,
     thinking_mode: Optional[str] = None,
+    max_output_tokens: Optional[int] = None,
     **kwargs,
 ) -> ModelResponse:
     """Create chat completion asynchronously using message arrays (for expert_analysis compatibility).
 
-    This wraps the sync chat_completions_create with asyncio.to_thread() for async execution.
-
     Args:
-        client: ZhipuAI SDK client instance (sync)
+        client: AsyncOpenAI client configured for the GLM base URL
         model: Model name to use
         messages: List of message dictionaries with 'role' and 'content'
         temperature: Sampling temperature (0-2)
-        thinking_mode: Optional thinking mode for supported models
+        thinking_mode: Optional thinking mode; enables GLM's "thinking" parameter
+            on models that support it
+        max_output_tokens: Optional max output tokens
         **kwargs: Additional provider-specific parameters
 
     Returns:
         ModelResponse with generated content and metadata
 
     Raises:
-        RuntimeError: If chat completion fails
+        ProviderError: If chat completion fails (cancellation propagates unchanged)
     """
     logger.debug(f"Async GLM chat_completions_create called for model {model}")
 
-    # Use asyncio.to_thread() to run sync chat_completions_create in thread pool
-    result_dict = await asyncio.to_thread(
-        chat_completions_create,
-        sdk_client=client,
-        model=model,
-        messages=messages,
-        temperature=temperature,
-        thinking_mode=thinking_mode,
-        **kwargs
-    )
-
-    # Convert dict result to ModelResponse for consistency with other async providers
-    return ModelResponse(
-        content=result_dict.get("content", ""),
-        model_name=result_dict.get("model", model),
-        provider=ProviderType.GLM,  # FIXED: Changed from provider_type to provider
-        usage=result_dict.get("usage"),
-        metadata=result_dict.get("metadata", {}),
-    )
-
+    api_params = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "stream": False,
+    }
+    if max_output_tokens is not None:
+        api_params["max_tokens"] = max_output_tokens
+    for key in _API_PARAMS:
+        if kwargs.get(key) is not None:
+            api_params[key] = kwargs[key]
+    if not api_params.get("tools"):
+        api_params.pop("tools", None)
+        api_params.pop("tool_choice", None)
+    if thinking_mode and thinking_mode != "disabled" and _supports_thinking(model):
+        api_params["extra_body"] = {"thinking": {"type": "enabled"}}
+
+    try:
+        response = await client.chat.completions.create(**api_params)
+
+        choice0 = response.choices[0] if response.choices else None
+        if not choice0:
+            raise ProviderError("GLM", Exception("Async GLM returned empty choices"))
+
+        usage = {}
+        if response.usage:
+            usage = {
+                "input_tokens": response.usage.prompt_tokens,
+                "output_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            }
+
+        metadata = {
+            "model": response.model,
+            "id": response.id,
+            "created": response.created,
+            "finish_reason": choice0.finish_reason,
+        }
+        if choice0.message.tool_calls:
+            metadata["tool_calls"] = [
+                {
+                    "id": tc.id,
+                    "type": tc.type,
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments,
+                    }
+                }
+                for tc in choice0.message.tool_calls
+            ]
+
+        return ModelResponse(
+            content=choice0.message.content or "",
+            usage=usage,
+            model_name=model,
+            friendly_name="GLM",
+            provider=ProviderType.GLM,
+            metadata=metadata,
+        )
+
+    except ProviderError:
+        raise
+    except Exception as e:
+        log_error(ErrorCode.PROVIDER_ERROR, f"Async GLM chat completion failed: {e}", exc_info=True)
+        raise ProviderError("GLM", e) from e
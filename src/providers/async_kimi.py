@@ -10,6 +10,7 @@ from .base import ModelCapabilities, ModelResponse, ProviderType
 from . import kimi_config
 from . import async_kimi_chat
 from config import TimeoutConfig
+from utils.http_transport import get_transport_manager
 
 # Import error handling framework
 from src.daemon.error_handling import ProviderError, ErrorCode, log_error
@@ -71,22 +72,11 @@ class AsyncKimiProvider(AsyncModelProvider):
         try:
             from openai import AsyncOpenAI  # type: ignore
             
-            # Configure HTTP client with timeouts and connection pooling
-            http_client = httpx.AsyncClient(
-                limits=httpx.Limits(
-                    max_keepalive_connections=self.config.max_keepalive_connections,
-                    max_connections=self.config.max_connections,
-                    keepalive_expiry=self.config.keepalive_expiry,
-                ),
-                timeout=httpx.Timeout(
-                    connect=self.config.connect_timeout,
-                    read=self.config.read_timeout,
-                    write=self.config.write_timeout,
-                    pool=self.config.pool_timeout,
-                ),
-            )
+            # Shared keep-alive pool for the Kimi origin (utils/http_transport.py);
+            # pool limits come from PROVIDER_HTTP_*, timeouts are per client
+            http_client = get_transport_manager().get_async_client(self.base_url)
             
-            # Store HTTP client for cleanup
+            # Store HTTP client for cleanup (a no-op for the shared pool)
             self._http_client = http_client
             
             # Create async OpenAI client with custom HTTP client
@@ -94,6 +84,12 @@ class AsyncKimiProvider(AsyncModelProvider):
                 api_key=self.api_key,
                 base_url=self.base_url,
                 http_client=http_client,
+                timeout=httpx.Timeout(
+                    connect=self.config.connect_timeout,
+                    read=self.config.read_timeout,
+                    write=self.config.write_timeout,
+                    pool=self.config.pool_timeout,
+                ),
             )
             
             logger.info(f"Async Kimi provider initialized with AsyncOpenAI (base_url={self.base_url})")
@@ -1,5 +1,6 @@
 """Async Kimi chat functionality using openai.AsyncOpenAI."""
 
+import asyncio
 import logging
 from typing import Any, Optional
 
@@ -79,7 +80,8 @@ async def chat_completions_create_async(
     cache_token = None
     cache_attached = False
     if session_id and msg_prefix_hash:
-        cache_token = kimi_cache.get_cache_token(session_id, tool_name, msg_prefix_hash)
+        # The lookup may MGET from Redis with a blocking client: keep it off the event loop
+        cache_token = await asyncio.to_thread(kimi_cache.find_cache_token, session_id, tool_name, messages)
         if cache_token:
             _safe_set("Msh-Context-Cache-Token", cache_token)
             cache_attached = "Msh-Context-Cache-Token" in extra_headers
@@ -7,8 +7,9 @@ Simplified GLM provider for chat completions.
 import os
 import logging
 from typing import Any, List, Dict, Optional
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DEFAULT_TIMEOUT
 from src.providers.base import ProviderType, ModelCapabilities, ModelResponse
+from utils.http_transport import get_transport_manager
 
 logger = logging.getLogger(__name__)
 
@@ -163,7 +164,9 @@ class GLMProvider:
         if self.api_key:
             self.client = AsyncOpenAI(
                 api_key=self.api_key,
-                base_url=self.base_url
+                base_url=self.base_url,
+                http_client=get_transport_manager().get_async_client(self.base_url),
+                timeout=DEFAULT_TIMEOUT,
             )
 
     def get_provider_type(self) -> ProviderType:
@@ -4,6 +4,7 @@ import os
 import logging
 from typing import Any, List, Dict, Optional
 from src.providers.base import ProviderType, ModelCapabilities, ModelResponse
+from utils.http_transport import get_transport_manager
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +28,12 @@ class KimiProvider:
         self.client = None
 
         if self.api_key:
-            from openai import AsyncOpenAI
+            from openai import AsyncOpenAI, DEFAULT_TIMEOUT
             self.client = AsyncOpenAI(
                 api_key=self.api_key,
-                base_url=self.base_url
+                base_url=self.base_url,
+                http_client=get_transport_manager().get_async_client(self.base_url),
+                timeout=DEFAULT_TIMEOUT,
             )
 
     def get_provider_type(self) -> ProviderType:
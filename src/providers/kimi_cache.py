@@ -1,36 +1,337 @@
-"""Kimi cache token management (LRU + TTL)."""
+"""Kimi cache token management (prefix-aware LRU + TTL, optional Redis persistence).
 
+Moonshot returns a context-cache token (Msh-Context-Cache-Token-Saved) for the
+prompt it has just processed. Sending that token with a later request whose
+messages start with the same prefix lets the server skip re-reading it, which
+is where most of the cost of a long conversation goes.
+
+Tokens are keyed by session, tool and a rolling hash of the message prefix.
+``prefix_hashes`` yields one hash per message boundary over the full messages
+(nothing truncated), so ``find_cache_token`` can match the longest prefix
+that has a token - typically the request of the previous turn.
+
+- In-process LRU (OrderedDict): O(1) get/save/evict, TTL checked on access
+- Optional Redis write-through (KIMI_CACHE_REDIS_ENABLED=true) so tokens
+  survive daemon restarts; local misses are resolved with a single MGET
+- Hit/miss counters in get_stats() and Prometheus
+"""
+
+import hashlib
+import json
 import logging
 import os
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
 
 from src.daemon.error_handling import log_error, ErrorCode
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from src.monitoring.metrics import record_kimi_cache_event, record_kimi_cache_lookup
+except ImportError:
+    record_kimi_cache_event = record_kimi_cache_lookup = None
+
 logger = logging.getLogger(__name__)
 
+# Message fields that change what the model sees (and so what a cached prefix covers)
+_PREFIX_FIELDS = ("role", "content", "name", "tool_calls", "tool_call_id")
+
+
+def _message_bytes(message: Any) -> bytes:
+    """Canonical serialization of one message for prefix hashing."""
+    if not isinstance(message, dict):
+        message = {"content": message}
+    fields = {k: message[k] for k in _PREFIX_FIELDS if message.get(k) is not None}
+    return json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8", errors="ignore")
+
+
+def prefix_hashes(messages: Iterable[Any]) -> list[str]:
+    """Rolling SHA256 over the message prefix, one hash per message boundary.
+
+    hashes[i] covers messages[0..i]; hashes[-1] is the hash of the whole list.
+    Each message is length-framed so boundaries cannot shift between messages.
+
+    Args:
+        messages: List of message dictionaries
+
+    Returns:
+        List of hex digests (empty for no messages)
+    """
+    hasher = hashlib.sha256()
+    hashes: list[str] = []
+    for message in messages:
+        data = _message_bytes(message)
+        hasher.update(b"%d:" % len(data))
+        hasher.update(data)
+        hashes.append(hasher.copy().hexdigest())
+    return hashes
 
-# Simple in-process LRU for Kimi context tokens per session/tool/prefix
-_cache_tokens: dict[str, tuple[str, float]] = {}
-_cache_tokens_order: list[str] = []
-_cache_tokens_ttl: float = float(os.getenv("KIMI_CACHE_TOKEN_TTL_SECS", "1800"))
-_cache_tokens_max: int = int(os.getenv("KIMI_CACHE_TOKEN_LRU_MAX", "256"))
+
+def prefix_hash(messages: Iterable[Any]) -> str:
+    """Hash of the full message prefix ("" when there are no messages or hashing fails)."""
+    try:
+        hashes = prefix_hashes(messages)
+        return hashes[-1] if hashes else ""
+    except Exception as e:
+        logger.warning(f"Failed to hash Kimi message prefix: {e}")
+        return ""
 
 
 def lru_key(session_id: str, tool_name: str, prefix_hash: str) -> str:
     """Generate cache key from session, tool, and prefix hash.
-    
+
     Args:
         session_id: Session identifier
         tool_name: Tool name
         prefix_hash: Hash of message prefix
-        
+
     Returns:
         Cache key string
     """
     return f"{session_id}:{tool_name}:{prefix_hash}"
 
 
+class KimiPrefixCache:
+    """LRU + TTL store for Kimi context-cache tokens with optional Redis persistence."""
+
+    REDIS_PREFIX = "kimi:ctx:"
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        redis_client: Optional[Any] = None,
+    ):
+        self.max_entries = max_entries or int(os.getenv("KIMI_CACHE_TOKEN_LRU_MAX", "256"))
+        self.ttl = ttl or float(os.getenv("KIMI_CACHE_TOKEN_TTL_SECS", "1800"))
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()  # key -> (token, saved_at)
+        self._lock = threading.Lock()
+
+        self._redis = redis_client if redis_client is not None else self._get_redis_client()
+        self._redis_retry_after = float(os.getenv("KIMI_CACHE_REDIS_RETRY_SECS", "60"))
+        self._redis_down_until = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.saves = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _get_redis_client() -> Optional[Any]:
+        """Get Redis client from environment when persistence is enabled"""
+        if redis is None or os.getenv("KIMI_CACHE_REDIS_ENABLED", "false").strip().lower() not in ("1", "true", "yes"):
+            return None
+        try:
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            timeout = float(os.getenv("KIMI_CACHE_REDIS_TIMEOUT", "0.25"))
+            return redis.from_url(
+                redis_url, decode_responses=True, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+        except Exception as e:
+            logger.warning(f"Redis not available for Kimi cache tokens: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Local LRU
+    # ------------------------------------------------------------------
+
+    def _get_local(self, key: str, now: float) -> Optional[str]:
+        """Return a live token and mark it most recently used (caller holds the lock)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        token, saved_at = entry
+        if now - saved_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            _record_event("expire")
+            return None
+        self._entries.move_to_end(key)
+        return token
+
+    def _put_local(self, key: str, token: str, saved_at: float) -> None:
+        """Insert as most recently used and evict the oldest over capacity (caller holds the lock)."""
+        self._entries[key] = (token, saved_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            _record_event("evict")
+
+    # ------------------------------------------------------------------
+    # Redis persistence
+    # ------------------------------------------------------------------
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.time() >= self._redis_down_until
+
+    def _redis_failed(self, op: str, error: Exception) -> None:
+        # Back off so a Redis outage doesn't add a timeout to every provider call
+        self._redis_down_until = time.time() + self._redis_retry_after
+        _record_event("redis_error")
+        logger.warning(f"Kimi cache Redis {op} failed, using memory only for {self._redis_retry_after:.0f}s: {error}")
+
+    def _redis_save(self, key: str, token: str, saved_at: float) -> None:
+        if not self._redis_available():
+            return
+        try:
+            value = json.dumps({"token": token, "saved_at": saved_at})
+            self._redis.set(self.REDIS_PREFIX + key, value, ex=max(1, int(self.ttl)))
+        except Exception as e:
+            self._redis_failed("save", e)
+
+    def _redis_lookup(self, keys: list[str]) -> Optional[tuple[str, str]]:
+        """Return (key, token) for the last of ``keys`` found in Redis, loading it locally."""
+        if not keys or not self._redis_available():
+            return None
+        try:
+            values = self._redis.mget([self.REDIS_PREFIX + k for k in keys])
+        except Exception as e:
+            self._redis_failed("lookup", e)
+            return None
+
+        now = time.time()
+        for key, raw in reversed(list(zip(keys, values))):
+            if not raw:
+                continue
+            try:
+                data = json.loads(raw)
+                token, saved_at = str(data["token"]), float(data["saved_at"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if now - saved_at > self.ttl:
+                continue
+            with self._lock:
+                self._put_local(key, token, saved_at)
+            self.redis_hits += 1
+            _record_event("redis_hit")
+            return key, token
+        return None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def save(self, session_id: str, tool_name: str, prefix_hash: str, token: str) -> None:
+        """Save the token returned for a request whose messages hash to ``prefix_hash``."""
+        key = lru_key(session_id, tool_name, prefix_hash)
+        now = time.time()
+        with self._lock:
+            self._put_local(key, token, now)
+            self.saves += 1
+        _record_event("save")
+        self._redis_save(key, token, now)
+
+    def get(self, session_id: str, tool_name: str, prefix_hash: str) -> Optional[str]:
+        """Token saved for exactly this prefix hash, or None."""
+        key = lru_key(session_id, tool_name, prefix_hash)
+        with self._lock:
+            token = self._get_local(key, time.time())
+        if token is None:
+            found = self._redis_lookup([key])
+            token = found[1] if found else None
+        self._record_lookup(token is not None)
+        return token
+
+    def find(self, session_id: str, tool_name: str, messages: list[Any]) -> Optional[tuple[str, str]]:
+        """Token for the longest cached prefix of ``messages``.
+
+        Returns:
+            (token, prefix_hash) of the longest matching prefix, or None
+        """
+        hashes = prefix_hashes(messages)
+        keys = [lru_key(session_id, tool_name, h) for h in hashes]
+        now = time.time()
+
+        found: Optional[tuple[str, str]] = None
+        with self._lock:
+            for key in reversed(keys):
+                token = self._get_local(key, now)
+                if token is not None:
+                    found = (key, token)
+                    break
+        if found is None:
+            found = self._redis_lookup(keys)
+
+        self._record_lookup(found is not None)
+        if found is None:
+            return None
+        key, token = found
+        matched = keys.index(key) + 1
+        logger.debug(f"[KIMI_CACHE] Prefix hit: {matched}/{len(keys)} messages")
+        return token, hashes[matched - 1]
+
+    def purge(self) -> int:
+        """Drop expired tokens. Returns the number removed."""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (_, saved_at) in self._entries.items() if now - saved_at > self.ttl]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def _record_lookup(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if record_kimi_cache_lookup is not None:
+            record_kimi_cache_lookup(hit)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_secs": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "redis_enabled": self._redis is not None,
+            "redis_hits": self.redis_hits,
+            "saves": self.saves,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def _record_event(event: str) -> None:
+    if record_kimi_cache_event is not None:
+        record_kimi_cache_event(event)
+
+
+# Global cache instance
+_kimi_cache: Optional[KimiPrefixCache] = None
+_kimi_cache_lock = threading.Lock()
+
+
+def get_kimi_cache() -> KimiPrefixCache:
+    """Get the process-wide Kimi cache token store."""
+    global _kimi_cache
+    if _kimi_cache is None:
+        with _kimi_cache_lock:
+            if _kimi_cache is None:
+                _kimi_cache = KimiPrefixCache()
+    return _kimi_cache
+
+
+def reset_kimi_cache() -> None:
+    """Drop the global store (tests, config reload)."""
+    global _kimi_cache
+    with _kimi_cache_lock:
+        _kimi_cache = None
+
+
 def save_cache_token(session_id: str, tool_name: str, prefix_hash: str, token: str) -> None:
     """Save cache token with TTL.
 
@@ -41,12 +342,8 @@ def save_cache_token(session_id: str, tool_name: str, prefix_hash: str, token: s
         token: Cache token to save
     """
     try:
-        k = lru_key(session_id, tool_name, prefix_hash)
-        _cache_tokens[k] = (token, time.time())
-        _cache_tokens_order.append(k)
-        # Purge expired and over-capacity entries
-        purge_cache_tokens()
-        logger.info("Kimi cache token saved key=%s suffix=%s", k[-24:], token[-6:])
+        get_kimi_cache().save(session_id, tool_name, prefix_hash, token)
+        logger.info("Kimi cache token saved key=%s suffix=%s", prefix_hash[-24:], token[-6:])
     except (TypeError, ValueError, KeyError) as e:
         logger.warning("Failed to save cache token: %s", e)
     except Exception as e:
@@ -65,15 +362,7 @@ def get_cache_token(session_id: str, tool_name: str, prefix_hash: str) -> Option
         Cache token if found and not expired, None otherwise
     """
     try:
-        k = lru_key(session_id, tool_name, prefix_hash)
-        v = _cache_tokens.get(k)
-        if not v:
-            return None
-        token, ts = v
-        if time.time() - ts > _cache_tokens_ttl:
-            _cache_tokens.pop(k, None)
-            return None
-        return token
+        return get_kimi_cache().get(session_id, tool_name, prefix_hash)
     except (TypeError, ValueError, KeyError) as e:
         logger.warning("Failed to get cache token: %s", e)
         return None
@@ -82,38 +371,49 @@ def get_cache_token(session_id: str, tool_name: str, prefix_hash: str) -> Option
         return None
 
 
-def purge_cache_tokens() -> None:
-    """Purge expired and over-capacity cache tokens (LRU + TTL).
+def find_cache_token(session_id: str, tool_name: str, messages: list[Any]) -> Optional[str]:
+    """Retrieve the token for the longest cached prefix of ``messages``.
 
-    Removes tokens that have exceeded TTL and enforces LRU max size limit.
+    Args:
+        session_id: Session identifier
+        tool_name: Tool name
+        messages: Messages about to be sent
+
+    Returns:
+        Cache token if a prefix of the messages has one, None otherwise
     """
-    global _cache_tokens, _cache_tokens_order
     try:
-        # TTL-based cleanup
-        now = time.time()
-        ttl = _cache_tokens_ttl
-        _cache_tokens = {k: v for k, v in _cache_tokens.items() if now - v[1] <= ttl}
-        # LRU size limit
-        if len(_cache_tokens) > _cache_tokens_max:
-            # remove oldest keys
-            to_remove = len(_cache_tokens) - _cache_tokens_max
-            removed = 0
-            for k in list(_cache_tokens_order):
-                if k in _cache_tokens:
-                    _cache_tokens.pop(k, None)
-                    removed += 1
-                    if removed >= to_remove:
-                        break
+        found = get_kimi_cache().find(session_id, tool_name, messages)
+        return found[0] if found else None
     except (TypeError, ValueError, KeyError) as e:
-        logger.warning("Failed to purge cache tokens: %s", e)
+        logger.warning("Failed to find cache token: %s", e)
+        return None
+    except Exception as e:
+        log_error(ErrorCode.INTERNAL_ERROR, f"Unexpected error finding cache token: {e}", exc_info=True)
+        return None
+
+
+def purge_cache_tokens() -> None:
+    """Purge expired cache tokens.
+
+    Capacity is enforced on every save; this sweeps out tokens that have
+    exceeded the TTL without being looked up again.
+    """
+    try:
+        get_kimi_cache().purge()
     except Exception as e:
         log_error(ErrorCode.INTERNAL_ERROR, f"Unexpected error purging cache tokens: {e}", exc_info=True)
 
 
 __all__ = [
+    "KimiPrefixCache",
+    "get_kimi_cache",
+    "reset_kimi_cache",
+    "prefix_hash",
+    "prefix_hashes",
     "lru_key",
     "save_cache_token",
     "get_cache_token",
+    "find_cache_token",
     "purge_cache_tokens",
 ]
-
@@ -1,6 +1,5 @@
 """Kimi chat functionality with cache token integration."""
 
-import hashlib
 import logging
 import os
 import time
@@ -26,26 +25,14 @@ logger = logging.getLogger(__name__)
 
 def prefix_hash(messages: list[dict[str, Any]]) -> str:
     """Generate hash of message prefix for cache key.
-    
+
     Args:
         messages: List of message dictionaries
-        
+
     Returns:
-        SHA256 hash of message prefix
+        SHA256 rolling hash of the full message prefix (see kimi_cache.prefix_hashes)
     """
-    try:
-        # Serialize a stable prefix of messages (roles + first 2k chars)
-        parts: list[str] = []
-        for m in messages[:6]:  # limit to first few messages
-            role = str(m.get("role", ""))
-            content = str(m.get("content", ""))[:2048]
-            parts.append(role + "\n" + content + "\n")
-        joined = "\n".join(parts)
-        return hashlib.sha256(joined.encode("utf-8", errors="ignore")).hexdigest()
-    except Exception as e:
-        logger.warning(f"Failed to generate call key hash from messages: {e}")
-        # Continue - empty call key means no caching/deduplication, but request will still work
-        return ""
+    return kimi_cache.prefix_hash(messages)
 
 
 def chat_completions_create(
@@ -127,7 +114,8 @@ def chat_completions_create(
     cache_token = None
     cache_attached = False
     if session_id and msg_prefix_hash:
-        cache_token = kimi_cache.get_cache_token(session_id, tool_name, msg_prefix_hash)
+        # Longest cached prefix: usually the request of the previous turn
+        cache_token = kimi_cache.find_cache_token(session_id, tool_name, messages)
         if cache_token:
             _safe_set("Msh-Context-Cache-Token", cache_token)
             cache_attached = "Msh-Context-Cache-Token" in extra_headers
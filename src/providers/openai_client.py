@@ -36,6 +36,7 @@ class OpenAIClientManager:
     - Security checks and validation
     - Timeout configuration
     - Proxy avoidance
+    - Shared connection pool per origin (utils/http_transport.py)
     - Test transport injection
     """
 
@@ -128,18 +129,20 @@ class OpenAIClientManager:
                     follow_redirects=True,
                 )
             else:
-                # Normal production client
-                import httpx
-                http_client = httpx.Client(
-                    timeout=timeout_config,
-                    follow_redirects=True,
+                # Normal production client: shared keep-alive pool for the
+                # provider's origin (proxies bypassed, as above)
+                from utils.http_transport import get_transport_manager
+                http_client = get_transport_manager().get_client(
+                    self.base_url or "https://api.openai.com/v1",
+                    trust_env=False,
                 )
 
-            # Build client kwargs
+            # Build client kwargs (timeout set here: the pooled httpx client is shared)
             client_kwargs = {
                 "api_key": self.api_key,
                 "http_client": http_client,
                 "max_retries": self.max_retries,
+                "timeout": timeout_config,
             }
 
             if self.base_url:
@@ -20,6 +20,7 @@ from datetime import datetime
 from src.router.service import RouterService, RouteDecision
 from src.router.minimax_m2_router import get_router
 from src.router.routing_cache import get_routing_cache
+from src.providers.base import ProviderType
 from src.providers.registry_core import get_registry_instance
 
 logger = logging.getLogger(__name__)
@@ -117,7 +118,7 @@ class HybridRouter:
         try:
             # Step 1: Get available providers (auto-detect if not provided)
             if available_providers is None:
-                available_providers = self._get_available_providers()
+                available_providers = await self._get_available_providers()
 
             # Step 2: Check routing cache
             cache_key = self._build_cache_key(tool_name, request_context)
@@ -242,8 +243,26 @@ class HybridRouter:
             logger.error(f"[HYBRID_ROUTER] MiniMax routing error: {e}")
             return None
 
-    def _get_available_providers(self) -> Dict[str, Any]:
-        """Get available providers and their capabilities."""
+    async def _get_available_providers(self) -> Dict[str, Any]:
+        """
+        Get available providers and their capabilities.
+
+        Served from the cached provider statuses (one batched lookup) when every
+        provider type has one; otherwise the registry is scanned and all
+        statuses are re-cached in one pipelined write.
+        """
+        provider_names = [ptype.name for ptype in ProviderType]
+        try:
+            statuses = await self.routing_cache.aget_provider_statuses(provider_names)
+            if len(statuses) == len(provider_names):
+                return {
+                    name: {"name": name, "models": list(status.get("models") or []), "capabilities": []}
+                    for name, status in statuses.items()
+                    if status.get("available")
+                }
+        except Exception as e:
+            logger.debug(f"[HYBRID_ROUTER] Provider status cache unavailable: {e}")
+
         try:
             registry = get_registry_instance()
             avail = registry.get_available_models(respect_restrictions=True)
@@ -259,12 +278,23 @@ class HybridRouter:
                     }
                 providers[prov_name]["models"].append(model_name)
 
-            return providers
-
         except Exception as e:
             logger.warning(f"[HYBRID_ROUTER] Failed to get available providers: {e}")
             return {}
 
+        try:
+            await self.routing_cache.aset_provider_statuses({
+                name: {
+                    "available": name in providers,
+                    "models": sorted(providers[name]["models"]) if name in providers else [],
+                }
+                for name in provider_names
+            })
+        except Exception as e:
+            logger.debug(f"[HYBRID_ROUTER] Failed to cache provider statuses: {e}")
+
+        return providers
+
     def _build_cache_key(self, tool_name: str, context: Dict[str, Any]) -> str:
         """Build cache key for routing decision."""
         # Simplify context for caching
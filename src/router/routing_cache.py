@@ -145,6 +145,27 @@ class RoutingCache:
         self._provider_cache.set(provider_name, status)
         logger.debug(f"[ROUTING_CACHE] Cached provider status: {provider_name}")
 
+    async def aget_provider_statuses(self, provider_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get cached status for several providers with one async L2 round-trip."""
+        statuses = await self._provider_cache.amget(provider_names)
+        self._record_provider_batch(provider_names, statuses)
+        return statuses
+
+    def set_provider_statuses(self, statuses: Dict[str, Dict[str, Any]]) -> None:
+        """Cache status for several providers with one pipelined L2 write."""
+        self._provider_cache.mset(statuses)
+        logger.debug(f"[ROUTING_CACHE] Cached provider statuses: {sorted(statuses)}")
+
+    async def aset_provider_statuses(self, statuses: Dict[str, Dict[str, Any]]) -> None:
+        """Async variant of set_provider_statuses() for callers on the event loop."""
+        await self._provider_cache.amset(statuses)
+        logger.debug(f"[ROUTING_CACHE] Cached provider statuses: {sorted(statuses)}")
+
+    def _record_provider_batch(self, provider_names: List[str], statuses: Dict[str, Any]) -> None:
+        hits = sum(1 for name in set(provider_names) if name in statuses)
+        self._stats["provider_hits"] += hits
+        self._stats["provider_misses"] += len(set(provider_names)) - hits
+
     def invalidate_provider(self, provider_name: str) -> None:
         """Invalidate cached provider status from all layers."""
         self._provider_cache.delete(provider_name)
@@ -60,11 +60,15 @@ class RouterService:
             by_provider: Dict[str, list[str]] = {}
             for name, ptype in avail.items():
                 by_provider.setdefault(ptype.name, []).append(name)
-                # Cache provider availability status (5min TTL)
-                self._routing_cache.set_provider_status(
-                    ptype.name,
-                    {"available": True, "models": sorted(by_provider[ptype.name])}
-                )
+            # Cache availability of every provider type (5min TTL) in one batched write,
+            # so routing can serve the full status set from one batched lookup
+            self._routing_cache.set_provider_statuses({
+                ptype.name: {
+                    "available": ptype.name in by_provider,
+                    "models": sorted(by_provider.get(ptype.name, [])),
+                }
+                for ptype in ProviderType
+            })
             logger.info(json.dumps({
                 "event": "preflight_models",
                 "providers": {k: sorted(v) for k, v in by_provider.items()},
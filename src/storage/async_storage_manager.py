@@ -0,0 +1,654 @@
+"""
+Async Supabase Storage Manager
+
+Async-native data access for conversations, messages, files and provider
+file records. Talks to PostgREST (/rest/v1) and Supabase Storage
+(/storage/v1) directly over a pooled httpx.AsyncClient instead of running
+the synchronous supabase client in a thread pool:
+
+- One connection pool per manager (HTTP/2 when the h2 package is installed)
+- Per-endpoint concurrency limits (e.g. "rest:messages", "storage:user-files")
+  so a burst on one table cannot starve the others
+- Retries with exponential backoff, bounded by a per-endpoint retry budget so
+  an outage does not multiply load with retry storms
+- Return conventions match SupabaseStorageManager (None / [] / False on error)
+
+Configuration (environment):
+    SUPABASE_ASYNC_MAX_CONNECTIONS       Pool size (default 20)
+    SUPABASE_ASYNC_ENDPOINT_CONCURRENCY  Default in-flight requests per endpoint (default 8)
+    SUPABASE_ASYNC_ENDPOINT_LIMITS       Overrides, e.g. "rest:messages=16,storage:user-files=4"
+    SUPABASE_ASYNC_MAX_RETRIES           Retries per request (default 3)
+    SUPABASE_ASYNC_RETRY_RATIO           Retry tokens earned per request (default 0.2)
+    SUPABASE_ASYNC_TIMEOUT               Request timeout in seconds (default 30)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+from src.storage.storage_exceptions import NonRetryableError, RetryableError
+
+try:
+    import h2  # noqa: F401  # Enables HTTP/2 in httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+try:
+    from utils.monitoring import record_supabase_event
+except ImportError:
+    record_supabase_event = None
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _bucket_for(file_type: str) -> str:
+    return "user-files" if file_type == "user_upload" else "generated-files"
+
+
+def _parse_endpoint_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for part in spec.split(","):
+        name, _, value = part.strip().partition("=")
+        if name and value.strip().isdigit():
+            limits[name.strip()] = int(value)
+    return limits
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries to a fraction of recent traffic.
+
+    Each request deposits `ratio` tokens and each retry withdraws one, so in
+    steady state at most ~ratio retries are sent per request. `min_per_second`
+    tokens are added over time so low-traffic endpoints can still retry.
+
+    Args:
+        ratio: Tokens earned per request
+        min_per_second: Tokens earned per second regardless of traffic
+        max_tokens: Bucket capacity
+        clock: Time source (for tests)
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0,
+                 clock=time.monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+        self.exhausted = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class AsyncSupabaseStorageManager:
+    """
+    Async-native Supabase storage operations over pooled httpx connections.
+
+    Args:
+        url: Supabase project URL (default SUPABASE_URL)
+        service_key: Service role key (default SUPABASE_SERVICE_ROLE_KEY)
+        transport: Optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        service_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = (url or os.getenv("SUPABASE_URL") or "").rstrip("/")
+        self.service_key = service_key or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        self._enabled = bool(self.url and self.service_key)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.max_connections = int(os.getenv("SUPABASE_ASYNC_MAX_CONNECTIONS", "20"))
+        self.default_concurrency = int(os.getenv("SUPABASE_ASYNC_ENDPOINT_CONCURRENCY", "8"))
+        self.endpoint_limits = _parse_endpoint_limits(os.getenv("SUPABASE_ASYNC_ENDPOINT_LIMITS", ""))
+        self.max_retries = int(os.getenv("SUPABASE_ASYNC_MAX_RETRIES", "3"))
+        self.retry_ratio = float(os.getenv("SUPABASE_ASYNC_RETRY_RATIO", "0.2"))
+        self.timeout = float(os.getenv("SUPABASE_ASYNC_TIMEOUT", "30"))
+        self.base_delay = 0.1
+        self.max_delay = 5.0
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        if not self._enabled:
+            logger.warning("[ASYNC_STORAGE] Supabase credentials not configured. Async storage disabled.")
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    # ========================================================================
+    # TRANSPORT
+    # ========================================================================
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                headers={
+                    "apikey": self.service_key,
+                    "Authorization": f"Bearer {self.service_key}",
+                },
+                http2=_HTTP2_AVAILABLE and self._transport is None,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+            logger.info(
+                f"[ASYNC_STORAGE] Connection pool created (max_connections={self.max_connections}, "
+                f"http2={_HTTP2_AVAILABLE and self._transport is None})"
+            )
+        return self._client
+
+    def _endpoint_state(self, endpoint: str) -> Tuple[asyncio.Semaphore, RetryBudget, Dict[str, int]]:
+        if endpoint not in self._semaphores:
+            limit = self.endpoint_limits.get(endpoint, self.default_concurrency)
+            self._semaphores[endpoint] = asyncio.Semaphore(limit)
+            self._budgets[endpoint] = RetryBudget(ratio=self.retry_ratio)
+            self._stats[endpoint] = {"requests": 0, "retries": 0, "failures": 0, "budget_exhausted": 0}
+        return self._semaphores[endpoint], self._budgets[endpoint], self._stats[endpoint]
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.replace(".", "", 1).isdigit():
+                return min(float(retry_after), self.max_delay)
+        delay = min(self.base_delay * (2 ** attempt), self.max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _request(
+        self,
+        endpoint: str,
+        method: str,
+        path: str,
+        *,
+        idempotent: bool = True,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send one request under the endpoint's concurrency limit and retry budget.
+
+        Non-idempotent requests are only retried when the server cannot have
+        processed them (connection failures and 429).
+
+        Raises:
+            RetryableError: Transient failure that outlived the retries or budget
+            NonRetryableError: 4xx response (other than 408/429)
+        """
+        semaphore, budget, stats = self._endpoint_state(endpoint)
+        client = self._get_client()
+        start = time.monotonic()
+        attempt = 0
+
+        stats["requests"] += 1
+        budget.deposit()
+        while True:
+            response = None
+            # Hold the endpoint slot only while a request is in flight, not during backoff
+            async with semaphore:
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    if response.status_code < 400:
+                        self._record_event(endpoint, method, start, response)
+                        return response
+                    error = f"{method} {path} -> {response.status_code}: {response.text[:200]}"
+                    retryable = response.status_code in _RETRY_STATUSES and (
+                        idempotent or response.status_code == 429
+                    )
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                    error, retryable = f"{method} {path}: {type(e).__name__}: {e}", True
+                except httpx.TransportError as e:
+                    error, retryable = f"{method} {path}: {type(e).__name__}: {e}", idempotent
+
+            if not retryable:
+                stats["failures"] += 1
+                self._record_event(endpoint, method, start, response, error)
+                raise NonRetryableError(error)
+            if attempt >= self.max_retries or not budget.try_withdraw():
+                if attempt < self.max_retries:
+                    stats["budget_exhausted"] += 1
+                stats["failures"] += 1
+                self._record_event(endpoint, method, start, response, error)
+                raise RetryableError(error)
+
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            stats["retries"] += 1
+            logger.warning(f"[ASYNC_STORAGE] Retry {attempt}/{self.max_retries} for {endpoint} in {delay:.2f}s: {error}")
+            await asyncio.sleep(delay)
+
+    def _record_event(self, endpoint: str, method: str, start: float,
+                      response: Optional[httpx.Response], error: Optional[str] = None) -> None:
+        if record_supabase_event is None:
+            return
+        try:
+            record_supabase_event(
+                direction="error" if error else ("receive" if method == "GET" else "send"),
+                function_name=f"AsyncSupabaseStorageManager.{endpoint}",
+                data_size=len(response.content) if response is not None else 0,
+                response_time_ms=(time.monotonic() - start) * 1000,
+                error=error,
+                metadata={"method": method},
+            )
+        except Exception:
+            pass
+
+    async def _rest(
+        self,
+        method: str,
+        table: str,
+        params: Optional[Dict[str, str]] = None,
+        json_body: Any = None,
+        prefer: Optional[str] = None,
+        idempotent: bool = True,
+    ) -> List[Dict[str, Any]]:
+        headers = {"Prefer": prefer} if prefer else {}
+        response = await self._request(
+            f"rest:{table}", method, f"/rest/v1/{table}",
+            params=params, json=json_body, headers=headers, idempotent=idempotent,
+        )
+        if not response.content:
+            return []
+        data = response.json()
+        return data if isinstance(data, list) else [data]
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-endpoint request/retry counters and remaining retry budget."""
+        return {
+            endpoint: dict(stats, retry_tokens=round(self._budgets[endpoint].tokens, 2))
+            for endpoint, stats in self._stats.items()
+        }
+
+    # ========================================================================
+    # CONVERSATION OPERATIONS
+    # ========================================================================
+
+    async def save_conversation(
+        self,
+        session_id: str = None,
+        continuation_id: str = None,
+        title: Optional[str] = None,
+        metadata: Optional[Dict] = None
+    ) -> Optional[str]:
+        """Save or update a conversation; returns its UUID or None on error."""
+        if not self._enabled:
+            return None
+
+        identifier = continuation_id or session_id
+        if not identifier:
+            logger.error("save_conversation requires either session_id or continuation_id")
+            return None
+
+        data = {"title": title or f"Conversation {identifier[:8]}", "metadata": metadata or {}}
+        if continuation_id:
+            data["continuation_id"] = continuation_id
+        if session_id:
+            data["session_id"] = session_id
+
+        try:
+            rows = await self._rest(
+                "POST", "conversations", json_body=data,
+                prefer="return=representation,resolution=merge-duplicates",
+            )
+            return rows[0]["id"] if rows else None
+        except Exception as e:
+            logger.error(f"Failed to save conversation {identifier}: {e}")
+            return None
+
+    async def _get_conversation_by(self, column: str, value: str) -> Optional[Dict]:
+        if not self._enabled:
+            return None
+        try:
+            rows = await self._rest("GET", "conversations", params={"select": "*", column: f"eq.{value}"})
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error(f"Failed to get conversation by {column} {value}: {e}")
+            return None
+
+    async def get_conversation_by_session_id(self, session_id: str) -> Optional[Dict]:
+        return await self._get_conversation_by("session_id", session_id)
+
+    async def get_conversation_by_continuation_id(self, continuation_id: str) -> Optional[Dict]:
+        return await self._get_conversation_by("continuation_id", continuation_id)
+
+    # ========================================================================
+    # MESSAGE OPERATIONS
+    # ========================================================================
+
+    @staticmethod
+    def _message_row(message: Dict[str, Any]) -> Dict[str, Any]:
+        row = {
+            "conversation_id": message["conversation_id"],
+            "role": message["role"],
+            "content": message["content"],
+            "metadata": message.get("metadata") or {},
+            "created_at": message.get("created_at") or datetime.now().isoformat(),
+        }
+        # Same key as SupabaseStorageManager._generate_idempotency_key
+        key = f"{row['role']}:{row['content']}:{row['created_at']}"
+        row["idempotency_key"] = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return row
+
+    async def save_message(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict] = None,
+        timestamp: Optional[str] = None
+    ) -> Optional[str]:
+        """Save a message with idempotency; returns its UUID (None if duplicate or on error)."""
+        if not self._enabled:
+            return None
+        try:
+            ids = await self.save_messages_batch([{
+                "conversation_id": conversation_id, "role": role, "content": content,
+                "metadata": metadata, "created_at": timestamp,
+            }])
+            return ids[0] if ids else None
+        except Exception as e:
+            logger.error(f"Failed to save message to {conversation_id}: {e}")
+            return None
+
+    async def save_messages_batch(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save many messages in one upsert call
+
+        Returns:
+            UUIDs of newly inserted messages (duplicates are skipped)
+
+        Raises:
+            Exception: If the upsert fails, so the caller can retry the batch
+        """
+        if not self._enabled or not messages:
+            return []
+        rows = await self._rest(
+            "POST", "messages",
+            params={"on_conflict": "idempotency_key"},
+            json_body=[self._message_row(m) for m in messages],
+            prefer="return=representation,resolution=ignore-duplicates",
+        )
+        return [row["id"] for row in rows]
+
+    async def get_conversation_messages(self, conversation_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Messages for a conversation ordered by created_at ([] on error)."""
+        if not self._enabled:
+            return []
+        params = {"select": "*", "conversation_id": f"eq.{conversation_id}", "order": "created_at.asc"}
+        if limit:
+            params["limit"] = str(limit)
+        try:
+            return await self._rest("GET", "messages", params=params)
+        except Exception as e:
+            logger.error(f"Failed to get messages for {conversation_id}: {e}")
+            return []
+
+    # ========================================================================
+    # FILE OPERATIONS
+    # ========================================================================
+
+    async def _check_file_exists(self, file_path: str, file_type: str) -> Optional[str]:
+        rows = await self._rest("GET", "files", params={
+            "select": "id", "storage_path": f"eq.{file_path}", "file_type": f"eq.{file_type}",
+        })
+        return rows[0]["id"] if rows else None
+
+    async def _get_file_record(self, file_id: str) -> Optional[Dict]:
+        rows = await self._rest("GET", "files", params={"select": "*", "id": f"eq.{file_id}"})
+        return rows[0] if rows else None
+
+    def _object_path(self, bucket: str, storage_path: str) -> str:
+        return f"/storage/v1/object/{bucket}/{quote(storage_path.lstrip('/'))}"
+
+    async def upload_file(
+        self,
+        file_data: bytes,
+        original_name: str,
+        file_path: str,
+        mime_type: str,
+        file_type: str
+    ) -> Optional[str]:
+        """Upload a file to Storage and record it in `files`; returns the file UUID or None."""
+        if not self._enabled:
+            return None
+
+        bucket = _bucket_for(file_type)
+        try:
+            existing = await self._check_file_exists(file_path, file_type)
+            if existing:
+                logger.info(f"File already exists: {original_name} -> {existing}")
+                return existing
+
+            try:
+                await self._request(
+                    f"storage:{bucket}", "POST", self._object_path(bucket, file_path),
+                    content=file_data, headers={"Content-Type": mime_type or "application/octet-stream"},
+                )
+            except NonRetryableError as e:
+                # Race with another uploader: the object (and soon its record) exists
+                if "409" not in str(e) and "Duplicate" not in str(e):
+                    raise
+                existing = await self._check_file_exists(file_path, file_type)
+                if existing:
+                    return existing
+
+            rows = await self._rest(
+                "POST", "files",
+                json_body={
+                    "storage_path": file_path,
+                    "original_name": original_name,
+                    "mime_type": mime_type,
+                    "size_bytes": len(file_data),
+                    "file_type": file_type,
+                },
+                prefer="return=representation",
+                idempotent=False,
+            )
+            if not rows:
+                raise NonRetryableError("Failed to save file metadata")
+            logger.info(f"Uploaded file: {original_name} -> {rows[0]['id']}")
+            return rows[0]["id"]
+
+        except Exception as e:
+            logger.error(f"Upload failed: {e}")
+            return None
+
+    async def download_file(self, file_id: str) -> Optional[bytes]:
+        """Download a file's bytes by file UUID (None on error)."""
+        if not self._enabled:
+            return None
+        try:
+            record = await self._get_file_record(file_id)
+            if not record:
+                logger.error(f"File {file_id} not found in database")
+                return None
+            bucket = _bucket_for(record["file_type"])
+            response = await self._request(
+                f"storage:{bucket}", "GET", self._object_path(bucket, record["storage_path"])
+            )
+            return response.content
+        except Exception as e:
+            logger.error(f"Failed to download file {file_id}: {e}")
+            return None
+
+    async def delete_file(self, file_id: str) -> bool:
+        """Delete a file from Storage and its record (True if already gone)."""
+        if not self._enabled:
+            return False
+        try:
+            record = await self._get_file_record(file_id)
+            if not record:
+                logger.warning(f"File {file_id} not found in database - considering already deleted")
+                return True
+            bucket = _bucket_for(record["file_type"])
+            try:
+                await self._request(
+                    f"storage:{bucket}", "DELETE", f"/storage/v1/object/{bucket}",
+                    content=json.dumps({"prefixes": [record["storage_path"]]}),
+                    headers={"Content-Type": "application/json"},
+                )
+            except Exception as storage_error:
+                # Continue to delete database record to prevent orphaned records
+                logger.warning(f"Storage deletion warning: {storage_error}")
+            rows = await self._rest(
+                "DELETE", "files", params={"id": f"eq.{file_id}"}, prefer="return=representation"
+            )
+            return bool(rows)
+        except Exception as e:
+            logger.error(f"Unexpected error deleting file {file_id}: {e}")
+            return False
+
+    async def link_files_to_conversation_batch(self, conversation_id: str, file_ids: List[str]) -> dict:
+        """Link files to a conversation in one upsert; returns success count and errors."""
+        if not self._enabled or not file_ids:
+            return {"success": 0, "errors": []}
+        try:
+            rows = await self._rest(
+                "POST", "conversation_files",
+                params={"on_conflict": "conversation_id,file_id"},
+                json_body=[{"conversation_id": conversation_id, "file_id": fid} for fid in file_ids],
+                prefer="return=representation,resolution=ignore-duplicates",
+            )
+            return {"success": len(rows), "errors": []}
+        except Exception as e:
+            logger.error(f"Failed to batch link files: {e}")
+            return {"success": 0, "errors": [str(e)]}
+
+    # ========================================================================
+    # PROVIDER FILE OPERATIONS
+    # ========================================================================
+
+    async def save_provider_file_upload(
+        self,
+        provider: str,
+        provider_file_id: str,
+        purpose: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Save a provider file upload record; returns its UUID (existing one on conflict)."""
+        if not self._enabled:
+            return None
+        try:
+            rows = await self._rest(
+                "POST", "provider_file_uploads",
+                json_body={"provider": provider, "provider_file_id": provider_file_id,
+                           "purpose": purpose, "metadata": metadata or {}},
+                prefer="return=representation",
+                idempotent=False,
+            )
+            return rows[0]["id"] if rows else None
+        except NonRetryableError as e:
+            if "409" in str(e) or "duplicate key" in str(e).lower():
+                logger.warning(f"Duplicate provider file: {provider}/{provider_file_id}")
+                existing = await self.get_provider_file_by_id(provider, provider_file_id)
+                return existing.get("id") if existing else None
+            logger.error(f"Failed to save provider file upload {provider}/{provider_file_id}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to save provider file upload {provider}/{provider_file_id}: {e}")
+            return None
+
+    async def get_provider_file_by_id(self, provider: str, provider_file_id: str) -> Optional[Dict]:
+        if not self._enabled:
+            return None
+        try:
+            rows = await self._rest("GET", "provider_file_uploads", params={
+                "select": "*", "provider": f"eq.{provider}", "provider_file_id": f"eq.{provider_file_id}",
+            })
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error(f"Failed to get provider file {provider}/{provider_file_id}: {e}")
+            return None
+
+    async def update_provider_file_last_used(self, provider: str, provider_file_id: str) -> bool:
+        if not self._enabled:
+            return False
+        try:
+            rows = await self._rest(
+                "PATCH", "provider_file_uploads",
+                params={"provider": f"eq.{provider}", "provider_file_id": f"eq.{provider_file_id}"},
+                json_body={"last_used": datetime.now().isoformat()},
+                prefer="return=representation",
+            )
+            return bool(rows)
+        except Exception as e:
+            logger.error(f"Failed to update last_used for {provider}/{provider_file_id}: {e}")
+            return False
+
+    async def get_provider_files_by_purpose(self, provider: str, purpose: str, limit: int = 100) -> List[Dict]:
+        if not self._enabled:
+            return []
+        try:
+            return await self._rest("GET", "provider_file_uploads", params={
+                "select": "*", "provider": f"eq.{provider}", "purpose": f"eq.{purpose}", "limit": str(limit),
+            })
+        except Exception as e:
+            logger.error(f"Failed to get provider files by purpose: {e}")
+            return []
+
+
+_async_storage_manager: Optional[AsyncSupabaseStorageManager] = None
+
+
+def get_async_storage_manager() -> AsyncSupabaseStorageManager:
+    """Get the process-wide async storage manager (pool is created on first request)."""
+    global _async_storage_manager
+    if _async_storage_manager is None:
+        _async_storage_manager = AsyncSupabaseStorageManager()
+    return _async_storage_manager
+
+
+async def close_async_storage_manager() -> None:
+    """Close the process-wide manager's connection pool."""
+    global _async_storage_manager
+    if _async_storage_manager is not None:
+        await _async_storage_manager.aclose()
+        _async_storage_manager = None
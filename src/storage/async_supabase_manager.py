@@ -1,36 +1,33 @@
 """
 Async Supabase Manager for EXAI MCP Server
-Provides async wrapper around synchronous Supabase client for MCP compatibility
+Provides async Supabase operations for MCP compatibility
 
 WEEK 2 (2025-10-19): Async Supabase Operations
 - Async wrapper pattern for MCP protocol compatibility
-- ThreadPoolExecutor for non-blocking operations
 - Fire-and-forget pattern for non-critical writes
 - Graceful degradation on failures
+
+Operations are served by AsyncSupabaseStorageManager (pooled httpx
+connections, per-endpoint concurrency limits) instead of running the sync
+client in a small thread pool, so concurrent calls from the daemon event
+loop no longer queue behind the pool's worker threads.
 """
 
-import os
 import logging
 import asyncio
-from typing import Optional, Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Set
 
-from supabase import create_client, Client
-from src.storage.supabase_client import SupabaseStorageManager
+from src.storage.async_storage_manager import AsyncSupabaseStorageManager, get_async_storage_manager
 
 logger = logging.getLogger(__name__)
 
 
 class AsyncSupabaseManager:
     """
-    Async wrapper around SupabaseStorageManager for MCP compatibility.
-    
-    The MCP protocol is synchronous, but we want non-blocking Supabase operations.
-    This class provides async methods that run sync operations in a thread pool.
+    Async facade over AsyncSupabaseStorageManager for MCP compatibility.
     
     Features:
-    - Async wrapper pattern using ThreadPoolExecutor
+    - Async-native I/O on a shared connection pool
     - Fire-and-forget pattern for non-critical writes
     - Graceful degradation on failures
     - Singleton pattern for resource efficiency
@@ -39,19 +36,20 @@ class AsyncSupabaseManager:
     _instance: Optional['AsyncSupabaseManager'] = None
     _lock = asyncio.Lock()
     
-    def __init__(self, pool_size: int = 5):
+    def __init__(self, pool_size: int = 5, storage: Optional[AsyncSupabaseStorageManager] = None):
         """
         Initialize async Supabase manager.
         
         Args:
-            pool_size: Number of worker threads for async operations
+            pool_size: Unused; kept for backward compatibility (concurrency is
+                configured per endpoint on the async storage manager)
+            storage: Async storage manager (default: process-wide instance)
         """
         self.pool_size = pool_size
-        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="supabase-async")
-        self.sync_client = SupabaseStorageManager()
-        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.storage = storage or get_async_storage_manager()
+        self._background: Set[asyncio.Task] = set()
         
-        logger.info(f"AsyncSupabaseManager initialized with pool_size={pool_size}")
+        logger.info("AsyncSupabaseManager initialized (async-native storage)")
     
     @classmethod
     async def get_instance(cls, pool_size: int = 5) -> 'AsyncSupabaseManager':
@@ -59,7 +57,7 @@ class AsyncSupabaseManager:
         Get or create singleton instance (async-safe).
         
         Args:
-            pool_size: Number of worker threads (only used on first call)
+            pool_size: Unused; kept for backward compatibility
             
         Returns:
             AsyncSupabaseManager instance
@@ -70,33 +68,11 @@ class AsyncSupabaseManager:
                     cls._instance = cls(pool_size=pool_size)
         return cls._instance
     
-    def _get_loop(self) -> asyncio.AbstractEventLoop:
-        """Get or create event loop."""
-        if self._loop is None or self._loop.is_closed():
-            try:
-                self._loop = asyncio.get_running_loop()
-            except RuntimeError:
-                self._loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(self._loop)
-        return self._loop
-    
-    async def _run_in_executor(self, func, *args, **kwargs):
-        """
-        Run synchronous function in thread pool executor.
-        
-        Args:
-            func: Synchronous function to run
-            *args: Positional arguments
-            **kwargs: Keyword arguments
-            
-        Returns:
-            Result from function
-        """
-        loop = self._get_loop()
-        return await loop.run_in_executor(
-            self.executor,
-            lambda: func(*args, **kwargs)
-        )
+    def _fire_and_forget(self, coro) -> None:
+        """Schedule a coroutine, keeping a reference so it is not garbage collected."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
     
     async def save_conversation_async(
         self,
@@ -120,30 +96,19 @@ class AsyncSupabaseManager:
             Saved conversation data (None if fire_and_forget=True or on error)
         """
         try:
+            coro = self.storage.save_conversation(
+                continuation_id=conversation_id,
+                title=title,
+                metadata={**(metadata or {}), "user_id": user_id}
+            )
             if fire_and_forget:
-                # Fire-and-forget: Schedule task but don't wait
-                asyncio.create_task(
-                    self._run_in_executor(
-                        self.sync_client.save_conversation,
-                        conversation_id,
-                        user_id,
-                        title,
-                        metadata
-                    )
-                )
+                self._fire_and_forget(coro)
                 logger.debug(f"Fire-and-forget save for conversation {conversation_id}")
                 return None
-            else:
-                # Wait for result
-                result = await self._run_in_executor(
-                    self.sync_client.save_conversation,
-                    conversation_id,
-                    user_id,
-                    title,
-                    metadata
-                )
-                logger.debug(f"Async save completed for conversation {conversation_id}")
-                return result
+
+            conv_uuid = await coro
+            logger.debug(f"Async save completed for conversation {conversation_id}")
+            return {"id": conv_uuid} if conv_uuid else None
                 
         except Exception as e:
             logger.error(f"Async save failed for conversation {conversation_id}: {e}")
@@ -163,10 +128,7 @@ class AsyncSupabaseManager:
             Conversation data or None if not found/error
         """
         try:
-            result = await self._run_in_executor(
-                self.sync_client.get_conversation,
-                conversation_id
-            )
+            result = await self.storage.get_conversation_by_continuation_id(conversation_id)
             logger.debug(f"Async get completed for conversation {conversation_id}")
             return result
         except Exception as e:
@@ -195,30 +157,15 @@ class AsyncSupabaseManager:
             Saved message data (None if fire_and_forget=True or on error)
         """
         try:
+            coro = self.storage.save_message(conversation_id, role, content, metadata)
             if fire_and_forget:
-                # Fire-and-forget: Schedule task but don't wait
-                asyncio.create_task(
-                    self._run_in_executor(
-                        self.sync_client.save_message,
-                        conversation_id,
-                        role,
-                        content,
-                        metadata
-                    )
-                )
+                self._fire_and_forget(coro)
                 logger.debug(f"Fire-and-forget save for message in {conversation_id}")
                 return None
-            else:
-                # Wait for result
-                result = await self._run_in_executor(
-                    self.sync_client.save_message,
-                    conversation_id,
-                    role,
-                    content,
-                    metadata
-                )
-                logger.debug(f"Async message save completed for {conversation_id}")
-                return result
+
+            message_id = await coro
+            logger.debug(f"Async message save completed for {conversation_id}")
+            return {"id": message_id} if message_id else None
                 
         except Exception as e:
             logger.error(f"Async message save failed for {conversation_id}: {e}")
@@ -240,11 +187,7 @@ class AsyncSupabaseManager:
             List of messages (empty list on error)
         """
         try:
-            result = await self._run_in_executor(
-                self.sync_client.get_conversation_history,
-                conversation_id,
-                limit
-            )
+            result = await self.storage.get_conversation_messages(conversation_id, limit=limit)
             logger.debug(f"Async history get completed for {conversation_id}")
             return result or []
         except Exception as e:
@@ -252,17 +195,12 @@ class AsyncSupabaseManager:
             return []
     
     async def shutdown(self):
-        """Shutdown executor gracefully."""
+        """Wait for pending fire-and-forget writes, then close the connection pool."""
         logger.info("Shutting down AsyncSupabaseManager...")
-        self.executor.shutdown(wait=True)
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        await self.storage.aclose()
         logger.info("AsyncSupabaseManager shutdown complete")
-    
-    def __del__(self):
-        """Cleanup on deletion."""
-        try:
-            self.executor.shutdown(wait=False)
-        except Exception:
-            pass
 
 
 # Singleton instance getter (convenience function)
@@ -271,7 +209,7 @@ async def get_async_supabase_manager(pool_size: int = 5) -> AsyncSupabaseManager
     Get singleton AsyncSupabaseManager instance.
     
     Args:
-        pool_size: Number of worker threads (only used on first call)
+        pool_size: Unused; kept for backward compatibility
         
     Returns:
         AsyncSupabaseManager instance
@@ -7,7 +7,7 @@ Provides immediate upload capability with fallback to local paths.
 
 import os
 import logging
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 from pathlib import Path
 from .supabase_client import get_storage_manager
 from utils.file.cross_platform import get_path_handler
@@ -113,10 +113,6 @@ class FileHandler:
             if upload_immediately and self.storage.enabled:
                 # Upload to Supabase storage using normalized path
                 try:
-                    # Use normalized_path for file operations
-                    with open(normalized_path, 'rb') as f:
-                        file_data = f.read()
-
                     # Generate storage path using original filename
                     file_name = os.path.basename(file_path)  # Use original path for filename
                     storage_path = f"contexts/{context_id}/{file_name}"
@@ -127,9 +123,9 @@ class FileHandler:
                     if mime_type is None:
                         mime_type = "application/octet-stream"  # Default fallback
 
-                    # Upload file
-                    file_id = self.storage.upload_file(
-                        file_data=file_data,
+                    # Stream the file from disk (hashed in the same pass, never fully in memory)
+                    file_id = self.storage.upload_file_from_path(
+                        local_path=normalized_path,
                         original_name=file_name,
                         file_path=storage_path,
                         mime_type=mime_type
@@ -151,31 +147,31 @@ class FileHandler:
         
         return processed_files
     
-    def download_file(self, file_id: str, output_path: Optional[str] = None) -> Optional[bytes]:
+    def download_file(self, file_id: str, output_path: Optional[str] = None) -> Optional[Union[bytes, str]]:
         """
         Download file from Supabase storage
         
         Args:
             file_id: UUID of the file
-            output_path: Optional path to save file
+            output_path: Optional path to save file (streamed to disk, not buffered)
         
         Returns:
-            File content as bytes or None on error
+            File content as bytes, or the SHA-256 of the saved file when
+            output_path is given; None on error
         """
         if not self.storage.enabled:
             logger.debug("Supabase storage not enabled, skipping download")
             return None
         
         try:
-            file_data = self.storage.download_file(file_id)
-            
-            if file_data and output_path:
-                # Save to local file
-                with open(output_path, 'wb') as f:
-                    f.write(file_data)
-                logger.info(f"Downloaded file {file_id} to {output_path}")
-            
-            return file_data
+            if output_path:
+                # Stream to disk instead of buffering the whole file
+                sha256 = self.storage.download_file_to_path(file_id, output_path)
+                if sha256:
+                    logger.info(f"Downloaded file {file_id} to {output_path}")
+                return sha256
+
+            return self.storage.download_file(file_id)
         
         except Exception as e:
             logger.error(f"Error downloading file {file_id}: {e}")
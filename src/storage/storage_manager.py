@@ -100,6 +100,9 @@ class SupabaseStorageManager:
     def close(self):
         """Close the Supabase client"""
         self._client = None
+        if getattr(self, "_streaming_transfer", None) is not None:
+            self._streaming_transfer.close()
+            self._streaming_transfer = None
         logger.debug("Supabase client closed")
 
     # ========================================================================
@@ -295,6 +298,55 @@ class SupabaseStorageManager:
             logger.error(f"Failed to save message to {conversation_id}: {e}")
             return None
 
+    @track_storage_performance(operation_type="write")
+    def save_messages_batch(self, messages: List[Dict[str, Any]]) -> List[str]:
+        """
+        Save many messages (possibly across conversations) in one upsert call
+
+        Used by the conversation write-behind queue to flush a window of turns
+        with a single PostgREST request. Idempotency keys are computed exactly
+        as in save_message, so retried batches do not create duplicates.
+
+        Args:
+            messages: Dicts with conversation_id, role, content, metadata and created_at
+
+        Returns:
+            UUIDs of newly inserted messages (duplicates are skipped)
+
+        Raises:
+            Exception: If the upsert fails, so the caller can retry the batch
+        """
+        if not self._enabled or not messages:
+            return []
+
+        try:
+            client = self.get_client()
+            rows = []
+            for message in messages:
+                row = {
+                    "conversation_id": message["conversation_id"],
+                    "role": message["role"],
+                    "content": message["content"],
+                    "metadata": message.get("metadata") or {},
+                    "created_at": message.get("created_at") or datetime.now().isoformat()
+                }
+                row["idempotency_key"] = self._generate_idempotency_key(row)
+                rows.append(row)
+
+            result = client.table("messages").upsert(
+                rows,
+                on_conflict="idempotency_key",
+                ignore_duplicates=True
+            ).execute()
+
+            message_ids = [record["id"] for record in (result.data or [])]
+            logger.debug(f"Saved {len(message_ids)}/{len(rows)} messages in batch")
+            return message_ids
+
+        except Exception as e:
+            logger.error(f"Failed to save batch of {len(messages)} messages: {e}")
+            raise
+
     @track_storage_performance(operation_type="query")
     def get_conversation_messages(
         self,
@@ -511,6 +563,142 @@ class SupabaseStorageManager:
             logger.error(f"Failed to download file {file_id}: {e}")
             return None
 
+    def _get_streaming_transfer(self):
+        """Lazily create the streaming transfer client (shares this manager's credentials)."""
+        if getattr(self, "_streaming_transfer", None) is None:
+            from src.storage.streaming_transfer import StreamingTransfer
+            self._streaming_transfer = StreamingTransfer(url=self.url, service_key=self.service_key)
+        return self._streaming_transfer
+
+    @track_storage_performance(operation_type="write")
+    def upload_file_from_path(
+        self,
+        local_path: str,
+        original_name: str,
+        file_path: str,
+        mime_type: str,
+        file_type: str = "user_upload",
+        compress: bool = False,
+        progress_callback: Optional[callable] = None
+    ) -> Optional[str]:
+        """
+        Upload a local file to Supabase Storage without loading it into memory
+
+        The file is read once: SHA-256 is computed (and gzip applied, if
+        requested) while streaming. Large files use resumable uploads. The
+        hash and content encoding are stored in the file record's metadata.
+
+        Args:
+            local_path: File on disk
+            original_name: Original filename
+            file_path: Storage path (within bucket)
+            mime_type: MIME type
+            file_type: File type category
+            compress: Store gzip-compressed
+            progress_callback: Optional callback(current, total, percent)
+
+        Returns:
+            File UUID or None on error
+        """
+        if not self._enabled:
+            return None
+
+        try:
+            existing_file_id = self._check_file_exists(file_path, original_name, file_type)
+            if existing_file_id:
+                logger.info(f"File already exists: {original_name} -> {existing_file_id}")
+                return existing_file_id
+
+            bucket = "user-files" if file_type == "user_upload" else "generated-files"
+            callback = None
+            if progress_callback:
+                tracker = ProgressTracker(
+                    progress_callback,
+                    throttle_interval=float(os.getenv("SUPABASE_PROGRESS_INTERVAL", "0.5"))
+                )
+                callback = tracker.update
+
+            try:
+                result = self._get_streaming_transfer().upload(
+                    local_path, bucket, file_path,
+                    content_type=mime_type, compress=compress, progress_callback=callback
+                )
+            except NonRetryableError as e:
+                # Handle race condition - file might exist from another process
+                if "409" in str(e) or "Duplicate" in str(e) or "already exists" in str(e).lower():
+                    existing_file_id = self._check_file_exists(file_path, original_name, file_type)
+                    if existing_file_id:
+                        return existing_file_id
+                raise
+
+            metadata = {"sha256": result.sha256}
+            if result.compressed:
+                metadata["content_encoding"] = "gzip"
+                metadata["stored_size_bytes"] = result.stored_size
+
+            client = self.get_client()
+            db_result = client.table("files").insert({
+                "storage_path": file_path,
+                "original_name": original_name,
+                "mime_type": mime_type,
+                "size_bytes": result.size,
+                "file_type": file_type,
+                "metadata": metadata
+            }).execute()
+
+            if not db_result.data:
+                raise Exception("Failed to save file metadata")
+
+            file_id = db_result.data[0]["id"]
+            logger.info(f"Uploaded file (streamed): {original_name} -> {file_id}")
+            return file_id
+
+        except Exception as e:
+            logger.error(f"Streaming upload failed for {original_name}: {e}")
+            return None
+
+    @track_storage_performance(operation_type="query")
+    def download_file_to_path(self, file_id: str, dest_path: str) -> Optional[str]:
+        """
+        Stream a file from Supabase Storage to disk
+
+        Decompresses gzip-stored files and verifies the recorded SHA-256
+        (when present) in the same pass as writing.
+
+        Args:
+            file_id: UUID of the file
+            dest_path: Local destination path
+
+        Returns:
+            SHA-256 of the written content, or None on error
+        """
+        if not self._enabled:
+            return None
+
+        try:
+            client = self.get_client()
+            file_record = client.table("files").select("*").eq("id", file_id).execute()
+
+            if not file_record.data:
+                logger.error(f"File {file_id} not found in database")
+                return None
+
+            record = file_record.data[0]
+            metadata = record.get("metadata") or {}
+            bucket = "user-files" if record["file_type"] == "user_upload" else "generated-files"
+
+            result = self._get_streaming_transfer().download(
+                bucket, record["storage_path"], dest_path,
+                expected_sha256=metadata.get("sha256"),
+                decompress=metadata.get("content_encoding") == "gzip"
+            )
+            logger.debug(f"Downloaded file (streamed): {file_id} -> {dest_path}")
+            return result.sha256
+
+        except Exception as e:
+            logger.error(f"Failed to download file {file_id} to {dest_path}: {e}")
+            return None
+
     @track_storage_performance(operation_type="write")
     @with_retry(max_retries=3)
     def delete_file(self, file_id: str) -> bool:
@@ -0,0 +1,411 @@
+"""
+Streaming File Transfer for Supabase Storage
+
+Moves files between local disk and Supabase Storage without holding them in
+memory and without a separate hashing pass:
+
+- Uploads read the file once in fixed-size buffers; each buffer is fed to
+  SHA-256, optionally gzip-compressed, and sent. Memory stays at a few
+  buffers regardless of file size.
+- Files at or above STORAGE_RESUMABLE_THRESHOLD use Supabase's resumable
+  (TUS) endpoint in STORAGE_STREAMING_CHUNK_SIZE parts. A failed part is resumed from
+  the server's offset; bytes already hashed are never hashed twice, and an
+  interrupted upload can be continued later with its upload_url.
+- Downloads stream to a ".part" file next to the destination (hashing and
+  optionally decompressing as they go), resume with a Range request if a
+  partial file exists, verify the expected hash and rename into place.
+
+Compressed uploads are always single-request (their length is not known up
+front, which the resumable protocol requires).
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+from urllib.parse import quote
+
+import httpx
+
+from src.storage.storage_exceptions import NonRetryableError, RetryableError
+
+logger = logging.getLogger(__name__)
+
+# Supabase's resumable endpoint requires 6MB parts (except the last)
+DEFAULT_CHUNK_SIZE = 6 * 1024 * 1024
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+ProgressCallback = Callable[[int, int], None]  # (bytes_done, total_bytes)
+
+
+class _RangeIgnored(Exception):
+    """The server answered a ranged GET with the full object."""
+
+
+@dataclass
+class TransferResult:
+    """Outcome of a streamed upload or download."""
+
+    object_path: str
+    sha256: str
+    size: int  # Bytes of the original (uncompressed) content
+    stored_size: int  # Bytes on the wire / in the bucket
+    compressed: bool = False
+    upload_url: Optional[str] = None  # Resumable upload URL (for later resume)
+    resumes: int = 0
+
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+class _HashingReader:
+    """
+    Reads a file by offset in fixed-size parts, hashing each byte exactly once.
+
+    Parts re-sent after a resume are not re-hashed; if the server is ahead of
+    what was hashed (resuming an earlier upload), the gap is hashed first.
+    """
+
+    def __init__(self, f, hasher, chunk_size: int):
+        self._f = f
+        self._hasher = hasher
+        self._chunk_size = chunk_size
+        self.hashed = 0
+
+    def _hash_to(self, offset: int) -> None:
+        self._f.seek(self.hashed)
+        while self.hashed < offset:
+            data = self._f.read(min(self._chunk_size, offset - self.hashed))
+            if not data:
+                break
+            self._hasher.update(data)
+            self.hashed += len(data)
+
+    def read_at(self, offset: int) -> bytes:
+        if offset > self.hashed:
+            self._hash_to(offset)
+        self._f.seek(offset)
+        data = self._f.read(self._chunk_size)
+        end = offset + len(data)
+        if end > self.hashed:
+            self._hasher.update(data[self.hashed - offset:])
+            self.hashed = end
+        return data
+
+    def finish(self, size: int) -> None:
+        self._hash_to(size)
+
+
+class StreamingTransfer:
+    """
+    Streamed uploads/downloads against Supabase Storage.
+
+    Args:
+        url: Supabase project URL (default SUPABASE_URL)
+        service_key: Service role key (default SUPABASE_SERVICE_ROLE_KEY)
+        chunk_size: Buffer / resumable part size (default STORAGE_STREAMING_CHUNK_SIZE or 6MB)
+        resumable_threshold: Files at least this large use resumable uploads
+        max_resumes: Resume attempts per upload/download before giving up
+        transport: Optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        service_key: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        resumable_threshold: Optional[int] = None,
+        max_resumes: int = 3,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.url = (url or os.getenv("SUPABASE_URL") or "").rstrip("/")
+        self.service_key = service_key or os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        if not self.url or not self.service_key:
+            raise RuntimeError("Supabase storage not configured")
+        self.chunk_size = chunk_size or int(os.getenv("STORAGE_STREAMING_CHUNK_SIZE", str(DEFAULT_CHUNK_SIZE)))
+        self.resumable_threshold = resumable_threshold or int(
+            os.getenv("STORAGE_RESUMABLE_THRESHOLD", str(50 * 1024 * 1024))
+        )
+        self.max_resumes = max_resumes
+        self._client = httpx.Client(
+            base_url=self.url,
+            headers={"apikey": self.service_key, "Authorization": f"Bearer {self.service_key}"},
+            timeout=httpx.Timeout(300.0, connect=10.0),
+            transport=transport,
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ========================================================================
+    # HELPERS
+    # ========================================================================
+
+    @staticmethod
+    def _object_url(bucket: str, object_path: str) -> str:
+        return f"/storage/v1/object/{bucket}/{quote(object_path.lstrip('/'))}"
+
+    @staticmethod
+    def _raise_for(response: httpx.Response, what: str) -> None:
+        if response.status_code < 400:
+            return
+        message = f"{what} failed: {response.status_code} {response.text[:200]}"
+        if response.status_code in _RETRY_STATUSES:
+            raise RetryableError(message)
+        raise NonRetryableError(message)
+
+    # ========================================================================
+    # UPLOAD
+    # ========================================================================
+
+    def upload(
+        self,
+        file_path: Union[str, Path],
+        bucket: str,
+        object_path: str,
+        content_type: str = "application/octet-stream",
+        compress: bool = False,
+        upsert: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+        resume_url: Optional[str] = None,
+    ) -> TransferResult:
+        """
+        Upload a file while hashing it (and optionally gzip-compressing it).
+
+        Args:
+            file_path: Local file
+            bucket: Storage bucket
+            object_path: Destination path within the bucket
+            content_type: Stored content type
+            compress: Store gzip-compressed bytes (single request)
+            upsert: Overwrite an existing object
+            progress_callback: Called with (bytes_read, file_size)
+            resume_url: upload_url of an interrupted resumable upload to continue
+
+        Returns:
+            TransferResult with the SHA-256 of the original content
+
+        Raises:
+            RetryableError / NonRetryableError: Upload failed
+        """
+        size = os.path.getsize(file_path)
+        if not compress and (resume_url or size >= self.resumable_threshold):
+            return self._upload_resumable(file_path, size, bucket, object_path, content_type,
+                                          upsert, progress_callback, resume_url)
+        return self._upload_single(file_path, size, bucket, object_path, content_type,
+                                   compress, upsert, progress_callback)
+
+    def _upload_single(self, file_path, size, bucket, object_path, content_type,
+                       compress, upsert, progress_callback) -> TransferResult:
+        hasher = hashlib.sha256()
+        sent = [0]
+
+        def file_chunks() -> Iterator[bytes]:
+            done = 0
+            with open(file_path, "rb") as f:
+                while True:
+                    chunk = f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    done += len(chunk)
+                    if progress_callback:
+                        progress_callback(done, size)
+                    yield chunk
+
+        def counted(chunks: Iterator[bytes]) -> Iterator[bytes]:
+            for chunk in chunks:
+                sent[0] += len(chunk)
+                yield chunk
+
+        body = counted(_gzip_stream(file_chunks()) if compress else file_chunks())
+        headers = {"Content-Type": content_type, "x-upsert": "true" if upsert else "false"}
+        if not compress:
+            headers["Content-Length"] = str(size)
+        try:
+            response = self._client.post(self._object_url(bucket, object_path), content=body, headers=headers)
+        except httpx.TransportError as e:
+            raise RetryableError(f"Upload of {object_path} failed: {e}") from e
+        self._raise_for(response, f"Upload of {object_path}")
+
+        logger.debug(f"[STREAM_UPLOAD] {object_path}: {size} bytes ({sent[0]} sent, compressed={compress})")
+        return TransferResult(object_path, hasher.hexdigest(), size, sent[0], compressed=compress)
+
+    def _create_resumable(self, size, bucket, object_path, content_type, upsert) -> str:
+        def b64(value: str) -> str:
+            return base64.b64encode(value.encode("utf-8")).decode("ascii")
+
+        response = self._client.post("/storage/v1/upload/resumable", headers={
+            "Tus-Resumable": "1.0.0",
+            "Upload-Length": str(size),
+            "Upload-Metadata": f"bucketName {b64(bucket)},objectName {b64(object_path)},contentType {b64(content_type)}",
+            "x-upsert": "true" if upsert else "false",
+        })
+        self._raise_for(response, f"Creating resumable upload for {object_path}")
+        location = response.headers.get("Location")
+        if not location:
+            raise NonRetryableError("Resumable upload created without a Location header")
+        return location
+
+    def _server_offset(self, upload_url: str) -> int:
+        response = self._client.head(upload_url, headers={"Tus-Resumable": "1.0.0"})
+        self._raise_for(response, "Resumable upload status")
+        return int(response.headers.get("Upload-Offset", "0"))
+
+    def _upload_resumable(self, file_path, size, bucket, object_path, content_type,
+                          upsert, progress_callback, resume_url) -> TransferResult:
+        hasher = hashlib.sha256()
+        upload_url = resume_url or self._create_resumable(size, bucket, object_path, content_type, upsert)
+        offset = self._server_offset(upload_url) if resume_url else 0
+        resumes = 0
+
+        with open(file_path, "rb") as f:
+            reader = _HashingReader(f, hasher, self.chunk_size)
+            while offset < size:
+                part = reader.read_at(offset)
+                try:
+                    response = self._client.patch(upload_url, content=part, headers={
+                        "Tus-Resumable": "1.0.0",
+                        "Upload-Offset": str(offset),
+                        "Content-Type": "application/offset+octet-stream",
+                    })
+                    self._raise_for(response, f"Uploading part at {offset} of {object_path}")
+                    offset = int(response.headers.get("Upload-Offset", offset + len(part)))
+                except (httpx.TransportError, RetryableError) as e:
+                    resumes += 1
+                    if resumes > self.max_resumes:
+                        raise RetryableError(
+                            f"Upload of {object_path} interrupted at {offset}/{size} (resume with {upload_url}): {e}"
+                        ) from e
+                    offset = self._server_offset(upload_url)
+                    logger.warning(f"[STREAM_UPLOAD] Resuming {object_path} at {offset}/{size}: {e}")
+                    continue
+                if progress_callback:
+                    progress_callback(offset, size)
+            reader.finish(size)
+
+        logger.debug(f"[STREAM_UPLOAD] {object_path}: {size} bytes resumable ({resumes} resumes)")
+        return TransferResult(object_path, hasher.hexdigest(), size, size,
+                              upload_url=upload_url, resumes=resumes)
+
+    def move(self, bucket: str, source_path: str, destination_path: str) -> None:
+        """Rename an object within a bucket (server-side, no re-upload)."""
+        response = self._client.post("/storage/v1/object/move", json={
+            "bucketId": bucket, "sourceKey": source_path, "destinationKey": destination_path,
+        })
+        self._raise_for(response, f"Moving {source_path} to {destination_path}")
+
+    def remove(self, bucket: str, object_paths: list) -> None:
+        response = self._client.request("DELETE", f"/storage/v1/object/{bucket}", json={"prefixes": object_paths})
+        self._raise_for(response, f"Removing {object_paths}")
+
+    # ========================================================================
+    # DOWNLOAD
+    # ========================================================================
+
+    def download(
+        self,
+        bucket: str,
+        object_path: str,
+        dest_path: Union[str, Path],
+        expected_sha256: Optional[str] = None,
+        decompress: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> TransferResult:
+        """
+        Stream an object to disk, hashing (and optionally gunzipping) on the way.
+
+        A leftover "<dest>.part" from an interrupted download is continued with
+        a Range request (uncompressed objects only).
+
+        Returns:
+            TransferResult with the SHA-256 of the written content
+
+        Raises:
+            NonRetryableError: Hash mismatch or 4xx response
+            RetryableError: Download still failing after max_resumes
+        """
+        dest_path = Path(dest_path)
+        part_path = dest_path.with_name(dest_path.name + ".part")
+        hasher = hashlib.sha256()
+        resumes = 0
+        received = 0
+
+        if decompress or not part_path.exists():
+            part_path.unlink(missing_ok=True)
+        else:
+            # Hash what an earlier attempt already wrote, then continue after it
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                    hasher.update(chunk)
+
+        while True:
+            written = part_path.stat().st_size if part_path.exists() else 0
+            try:
+                received += self._download_into(bucket, object_path, part_path, written, hasher,
+                                                decompress, progress_callback)
+                break
+            except _RangeIgnored:
+                # Server ignored the Range header: start over from scratch
+                part_path.unlink(missing_ok=True)
+                hasher = hashlib.sha256()
+            except (httpx.TransportError, RetryableError) as e:
+                resumes += 1
+                if decompress or resumes > self.max_resumes:
+                    raise RetryableError(f"Download of {object_path} failed: {e}") from e
+                logger.warning(f"[STREAM_DOWNLOAD] Resuming {object_path}: {e}")
+
+        sha256 = hasher.hexdigest()
+        if expected_sha256 and sha256 != expected_sha256:
+            part_path.unlink(missing_ok=True)
+            raise NonRetryableError(f"SHA-256 mismatch for {object_path}: expected {expected_sha256}, got {sha256}")
+        size = part_path.stat().st_size
+        os.replace(part_path, dest_path)
+        logger.debug(f"[STREAM_DOWNLOAD] {object_path} -> {dest_path}: {size} bytes")
+        return TransferResult(object_path, sha256, size, received, compressed=decompress, resumes=resumes)
+
+    def _download_into(self, bucket, object_path, part_path, offset, hasher, decompress, progress_callback) -> int:
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        received = 0
+        with self._client.stream("GET", self._object_url(bucket, object_path), headers=headers) as response:
+            if response.status_code == 416:
+                return 0  # Already complete
+            if response.status_code >= 400:
+                response.read()
+            self._raise_for(response, f"Download of {object_path}")
+
+            if offset and response.status_code != 206:
+                raise _RangeIgnored()
+
+            total = int(response.headers.get("Content-Length", "0")) + offset
+            decompressor = zlib.decompressobj(47) if decompress else None  # 47: auto-detect gzip/zlib
+            with open(part_path, "ab") as out:
+                for chunk in response.iter_bytes(self.chunk_size):
+                    received += len(chunk)
+                    if decompressor:
+                        chunk = decompressor.decompress(chunk)
+                    hasher.update(chunk)
+                    out.write(chunk)
+                    if progress_callback:
+                        progress_callback(offset + received, total)
+                if decompressor:
+                    tail = decompressor.flush()
+                    hasher.update(tail)
+                    out.write(tail)
+        return received
@@ -1,6 +1,5 @@
 """Streaming adapter package for EX-AI-MCP-Server."""
 
-from .streaming_adapter import stream_openai_chat_events
-
-__all__ = ["stream_openai_chat_events"]
+from .streaming_adapter import StreamSink, astream_openai_chat_events, stream_openai_chat_events
 
+__all__ = ["StreamSink", "astream_openai_chat_events", "stream_openai_chat_events"]
@@ -4,13 +4,28 @@ Supports:
 - Standard content streaming
 - Kimi thinking mode (reasoning_content extraction)
 - GLM thinking mode (thinking field extraction)
+
+Pipeline (provider -> WebSocket client):
+- astream_openai_chat_events() reads the provider stream asynchronously
+  (AsyncOpenAI streams are consumed on the event loop; sync SDK streams are
+  read by a worker thread through a bounded buffer)
+- StreamSink coalesces tiny deltas into frames (STREAM_FRAME_MAX_CHARS or
+  STREAM_FRAME_INTERVAL_MS, whichever comes first) and sends them from one
+  sender task. While the socket is slow, deltas keep coalescing into the
+  pending frame; past STREAM_MAX_PENDING_CHARS the producer waits, which in
+  turn stops reading from the provider
+- Raw provider events are only retained when STREAM_DEBUG_EVENTS is enabled
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 import os
-from typing import Any, Callable, List, Optional, Tuple
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional, Tuple, Union
 
 # Import httpx for RemoteProtocolError handling
 try:
@@ -21,6 +36,197 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _env_flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
+
+
+class StreamSink:
+    """
+    Coalesces streamed text into frames and delivers them with backpressure.
+
+    Awaiting the sink with a delta buffers it; a frame is queued for the
+    sender task once it reaches max_frame_chars, or interval seconds after its
+    first delta. Frames are sent one at a time, so a slow socket (its send
+    awaits the transport drain) holds the queue full; further deltas then
+    merge into the pending frame, and once that exceeds max_pending_chars the
+    caller waits for the queue.
+
+    Sync producers running in worker threads call feed_threadsafe(), which
+    blocks the thread for the same backpressure.
+
+    Args:
+        send: Sync or async callable that delivers one frame
+        max_frame_chars: Frame size that triggers an immediate send
+        interval: Max seconds a delta waits for company before it is sent
+        max_pending_chars: Pending text above which producers wait
+        queue_frames: Frames queued ahead of the sender
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Union[None, Awaitable[None]]],
+        *,
+        max_frame_chars: Optional[int] = None,
+        interval: Optional[float] = None,
+        max_pending_chars: Optional[int] = None,
+        queue_frames: Optional[int] = None,
+    ):
+        self._send = send
+        self.max_frame_chars = max_frame_chars or int(os.getenv("STREAM_FRAME_MAX_CHARS", "1024"))
+        self.interval = interval if interval is not None else float(os.getenv("STREAM_FRAME_INTERVAL_MS", "50")) / 1000
+        self.max_pending_chars = max_pending_chars or int(os.getenv("STREAM_MAX_PENDING_CHARS", str(64 * 1024)))
+        self.queue_frames = queue_frames or int(os.getenv("STREAM_SEND_QUEUE_FRAMES", "4"))
+        self.block_timeout = float(os.getenv("STREAM_BACKPRESSURE_TIMEOUT", "30"))
+
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+        self.deltas = 0
+        self.frames = 0
+        self.chars = 0
+        self.backpressure_waits = 0
+        self.send_errors = 0
+
+    # Internals -----------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self.loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(maxsize=self.queue_frames)
+            self._sender = self.loop.create_task(self._run_sender())
+
+    def _buffer(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        self.deltas += 1
+        self.chars += len(text)
+
+    def _take(self) -> str:
+        frame = "".join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return frame
+
+    def _arm_timer(self) -> None:
+        if self._timer is None and self._pending:
+            self._timer = self.loop.call_later(self.interval, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if not self._pending:
+            return
+        if self._queue.full():
+            self._arm_timer()  # Socket still draining; keep coalescing
+        else:
+            self._queue.put_nowait(self._take())
+
+    async def _run_sender(self) -> None:
+        while True:
+            frame = await self._queue.get()
+            if frame is None:
+                return
+            try:
+                result = self._send(frame)
+                if inspect.isawaitable(result):
+                    await result
+                self.frames += 1
+            except Exception as e:
+                self.send_errors += 1
+                logger.debug(f"[STREAM] Frame send failed: {e}")
+
+    # Public API ------------------------------------------------------------
+
+    async def __call__(self, text: str) -> None:
+        """Add a delta (event loop side)."""
+        if not text or self._closed:
+            return
+        self._ensure_started()
+        self._buffer(text)
+        if self._pending_chars < self.max_frame_chars:
+            self._arm_timer()
+            return
+        if self._queue.full():
+            if self._pending_chars < self.max_pending_chars:
+                self._arm_timer()
+                return
+            self.backpressure_waits += 1
+        await self._queue.put(self._take())
+
+    def feed_nowait(self, text: str) -> None:
+        """Add a delta from sync code on the event loop thread (never waits)."""
+        if not text or self._closed:
+            return
+        self._ensure_started()
+        self._buffer(text)
+        if self._pending_chars >= self.max_frame_chars and not self._queue.full():
+            self._queue.put_nowait(self._take())
+        else:
+            self._arm_timer()
+
+    def feed_threadsafe(self, text: str) -> None:
+        """Add a delta from a worker thread, waiting while the client is backed up."""
+        if not text or self._closed or self.loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.feed_nowait(text)
+            return
+        future = asyncio.run_coroutine_threadsafe(self(text), self.loop)
+        try:
+            future.result(timeout=self.block_timeout)
+        except Exception as e:
+            logger.debug(f"[STREAM] Delta not delivered from worker thread: {e}")
+
+    async def aclose(self) -> None:
+        """Send the pending frame and wait for the sender to finish."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._queue is None:
+            return
+        if self._pending:
+            await self._queue.put(self._take())
+        await self._queue.put(None)
+        await self._sender
+        logger.debug(
+            f"[STREAM] {self.deltas} deltas ({self.chars} chars) sent as {self.frames} frames, "
+            f"{self.backpressure_waits} backpressure waits"
+        )
+
+    def abort(self) -> None:
+        """Drop pending frames without sending (error paths)."""
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = []
+        if self._sender is not None and not self._sender.done():
+            self._sender.cancel()
+
+    def get_stats(self) -> dict:
+        return {
+            "deltas": self.deltas,
+            "frames": self.frames,
+            "chars": self.chars,
+            "backpressure_waits": self.backpressure_waits,
+            "send_errors": self.send_errors,
+        }
+
+
 def _safe_call_chunk_callback(callback: Callable[[str], None], chunk: str) -> None:
     """
     Safely call a chunk callback, handling both sync and async callbacks.
@@ -29,18 +235,19 @@ def _safe_call_chunk_callback(callback: Callable[[str], None], chunk: str) -> No
     FIX (2025-11-07): Proper async/sync pattern - create event loop in thread if needed.
 
     Args:
-        callback: Sync or async callback function
+        callback: StreamSink, or sync or async callback function
         chunk: Text chunk to forward
 
     Note:
-        For async callbacks, creates a task in the running event loop.
-        Falls back to new event loop if no loop is running.
+        A StreamSink is fed on its own event loop (coalesced, with
+        backpressure on the calling thread). For other async callbacks,
+        creates a task in the running event loop. Falls back to new event
+        loop if no loop is running.
     """
-    import asyncio
-    import inspect
-
     try:
-        if inspect.iscoroutinefunction(callback):
+        if isinstance(callback, StreamSink):
+            callback.feed_threadsafe(chunk)
+        elif inspect.iscoroutinefunction(callback):
             # Async callback - need to run in event loop
             try:
                 loop = asyncio.get_event_loop()
@@ -66,6 +273,99 @@ def _safe_call_chunk_callback(callback: Callable[[str], None], chunk: str) -> No
         logger.debug(f"Chunk callback error: {e}")
 
 
+class _StreamAccumulator:
+    """Bounded accumulation of streamed reasoning/content (raw events only when debugging)."""
+
+    def __init__(self):
+        # SECURITY FIX: Add buffer size limits to prevent memory exhaustion
+        self.max_chunks = int(os.getenv("STREAM_MAX_CHUNKS", "10000"))
+        self.max_content_size = int(os.getenv("STREAM_MAX_CONTENT_SIZE", str(10 * 1024 * 1024)))  # 10MB default
+        self.retain_raw = _env_flag("STREAM_DEBUG_EVENTS")
+        self.content_parts: List[str] = []
+        self.reasoning_parts: List[str] = []
+        self.raw_items: List[Any] = []
+        self.events = 0
+        self._content_size = 0
+        self._reasoning_size = 0
+        self._in_thinking = False
+
+    def add_event(self, evt: Any) -> None:
+        self.events += 1
+        if not self.retain_raw:
+            return
+        if len(self.raw_items) >= self.max_chunks:
+            logger.warning(f"Raw items buffer overflow: max {self.max_chunks} items reached")
+            raise RuntimeError(
+                f"Stream buffer overflow: raw items exceeded limit of {self.max_chunks}. "
+                f"Increase STREAM_MAX_CHUNKS if needed."
+            )
+        self.raw_items.append(evt)
+
+    def add_reasoning(self, text: str) -> None:
+        if not self._in_thinking:
+            self._in_thinking = True
+            logger.debug("=============thinking start=============")
+        self._reasoning_size += len(text)
+        if self._reasoning_size > self.max_content_size:
+            logger.warning(f"Reasoning buffer overflow: max {self.max_content_size} bytes reached")
+            raise RuntimeError(
+                f"Stream buffer overflow: reasoning content exceeded {self.max_content_size} bytes. "
+                f"Increase STREAM_MAX_CONTENT_SIZE if needed."
+            )
+        self.reasoning_parts.append(text)
+
+    def add_content(self, text: str) -> None:
+        if self._in_thinking:
+            self._in_thinking = False
+            logger.debug("=============thinking end=============")
+        self._content_size += len(text)
+        if self._content_size > self.max_content_size:
+            logger.warning(f"Content buffer overflow: max {self.max_content_size} bytes reached")
+            raise RuntimeError(
+                f"Stream buffer overflow: content exceeded {self.max_content_size} bytes. "
+                f"Increase STREAM_MAX_CONTENT_SIZE if needed."
+            )
+        self.content_parts.append(text)
+
+    def text(self) -> str:
+        # Combine reasoning and content
+        # Format: [Reasoning]\n{reasoning}\n\n[Response]\n{content}
+        final_text = ""
+        if self.reasoning_parts:
+            final_text = f"[Reasoning]\n{''.join(self.reasoning_parts)}\n\n[Response]\n"
+        return final_text + "".join(self.content_parts)
+
+
+def _event_deltas(evt: Any, extract_reasoning: bool) -> Tuple[Optional[str], Optional[str]]:
+    """(reasoning, content) text of one stream event (SDK object or parsed SSE dict)."""
+    if isinstance(evt, dict):
+        choices = evt.get("choices") or []
+        delta = choices[0].get("delta") if choices else None
+        get = (lambda name: delta.get(name)) if delta else None
+    else:
+        choices = getattr(evt, "choices", None) or []
+        delta = getattr(choices[0], "delta", None) if choices else None
+        get = (lambda name: getattr(delta, name, None)) if delta else None
+    if get is None:
+        return None, None
+    # Extract reasoning_content for Kimi thinking mode
+    # Source: https://platform.moonshot.ai/docs/guide/use-kimi-thinking-preview-model
+    reasoning = get("reasoning_content") if extract_reasoning else None
+    content = get("content")
+    return (str(reasoning) if reasoning else None), (str(content) if content else None)
+
+
+def _is_remote_protocol_error(e: Exception) -> bool:
+    return bool(httpx) and isinstance(e, httpx.RemoteProtocolError)
+
+
+def _resolve_extract_reasoning(extract_reasoning: Optional[bool]) -> bool:
+    # Read extract_reasoning from env if not explicitly provided
+    if extract_reasoning is None:
+        return _env_flag("KIMI_EXTRACT_REASONING", "true")
+    return extract_reasoning
+
+
 def stream_openai_chat_events(
     *,
     client: Any,
@@ -75,177 +375,240 @@ def stream_openai_chat_events(
     extract_reasoning: Optional[bool] = None,
 ) -> Tuple[str, List[Any]]:
     """
-    Stream OpenAI-compatible chat events with optional progressive chunk forwarding.
-
-    Args:
-        client: OpenAI-compatible client instance
-        create_kwargs: Arguments for client.chat.completions.create()
-        on_delta: Optional callback for each content delta (legacy)
-        on_chunk: Optional async callback for progressive WebSocket streaming (NEW)
-        extract_reasoning: Whether to extract reasoning tokens
-
-    Returns:
-        Tuple of (complete_content, reasoning_events)
-
-    Note:
-        on_chunk callback can be sync or async. If async, it will be awaited.
-        This enables real-time progressive streaming to WebSocket clients.
-    """
-    """Iterate OpenAI-compatible chat.completions.create(stream=True) events.
+    Iterate OpenAI-compatible chat.completions.create(stream=True) events (sync).
 
     Supports both standard content streaming and thinking mode (reasoning_content).
+    Prefer astream_openai_chat_events() from async code.
 
     Args:
         client: OpenAI-compatible client instance
         create_kwargs: Kwargs for client.chat.completions.create()
-        on_delta: Optional callback for each content delta
+        on_delta: Optional callback for each content delta (legacy)
+        on_chunk: Optional StreamSink or callback for progressive WebSocket streaming
         extract_reasoning: Whether to extract reasoning_content (for kimi-thinking-preview)
                           If None, reads from KIMI_EXTRACT_REASONING env var (default: true)
 
     Returns:
         Tuple of (content_text, raw_items)
         - content_text: Concatenated content (reasoning + regular content)
-        - raw_items: List of raw streaming events
+        - raw_items: Raw streaming events (only when STREAM_DEBUG_EVENTS is enabled)
     """
-    # Read extract_reasoning from env if not explicitly provided
-    if extract_reasoning is None:
-        extract_reasoning = os.getenv("KIMI_EXTRACT_REASONING", "true").strip().lower() in ("1", "true", "yes")
-
-    # SECURITY FIX: Add buffer size limits to prevent memory exhaustion
-    # Max chunks to prevent unbounded list growth
-    MAX_CHUNKS = int(os.getenv("STREAM_MAX_CHUNKS", "10000"))
-    MAX_CONTENT_SIZE = int(os.getenv("STREAM_MAX_CONTENT_SIZE", str(10 * 1024 * 1024)))  # 10MB default
-
-    content_parts: List[str] = []
-    reasoning_parts: List[str] = []
-    raw_items: List[Any] = []
-
-    # Track if we're in thinking mode
-    in_thinking = False
+    extract_reasoning = _resolve_extract_reasoning(extract_reasoning)
+    acc = _StreamAccumulator()
 
     # CRITICAL FIX (2025-10-15): Add streaming timeout to prevent 6+ hour hangs
     # Get timeout from env (default 10 minutes for Kimi - can be slower than GLM)
-    import time
     stream_timeout = int(os.getenv("KIMI_STREAM_TIMEOUT", "600"))  # 10 minutes default
     stream_start = time.time()
 
+    def forward(text: str) -> None:
+        if on_delta:
+            on_delta(text)
+        if on_chunk:  # NEW (2025-10-24): Forward chunk for WebSocket streaming
+            _safe_call_chunk_callback(on_chunk, text)
+
     try:
         for evt in client.chat.completions.create(stream=True, **create_kwargs):
-            # Check if streaming has exceeded timeout
-            elapsed = time.time() - stream_start
-            if elapsed > stream_timeout:
-                raise TimeoutError(
-                    f"Kimi streaming exceeded timeout of {stream_timeout}s (elapsed: {int(elapsed)}s). "
-                    "This prevents indefinite hangs. Increase KIMI_STREAM_TIMEOUT if needed."
-                )
-
-            # SECURITY FIX: Check buffer size before appending to raw_items
-            if len(raw_items) >= MAX_CHUNKS:
-                logger.warning(f"Raw items buffer overflow: max {MAX_CHUNKS} items reached")
-                raise RuntimeError(
-                    f"Stream buffer overflow: raw items exceeded limit of {MAX_CHUNKS}. "
-                    f"Increase STREAM_MAX_CHUNKS if needed."
-                )
-
-            raw_items.append(evt)
+            _check_stream_timeout(stream_start, stream_timeout)
+            acc.add_event(evt)
             try:
-                ch = getattr(evt, "choices", None) or []
-                if ch:
-                    delta = getattr(ch[0], "delta", None)
-                    if delta:
-                        # Extract reasoning_content for Kimi thinking mode
-                        # Source: https://platform.moonshot.ai/docs/guide/use-kimi-thinking-preview-model
-                        if extract_reasoning and hasattr(delta, "reasoning_content"):
-                            reasoning_piece = getattr(delta, "reasoning_content")
-                            if reasoning_piece:
-                                if not in_thinking:
-                                    in_thinking = True
-                                    logger.debug("=============thinking start=============")
-
-                                # SECURITY FIX: Check buffer size before appending
-                                reasoning_str = str(reasoning_piece)
-                                total_size = sum(len(p) for p in reasoning_parts) + len(reasoning_str)
-                                if len(reasoning_parts) >= MAX_CHUNKS:
-                                    logger.warning(f"Reasoning buffer overflow: max {MAX_CHUNKS} chunks reached")
-                                    raise RuntimeError(
-                                        f"Stream buffer overflow: reasoning chunks exceeded limit of {MAX_CHUNKS}. "
-                                        f"Increase STREAM_MAX_CHUNKS if needed."
-                                    )
-                                if total_size > MAX_CONTENT_SIZE:
-                                    logger.warning(f"Reasoning buffer overflow: max {MAX_CONTENT_SIZE} bytes reached")
-                                    raise RuntimeError(
-                                        f"Stream buffer overflow: reasoning content exceeded {MAX_CONTENT_SIZE} bytes. "
-                                        f"Increase STREAM_MAX_CONTENT_SIZE if needed."
-                                    )
-
-                                reasoning_parts.append(reasoning_str)
-                                # Optionally call on_delta for reasoning too
-                                if on_delta:
-                                    on_delta(reasoning_str)
-                                if on_chunk:  # NEW (2025-10-24): Forward reasoning chunks too
-                                    _safe_call_chunk_callback(on_chunk, reasoning_str)
-
-                        # Extract regular content
-                        piece = getattr(delta, "content", None)
-                        if piece:
-                            if in_thinking:
-                                in_thinking = False
-                                logger.debug("=============thinking end=============")
-                            s = str(piece)
-
-                            # SECURITY FIX: Check buffer size before appending
-                            total_size = sum(len(p) for p in content_parts) + len(s)
-                            if len(content_parts) >= MAX_CHUNKS:
-                                logger.warning(f"Content buffer overflow: max {MAX_CHUNKS} chunks reached")
-                                raise RuntimeError(
-                                    f"Stream buffer overflow: content chunks exceeded limit of {MAX_CHUNKS}. "
-                                    f"Increase STREAM_MAX_CHUNKS if needed."
-                                )
-                            if total_size > MAX_CONTENT_SIZE:
-                                logger.warning(f"Content buffer overflow: max {MAX_CONTENT_SIZE} bytes reached")
-                                raise RuntimeError(
-                                    f"Stream buffer overflow: content exceeded {MAX_CONTENT_SIZE} bytes. "
-                                    f"Increase STREAM_MAX_CONTENT_SIZE if needed."
-                                )
-
-                            content_parts.append(s)
-                            if on_delta:
-                                on_delta(s)
-                            if on_chunk:  # NEW (2025-10-24): Forward chunk for WebSocket streaming
-                                _safe_call_chunk_callback(on_chunk, s)
+                reasoning, piece = _event_deltas(evt, extract_reasoning)
             except Exception as e:
                 # Continue on best-effort parsing
                 logger.debug(f"Failed to parse streaming chunk: {e}")
-                pass
+                continue
+            if reasoning:
+                acc.add_reasoning(reasoning)
+                forward(reasoning)
+            if piece:
+                acc.add_content(piece)
+                forward(piece)
     except TimeoutError as timeout_err:
         logger.error(f"Kimi streaming timeout: {timeout_err}")
         raise RuntimeError(f"Kimi streaming timeout: {timeout_err}") from timeout_err
     except Exception as e:
-        # Check if this is a RemoteProtocolError (connection closed prematurely)
-        if httpx and isinstance(e, (httpx.RemoteProtocolError, getattr(httpx, '_exceptions', {}).get('RemoteProtocolError'))):
-            logger.warning(
-                f"Kimi API closed connection prematurely during streaming. "
-                f"Returning partial response (elapsed: {int(time.time() - stream_start)}s). "
-                f"Error: {e}"
-            )
-            # Return partial data - we've accumulated content_parts and reasoning_parts
-            final_text = ""
-            if reasoning_parts:
-                reasoning_text = "".join(reasoning_parts)
-                final_text = f"[Reasoning]\n{reasoning_text}\n\n[Response]\n"
-            final_text += "".join(content_parts)
-            return (final_text, raw_items)
-        else:
+        if not _is_remote_protocol_error(e):
             logger.error(f"Streaming error: {e}")
             raise
-    
-    # Combine reasoning and content
-    # Format: [Reasoning]\n{reasoning}\n\n[Response]\n{content}
-    final_text = ""
-    if reasoning_parts:
-        reasoning_text = "".join(reasoning_parts)
-        final_text = f"[Reasoning]\n{reasoning_text}\n\n[Response]\n"
-    final_text += "".join(content_parts)
-    
-    return (final_text, raw_items)
+        _log_partial(e, stream_start)
+
+    return (acc.text(), acc.raw_items)
 
+
+def _check_stream_timeout(stream_start: float, stream_timeout: float) -> None:
+    elapsed = time.time() - stream_start
+    if elapsed > stream_timeout:
+        raise TimeoutError(
+            f"Kimi streaming exceeded timeout of {stream_timeout}s (elapsed: {int(elapsed)}s). "
+            "This prevents indefinite hangs. Increase KIMI_STREAM_TIMEOUT if needed."
+        )
+
+
+def _log_partial(e: Exception, stream_start: float) -> None:
+    # Connection closed prematurely: the caller returns the partial response
+    logger.warning(
+        f"Kimi API closed connection prematurely during streaming. "
+        f"Returning partial response (elapsed: {int(time.time() - stream_start)}s). "
+        f"Error: {e}"
+    )
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+async def _aiter_in_thread(open_stream: Callable[[], Iterable[Any]], max_buffered: int) -> AsyncIterator[Any]:
+    """
+    Consume a blocking iterator from a worker thread as an async iterator.
+
+    At most max_buffered events wait on the loop side; beyond that the worker
+    stops reading (so a slow consumer slows the provider read, instead of
+    the events piling up in memory).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    slots = threading.Semaphore(max_buffered)
+    stop = threading.Event()
+
+    def deliver(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            stop.set()  # Loop closed
+
+    def produce() -> None:
+        try:
+            stream = open_stream()
+            try:
+                for item in stream:
+                    while not slots.acquire(timeout=0.5):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    deliver(item)
+            finally:
+                close = getattr(stream, "close", None)
+                if callable(close):
+                    close()
+        except BaseException as e:
+            deliver(_Failure(e))
+        finally:
+            deliver(_DONE)
+
+    loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            slots.release()
+            yield item
+    finally:
+        stop.set()
+
+
+async def _open_event_stream(client: Any, create_kwargs: dict[str, Any]) -> AsyncIterator[Any]:
+    """Async iterator over chat.completions stream events for a sync or async client."""
+    create = client.chat.completions.create
+    if inspect.iscoroutinefunction(inspect.unwrap(create)):
+        stream = await create(stream=True, **create_kwargs)
+        try:
+            async for evt in stream:
+                yield evt
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+        return
+    max_buffered = int(os.getenv("STREAM_EVENT_BUFFER", "64"))
+    async for evt in _aiter_in_thread(lambda: create(stream=True, **create_kwargs), max_buffered):
+        yield evt
+
+
+async def astream_openai_chat_events(
+    *,
+    client: Any,
+    create_kwargs: dict[str, Any],
+    on_delta: Optional[Callable[[str], None]] = None,
+    on_chunk: Optional[Callable[[str], Any]] = None,
+    extract_reasoning: Optional[bool] = None,
+) -> Tuple[str, List[Any]]:
+    """
+    Stream OpenAI-compatible chat events on the event loop.
+
+    Deltas are forwarded to on_chunk through a StreamSink (on_chunk itself if
+    it is one, else a sink created around it for this stream), so the client
+    receives coalesced frames and a slow client slows the provider read.
+
+    Args:
+        client: OpenAI-compatible client (AsyncOpenAI or sync OpenAI)
+        create_kwargs: Kwargs for client.chat.completions.create()
+        on_delta: Optional sync callback for each delta (legacy)
+        on_chunk: Optional StreamSink or sync/async callback for progressive streaming
+        extract_reasoning: Whether to extract reasoning_content
+                          If None, reads from KIMI_EXTRACT_REASONING env var (default: true)
+
+    Returns:
+        Tuple of (content_text, raw_items) - as stream_openai_chat_events()
+    """
+    extract_reasoning = _resolve_extract_reasoning(extract_reasoning)
+    acc = _StreamAccumulator()
+    sink = on_chunk if on_chunk is None or isinstance(on_chunk, StreamSink) else StreamSink(on_chunk)
+    owns_sink = sink is not on_chunk
+
+    stream_timeout = int(os.getenv("KIMI_STREAM_TIMEOUT", "600"))
+    stream_start = time.time()
+
+    async def forward(text: str) -> None:
+        if on_delta:
+            on_delta(text)
+        if sink is not None:
+            await sink(text)
+
+    events = _open_event_stream(client, create_kwargs)
+    completed = False
+    try:
+        async for evt in events:
+            _check_stream_timeout(stream_start, stream_timeout)
+            acc.add_event(evt)
+            try:
+                reasoning, piece = _event_deltas(evt, extract_reasoning)
+            except Exception as e:
+                logger.debug(f"Failed to parse streaming chunk: {e}")
+                continue
+            if reasoning:
+                acc.add_reasoning(reasoning)
+                await forward(reasoning)
+            if piece:
+                acc.add_content(piece)
+                await forward(piece)
+        completed = True
+    except TimeoutError as timeout_err:
+        logger.error(f"Kimi streaming timeout: {timeout_err}")
+        raise RuntimeError(f"Kimi streaming timeout: {timeout_err}") from timeout_err
+    except Exception as e:
+        if not _is_remote_protocol_error(e):
+            logger.error(f"Streaming error: {e}")
+            raise
+        _log_partial(e, stream_start)
+        completed = True
+    finally:
+        await events.aclose()
+        if owns_sink:
+            if completed:
+                await sink.aclose()
+            else:
+                sink.abort()
+
+    return (acc.text(), acc.raw_items)
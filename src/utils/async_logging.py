@@ -1,103 +1,89 @@
 """
 Async-safe logging configuration for the EX-AI MCP Server.
 
-This module provides non-blocking logging using QueueHandler and QueueListener
-to prevent deadlocks in async contexts.
+This module provides non-blocking logging on top of the log pipeline
+(src/utils/log_pipeline.py) to prevent deadlocks in async contexts.
 
 CRITICAL: Python's standard logging module uses thread locks internally,
 which can cause deadlocks when used in async code. This module solves that
-by offloading all logging I/O to a separate thread via a queue.
+by offloading all logging I/O to a separate thread via a bounded ring buffer.
+Under a log burst the oldest records are dropped (and counted) instead of
+growing memory without limit.
 """
 
 import logging
-import logging.handlers
-import queue
 import sys
 from typing import Optional
 
-# Global listener instance
-_log_listener: Optional[logging.handlers.QueueListener] = None
+from src.utils.log_pipeline import LogPipeline, PipelineHandler, StreamSink
 
+# Global pipeline instance
+_log_pipeline: Optional[LogPipeline] = None
 
-def setup_async_safe_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+
+def setup_async_safe_logging(level: int = logging.INFO) -> LogPipeline:
     """
-    Configure async-safe logging using QueueHandler and QueueListener.
+    Configure async-safe logging through a LogPipeline.
     
     This prevents logging deadlocks in async code by:
-    1. Using a QueueHandler that never blocks (just puts messages in a queue)
-    2. Using a QueueListener in a separate thread to actually write logs
+    1. Using a PipelineHandler that never blocks (formats and appends to a ring buffer)
+    2. Using a writer thread to write batches of records to stdout
     3. Ensuring the event loop is never blocked by logging I/O
     
     Args:
         level: Logging level (default: INFO)
         
     Returns:
-        QueueListener instance (must be stopped on shutdown)
+        LogPipeline instance (must be closed on shutdown)
     """
-    global _log_listener
-    
-    # If already configured, return existing listener
-    if _log_listener is not None:
-        return _log_listener
+    global _log_pipeline
     
-    # Create a queue for log messages (no size limit)
-    log_queue: queue.Queue = queue.Queue(-1)
+    # If already configured, return existing pipeline
+    if _log_pipeline is not None:
+        return _log_pipeline
     
-    # Create the actual handlers that will write logs
-    # These run in a separate thread, so they won't block the event loop
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
+    # Bounded ring buffer plus writer thread; sized by LOG_PIPELINE_* env vars
+    _log_pipeline = LogPipeline(StreamSink(sys.stdout), name="AsyncLogWriter")
     
-    # Format for log messages
-    formatter = logging.Formatter(
+    # Records are formatted on the logging thread, so the writer only does I/O
+    handler = PipelineHandler(_log_pipeline, level=level)
+    handler.setFormatter(logging.Formatter(
         '%(asctime)s %(levelname)s %(name)s: %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
-    
-    # Create listener that processes messages from the queue
-    # This runs in a separate thread and handles all I/O
-    _log_listener = logging.handlers.QueueListener(
-        log_queue,
-        console_handler,
-        respect_handler_level=True
-    )
-    
-    # Start the listener thread
-    _log_listener.start()
-    
-    # Create queue handler for the root logger
-    # This handler just puts messages in the queue (non-blocking)
-    queue_handler = logging.handlers.QueueHandler(log_queue)
+    ))
     
     # Configure root logger
     root_logger = logging.getLogger()
     
     # Remove existing handlers to avoid duplicates
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    for existing in root_logger.handlers[:]:
+        root_logger.removeHandler(existing)
     
-    # Add the queue handler
-    root_logger.addHandler(queue_handler)
+    # Add the pipeline handler
+    root_logger.addHandler(handler)
     root_logger.setLevel(level)
     
     logging.info("[ASYNC_LOGGING] Async-safe logging configured successfully")
     
-    return _log_listener
+    return _log_pipeline
 
 
 def shutdown_async_logging():
     """
-    Shutdown the async logging listener.
+    Shutdown the async logging pipeline.
     
     Call this on application shutdown to ensure all log messages are flushed.
     """
-    global _log_listener
-    
-    if _log_listener is not None:
-        logging.info("[ASYNC_LOGGING] Shutting down async logging listener")
-        _log_listener.stop()
-        _log_listener = None
+    global _log_pipeline
+    
+    if _log_pipeline is not None:
+        stats = _log_pipeline.stats()
+        logging.info(
+            f"[ASYNC_LOGGING] Shutting down async logging pipeline "
+            f"(written={stats['written']}, dropped={stats['dropped']})"
+        )
+        _log_pipeline.close()
+        _log_pipeline = None
 
 
 def get_async_safe_logger(name: str) -> logging.Logger:
@@ -105,7 +91,7 @@ def get_async_safe_logger(name: str) -> logging.Logger:
     Get a logger that's safe to use in async contexts.
     
     This returns a standard Python logger, but because we've configured
-    the root logger with a QueueHandler, all logging calls are non-blocking.
+    the root logger with a PipelineHandler, all logging calls are non-blocking.
     
     Args:
         name: Logger name (usually __name__)
@@ -0,0 +1,512 @@
+"""
+Log Pipeline - the single logging backend for EX-AI MCP Server.
+
+Console logging (src/utils/async_logging.py), the AsyncLogHandler
+(src/utils/logging_utils.py) and the tool-call log (utils/logging_unified.py)
+all hand records to a LogPipeline:
+
+- Producers append to a bounded ring buffer without taking a lock (deque
+  append/popleft are atomic in CPython). When it is full the oldest record is
+  dropped and counted, so a log burst costs bounded memory, never latency.
+- Records are serialized by the producer (orjson when installed), so the
+  writer thread only concatenates bytes.
+- One writer thread drains the buffer in batches, on a timer or as soon as a
+  batch is ready, and writes each batch with a single call.
+- File sinks rotate by size and age, keeping a fixed number of backups.
+- Tool-call logs can use a compact binary format: zlib-compressed frames of
+  length-prefixed JSON records. read_tail() reads either format, and so does
+  the CLI:
+
+    python -m src.utils.log_pipeline tail .logs/toolcalls.bin -n 20
+
+Configuration:
+    LOG_PIPELINE_CAPACITY (default 10000): records buffered per pipeline
+    LOG_PIPELINE_BATCH_SIZE (default 256): records per write
+    LOG_PIPELINE_FLUSH_INTERVAL_MS (default 250): max delay before a write
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BINARY_MAGIC = b"XL"
+BINARY_VERSION = 1
+# magic, version, record count, compressed payload length
+_FRAME_HEADER = struct.Struct(">2sBII")
+_RECORD_LENGTH = struct.Struct(">I")
+
+OVERFLOW_STRATEGIES = ("drop_oldest", "drop_newest", "block")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a record to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ============================================================================
+# Ring buffer
+# ============================================================================
+
+class RingBuffer:
+    """
+    Bounded FIFO with drop accounting.
+
+    put() never takes a lock: deque operations are atomic in CPython. Counters
+    are updated without a lock too, so under heavy multi-producer contention
+    the dropped count may undercount slightly.
+    """
+
+    def __init__(self, capacity: int, overflow: str = "drop_oldest", block_timeout: float = 0.1):
+        if overflow not in OVERFLOW_STRATEGIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_STRATEGIES}, got {overflow!r}")
+        self.capacity = max(1, capacity)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        # drop_oldest relies on maxlen; the other strategies check before appending
+        self._items: deque = deque(maxlen=self.capacity if overflow == "drop_oldest" else None)
+        self.accepted = 0
+        self.dropped = 0
+        self.blocked = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> bool:
+        """Append item; returns False if it was dropped."""
+        if len(self._items) >= self.capacity:
+            if self.overflow == "drop_oldest":
+                self.dropped += 1  # deque(maxlen) evicts the oldest on append
+            elif self.overflow == "drop_newest":
+                self.dropped += 1
+                return False
+            else:
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._items) >= self.capacity:
+                    if time.monotonic() >= deadline:
+                        self.dropped += 1
+                        return False
+                    time.sleep(0.001)
+                self.blocked += 1
+        self._items.append(item)
+        self.accepted += 1
+        return True
+
+    def drain(self, max_items: int) -> List[Any]:
+        """Remove and return up to max_items items, oldest first."""
+        batch = []
+        popleft = self._items.popleft
+        try:
+            for _ in range(max_items):
+                batch.append(popleft())
+        except IndexError:
+            pass
+        return batch
+
+
+# ============================================================================
+# Sinks
+# ============================================================================
+
+def encode_binary_frame(records: List[bytes]) -> bytes:
+    """Encode records as one compressed frame."""
+    payload = b"".join(_RECORD_LENGTH.pack(len(r)) + r for r in records)
+    compressed = zlib.compress(payload, 6)
+    return _FRAME_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(records), len(compressed)) + compressed
+
+
+def iter_binary_records(data: bytes) -> Iterator[bytes]:
+    """Yield records from binary frames; a truncated trailing frame is ignored."""
+    offset = 0
+    while offset + _FRAME_HEADER.size <= len(data):
+        magic, version, count, length = _FRAME_HEADER.unpack_from(data, offset)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"Not a binary log frame at offset {offset}")
+        start = offset + _FRAME_HEADER.size
+        if start + length > len(data):
+            return
+        payload = zlib.decompress(data[start:start + length])
+        pos = 0
+        for _ in range(count):
+            (size,) = _RECORD_LENGTH.unpack_from(payload, pos)
+            pos += _RECORD_LENGTH.size
+            yield payload[pos:pos + size]
+            pos += size
+        offset = start + length
+
+
+class StreamSink:
+    """Writes each record as a line to a stream (console logging)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, batch: List[bytes]) -> None:
+        data = b"\n".join(batch) + b"\n"
+        buffer = getattr(self.stream, "buffer", None)
+        if buffer is not None:
+            self.stream.flush()  # Keep ordering with any text already written
+            buffer.write(data)
+            buffer.flush()
+        else:
+            self.stream.write(data.decode("utf-8", "replace"))
+            self.stream.flush()
+
+
+class RotatingFileSink:
+    """
+    Appends batches to a file, rotating by size and age.
+
+    fmt "jsonl" writes one record per line; "binary" writes one compressed
+    frame per batch. Rotation renames path -> path.1 -> ... -> path.N.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: str = "jsonl",
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age_secs: float = 0,
+        backup_count: int = 5,
+    ):
+        if fmt not in ("jsonl", "binary"):
+            raise ValueError(f"fmt must be 'jsonl' or 'binary', got {fmt!r}")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.max_age_secs = max_age_secs
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        """Open (creating) the file if needed."""
+        with self._lock:
+            self._open()
+
+    def _open(self) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._size = self._file.tell()
+            self._opened_at = time.time()
+
+    def _encode(self, batch: List[bytes]) -> bytes:
+        if self.fmt == "binary":
+            return encode_binary_frame(batch)
+        return b"\n".join(batch) + b"\n"
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes and self._size + incoming > self.max_bytes:
+            return True
+        return bool(self.max_age_secs) and time.time() - self._opened_at >= self.max_age_secs
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = self.path.with_name(f"{self.path.name}.{i}")
+                if src.exists():
+                    os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._open()
+
+    def __call__(self, batch: List[bytes]) -> None:
+        data = self._encode(batch)
+        with self._lock:
+            self._open()
+            if self._should_rotate(len(data)):
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+class LogPipeline:
+    """
+    Ring buffer plus one writer thread that hands batches to a sink.
+
+    Usage:
+        pipeline = LogPipeline(RotatingFileSink(".logs/events.jsonl"))
+        pipeline.submit(dumps({"event": "x"}))   # Never blocks (default overflow)
+        pipeline.flush()                         # Write everything buffered now
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[Any]], None],
+        capacity: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        overflow: str = "drop_oldest",
+        block_timeout: float = 0.1,
+        name: str = "LogPipeline",
+    ):
+        self.sink = sink
+        self.name = name
+        self.buffer = RingBuffer(
+            capacity if capacity is not None else _env_int("LOG_PIPELINE_CAPACITY", 10000),
+            overflow=overflow,
+            block_timeout=block_timeout,
+        )
+        self.batch_size = max(1, batch_size if batch_size is not None else _env_int("LOG_PIPELINE_BATCH_SIZE", 256))
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else _env_int("LOG_PIPELINE_FLUSH_INTERVAL_MS", 250) / 1000.0
+        )
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, record: Any) -> bool:
+        """Buffer one record for writing; returns False if it was dropped."""
+        if self._thread is None:
+            self._start()
+        accepted = self.buffer.put(record)
+        if len(self.buffer) >= self.batch_size:
+            self._wake.set()
+        return accepted
+
+    def submit_many(self, records: List[Any]) -> int:
+        """Buffer several records; returns how many were accepted."""
+        return sum(1 for r in records if self.submit(r))
+
+    def flush(self) -> None:
+        """Write everything buffered so far, on the calling thread."""
+        self._drain()
+
+    def close(self) -> None:
+        """Stop the writer thread after writing what is buffered."""
+        self._closed = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._drain()
+        close = getattr(self.sink, "close", None)
+        if close is not None:
+            close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.buffer),
+            "capacity": self.buffer.capacity,
+            "accepted": self.buffer.accepted,
+            "dropped": self.buffer.dropped,
+            "blocked": self.buffer.blocked,
+            "written": self.written,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+    def _start(self) -> None:
+        with self._thread_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        with self._write_lock:
+            while True:
+                batch = self.buffer.drain(self.batch_size)
+                if not batch:
+                    return
+                try:
+                    self.sink(batch)
+                    self.written += len(batch)
+                    self.batches += 1
+                except Exception as e:
+                    # Never log from inside the logging backend
+                    self.errors += 1
+                    try:
+                        sys.stderr.write(f"[LOG_PIPELINE] {self.name}: dropped batch of {len(batch)}: {e}\n")
+                    except Exception:
+                        pass
+
+
+# ============================================================================
+# Shared file pipelines
+# ============================================================================
+
+_file_pipelines: Dict[str, LogPipeline] = {}
+_file_pipelines_lock = threading.Lock()
+
+
+def get_file_pipeline(
+    path: str,
+    fmt: str = "jsonl",
+    max_bytes: int = 50 * 1024 * 1024,
+    max_age_secs: float = 0,
+    backup_count: int = 5,
+) -> LogPipeline:
+    """Get the process-wide pipeline writing to path (one writer per file)."""
+    key = str(Path(path).resolve())
+    pipeline = _file_pipelines.get(key)
+    if pipeline is None:
+        with _file_pipelines_lock:
+            pipeline = _file_pipelines.get(key)
+            if pipeline is None:
+                sink = RotatingFileSink(path, fmt=fmt, max_bytes=max_bytes,
+                                        max_age_secs=max_age_secs, backup_count=backup_count)
+                pipeline = LogPipeline(sink, name=f"LogPipeline:{Path(path).name}")
+                _file_pipelines[key] = pipeline
+    return pipeline
+
+
+def close_file_pipelines() -> None:
+    """Flush and close all file pipelines (shutdown)."""
+    with _file_pipelines_lock:
+        pipelines = list(_file_pipelines.values())
+        _file_pipelines.clear()
+    for pipeline in pipelines:
+        pipeline.close()
+
+
+atexit.register(close_file_pipelines)
+
+
+# ============================================================================
+# logging integration
+# ============================================================================
+
+class PipelineHandler(logging.Handler):
+    """
+    logging.Handler that formats records and submits them to a pipeline.
+
+    handle() is overridden to skip the handler lock: submitting is lock-free,
+    so concurrent loggers (including coroutines on the event loop) never wait
+    on each other or on I/O.
+    """
+
+    def __init__(self, pipeline: LogPipeline, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.pipeline = pipeline
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.pipeline.submit(self.format(record).encode("utf-8", "replace"))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.pipeline.flush()
+
+    def close(self) -> None:
+        self.pipeline.close()
+        super().close()
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+def is_binary_log(path) -> bool:
+    """Whether path holds binary frames (rather than JSONL)."""
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def _tail_records(path: Path, n: int) -> List[bytes]:
+    if is_binary_log(path):
+        return list(deque(iter_binary_records(path.read_bytes()), maxlen=n))
+    with open(path, "rb") as f:
+        return list(deque((line.rstrip(b"\r\n") for line in f if line.strip()), maxlen=n))
+
+
+def read_tail(path: str, n: int = 20) -> List[Any]:
+    """
+    Last n records of a log file (JSONL or binary), oldest first.
+
+    Continues into the most recent rotated file when the current one has
+    fewer than n records. Raises FileNotFoundError if path does not exist.
+    """
+    current = Path(path)
+    records = _tail_records(current, n)
+    backup = current.with_name(f"{current.name}.1")
+    if len(records) < n and backup.exists():
+        records = _tail_records(backup, n - len(records)) + records
+    return [loads(r) for r in records]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.utils.log_pipeline", description="Read pipeline log files")
+    sub = parser.add_subparsers(dest="command", required=True)
+    tail = sub.add_parser("tail", help="Print the last records of a JSONL or binary log as JSON lines")
+    tail.add_argument("path", nargs="?", default=os.getenv("EX_TOOLCALL_LOG_PATH", ".logs/toolcalls.jsonl"))
+    tail.add_argument("-n", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    try:
+        for record in read_tail(args.path, args.n):
+            print(json.dumps(record, ensure_ascii=False))
+    except FileNotFoundError:
+        print(f"not found: {args.path}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
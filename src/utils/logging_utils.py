@@ -15,9 +15,10 @@ from functools import wraps
 from typing import Callable, Any, Optional, Literal
 from collections import deque, OrderedDict
 import threading
-from queue import Queue, Full, Empty
 import os
 
+from src.utils.log_pipeline import LogPipeline
+
 
 class AsyncLogHandler(logging.Handler):
     """
@@ -27,7 +28,7 @@ class AsyncLogHandler(logging.Handler):
     for high-frequency operations in async WebSocket systems.
 
     Features:
-    - Queue-based log processing
+    - Ring buffer + batching writer thread (src/utils/log_pipeline.py)
     - Configurable queue size and overflow behavior
     - Backpressure mechanism with multiple strategies
     - Thread-safe operation
@@ -65,31 +66,28 @@ class AsyncLogHandler(logging.Handler):
             block_timeout: Timeout in seconds when using 'block' strategy (default: 0.1s)
         """
         super().__init__()
-        self.log_queue = Queue(maxsize=max_queue_size)
         self.target_handler = target_handler or logging.StreamHandler()
         self.overflow_strategy = overflow_strategy
         self.block_timeout = block_timeout
-        self.worker_thread = threading.Thread(target=self._process_logs, daemon=True, name="AsyncLogWorker")
-        self.worker_thread.start()
-        self._dropped_count = 0
         self._processed_count = 0
-        self._blocked_count = 0
-    
-    def _process_logs(self):
-        """Background thread that processes queued log records."""
-        while True:
+        # Ring buffer + batching writer thread (src/utils/log_pipeline.py)
+        self.pipeline = LogPipeline(
+            self._forward_batch,
+            capacity=max_queue_size,
+            overflow=overflow_strategy,
+            block_timeout=block_timeout,
+            name="AsyncLogWorker",
+        )
+
+    def _forward_batch(self, records: list):
+        """Writer thread: forward a batch of records to the target handler."""
+        for record in records:
             try:
-                log_record = self.log_queue.get(timeout=1)
-                if log_record:
-                    self.target_handler.emit(log_record)
-                    self._processed_count += 1
-                self.log_queue.task_done()
-            except Empty:
-                continue
-            except Exception as e:
-                # Avoid infinite loop if target handler fails
-                logger.info(f"AsyncLogHandler error: {e}")
-    
+                self.target_handler.handle(record)
+                self._processed_count += 1
+            except Exception:
+                self.target_handler.handleError(record)
+
     def emit(self, record: logging.LogRecord):
         """
         Queue a log record for async processing.
@@ -100,53 +98,45 @@ class AsyncLogHandler(logging.Handler):
         - block: Block briefly with timeout
         """
         try:
-            self.log_queue.put_nowait(record)
-        except Full:
-            # Apply overflow strategy
-            if self.overflow_strategy == 'drop_oldest':
-                # Remove oldest log to make room for new one
-                try:
-                    self.log_queue.get_nowait()
-                    self._dropped_count += 1
-                    self.log_queue.put_nowait(record)
-                except (Empty, Full):
-                    # Race condition - queue state changed
-                    self._dropped_count += 1
-            elif self.overflow_strategy == 'drop_newest':
-                # Drop the new log (preserve history)
-                self._dropped_count += 1
-            elif self.overflow_strategy == 'block':
-                # Block briefly with timeout
-                try:
-                    self.log_queue.put(record, timeout=self.block_timeout)
-                    self._blocked_count += 1
-                except Full:
-                    # Still full after timeout - drop it
-                    self._dropped_count += 1
-
-            # Only log drops occasionally to avoid spam
-            if self._dropped_count % 100 == 0:
-                logger.info(f"AsyncLogHandler: Dropped {self._dropped_count} logs (strategy={self.overflow_strategy})")
-    
+            # Resolve the message now (like QueueHandler): args may change before the writer runs
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                if not record.exc_text:
+                    record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.pipeline.submit(record)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Forward every queued record now."""
+        self.pipeline.flush()
+
+    def close(self):
+        self.pipeline.close()
+        super().close()
+
     def get_stats(self) -> dict:
         """Get handler statistics."""
-        queue_size = self.log_queue.qsize()
-        queue_max = self.log_queue.maxsize
+        stats = self.pipeline.stats()
+        queue_size = stats["queued"]
+        queue_max = stats["capacity"]
         return {
             "processed": self._processed_count,
-            "dropped": self._dropped_count,
-            "blocked": self._blocked_count,
+            "dropped": stats["dropped"],
+            "blocked": stats["blocked"],
             "queue_size": queue_size,
             "queue_max": queue_max,
             "overflow_strategy": self.overflow_strategy,
             "utilization_percent": (queue_size / queue_max * 100) if queue_max > 0 else 0,
-            "drop_rate": (self._dropped_count / max(self._processed_count, 1) * 100)
+            "drop_rate": (stats["dropped"] / max(self._processed_count, 1) * 100)
         }
 
     def reset_stats(self):
         """Reset statistics counters."""
-        self._dropped_count = 0
-        self._blocked_count = 0
+        self.pipeline.buffer.dropped = 0
+        self.pipeline.buffer.blocked = 0
         self._processed_count = 0
 
 
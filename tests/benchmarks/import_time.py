@@ -0,0 +1,140 @@
+"""
+Tool Registry Startup / Import-Time Benchmark.
+
+Runs `python -X importtime` in a fresh interpreter that builds the tool
+registry, once importing every tool eagerly and once from the tool manifest
+(lazy loading), and reports wall time, total import time and the slowest
+top-level imports.
+
+Target: lazy startup should stay well under eager startup. Use --max-ms to
+fail (exit 1) when lazy startup exceeds a budget, e.g. in CI:
+
+    python tests/benchmarks/import_time.py --max-ms 500
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_STARTUP_SNIPPET = (
+    "import time; _s = time.perf_counter(); "
+    "from tools.registry import ToolRegistry; r = ToolRegistry(); r.build_tools(); "
+    "print('BUILD_MS', (time.perf_counter() - _s) * 1000, len(r.list_tools()))"
+)
+
+
+def parse_importtime(stderr: str, top: int = 10) -> Dict:
+    """Parse `-X importtime` output into total and slowest top-level imports."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_col, cumulative_col, name = line.split("|", 2)
+            self_us = int(self_col.split(":", 1)[1])
+            cumulative_us = int(cumulative_col)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({"module": name.strip(), "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth})
+
+    # Top-level imports carry the smallest indentation; their cumulative times add up to the total
+    min_depth = min((r["depth"] for r in rows), default=0)
+    top_level = [r for r in rows if r["depth"] == min_depth]
+    slowest = sorted(top_level, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+    return {
+        "modules_imported": len(rows),
+        "total_import_ms": sum(r["cumulative_us"] for r in top_level) / 1000,
+        "slowest": [{"module": r["module"], "cumulative_ms": r["cumulative_us"] / 1000} for r in slowest],
+    }
+
+
+def measure_startup(lazy: bool, manifest_path: str, profile: str = "full") -> Dict:
+    """Build the registry in a fresh interpreter and measure its imports."""
+    env = dict(os.environ)
+    env.update({
+        "TOOL_PROFILE": profile,
+        "TOOL_LAZY_LOAD": "true" if lazy else "false",
+        "TOOL_MANIFEST_PATH": manifest_path,
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_SNIPPET],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    result = {"mode": "lazy" if lazy else "eager", **parse_importtime(proc.stderr)}
+    for line in proc.stdout.splitlines():
+        if line.startswith("BUILD_MS"):
+            _, build_ms, tool_count = line.split()
+            result["build_ms"] = float(build_ms)
+            result["tool_count"] = int(tool_count)
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+    return result
+
+
+def run_benchmark(profile: str = "full", max_lazy_ms: float = 0.0) -> Dict:
+    """Run eager vs lazy startup (a fresh manifest is built for the lazy run)."""
+    print("\n" + "=" * 60)
+    print("TOOL REGISTRY STARTUP BENCHMARK")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = os.path.join(tmp, "tool_manifest.json")
+        eager = measure_startup(lazy=False, manifest_path=manifest_path, profile=profile)
+        subprocess.run(
+            [sys.executable, "-m", "tools.manifest", "build", "--path", manifest_path],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            timeout=300,
+        )
+        lazy = measure_startup(lazy=True, manifest_path=manifest_path, profile=profile)
+
+    results: List[Dict] = [eager, lazy]
+    print(f"{'Mode':<8} {'Build (ms)':<12} {'Imports (ms)':<14} {'Modules':<10} {'Tools'}")
+    print("-" * 60)
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r.get('build_ms', float('nan')):<12.1f} {r['total_import_ms']:<14.1f} "
+            f"{r['modules_imported']:<10} {r.get('tool_count', 'N/A')}"
+        )
+    print("\nSlowest top-level imports (eager):")
+    for item in eager["slowest"][:5]:
+        print(f"  {item['cumulative_ms']:>9.1f} ms  {item['module']}")
+
+    lazy_ms = lazy.get("build_ms", float("inf"))
+    passed = max_lazy_ms <= 0 or lazy_ms <= max_lazy_ms
+    speedup = eager.get("build_ms", 0.0) / lazy_ms if lazy_ms and lazy_ms != float("inf") else None
+    if speedup is not None:
+        print(f"\nLazy startup speedup: {speedup:.1f}x")
+    if max_lazy_ms > 0:
+        print(f"Budget: {max_lazy_ms:.0f} ms -> {'✅ PASS' if passed else '⚠️  FAIL'}")
+    print("=" * 60 + "\n")
+
+    return {"profile": profile, "eager": eager, "lazy": lazy, "speedup": speedup, "passed": passed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", default="full", help="TOOL_PROFILE to build (default: full)")
+    parser.add_argument("--max-ms", type=float, default=0.0, help="Fail if lazy registry build exceeds this")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    result = run_benchmark(profile=args.profile, max_lazy_ms=args.max_ms)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results saved to: {args.output}")
+    sys.exit(0 if result["passed"] else 1)
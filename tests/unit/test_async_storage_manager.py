@@ -0,0 +1,267 @@
+"""
+Unit tests for the async-native Supabase storage manager
+
+Runs against a local stub of PostgREST + Storage (aiohttp), so no network
+or Supabase project is needed.
+
+Tests:
+- Conversation/message/file/provider-file round-trips
+- Message upserts are idempotent (duplicates skipped)
+- Transient 5xx responses are retried; 4xx are not
+- The retry budget stops retry storms
+- Per-endpoint concurrency limits are enforced
+- Retry backoff does not hold an endpoint slot
+- AsyncSupabaseManager runs on the async layer
+"""
+
+import asyncio
+import itertools
+import json
+from collections import defaultdict
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.storage import async_storage_manager
+from src.storage.async_storage_manager import AsyncSupabaseStorageManager, RetryBudget
+from src.storage.async_supabase_manager import AsyncSupabaseManager
+
+
+class SupabaseStub:
+    """Just enough PostgREST and Storage semantics for the manager."""
+
+    def __init__(self):
+        self.tables = defaultdict(list)
+        self.objects = {}
+        self.failures = defaultdict(list)  # path -> statuses to return first
+        self.requests = defaultdict(int)
+        self.in_flight = defaultdict(int)
+        self.max_in_flight = defaultdict(int)
+        self.delay = 0.0
+        self._ids = itertools.count(1)
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route("*", "/rest/v1/{table}", self.rest)
+        app.router.add_route("*", "/storage/v1/object/{bucket}", self.storage)
+        app.router.add_route("*", "/storage/v1/object/{bucket}/{path:.*}", self.storage)
+        return app
+
+    async def _guard(self, request, key):
+        self.requests[key] += 1
+        if self.failures[key]:
+            return web.Response(status=self.failures[key].pop(0), text="stub failure")
+        if request.headers.get("apikey") != "service-key":
+            return web.Response(status=401, text="bad key")
+        return None
+
+    def _matches(self, row, query):
+        for column, value in query.items():
+            if column in ("select", "order", "limit", "on_conflict"):
+                continue
+            if str(row.get(column)) != value.removeprefix("eq."):
+                return False
+        return True
+
+    async def rest(self, request):
+        table = request.match_info["table"]
+        key = f"rest:{table}"
+        failure = await self._guard(request, key)
+        if failure:
+            return failure
+        self.in_flight[key] += 1
+        self.max_in_flight[key] = max(self.max_in_flight[key], self.in_flight[key])
+        try:
+            await asyncio.sleep(self.delay)
+            return await self._rest(request, table)
+        finally:
+            self.in_flight[key] -= 1
+
+    async def _rest(self, request, table):
+        rows, query = self.tables[table], request.query
+        if request.method == "GET":
+            result = [r for r in rows if self._matches(r, query)]
+            if query.get("order", "").startswith("created_at"):
+                result.sort(key=lambda r: r.get("created_at", ""))
+            if "limit" in query:
+                result = result[:int(query["limit"])]
+            return web.json_response(result)
+        if request.method == "POST":
+            body = await request.json()
+            conflict = query.get("on_conflict", "").split(",") if query.get("on_conflict") else []
+            inserted = []
+            for row in body if isinstance(body, list) else [body]:
+                if conflict and any(all(r.get(c) == row.get(c) for c in conflict) for r in rows):
+                    continue
+                if table == "provider_file_uploads" and any(
+                    r["provider_file_id"] == row["provider_file_id"] for r in rows
+                ):
+                    return web.Response(status=409, text="duplicate key value")
+                row = dict(row, id=f"{table}-{next(self._ids)}")
+                rows.append(row)
+                inserted.append(row)
+            return web.json_response(inserted, status=201)
+        if request.method == "PATCH":
+            body = await request.json()
+            updated = [r for r in rows if self._matches(r, query)]
+            for r in updated:
+                r.update(body)
+            return web.json_response(updated)
+        if request.method == "DELETE":
+            deleted = [r for r in rows if self._matches(r, query)]
+            self.tables[table] = [r for r in rows if r not in deleted]
+            return web.json_response(deleted)
+        return web.Response(status=405)
+
+    async def storage(self, request):
+        bucket = request.match_info["bucket"]
+        failure = await self._guard(request, f"storage:{bucket}")
+        if failure:
+            return failure
+        path = request.match_info.get("path", "")
+        if request.method == "POST":
+            if (bucket, path) in self.objects:
+                return web.Response(status=409, text="Duplicate")
+            self.objects[(bucket, path)] = await request.read()
+            return web.json_response({"Key": f"{bucket}/{path}"})
+        if request.method == "GET":
+            if (bucket, path) not in self.objects:
+                return web.Response(status=404)
+            return web.Response(body=self.objects[(bucket, path)])
+        if request.method == "DELETE":
+            for prefix in (await request.json())["prefixes"]:
+                self.objects.pop((bucket, prefix), None)
+            return web.json_response([])
+        return web.Response(status=405)
+
+
+@pytest_asyncio.fixture
+async def stub():
+    stub = SupabaseStub()
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    stub.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    yield stub
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def manager(stub, monkeypatch):
+    monkeypatch.setattr(async_storage_manager, "record_supabase_event", None)
+    manager = AsyncSupabaseStorageManager(url=stub.url, service_key="service-key")
+    manager.base_delay = 0.001
+    yield manager
+    await manager.aclose()
+
+
+class TestAsyncStorageManager:
+    """Test data access against the stub server."""
+
+    @pytest.mark.asyncio
+    async def test_conversation_and_messages(self, manager):
+        conv_id = await manager.save_conversation(continuation_id="cont-1", metadata={"tool_name": "chat"})
+        assert (await manager.get_conversation_by_continuation_id("cont-1"))["id"] == conv_id
+
+        rows = [{"conversation_id": conv_id, "role": "user", "content": f"m{n}",
+                 "created_at": f"2025-01-01T00:00:0{n}.000000"} for n in range(3)]
+        assert len(await manager.save_messages_batch(rows)) == 3
+        assert await manager.save_messages_batch(rows) == []  # Idempotent
+        assert await manager.save_message(conv_id, "assistant", "hi", timestamp="2025-01-01T00:00:09") is not None
+
+        messages = await manager.get_conversation_messages(conv_id, limit=2)
+        assert [m["content"] for m in messages] == ["m0", "m1"]
+
+    @pytest.mark.asyncio
+    async def test_file_round_trip(self, manager, stub):
+        file_id = await manager.upload_file(b"data", "a.txt", "dir/a b.txt", "text/plain", "user_upload")
+        assert await manager.upload_file(b"data", "a.txt", "dir/a b.txt", "text/plain", "user_upload") == file_id
+        assert await manager.download_file(file_id) == b"data"
+        assert (await manager.link_files_to_conversation_batch("c", [file_id]))["success"] == 1
+
+        assert await manager.delete_file(file_id)
+        assert stub.objects == {}
+        assert await manager.download_file(file_id) is None
+
+    @pytest.mark.asyncio
+    async def test_provider_files(self, manager):
+        record_id = await manager.save_provider_file_upload("kimi", "f-1", "file-extract")
+        assert await manager.save_provider_file_upload("kimi", "f-1", "file-extract") == record_id
+        assert await manager.update_provider_file_last_used("kimi", "f-1")
+        assert [r["id"] for r in await manager.get_provider_files_by_purpose("kimi", "file-extract")] == [record_id]
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_retried(self, manager, stub):
+        stub.failures["rest:conversations"] = [503, 502]
+        assert await manager.save_conversation(continuation_id="c") is not None
+        assert manager.get_stats()["rest:conversations"]["retries"] == 2
+
+        stub.failures["rest:conversations"] = [400]
+        assert await manager.get_conversation_by_continuation_id("c") is None
+        assert stub.requests["rest:conversations"] == 4  # 400 is not retried
+
+    @pytest.mark.asyncio
+    async def test_non_idempotent_insert_not_retried_on_5xx(self, manager, stub):
+        stub.failures["rest:provider_file_uploads"] = [500]
+        assert await manager.save_provider_file_upload("kimi", "f-2", "p") is None
+        assert stub.requests["rest:provider_file_uploads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_limits_storm(self, manager, stub):
+        manager._endpoint_state("rest:messages")
+        manager._budgets["rest:messages"] = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2)
+        stub.failures["rest:messages"] = [503] * 100
+
+        for _ in range(3):
+            assert await manager.get_conversation_messages("c") == []
+
+        stats = manager.get_stats()["rest:messages"]
+        assert stats["retries"] == 2
+        assert stats["budget_exhausted"] == 3
+        assert stub.requests["rest:messages"] == 5
+
+    @pytest.mark.asyncio
+    async def test_endpoint_concurrency_limit(self, manager, stub):
+        manager.endpoint_limits["rest:messages"] = 2
+        stub.delay = 0.02
+
+        await asyncio.gather(*(manager.get_conversation_messages(f"c{n}") for n in range(8)),
+                             *(manager.get_conversation_by_continuation_id(f"c{n}") for n in range(8)))
+
+        assert stub.max_in_flight["rest:messages"] == 2
+        assert stub.max_in_flight["rest:conversations"] > 2
+
+    @pytest.mark.asyncio
+    async def test_backoff_releases_endpoint_slot(self, manager, stub):
+        manager.endpoint_limits["rest:conversations"] = 1
+        manager.base_delay = 1.0
+        stub.failures["rest:conversations"] = [503]
+
+        retrying = asyncio.create_task(manager.save_conversation(continuation_id="slow"))
+        await asyncio.sleep(0.1)  # First attempt failed, now backing off
+
+        await asyncio.wait_for(manager.get_conversation_by_continuation_id("other"), timeout=0.3)
+        assert not retrying.done()
+        assert await retrying is not None
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_credentials(self, monkeypatch):
+        monkeypatch.delenv("SUPABASE_URL", raising=False)
+        manager = AsyncSupabaseStorageManager(service_key="k")
+        assert not manager.enabled
+        assert await manager.get_conversation_messages("c") == []
+
+
+@pytest.mark.asyncio
+async def test_async_supabase_manager_uses_async_layer(manager, stub):
+    facade = AsyncSupabaseManager(storage=manager)
+
+    saved = await facade.save_conversation_async("cont-9", "user-1", title="t")
+    assert (await facade.get_conversation_async("cont-9"))["id"] == saved["id"]
+    await facade.save_message_async(saved["id"], "user", "hello")
+    await facade.shutdown()
+
+    assert [m["content"] for m in stub.tables["messages"]] == ["hello"]
+    assert json.dumps(stub.tables["conversations"][0]["metadata"]) == '{"user_id": "user-1"}'
@@ -0,0 +1,201 @@
+"""
+Unit tests for BaseCacheManager batch and async APIs
+
+Tests:
+- mget/mset served from L1 without Redis
+- amget issues a single MGET for L1 misses and promotes hits to L1
+- amset writes through one non-transactional pipeline
+- Async pools are kept per event loop and dropped once the loop closes
+- SemanticCacheManager aget/aset round-trip
+- Batched provider status lookups in RoutingCache
+"""
+
+import asyncio
+import weakref
+
+import pytest
+
+from utils.caching.base_cache_manager import BaseCacheManager
+from utils.infrastructure.semantic_cache_manager import SemanticCacheManager
+
+
+class FakePipeline:
+    def __init__(self, store, calls):
+        self._store = store
+        self._calls = calls
+        self._pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self._pending.append((key, value))
+
+    async def execute(self):
+        self._calls.append(("pipeline", len(self._pending)))
+        self._store.update(self._pending)
+        self._pending = []
+
+
+class FakeAsyncRedis:
+    """Minimal redis.asyncio stand-in recording round-trips."""
+
+    def __init__(self):
+        self.store = {}
+        self.calls = []
+
+    async def mget(self, keys):
+        self.calls.append(("mget", len(keys)))
+        return [self.store.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self.store, self.calls)
+
+
+def _attach_fake_redis(manager):
+    fake = FakeAsyncRedis()
+    manager._enable_redis = True
+    manager._async_redis_client = fake
+    manager._async_redis_loop = weakref.ref(asyncio.get_running_loop())
+    return fake
+
+
+class TestBatchApi:
+    """Test synchronous batch operations."""
+
+    def test_mset_mget_l1_only(self):
+        manager = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        manager.mset({"a": 1, "b": {"x": 2}})
+
+        assert manager.mget(["a", "b", "c"]) == {"a": 1, "b": {"x": 2}}
+        stats = manager.get_stats()
+        assert stats["l1_hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["writes"] == 2
+
+    def test_mget_dedups_keys_in_order(self):
+        manager = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        manager.mset({"a": 1})
+
+        found, missing = manager._split_l1(["b", "a", "c", "b", "a"])
+        assert found == {"a": 1}
+        assert missing == ["b", "c"]
+
+
+class TestAsyncPools:
+    """Test the per-event-loop redis.asyncio pool registry."""
+
+    def test_pools_are_per_loop_and_pruned_when_closed(self):
+        from utils.caching import base_cache_manager
+
+        url = "redis://localhost:6379/15"
+        first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            pool = base_cache_manager._get_async_pool(url, first)
+            assert base_cache_manager._get_async_pool(url, first) is pool
+            assert base_cache_manager._get_async_pool(url, second) is not pool
+
+            first.close()
+            base_cache_manager._get_async_pool(url, second)
+            assert first not in base_cache_manager._async_pools
+            assert second in base_cache_manager._async_pools
+        finally:
+            first.close()
+            second.close()
+
+
+class TestAsyncApi:
+    """Test async operations against a fake redis.asyncio client."""
+
+    @pytest.mark.asyncio
+    async def test_amget_single_round_trip(self):
+        writer = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        manager = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        fake = _attach_fake_redis(manager)
+        fake.store["test:k1"] = writer._serialize_value({"v": 1})
+        fake.store["test:k2"] = writer._serialize_value([1, 2])
+        manager._l1_cache["k0"] = "local"
+
+        found = await manager.amget(["k0", "k1", "k2", "k3"])
+
+        assert found == {"k0": "local", "k1": {"v": 1}, "k2": [1, 2]}
+        assert fake.calls == [("mget", 3)]
+        stats = manager.get_stats()
+        assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 2, 1)
+
+        # Promoted to L1: no further round-trips
+        assert await manager.aget("k1") == {"v": 1}
+        assert fake.calls == [("mget", 3)]
+
+    @pytest.mark.asyncio
+    async def test_amset_pipelines_writes(self):
+        manager = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        fake = _attach_fake_redis(manager)
+
+        await manager.amset({"a": 1, "b": 2, "c": 3}, ttl=60)
+
+        assert fake.calls == [("pipeline", 3)]
+        assert set(fake.store) == {"test:a", "test:b", "test:c"}
+        assert manager._deserialize_value(fake.store["test:b"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_without_redis(self):
+        manager = BaseCacheManager(enable_redis=False, cache_prefix="test")
+        await manager.aset("k", {"v": 1})
+        assert await manager.aget("k") == {"v": 1}
+        assert await manager.aget("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_aget_aset(self):
+        cache = SemanticCacheManager(enable_redis=False)
+        params = {"prompt": "hello", "model": "glm-4.5-flash", "temperature": 0.3}
+
+        assert await cache.aget(**params) is None
+        await cache.aset(**params, response=[{"type": "text", "text": "hi"}])
+        assert await cache.aget(**params) == [{"type": "text", "text": "hi"}]
+        assert cache.get(**params) == [{"type": "text", "text": "hi"}]
+
+
+class TestRoutingCacheBatch:
+    """Test batched provider status lookups."""
+
+    def test_provider_statuses_batch(self):
+        from src.router.routing_cache import RoutingCache
+
+        cache = RoutingCache()
+        cache._provider_cache._enable_redis = False
+        cache.set_provider_statuses({"GLM": {"available": True}, "KIMI": {"available": False}})
+
+        statuses = asyncio.run(cache.aget_provider_statuses(["GLM", "KIMI", "OTHER"]))
+        assert statuses == {"GLM": {"available": True}, "KIMI": {"available": False}}
+        assert cache._stats["provider_hits"] == 2
+        assert cache._stats["provider_misses"] == 1
+
+    def test_hybrid_router_serves_providers_from_cache(self, monkeypatch):
+        from src.providers.base import ProviderType
+        from src.router import hybrid_router
+        from src.router.routing_cache import RoutingCache
+
+        scans = []
+
+        class FakeRegistry:
+            def get_available_models(self, respect_restrictions=True):
+                scans.append(respect_restrictions)
+                return {"glm-4.5-flash": ProviderType.GLM, "kimi-k2": ProviderType.KIMI}
+
+        monkeypatch.setattr(hybrid_router, "get_registry_instance", lambda: FakeRegistry())
+        router = hybrid_router.HybridRouter.__new__(hybrid_router.HybridRouter)
+        router.routing_cache = RoutingCache()
+        router.routing_cache._provider_cache._enable_redis = False
+
+        first = asyncio.run(router._get_available_providers())
+        second = asyncio.run(router._get_available_providers())
+
+        assert scans == [True]
+        assert sorted(first) == sorted(second) == ["GLM", "KIMI"]
+        assert second["GLM"]["models"] == ["glm-4.5-flash"]
+        assert router.routing_cache._stats["provider_hits"] == len(ProviderType)
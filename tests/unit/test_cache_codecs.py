@@ -0,0 +1,128 @@
+"""
+Unit tests for CacheCodec and BaseCacheManager L2 serialization
+
+Tests:
+- Round-trip through every available serializer/compressor
+- Compression threshold
+- Legacy JSON entries still decode
+- Pickle frames only decode with a codec configured for pickle
+- Dataclass/enum values via the default hook
+- Per-codec stats
+"""
+
+import enum
+import json
+from dataclasses import dataclass
+
+import pytest
+
+from utils.caching.base_cache_manager import BaseCacheManager
+from utils.caching.codecs import FRAME_MAGIC, CacheCodec, CodecError
+
+
+VALUE = {"content": "x" * 10_000, "usage": {"tokens": 42}, "items": [1, 2.5, None, True, "ü"]}
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclass
+class Inner:
+    color: Color
+    count: int
+
+
+@dataclass
+class Outer:
+    name: str
+    inner: Inner
+
+
+UNPICKLED = []
+
+
+def _mark_unpickled():
+    UNPICKLED.append("ran")
+
+
+class Exploit:
+    """Runs _mark_unpickled when unpickled."""
+
+    def __reduce__(self):
+        return (_mark_unpickled, ())
+
+
+class TestCacheCodec:
+    """Test the framing codec."""
+
+    @pytest.mark.parametrize("serializer", ["json", "msgpack"])
+    @pytest.mark.parametrize("compression", ["none", "zlib", "zstd", "lz4"])
+    def test_round_trip(self, serializer, compression):
+        codec = CacheCodec(serializer=serializer, compression=compression, compression_threshold=1024)
+        frame = codec.encode(VALUE)
+        assert frame[0] == FRAME_MAGIC
+        assert codec.decode(frame) == VALUE
+
+    def test_small_values_are_not_compressed(self):
+        codec = CacheCodec(serializer="json", compression="zlib", compression_threshold=1024)
+        frame = codec.encode({"a": 1})
+        assert frame[3] == 0
+        assert codec.get_stats()["codecs"]["json+none"]["encode_count"] == 1
+
+    def test_large_values_are_compressed(self):
+        codec = CacheCodec(serializer="json", compression="zlib", compression_threshold=1024)
+        frame = codec.encode(VALUE)
+        assert len(frame) < len(json.dumps(VALUE))
+        stats = codec.get_stats()["codecs"]["json+zlib"]
+        assert stats["compression_ratio"] < 1.0
+
+    def test_legacy_json_decodes(self):
+        codec = CacheCodec()
+        assert codec.decode(json.dumps(VALUE)) == VALUE
+        assert codec.decode(json.dumps(VALUE).encode()) == VALUE
+        assert "legacy-json" in codec.get_stats()["codecs"]
+
+    def test_unknown_version_is_rejected(self):
+        codec = CacheCodec(serializer="json", compression="none")
+        frame = bytearray(codec.encode(VALUE))
+        frame[1] = 99
+        with pytest.raises(CodecError):
+            codec.decode(bytes(frame))
+
+    @pytest.mark.parametrize("serializer", ["json", "msgpack"])
+    def test_pickle_frame_rejected_unless_configured(self, serializer):
+        UNPICKLED.clear()
+        frame = CacheCodec(serializer="pickle", compression="none").encode(Exploit())
+        with pytest.raises(CodecError):
+            CacheCodec(serializer=serializer, compression="none").decode(frame)
+        assert UNPICKLED == []
+
+        CacheCodec(serializer="pickle", compression="none").decode(frame)
+        assert UNPICKLED == ["ran"]
+
+
+class TestBaseCacheManagerSerialization:
+    """Test BaseCacheManager serialization through the codec."""
+
+    def _manager(self):
+        return BaseCacheManager(enable_redis=False, cache_prefix="test")
+
+    def test_dataclass_round_trip(self):
+        manager = self._manager()
+        data = manager._serialize_value(Outer(name="n", inner=Inner(color=Color.RED, count=3)))
+        assert manager._deserialize_value(data) == {"name": "n", "inner": {"color": "red", "count": 3}}
+
+    def test_plain_values_round_trip(self):
+        manager = self._manager()
+        assert manager._deserialize_value(manager._serialize_value(VALUE)) == VALUE
+
+    def test_legacy_entry_and_garbage(self):
+        manager = self._manager()
+        assert manager._deserialize_value(json.dumps({"a": 1})) == {"a": 1}
+        assert manager._deserialize_value(b"\xec\x01\x07\x00junk") is None
+
+    def test_stats_include_codec(self):
+        manager = self._manager()
+        manager._serialize_value(VALUE)
+        assert "codec" in manager.get_stats()
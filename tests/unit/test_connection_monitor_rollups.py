@@ -0,0 +1,128 @@
+"""
+Unit tests for ConnectionMonitor time-series rollups
+
+Tests:
+- Batches are folded into per-minute and per-hour rollup buckets
+- get_time_series_data reads rollups (no raw event scan)
+- Hour-sized intervals use the downsampled hourly rollups
+"""
+
+import time
+from collections import defaultdict
+
+import pytest
+
+from utils.monitoring.connection_monitor import ConnectionMonitor, get_monitor
+
+
+class FakePipeline:
+    """Records calls and replays them on execute()."""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self._calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+
+
+class FakeRedis:
+    """Just enough of redis-py for the monitor's rollup path."""
+
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+        self.zsets = defaultdict(dict)
+        self.raw_reads = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hincrby(self, key, field, amount):
+        self.hashes[key][field] = int(self.hashes[key].get(field, 0)) + amount
+
+    def hincrbyfloat(self, key, field, amount):
+        self.hashes[key][field] = float(self.hashes[key].get(field, 0)) + amount
+
+    def hgetall(self, key):
+        return {k.encode(): str(v).encode() for k, v in self.hashes.get(key, {}).items()}
+
+    def zadd(self, key, mapping):
+        self.zsets[key].update(mapping)
+
+    def zrangebyscore(self, key, low, high, withscores=False):
+        if key.endswith(":events"):
+            self.raw_reads += 1
+        low = float("-inf") if low == "-inf" else float(low)
+        high = float("inf") if high == "+inf" else float(high)
+        return [m.encode() for m, s in sorted(self.zsets.get(key, {}).items(), key=lambda i: i[1]) if low <= s <= high]
+
+    def zremrangebyscore(self, key, low, high):
+        high = float(high)
+        self.zsets[key] = {m: s for m, s in self.zsets[key].items() if s > high}
+
+    def expire(self, *args):
+        pass
+
+    def expireat(self, *args):
+        pass
+
+    def hset(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monitor = get_monitor()
+    fake = FakeRedis()
+    monkeypatch.setattr(monitor, "_redis_enabled", True)
+    monkeypatch.setattr(monitor, "_redis_storage", fake)
+    monkeypatch.setitem(monitor._redis_circuit_breaker, "state", "closed")
+    return monitor, fake
+
+
+def _event(timestamp, response_time_ms=None, error=None, size=100):
+    return ("kimi", {"timestamp": timestamp, "data_size_bytes": size,
+                     "response_time_ms": response_time_ms, "error": error})
+
+
+class TestRollups:
+    """Test rollup aggregation and queries."""
+
+    def test_aggregate_buckets(self):
+        batch = [_event(3600 * 10 + 5, 100.0), _event(3600 * 10 + 65, None, "boom"), _event(3600 * 10 + 70, 0.0)]
+        rollups = ConnectionMonitor._aggregate_rollups(batch)
+
+        hour = rollups[("kimi", "hour", 36000)]
+        assert (hour["count"], hour["errors"], hour["bytes"], hour["rt_count"]) == (3, 1, 300, 2)
+        assert hour["rt_sum"] == 100.0
+        assert hour["l:z"] == 1
+        assert rollups[("kimi", "minute", 36000)]["count"] == 1
+        assert rollups[("kimi", "minute", 36060)]["count"] == 2
+
+    def test_time_series_reads_rollups(self, monitor):
+        monitor, fake = monitor
+        base = int(time.time() // 3600) * 3600 - 3600
+        batch = [_event(base + i * 30, response_time_ms=float(10 * (i + 1))) for i in range(20)]
+        batch.append(_event(base + 10, error="timeout"))
+        monitor._flush_to_redis(batch)
+
+        series = monitor.get_time_series_data("kimi", interval_minutes=5, hours=3)
+
+        assert fake.raw_reads == 0
+        assert list(series) == [str(base), str(base + 300)]
+        first = series[str(base)]
+        assert (first["count"], first["errors"], first["total_bytes"]) == (11, 1, 1100)
+        assert first["avg_response_time"] == pytest.approx(55.0)
+        assert first["p99_response_time"] == pytest.approx(90.0, rel=0.0101)
+
+    def test_hour_intervals_use_hour_rollups(self, monitor):
+        monitor, fake = monitor
+        base = int(time.time() // 3600) * 3600 - 7200
+        monitor._flush_to_redis([_event(base + 10, 5.0), _event(base + 3700, 7.0)])
+
+        series = monitor.get_time_series_data("kimi", interval_minutes=60, hours=4)
+
+        assert {k: v["count"] for k, v in series.items()} == {str(base): 1, str(base + 3600): 1}
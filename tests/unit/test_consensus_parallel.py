@@ -0,0 +1,132 @@
+"""
+Unit tests for the consensus workflow's parallel fan-out mode (tools/workflows/consensus.py)
+
+Tests:
+- All models consulted concurrently: wall time ~ slowest model, not the sum
+- Stragglers past the per-model deadline are reported, others returned
+- The daemon's per-provider semaphore still caps concurrency
+- Sequential mode is unchanged when parallel is not requested
+"""
+
+import json
+import threading
+import time
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+
+from src.providers.base import ProviderType
+from tools.workflows.consensus import ConsensusTool
+
+_ports = count(19000)
+
+
+class _FakeProvider:
+    def __init__(self, provider_type, delays):
+        self.provider_type = provider_type
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_provider_type(self):
+        return self.provider_type
+
+    def generate_content(self, prompt, model_name, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delays[model_name])
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(content=f"{model_name} says yes to: {prompt}")
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    # Fresh port so each test gets its own provider semaphores
+    monkeypatch.setenv("EXAI_WS_PORT", str(next(_ports)))
+    monkeypatch.delenv("CONSENSUS_PARALLEL", raising=False)
+    return ConsensusTool()
+
+
+def _use_provider(tool, monkeypatch, provider):
+    monkeypatch.setattr(tool, "get_model_provider", lambda model_name: provider)
+
+
+def _step_one(models, **extra):
+    return {
+        "step": "Should we adopt X?",
+        "step_number": 1,
+        "total_steps": len(models),
+        "next_step_required": True,
+        "findings": "My own analysis",
+        "models": [{"model": m, "stance": "neutral"} for m in models],
+        **extra,
+    }
+
+
+async def _run(tool, arguments):
+    result = await tool.execute_workflow(arguments)
+    return json.loads(result[0].text)
+
+
+@pytest.mark.asyncio
+async def test_parallel_wall_time_is_slowest_model(tool, monkeypatch):
+    provider = _FakeProvider(ProviderType.OPENROUTER, {"a": 0.3, "b": 0.3, "c": 0.3})
+    _use_provider(tool, monkeypatch, provider)
+
+    start = time.monotonic()
+    data = await _run(tool, _step_one(["a", "b", "c"], parallel=True))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.8  # Sequential would be ~0.9s
+    assert provider.max_active == 3
+    assert data["status"] == "consensus_workflow_complete"
+    assert data["next_step_required"] is False
+    assert data["complete_consensus"]["total_responses"] == 3
+    assert all(r["verdict"].endswith("Should we adopt X?") for r in data["accumulated_responses"])
+
+
+@pytest.mark.asyncio
+async def test_parallel_returns_partial_results_on_timeout(tool, monkeypatch):
+    monkeypatch.setenv("CONSENSUS_MODEL_TIMEOUT_SECS", "0.3")
+    provider = _FakeProvider(ProviderType.OPENROUTER, {"fast": 0.05, "slow": 2.0})
+    _use_provider(tool, monkeypatch, provider)
+
+    start = time.monotonic()
+    data = await _run(tool, _step_one(["slow", "fast"], parallel=True))
+
+    assert time.monotonic() - start < 1.0
+    by_model = {r["model"]: r for r in data["accumulated_responses"]}
+    assert by_model["fast"]["status"] == "success"
+    assert by_model["slow"]["status"] == "timeout"
+    # Merged in completion order
+    assert [r["model"] for r in data["accumulated_responses"]] == ["fast", "slow"]
+    assert data["complete_consensus"]["consensus_confidence"] == "partial"
+    assert data["complete_consensus"]["models_missing"] == ["slow:neutral"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_respects_provider_semaphore(tool, monkeypatch):
+    monkeypatch.setenv("EXAI_WS_KIMI_MAX_INFLIGHT", "1")
+    provider = _FakeProvider(ProviderType.KIMI, {"k1": 0.1, "k2": 0.1, "k3": 0.1})
+    _use_provider(tool, monkeypatch, provider)
+
+    data = await _run(tool, _step_one(["k1", "k2", "k3"], parallel=True))
+
+    assert provider.max_active == 1
+    assert data["complete_consensus"]["total_responses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_sequential_mode_unchanged(tool, monkeypatch):
+    provider = _FakeProvider(ProviderType.OPENROUTER, {"a": 0.0, "b": 0.0})
+    _use_provider(tool, monkeypatch, provider)
+
+    data = await _run(tool, _step_one(["a", "b"]))
+
+    assert data["status"] == "analysis_and_first_model_consulted"
+    assert data["model_consulted"] == "a"
+    assert data["next_step_required"] is True
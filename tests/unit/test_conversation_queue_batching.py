@@ -0,0 +1,223 @@
+"""
+Unit tests for the batched conversation write-behind queue
+
+Tests:
+- Items queued within the flush window are handed over as one batch
+- put_sync rejects items when the queue is full (backpressure)
+- stop() flushes pending items instead of dropping them
+- Batch writer coalesces per conversation and dedups assistant turns
+- A failed bulk insert is retried per row with the original timestamps
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from src.daemon.conversation_queue import ConversationQueue, QueueItem
+from utils.conversation.recent_turns import RecentTurnIndex
+from utils.conversation.supabase_memory import SupabaseConversationMemory
+
+
+def _item(conversation_id, role="user", content="hi", timestamp=None):
+    return QueueItem(
+        conversation_id=conversation_id,
+        update_data={"role": role, "content": content, "metadata": {}, "tool_name": "chat"},
+        timestamp=time.time() if timestamp is None else timestamp,
+    )
+
+
+class TestConversationQueueBatching:
+    """Test ConversationQueue batch mode."""
+
+    @pytest.mark.asyncio
+    async def test_window_is_one_batch(self):
+        batches = []
+
+        async def consume(items):
+            batches.append([i.conversation_id for i in items])
+
+        queue = ConversationQueue(batch_consumer_func=consume, flush_interval=0.2, max_batch_size=100)
+        await queue.start()
+        for n in range(5):
+            assert queue.put_sync(_item(f"c{n}"))
+        await asyncio.sleep(0.4)
+        await queue.stop()
+
+        assert batches == [["c0", "c1", "c2", "c3", "c4"]]
+        assert queue.get_metrics()["total_batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits(self):
+        batches = []
+
+        async def consume(items):
+            batches.append(len(items))
+
+        queue = ConversationQueue(batch_consumer_func=consume, flush_interval=5.0, max_batch_size=3)
+        await queue.start()
+        for n in range(7):
+            queue.put_sync(_item(f"c{n}"))
+        await queue.stop()
+
+        assert batches == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_put_sync_backpressure(self):
+        queue = ConversationQueue(max_size=2, batch_consumer_func=None)
+
+        assert queue.put_sync(_item("a"))
+        assert queue.put_sync(_item("b"))
+        assert not queue.put_sync(_item("c"))
+        assert queue.get_metrics()["total_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_put_sync_from_other_thread(self):
+        seen = []
+
+        async def consume(items):
+            seen.extend(i.conversation_id for i in items)
+
+        queue = ConversationQueue(batch_consumer_func=consume, flush_interval=0.05)
+        await queue.start()
+        thread = threading.Thread(target=lambda: [queue.put_sync(_item(f"t{n}")) for n in range(10)])
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0.01)
+        await queue.stop()
+
+        assert seen == [f"t{n}" for n in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_items(self):
+        seen = []
+
+        async def consume(item):
+            seen.append(item.conversation_id)
+
+        queue = ConversationQueue(consumer_func=consume)
+        queue.put_sync(_item("a"))
+        queue.put_sync(_item("b"))
+        await queue.start()
+        await queue.stop()
+
+        assert seen == ["a", "b"]
+
+
+class FakeStorage:
+    def __init__(self):
+        self.batches = []
+        self.links = []
+
+    def save_messages_batch(self, rows):
+        self.batches.append(rows)
+        return [str(n) for n in range(len(rows))]
+
+    def link_files_to_conversation_batch(self, conv_id, file_ids):
+        self.links.append((conv_id, file_ids))
+
+
+class FakeMapper:
+    def __init__(self):
+        self.calls = []
+
+    def get_or_create_conversation(self, continuation_id, title=None, metadata=None):
+        if title is None:  # Dedup warm-up lookup
+            return None
+        self.calls.append(continuation_id)
+        return f"uuid-{continuation_id}"
+
+
+class FakeCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, continuation_id):
+        self.invalidated.append(continuation_id)
+
+
+@pytest.fixture
+def memory():
+    memory = SupabaseConversationMemory.__new__(SupabaseConversationMemory)
+    memory.storage, memory.mapper, memory.cache = FakeStorage(), FakeMapper(), FakeCache()
+    memory.file_handler = None
+    memory.recent_turns = RecentTurnIndex(ring_size=10, window_seconds=60, max_conversations=100)
+    return memory
+
+
+class TestBatchWriter:
+    """Test SupabaseConversationMemory._write_messages_batch."""
+
+    def test_coalesces_per_conversation(self, memory):
+        now = time.time()
+        items = [_item("a", content="1", timestamp=now), _item("b", content="2", timestamp=now + 0.001),
+                 _item("a", role="assistant", content="3", timestamp=now + 0.002)]
+
+        memory._write_messages_batch(items)
+
+        assert memory.mapper.calls == ["a", "b"]
+        assert len(memory.storage.batches) == 1
+        rows = memory.storage.batches[0]
+        assert [(r["conversation_id"], r["content"]) for r in rows] == [("uuid-a", "1"), ("uuid-a", "3"), ("uuid-b", "2")]
+        assert len({r["created_at"] for r in rows}) == 3
+        assert memory.cache.invalidated == ["a", "b"]
+
+    def test_duplicate_assistant_turns_dropped(self, memory):
+        now = time.time()
+        memory._write_messages_batch([_item("a", role="assistant", content="x", timestamp=now),
+                                      _item("a", role="assistant", content="x", timestamp=now + 1),
+                                      _item("a", role="user", content="y", timestamp=now + 2),
+                                      _item("a", role="user", content="y", timestamp=now + 3)])
+        memory._write_messages_batch([_item("a", role="assistant", content="x", timestamp=now + 5),
+                                      _item("b", role="assistant", content="x", timestamp=now + 5)])
+        memory._write_messages_batch([_item("a", role="assistant", content="x", timestamp=now + 120)])
+
+        counts = [len(batch) for batch in memory.storage.batches]
+        assert counts == [3, 1, 1]
+        assert memory.storage.batches[1][0]["conversation_id"] == "uuid-b"
+
+    def test_failed_insert_does_not_record_turns(self, memory):
+        now = time.time()
+
+        def fail(rows):
+            raise RuntimeError("insert failed")
+
+        memory.storage.save_messages_batch = fail
+        with pytest.raises(RuntimeError):
+            memory._write_messages_batch([_item("a", role="assistant", content="x", timestamp=now)])
+
+        del memory.storage.save_messages_batch
+        memory._write_messages_batch([_item("a", role="assistant", content="x", timestamp=now + 1)])
+        assert len(memory.storage.batches) == 1
+
+
+class FlakyStorage(FakeStorage):
+    """Rejects any insert of more than one row."""
+
+    def save_messages_batch(self, rows):
+        if len(rows) > 1:
+            raise TimeoutError("bulk insert timed out")
+        return super().save_messages_batch(rows)
+
+
+@pytest.mark.asyncio
+async def test_batch_fallback_retries_prepared_rows(memory, monkeypatch):
+    from utils.conversation import supabase_memory
+
+    memory.storage = FlakyStorage()
+    monkeypatch.setattr(supabase_memory, "get_supabase_memory", lambda: memory)
+    now = time.time()
+    items = [_item("a", role="assistant", content="x", timestamp=now),
+             _item("a", role="assistant", content="x", timestamp=now + 1),
+             _item("a", role="user", content="y", timestamp=now + 2)]
+
+    await supabase_memory.process_conversation_batch(items)
+
+    rows = [batch[0] for batch in memory.storage.batches]
+    assert [r["content"] for r in rows] == ["x", "y"]
+    assert [r["created_at"] for r in rows] == [
+        datetime.utcfromtimestamp(t).strftime("%Y-%m-%dT%H:%M:%S.%f") for t in (now, now + 2)
+    ]
+    assert memory.recent_turns.is_duplicate("a", "assistant", "x", now=now + 3)
@@ -0,0 +1,89 @@
+"""
+Unit tests for the cached directory index used by expand_paths
+
+Tests:
+- Indexed expansion matches a plain walk (hidden/excluded dirs, extensions)
+- Repeated expansions only stat unchanged directories
+- Only directories whose entries changed are rescanned
+- Directories modified "just now" are rescanned (racy mtime)
+- Watched roots skip stats until the watcher marks a directory dirty
+"""
+
+import os
+
+import pytest
+
+from utils.file import expansion
+from utils.file.expansion import DirectoryIndex, expand_paths
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in ["a.py", "b.txt", ".hidden.py", "pkg/c.py", "pkg/deep/d.js", "pkg/deep/e.bin",
+                ".git/f.py", "node_modules/g.js", "__pycache__/h.py"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return tmp_path
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = DirectoryIndex(watch=False)
+    monkeypatch.setattr(expansion, "get_directory_index", lambda: index)
+    # Treat every directory mtime as settled so listings are reused
+    monkeypatch.setattr(expansion, "_RACY_MTIME_NS", 0)
+    yield index
+    index.close()
+
+
+class TestDirectoryIndex:
+    """Test suite for DirectoryIndex"""
+
+    def test_matches_uncached_walk(self, tree, index, monkeypatch):
+        indexed = expand_paths([str(tree)])
+        indexed_all = expand_paths([str(tree)], extensions=set())
+        monkeypatch.setenv("FILE_INDEX_ENABLED", "false")
+
+        assert indexed == expand_paths([str(tree)])
+        assert indexed_all == expand_paths([str(tree)], extensions=set())
+        assert indexed == sorted(str(tree / rel) for rel in ["a.py", "b.txt", "pkg/c.py", "pkg/deep/d.js"])
+        assert str(tree / "pkg/deep/e.bin") in indexed_all
+
+    def test_repeat_expansion_only_stats(self, tree, index):
+        first = expand_paths([str(tree)])
+        scanned = index.get_stats()["dirs_scanned"]
+
+        assert expand_paths([str(tree)]) == first
+        stats = index.get_stats()
+        assert stats["dirs_scanned"] == scanned
+        assert stats["dirs_revalidated"] == 3
+
+    def test_only_changed_directories_rescanned(self, tree, index):
+        expand_paths([str(tree)])
+        scanned = index.get_stats()["dirs_scanned"]
+
+        (tree / "pkg/deep/new.py").write_text("x")
+        os.utime(tree / "pkg/deep", ns=(1, 1))
+
+        assert str(tree / "pkg/deep/new.py") in expand_paths([str(tree)])
+        assert index.get_stats()["dirs_scanned"] == scanned + 1
+
+    def test_racy_directory_is_rescanned(self, tree, index, monkeypatch):
+        monkeypatch.setattr(expansion, "_RACY_MTIME_NS", 10**18)
+        expand_paths([str(tree)])
+        expand_paths([str(tree)])
+
+        assert index.get_stats()["dirs_revalidated"] == 0
+
+    def test_watched_root_trusts_watcher(self, tree, index):
+        index._watched.add(str(tree))  # As if the watcher were running
+        files = index.list_files(str(tree))
+        (tree / "new.py").write_text("x")
+
+        # No event yet: listings are reused without stat-ing
+        assert len(index.list_files(str(tree))) == len(files)
+        assert index.get_stats()["dirs_reused"] == 3
+
+        index.mark_dirty({str(tree)})
+        assert len(index.list_files(str(tree))) == len(files) + 1
@@ -0,0 +1,176 @@
+"""
+Unit tests for expert analysis provider dispatch (tools/workflow/expert_dispatch.py)
+and the native async GLM chat path (src/providers/async_glm_chat.py)
+
+Tests:
+- Kimi/GLM calls go through the async client; a timeout cancels the request
+- Sync providers run on the bounded executor, with queue wait measured
+- A call still queued at its deadline never starts
+- Async client errors fall back to the sync provider
+- Async GLM maps thinking_mode to GLM's "thinking" parameter
+"""
+
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import tools.workflow.expert_dispatch as dispatch
+from src.providers.base import ProviderType
+
+
+@pytest.fixture(autouse=True)
+def fresh_dispatch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(dispatch, "record_expert_call", lambda *args: calls.append(args))
+    monkeypatch.setenv("EXPERT_ANALYSIS_MAX_WORKERS", "1")
+    monkeypatch.delenv("USE_ASYNC_PROVIDERS", raising=False)
+    dispatch.reset_expert_executor()
+    dispatch.reset_async_providers()
+    yield calls
+    dispatch.reset_expert_executor()
+    dispatch.reset_async_providers()
+
+
+class _AsyncClient:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def chat_completions_create(self, model, messages, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return {"content": "async answer", "model": model, "usage": {}}
+
+
+class _SyncProvider:
+    def __init__(self, provider_type=ProviderType.OPENROUTER, delay=0.0):
+        self.provider_type = provider_type
+        self.delay = delay
+        self.threads = []
+
+    def get_provider_type(self):
+        return self.provider_type
+
+    def generate_content(self, prompt, model_name, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return SimpleNamespace(content=f"sync answer to {prompt}")
+
+
+def _use_async_client(monkeypatch, client):
+    monkeypatch.setenv("KIMI_API_KEY", "test-key")
+    monkeypatch.setitem(dispatch._async_providers, ProviderType.KIMI, client)
+
+
+@pytest.mark.asyncio
+async def test_kimi_uses_async_client_and_timeout_cancels_request(monkeypatch, fresh_dispatch):
+    client = _AsyncClient(delay=5.0)
+    _use_async_client(monkeypatch, client)
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        await dispatch.call_provider(
+            None, "chat_completions_create", timeout=0.1, provider_type=ProviderType.KIMI,
+            model="kimi-k2", messages=[],
+        )
+
+    assert time.monotonic() - start < 1.0
+    assert client.cancelled
+    assert [c[:3] for c in fresh_dispatch] == [("async", "kimi", "timeout")]
+
+
+@pytest.mark.asyncio
+async def test_sync_provider_runs_on_bounded_executor(fresh_dispatch):
+    provider = _SyncProvider(delay=0.2)
+
+    first, second = await asyncio.gather(
+        dispatch.call_provider(provider, "generate_content", timeout=5, prompt="a", model_name="m"),
+        dispatch.call_provider(provider, "generate_content", timeout=5, prompt="b", model_name="m"),
+    )
+
+    assert (first.content, second.content) == ("sync answer to a", "sync answer to b")
+    assert all(name.startswith("expert-analysis") for name in provider.threads)
+    # One worker: the second call waited in the queue for the first
+    queue_waits = sorted(c[3] for c in fresh_dispatch)
+    assert queue_waits[0] < 0.1 and queue_waits[1] >= 0.15
+    assert {c[:3] for c in fresh_dispatch} == {("executor", "openrouter", "success")}
+
+
+@pytest.mark.asyncio
+async def test_queued_call_never_starts_after_timeout(fresh_dispatch):
+    provider = _SyncProvider(delay=0.3)
+
+    results = await asyncio.gather(
+        dispatch.call_provider(provider, "generate_content", timeout=5, prompt="a", model_name="m"),
+        dispatch.call_provider(provider, "generate_content", timeout=0.1, prompt="b", model_name="m"),
+        return_exceptions=True,
+    )
+    await asyncio.sleep(0.4)
+
+    assert isinstance(results[1], asyncio.TimeoutError)
+    assert len(provider.threads) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_error_falls_back_to_sync_provider(monkeypatch, fresh_dispatch):
+    _use_async_client(monkeypatch, _AsyncClient(error=RuntimeError("boom")))
+    provider = _SyncProvider(provider_type=ProviderType.KIMI)
+    provider.chat_completions_create = lambda model, messages, **kwargs: {"content": "sync", "model": model}
+
+    response = await dispatch.call_provider(
+        provider, "chat_completions_create", timeout=5, model="kimi-k2", messages=[]
+    )
+
+    assert response.content == "sync"
+    assert [c[:3] for c in fresh_dispatch] == [("async", "kimi", "error"), ("executor", "kimi", "success")]
+
+
+@pytest.mark.asyncio
+async def test_missing_api_key_is_an_error(monkeypatch):
+    monkeypatch.delenv("GLM_API_KEY", raising=False)
+    monkeypatch.delenv("ZHIPUAI_API_KEY", raising=False)
+    with pytest.raises(RuntimeError, match="glm API key not configured"):
+        await dispatch.call_provider(
+            _SyncProvider(ProviderType.GLM), "generate_content", timeout=5, prompt="a", model_name="glm-4.6"
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_glm_sends_thinking_parameter():
+    from openai import AsyncOpenAI
+    from src.providers import async_glm_chat
+
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "id": "1", "object": "chat.completion", "created": 0, "model": "glm-4.6",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+        })
+
+    client = AsyncOpenAI(
+        api_key="k", base_url="https://glm.test/v4",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    response = await async_glm_chat.chat_completions_create_async(
+        client, model="glm-4.6", messages=[{"role": "user", "content": "hi"}],
+        thinking_mode="minimal", images=None,
+    )
+
+    assert response.content == "ok"
+    assert response.usage["total_tokens"] == 4
+    assert requests[0]["thinking"] == {"type": "enabled"}
+    assert "images" not in requests[0]
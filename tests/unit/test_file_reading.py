@@ -0,0 +1,147 @@
+"""
+Unit tests for parallel multi-file reading in utils.file.reading
+
+Tests:
+- Line numbering keeps the "  45│ code" format
+- Large files are read via mmap with identical output
+- read_files output matches a sequential read, in original order
+- Files beyond the token budget are skipped (and not read once it is spent)
+- Files whose size estimate exceeds the budget are still read and counted
+- Formatted bodies and token counts are reused until the file changes
+"""
+
+import pytest
+
+from utils.file import formatted_cache, reading
+from utils.file.reading import read_file_content, read_files
+
+
+@pytest.fixture(autouse=True)
+def no_formatted_cache(monkeypatch):
+    monkeypatch.setattr(reading, "get_formatted_file_cache", lambda: None)
+
+
+def _sequential(paths, budget, include_line_numbers=False):
+    """Reference: the sequential greedy read read_files must match."""
+    parts, total, skipped = [], 0, []
+    for path in paths:
+        content, tokens = read_file_content(path, include_line_numbers=include_line_numbers)
+        if total + tokens <= budget:
+            parts.append(content)
+            total += tokens
+        else:
+            skipped.append(path)
+    return parts, skipped
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i, size in enumerate([300, 5000, 40, 12000, 800, 2500, 60]):
+        path = tmp_path / f"f{i}.py"
+        path.write_text("".join(f"line {j} of file {i}\r\n" for j in range(size // 20)), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+class TestFormatting:
+    """Test single-file formatting."""
+
+    def test_line_numbers_format(self):
+        numbered = reading._add_line_numbers("a\r\nb\rc")
+        assert numbered == "   1│ a\n   2│ b\n   3│ c"
+        width = len(reading._add_line_numbers("\n" * 12345).split("\n")[0].split("│")[0])
+        assert width == 5
+
+    def test_mmap_path_matches_buffered_read(self, tmp_path, monkeypatch):
+        path = tmp_path / "big.txt"
+        path.write_bytes("héllo\n".encode("utf-8") * 1000 + b"\xff tail")
+
+        monkeypatch.setattr(reading, "_MMAP_THRESHOLD", 1 << 30)
+        buffered = read_file_content(str(path), include_line_numbers=True)
+        monkeypatch.setattr(reading, "_MMAP_THRESHOLD", 1)
+        assert read_file_content(str(path), include_line_numbers=True) == buffered
+        assert "� tail" in buffered[0]
+
+    def test_errors_are_formatted(self, tmp_path):
+        missing, _ = read_file_content(str(tmp_path / "nope.py"))
+        assert missing.startswith(f"\n--- FILE NOT FOUND: {tmp_path / 'nope.py'} ---")
+        directory, _ = read_file_content(str(tmp_path))
+        assert "--- NOT A FILE:" in directory
+
+
+class TestReadFiles:
+    """Test budgeted parallel reads."""
+
+    @pytest.mark.parametrize("budget", [10_000_000, 4000, 1500, 50])
+    def test_matches_sequential_read(self, files, budget):
+        parts, skipped = _sequential(files, budget, include_line_numbers=True)
+
+        result = read_files(files, max_tokens=budget, reserve_tokens=0, include_line_numbers=True)
+
+        expected = "\n\n".join(parts)
+        assert result.startswith(expected)
+        if skipped:
+            assert f"Total skipped: {len(skipped)}\n" in result
+            assert all(f"  - {path}\n" in result for path in skipped)
+        else:
+            assert result == expected
+
+    def test_budget_stops_reading(self, files, monkeypatch):
+        first_tokens = read_file_content(files[0])[1]
+        read = []
+        original = reading._read_text
+        monkeypatch.setattr(reading, "_read_text", lambda path, size: read.append(str(path)) or original(path, size))
+
+        read_files(files, max_tokens=first_tokens, reserve_tokens=0)
+
+        assert read == [str(files[0])]
+
+    @pytest.mark.parametrize("budget", [4000, 1500])
+    def test_boundary_files_are_read_before_skipping(self, files, budget, monkeypatch):
+        parts, skipped = _sequential(files, budget, include_line_numbers=True)
+        # Estimates far above the real counts: every file is a boundary candidate
+        monkeypatch.setattr(reading, "_estimate_candidate_tokens", lambda *_: budget + 1)
+
+        result = read_files(files, max_tokens=budget, reserve_tokens=0, include_line_numbers=True)
+
+        assert result.startswith("\n\n".join(parts))
+        assert f"Total skipped: {len(skipped)}\n" in result
+
+
+class TestFormattedCache:
+    """Test reads through the persistent formatted-file cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch):
+        cache = formatted_cache.FormattedFileCache(path=tmp_path / "cache.sqlite3", min_file_bytes=0)
+        monkeypatch.setattr(reading, "get_formatted_file_cache", lambda: cache)
+        yield cache
+        cache.close()
+
+    def test_reuses_body_until_file_changes(self, files, cache, monkeypatch):
+        path = files[1]
+        first = read_file_content(path, include_line_numbers=True)
+        monkeypatch.setattr(reading, "_read_text", lambda *_: pytest.fail("cached file was re-read"))
+
+        assert read_file_content(path, include_line_numbers=True) == first
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["bytes_saved"] > 0
+
+        monkeypatch.undo()
+        monkeypatch.setattr(reading, "get_formatted_file_cache", lambda: cache)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("appended\n")
+        assert "appended" in read_file_content(path, include_line_numbers=True)[0]
+        assert cache.get_stats()["misses"] == 2
+
+    def test_hit_uses_stored_token_count(self, files, cache, monkeypatch):
+        path = files[3]
+        first = read_file_content(path, include_line_numbers=True)
+        estimated = []
+        original = reading.estimate_tokens
+        monkeypatch.setattr(reading, "estimate_tokens", lambda text: estimated.append(len(text)) or original(text))
+
+        assert read_file_content(path, include_line_numbers=True) == first
+        assert estimated and max(estimated) < 200  # Only the delimiters were estimated
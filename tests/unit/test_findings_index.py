@@ -0,0 +1,118 @@
+"""
+Unit tests for the incremental findings index (tools/workflow/findings_index.py)
+and the consolidator built on it (tools/workflow/optimized_consolidation.py)
+
+Tests:
+- Rolling content hash: order/content sensitive, restored on truncate
+- MinHash near-duplicate detection against earlier steps
+- File sets and counters maintained incrementally
+- Consolidated text: cache hits, incremental appends, correct footer
+- Auto-execute backtracking rebuilds the workflow's findings index
+"""
+
+from tools.workflow.findings_index import FindingsIndex, estimate_similarity, jaccard, minhash, tokenize
+from tools.workflow.optimized_consolidation import OptimizedConsolidatedFindings
+from tools.workflow.orchestration import OrchestrationMixin
+
+
+def test_content_hash_tracks_steps():
+    a, b = FindingsIndex(), FindingsIndex()
+    empty = a.content_hash
+
+    a.add_step(1, "found a leak", hypothesis="cache")
+    b.add_step(1, "found a leak", hypothesis="cache")
+    assert a.content_hash == b.content_hash != empty
+    after_one = a.content_hash
+
+    a.add_step(2, "confirmed")
+    b.add_step(2, "confirmed!")
+    assert a.content_hash != b.content_hash
+
+    a.truncate(1)
+    assert a.content_hash == after_one
+    a.clear()
+    assert a.content_hash == empty
+
+
+def test_hash_fields_do_not_collide():
+    a, b = FindingsIndex(), FindingsIndex()
+    a.add_step(1, "ab", hypothesis="c")
+    b.add_step(1, "a", hypothesis="bc")
+    assert a.content_hash != b.content_hash
+
+
+def test_jaccard_and_minhash_estimate():
+    t1 = tokenize("The Cache leaks memory under load")
+    t2 = tokenize("the cache leaks memory under heavy load")
+    assert jaccard(t1, t2) == 6 / 7
+    assert tokenize("The Cache leaks memory under load") is t1  # Memoized
+
+    estimate = estimate_similarity(minhash(t1), minhash(t2))
+    assert abs(estimate - 6 / 7) < 0.2
+    assert estimate_similarity(minhash(t1), minhash(tokenize("nothing in common here"))) < 0.2
+
+
+def test_most_similar_to_latest():
+    index = FindingsIndex()
+    index.add_step(1, "connection pool exhausted when redis is slow under load")
+    index.add_step(2, "tokenizer falls back to estimates without network access")
+    assert index.most_similar_to_latest()[1] < 0.5
+
+    index.add_step(3, "connection pool exhausted when redis is slow under load")
+    assert index.most_similar_to_latest() == (1, 1.0)
+
+
+def test_file_sets_and_counters():
+    index = FindingsIndex()
+    index.add_step(1, "x", files_checked=["a.py", "b.py"], relevant_files=["a.py"])
+    index.add_step(2, "y", files_checked=["b.py", "c.py"])
+    assert index.files_checked == {"a.py", "b.py", "c.py"}
+    assert (index.steps_with_files_checked, index.steps_with_relevant_files) == (2, 1)
+
+    index.truncate(1)
+    assert index.files_checked == {"a.py", "b.py"}
+    assert index.steps_with_files_checked == 1
+
+
+def test_consolidated_text_is_incremental():
+    consolidator = OptimizedConsolidatedFindings()
+    consolidator.add_step(1, "first", files_checked=["a.py"])
+    first = consolidator.get_consolidated_text()
+    assert consolidator.get_consolidated_text() is first
+
+    consolidator.add_step(2, "second", files_checked=["b.py"], relevant_files=["b.py"])
+    second = consolidator.get_consolidated_text()
+
+    assert second == consolidator.get_consolidated_text(force_full=True)
+    assert second.index("## Step 2") < second.index("**Summary:**")
+    assert "2 steps, 2 files checked, 1 relevant files" in second
+    stats = consolidator.get_stats()
+    assert stats["cache_hits"] == 1
+    assert stats["incremental_consolidations"] == 1
+
+
+class _Workflow(OrchestrationMixin):
+    def get_name(self):
+        return "test"
+
+
+def test_backtrack_rebuilds_findings_index():
+    workflow = _Workflow()
+    workflow.work_history = []
+    workflow._reprocess_consolidated_findings()
+    steps = [
+        {"step_number": 1, "findings": "a", "files_checked": ["a.py"], "relevant_files": ["a.py"]},
+        {"step_number": 2, "findings": "b", "files_checked": ["b.py"]},
+        {"step_number": 3, "findings": "c", "files_checked": ["c.py"]},
+    ]
+    for step in steps:
+        workflow.work_history.append(step)
+        workflow._update_consolidated_findings(step)
+    assert workflow.findings_index.steps_with_files_checked == 3
+
+    workflow._handle_backtrack(1)
+
+    index = workflow._get_findings_index()
+    assert (index.steps_with_files_checked, index.steps_with_relevant_files) == (1, 1)
+    assert index.files_checked == {"a.py"}
+    assert workflow.consolidated_findings.files_checked == {"a.py"}
@@ -0,0 +1,98 @@
+"""
+Unit tests for the persistent formatted-file cache
+
+Tests:
+- Entries are keyed by path, mtime, size and line-number flag
+- Storing a new version replaces older versions of the same file
+- LRU eviction keeps the store within its byte budget
+- Entries persist across instances (processes)
+- Threads read through their own connections
+"""
+
+import threading
+
+import pytest
+
+from utils.file.formatted_cache import FormattedFileCache
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "formatted.sqlite3"
+
+
+def _cache(db_path, **kwargs):
+    kwargs.setdefault("min_file_bytes", 0)
+    return FormattedFileCache(path=db_path, **kwargs)
+
+
+class TestFormattedFileCache:
+    """Test suite for FormattedFileCache"""
+
+    def test_key_includes_stat_and_flag(self, db_path):
+        cache = _cache(db_path)
+        cache.put("/a.py", 1, 10, True, "numbered", 2)
+
+        assert cache.get("/a.py", 1, 10, True) == ("numbered", 2)
+        assert cache.get("/a.py", 1, 10, False) is None
+        assert cache.get("/a.py", 2, 10, True) is None
+        assert cache.get("/a.py", 1, 11, True) is None
+
+    def test_new_version_replaces_old(self, db_path):
+        cache = _cache(db_path)
+        cache.put("/a.py", 1, 10, False, "old", 1)
+        cache.put("/a.py", 2, 10, False, "new", 1)
+
+        assert cache.get("/a.py", 1, 10, False) is None
+        assert cache.get("/a.py", 2, 10, False) == ("new", 1)
+        assert cache.get_stats()["total_bytes"] == 3
+
+    def test_lru_eviction(self, db_path):
+        cache = _cache(db_path, max_bytes=250)
+        for i in range(3):
+            cache.put(f"/{i}.py", 1, 10, False, "x" * 100, 25)
+            cache.get("/0.py", 1, 10, False)  # Keep the first file hot
+
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["total_bytes"] <= 250
+        assert cache.get("/0.py", 1, 10, False) is not None
+        assert cache.get("/1.py", 1, 10, False) is None
+
+    def test_persists_across_instances(self, db_path):
+        cache = _cache(db_path)
+        cache.put("/a.py", 1, 10, False, "body", 1)
+        cache.close()
+
+        reopened = _cache(db_path)
+        assert reopened.get("/a.py", 1, 10, False) == ("body", 1)
+        assert reopened.get_stats()["total_bytes"] == 4
+
+    def test_small_files_are_not_cached(self, db_path):
+        cache = _cache(db_path, min_file_bytes=1024)
+        cache.put("/a.py", 1, 10, False, "body", 1)
+
+        assert cache.get("/a.py", 1, 10, False) is None
+        assert not db_path.exists()
+
+    def test_threads_use_their_own_connections(self, db_path):
+        cache = _cache(db_path)
+        cache.put("/a.py", 1, 10, False, "body", 1)
+        results = []
+
+        def lookup():
+            # Keep each connection alive past its thread so ids stay distinct
+            results.append((cache.get("/a.py", 1, 10, False), cache._connect()))
+
+        threads = [threading.Thread(target=lookup) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [hit for hit, _ in results] == [("body", 1)] * 4
+        assert len({id(conn) for _, conn in results} | {id(cache._connect())}) == 5
+        assert cache.get_stats()["hits"] == 4
+
+        cache.close()
+        assert cache.get("/a.py", 1, 10, False) == ("body", 1)
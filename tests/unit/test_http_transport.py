@@ -0,0 +1,122 @@
+"""
+Unit tests for the shared provider transport (utils/http_transport.py)
+
+Runs against a local keep-alive HTTP server.
+
+Tests:
+- Clients for one origin share a pool; connections are reused
+- Connection setup latency and pool occupancy are recorded
+- Async clients work across event loops (one pool per loop)
+- Shared clients ignore close() from their users
+- Warmup opens connections and reports unreachable origins
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.http_client import HttpClient
+from utils.http_transport import ProviderTransportManager, origin_of
+import utils.http_transport as http_transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = ProviderTransportManager(http2=False)
+    monkeypatch.setattr(http_transport, "_transport_manager", manager)
+    yield manager
+    asyncio.run(manager.aclose())
+
+
+def test_origin_of():
+    assert origin_of("https://API.moonshot.ai/v1/") == "https://api.moonshot.ai:443"
+    assert origin_of("http://localhost:8080/x") == "http://localhost:8080"
+    assert origin_of("api.z.ai/api/paas/v4") == "https://api.z.ai:443"
+
+
+def test_clients_share_pool_and_reuse_connections(manager, server_url):
+    first = HttpClient(f"{server_url}/v1", api_key="k")
+    second = HttpClient(f"{server_url}/v2")
+    assert first.client is second.client
+
+    assert first.post_json("/chat", {"a": 1}) == {"path": "/v1/chat"}
+    assert second.get_json("models") == {"path": "/v2/models"}
+    first.client.close()  # Ignored: the pool is shared
+    assert first.get_json("/again") == {"path": "/v1/again"}
+
+    stats = manager.get_stats()["origins"][origin_of(server_url)]
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    assert stats["setup_ms"]["max"] > 0
+    assert stats["pool"]["idle"] == 1 and stats["pool"]["active"] == 0
+
+
+def test_async_client_across_event_loops(manager, server_url):
+    client = manager.get_async_client(server_url)  # Created outside any loop
+
+    async def calls():
+        responses = await asyncio.gather(*(client.get(f"{server_url}/n{i}") for i in range(3)))
+        await client.aclose()  # Ignored: the pool is shared
+        responses.append(await client.get(f"{server_url}/last"))
+        return [r.status_code for r in responses]
+
+    assert asyncio.run(calls()) == [200] * 4
+    assert asyncio.run(calls()) == [200] * 4  # New loop, new pool
+
+    stats = manager.get_stats()["origins"][origin_of(server_url)]
+    assert stats["requests"] == 8
+    assert 2 <= stats["new_connections"] <= 6  # Concurrent calls may each open one
+
+
+def test_warmup(manager, server_url):
+    unreachable = "http://127.0.0.1:1"
+
+    timings = asyncio.run(manager.warmup([server_url, unreachable]))
+
+    assert timings[origin_of(server_url)] is not None
+    assert timings[origin_of(unreachable)] is None
+    stats = manager.get_stats()["origins"]
+    assert stats[origin_of(server_url)]["new_connections"] == 2  # Async and sync pools
+    assert stats[origin_of(unreachable)]["connect_errors"] >= 1
+
+
+def test_configured_provider_urls(monkeypatch):
+    monkeypatch.setenv("KIMI_API_KEY", "k")
+    monkeypatch.setenv("KIMI_API_URL", "https://kimi.example/v1")
+    monkeypatch.delenv("GLM_API_KEY", raising=False)
+
+    assert http_transport.configured_provider_urls() == ["https://kimi.example/v1"]
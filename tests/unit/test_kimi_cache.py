@@ -0,0 +1,192 @@
+"""
+Unit tests for Kimi cache token management (src/providers/kimi_cache.py)
+
+Tests:
+- Rolling prefix hash covers full messages and every boundary
+- Follow-up turns find the token saved for the previous request
+- LRU eviction and TTL expiry
+- Redis persistence across store instances, and fallback when Redis fails
+- Hit-rate statistics
+- The async chat path looks tokens up off the event loop
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.providers import kimi_cache
+from src.providers.async_kimi_chat import chat_completions_create_async
+from src.providers.kimi_cache import KimiPrefixCache, prefix_hash, prefix_hashes
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": "You are helpful." * 200}]
+    for n in range(turns):
+        messages.append({"role": "user", "content": f"question {n}"})
+        messages.append({"role": "assistant", "content": f"answer {n}"})
+    return messages
+
+
+class TestPrefixHash:
+    """Test the rolling prefix hash."""
+
+    def test_one_hash_per_boundary(self):
+        messages = _conversation(3)
+        hashes = prefix_hashes(messages)
+
+        assert len(hashes) == len(messages)
+        assert len(set(hashes)) == len(hashes)
+        assert hashes[:4] == prefix_hashes(messages[:4])
+        assert prefix_hash(messages) == hashes[-1]
+        assert prefix_hash([]) == ""
+
+    def test_hash_covers_full_content(self):
+        base = [{"role": "user", "content": "x" * 5000}]
+        changed = [{"role": "user", "content": "x" * 4999 + "y"}]
+        assert prefix_hash(base) != prefix_hash(changed)
+
+        # More than six messages still distinguish later turns
+        assert prefix_hash(_conversation(5)) != prefix_hash(_conversation(6))
+
+    def test_message_boundaries_matter(self):
+        split = [{"role": "user", "content": "ab"}, {"role": "user", "content": "c"}]
+        joined = [{"role": "user", "content": "a"}, {"role": "user", "content": "bc"}]
+        assert prefix_hash(split) != prefix_hash(joined)
+
+
+class TestKimiPrefixCache:
+    """Test the LRU + TTL store."""
+
+    def test_follow_up_turn_finds_previous_token(self):
+        cache = KimiPrefixCache(max_entries=8, ttl=60, redis_client=None)
+        first = _conversation(1) + [{"role": "user", "content": "next"}]
+        cache.save("s1", "chat", prefix_hash(first), "tok-1")
+
+        follow_up = first + [{"role": "assistant", "content": "reply"}, {"role": "user", "content": "more"}]
+        token, matched = cache.find("s1", "chat", follow_up)
+
+        assert token == "tok-1"
+        assert matched == prefix_hash(first)
+        assert cache.find("s2", "chat", follow_up) is None  # Sessions are isolated
+
+        # The longest prefix wins
+        cache.save("s1", "chat", prefix_hash(follow_up[:-1]), "tok-2")
+        assert cache.find("s1", "chat", follow_up)[0] == "tok-2"
+
+    def test_lru_eviction(self):
+        cache = KimiPrefixCache(max_entries=2, ttl=60, redis_client=None)
+        cache.save("s", "t", "a", "tok-a")
+        cache.save("s", "t", "b", "tok-b")
+        assert cache.get("s", "t", "a") == "tok-a"  # a is now most recently used
+        cache.save("s", "t", "c", "tok-c")
+
+        assert cache.get("s", "t", "b") is None
+        assert cache.get("s", "t", "a") == "tok-a"
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        cache = KimiPrefixCache(max_entries=8, ttl=10, redis_client=None)
+        now = [1000.0]
+        monkeypatch.setattr(kimi_cache.time, "time", lambda: now[0])
+
+        cache.save("s", "t", "a", "tok-a")
+        cache.save("s", "t", "b", "tok-b")
+        now[0] += 11
+        assert cache.get("s", "t", "a") is None
+        assert cache.purge() == 1
+        assert cache.get_stats()["entries"] == 0
+
+    def test_hit_rate(self):
+        cache = KimiPrefixCache(max_entries=8, ttl=60, redis_client=None)
+        cache.save("s", "t", "a", "tok")
+        cache.get("s", "t", "a")
+        cache.get("s", "t", "missing")
+        cache.find("s", "t", [{"role": "user", "content": "nothing cached"}])
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 2)
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
+
+
+class TestRedisPersistence:
+    """Test persistence across daemon restarts."""
+
+    def test_tokens_survive_restart(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        before = KimiPrefixCache(max_entries=8, ttl=60, redis_client=fakeredis.FakeRedis(server=server, decode_responses=True))
+        messages = _conversation(2)
+        before.save("s", "t", prefix_hash(messages), "tok-persisted")
+
+        after = KimiPrefixCache(max_entries=8, ttl=60, redis_client=fakeredis.FakeRedis(server=server, decode_responses=True))
+        follow_up = messages + [{"role": "user", "content": "again"}]
+
+        assert after.find("s", "t", follow_up)[0] == "tok-persisted"
+        assert after.get_stats()["redis_hits"] == 1
+        assert after.find("s", "t", follow_up)[0] == "tok-persisted"  # Now served locally
+        assert after.get_stats()["redis_hits"] == 1
+
+    def test_redis_failure_falls_back_to_memory(self):
+        class BrokenRedis:
+            calls = 0
+
+            def set(self, *args, **kwargs):
+                BrokenRedis.calls += 1
+                raise ConnectionError("down")
+
+            def mget(self, *args):
+                BrokenRedis.calls += 1
+                raise ConnectionError("down")
+
+        cache = KimiPrefixCache(max_entries=8, ttl=60, redis_client=BrokenRedis())
+        cache.save("s", "t", "a", "tok-a")
+        cache.save("s", "t", "b", "tok-b")  # Redis skipped while backing off
+
+        assert cache.get("s", "t", "a") == "tok-a"
+        assert cache.get("s", "t", "missing") is None
+        assert BrokenRedis.calls == 1
+
+
+def test_module_api_uses_global_store(monkeypatch):
+    monkeypatch.setattr(kimi_cache, "_kimi_cache", KimiPrefixCache(max_entries=8, ttl=60, redis_client=None))
+    messages = _conversation(1)
+
+    kimi_cache.save_cache_token("s", "tool", prefix_hash(messages), "tok")
+
+    assert kimi_cache.get_cache_token("s", "tool", prefix_hash(messages)) == "tok"
+    assert kimi_cache.find_cache_token("s", "tool", messages + [{"role": "user", "content": "q"}]) == "tok"
+
+
+def test_async_chat_finds_token_off_the_event_loop(monkeypatch):
+    lookup_threads = []
+
+    def find_cache_token(session_id, tool_name, messages):
+        lookup_threads.append(threading.get_ident())
+        return "tok-123456"
+
+    monkeypatch.setattr(kimi_cache, "find_cache_token", find_cache_token)
+    sent = {}
+
+    async def create(**params):
+        sent.update(params)
+        message = SimpleNamespace(content="ok", tool_calls=None)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="stop")],
+            usage=None, model="kimi", id="id", created=0,
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    async def run():
+        response = await chat_completions_create_async(
+            client, model="kimi", messages=_conversation(1), session_id="s"
+        )
+        return response, threading.get_ident()
+
+    response, loop_thread = asyncio.run(run())
+
+    assert response.metadata["cache_attached"] is True
+    assert sent["extra_headers"]["Msh-Context-Cache-Token"] == "tok-123456"
+    assert lookup_threads and lookup_threads[0] != loop_thread
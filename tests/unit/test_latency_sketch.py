@@ -0,0 +1,102 @@
+"""
+Unit tests for mergeable latency sketches
+
+Tests:
+- Quantiles stay within the relative-error bound
+- Merging equals recording everything into one sketch
+- Serialization round-trips (cross-process merge)
+- Windowed sketches drop expired slots
+- Collector exports sketches that merge across processes
+"""
+
+import json
+import random
+
+import pytest
+
+from utils.infrastructure.latency_sketch import LatencySketch, WindowedLatencySketch
+from utils.infrastructure.performance_metrics import ToolMetrics, merge_latency_sketches
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch:
+    """Test LatencySketch accuracy and merging."""
+
+    def test_relative_error_bound(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1.5) for _ in range(20000)]
+        sketch = LatencySketch(alpha=0.01)
+        for v in values:
+            sketch.record(v)
+
+        for q, got in zip((0.5, 0.9, 0.95, 0.99, 0.999), sketch.quantiles((0.5, 0.9, 0.95, 0.99, 0.999))):
+            assert got == pytest.approx(_exact(values, q), rel=0.0101)
+        assert sketch.quantile(0) == min(values)
+        assert sketch.quantile(1) == max(values)
+
+    def test_zero_and_empty(self):
+        sketch = LatencySketch()
+        assert sketch.quantiles((0.5, 0.99)) == [0.0, 0.0]
+        for v in (0.0, 0.0, 0.0, 5.0):
+            sketch.record(v)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1) == 5.0
+
+    def test_merge_and_round_trip(self):
+        rng = random.Random(3)
+        a, b, both = LatencySketch(), LatencySketch(), LatencySketch()
+        for i in range(5000):
+            v = rng.expovariate(1 / 200)
+            (a if i % 2 else b).record(v)
+            both.record(v)
+
+        merged = LatencySketch.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+        assert merged.count == both.count
+        assert merged.quantiles((0.5, 0.99)) == both.quantiles((0.5, 0.99))
+
+        with pytest.raises(ValueError):
+            merged.merge(LatencySketch(alpha=0.02))
+
+    def test_window_expires_old_slots(self):
+        now = [0.0]
+        window = WindowedLatencySketch(window_seconds=60, slots=6, clock=lambda: now[0])
+        window.record(1000.0)
+        now[0] = 30.0
+        window.record(10.0)
+        assert len(window) == 2
+
+        now[0] = 65.0
+        snapshot = window.snapshot()
+        assert snapshot.count == 1
+        assert snapshot.max == 10.0
+
+
+class TestToolMetricsSketches:
+    """Test per-tool sketch export and cross-process merge."""
+
+    def test_unsorted_samples_give_correct_percentiles(self):
+        metrics = ToolMetrics(tool_name="t")
+        values = list(range(1, 1001))
+        random.Random(1).shuffle(values)
+        for v in values:
+            metrics.record_call(success=True, latency_ms=float(v))
+
+        stats = metrics.get_stats()
+        assert stats["p50_latency_ms"] == pytest.approx(500, rel=0.0101)
+        assert stats["p99_latency_ms"] == pytest.approx(990, rel=0.0101)
+
+    def test_merge_exports_from_processes(self):
+        exports = []
+        for offset in (0, 500):
+            metrics = ToolMetrics(tool_name="chat")
+            for v in range(1 + offset, 501 + offset):
+                metrics.record_call(success=True, latency_ms=float(v))
+            exports.append({"chat": metrics.export_sketches()})
+
+        merged = merge_latency_sketches(exports)["chat"]
+        assert merged.count == 1000
+        assert merged.quantile(0.99) == pytest.approx(990, rel=0.0101)
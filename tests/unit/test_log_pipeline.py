@@ -0,0 +1,149 @@
+"""
+Unit tests for the log pipeline (src/utils/log_pipeline.py)
+
+Tests:
+- A full ring buffer drops the oldest records and counts them
+- Records are written in batches, on flush() and by the writer thread
+- File sinks rotate by size and keep a bounded number of backups
+- Binary frames round-trip and a truncated trailing frame is ignored
+- read_tail() reads JSONL and binary logs, continuing into the rotated file
+- PipelineHandler routes logging records through a pipeline
+"""
+
+import logging
+import time
+
+import pytest
+
+from src.utils.log_pipeline import (
+    LogPipeline,
+    PipelineHandler,
+    RingBuffer,
+    RotatingFileSink,
+    dumps,
+    encode_binary_frame,
+    iter_binary_records,
+    main,
+    read_tail,
+)
+
+
+class _ListSink:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append(list(batch))
+
+
+def test_ring_buffer_drops_oldest_and_counts():
+    ring = RingBuffer(3)
+    for i in range(5):
+        assert ring.put(i)
+
+    assert ring.drain(10) == [2, 3, 4]
+    assert (ring.accepted, ring.dropped) == (5, 2)
+
+
+def test_ring_buffer_drop_newest_rejects():
+    ring = RingBuffer(2, overflow="drop_newest")
+    results = [ring.put(i) for i in range(3)]
+
+    assert results == [True, True, False]
+    assert ring.drain(10) == [0, 1]
+    assert ring.dropped == 1
+
+
+def test_pipeline_writes_in_batches():
+    sink = _ListSink()
+    pipeline = LogPipeline(sink, capacity=100, batch_size=4, flush_interval=60)
+    pipeline.submit_many(list(range(10)))
+    pipeline.flush()
+
+    assert sink.batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert pipeline.stats()["written"] == 10
+    pipeline.close()
+
+
+def test_writer_thread_drains_on_interval():
+    sink = _ListSink()
+    pipeline = LogPipeline(sink, capacity=100, batch_size=100, flush_interval=0.05)
+    pipeline.submit(b"x")
+
+    deadline = time.monotonic() + 2
+    while not sink.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert sink.batches == [[b"x"]]
+    pipeline.close()
+
+
+def test_sink_errors_are_counted_not_raised(capsys):
+    def failing(batch):
+        raise OSError("disk full")
+
+    pipeline = LogPipeline(failing, capacity=10, batch_size=10, flush_interval=60)
+    pipeline.submit(b"x")
+    pipeline.flush()
+
+    assert pipeline.stats()["errors"] == 1
+    assert "disk full" in capsys.readouterr().err
+    pipeline.close()
+
+
+def test_rotating_sink_rotates_by_size(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = RotatingFileSink(str(path), max_bytes=40, backup_count=2)
+    for i in range(6):
+        sink([dumps({"i": i, "pad": "x" * 10})])
+    sink.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+    assert [r["i"] for r in read_tail(str(path), 2)] == [4, 5]
+
+
+def test_binary_frames_round_trip():
+    records = [dumps({"i": i}) for i in range(3)]
+    data = encode_binary_frame(records) + encode_binary_frame([dumps({"i": 3})])
+
+    assert list(iter_binary_records(data)) == records + [dumps({"i": 3})]
+    # A partially written frame at the end is skipped
+    assert list(iter_binary_records(data[:-2])) == records
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "binary"])
+def test_read_tail_both_formats(tmp_path, fmt):
+    path = tmp_path / "toolcalls.log"
+    pipeline = LogPipeline(RotatingFileSink(str(path), fmt=fmt), batch_size=3, flush_interval=60)
+    pipeline.submit_many([dumps({"event": "tool_start", "i": i}) for i in range(7)])
+    pipeline.close()
+
+    assert [r["i"] for r in read_tail(str(path), 4)] == [3, 4, 5, 6]
+
+
+def test_tail_cli_prints_json_lines(tmp_path, capsys):
+    path = tmp_path / "toolcalls.bin"
+    sink = RotatingFileSink(str(path), fmt="binary")
+    sink([dumps({"tool": "chat"}), dumps({"tool": "debug"})])
+    sink.close()
+
+    assert main(["tail", str(path), "-n", "1"]) == 0
+    assert capsys.readouterr().out.strip() == '{"tool": "debug"}'
+
+
+def test_pipeline_handler_formats_on_producer_side():
+    sink = _ListSink()
+    pipeline = LogPipeline(sink, batch_size=10, flush_interval=60)
+    handler = PipelineHandler(pipeline)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("test_log_pipeline.handler")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        logger.warning("value=%s", 42)
+        handler.flush()
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert sink.batches == [[b"WARNING value=42"]]
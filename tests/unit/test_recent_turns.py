@@ -0,0 +1,111 @@
+"""
+Unit tests for the in-memory recent turn index (duplicate-turn detection)
+
+Tests:
+- Duplicates are detected within the window, per conversation and role
+- Rings are bounded and conversations evicted LRU
+- Persisted turns are loaded once, on first access, even after a record
+- _is_duplicate_message no longer reads Supabase per call
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.conversation.recent_turns import RecentTurnIndex
+from utils.conversation.supabase_memory import SupabaseConversationMemory
+
+
+@pytest.fixture
+def index():
+    return RecentTurnIndex(ring_size=3, window_seconds=60, max_conversations=2)
+
+
+class TestRecentTurnIndex:
+    """Test RecentTurnIndex lookups and bounds."""
+
+    def test_duplicate_within_window(self, index):
+        index.record("a", "assistant", "hello", timestamp=1000.0)
+
+        assert index.is_duplicate("a", "assistant", "hello", now=1030.0)
+        assert not index.is_duplicate("a", "user", "hello", now=1030.0)
+        assert not index.is_duplicate("b", "assistant", "hello", now=1030.0)
+        assert not index.is_duplicate("a", "assistant", "hello", now=1061.0)
+        assert index.get_stats()["duplicates_rejected"] == 1
+
+    def test_ring_and_conversation_bounds(self, index):
+        for n in range(4):
+            index.record("a", "assistant", f"m{n}", timestamp=100.0 + n)
+        assert not index.is_duplicate("a", "assistant", "m0", now=110.0)
+        assert index.is_duplicate("a", "assistant", "m3", now=110.0)
+
+        index.record("b", "assistant", "x", timestamp=100.0)
+        index.record("c", "assistant", "x", timestamp=100.0)
+        stats = index.get_stats()
+        assert (stats["conversations"], stats["evictions"]) == (2, 1)
+        assert not index.is_duplicate("a", "assistant", "m3", now=110.0)
+
+    def test_warms_once_from_loader(self, index):
+        now = datetime.utcnow()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{"role": "assistant", "content": "old", "created_at": (now - timedelta(seconds=5)).isoformat()},
+                    {"role": "assistant", "content": "stale", "created_at": (now - timedelta(hours=1)).isoformat() + "Z"}]
+
+        assert index.is_duplicate("a", "assistant", "old", loader=loader)
+        assert not index.is_duplicate("a", "assistant", "stale", loader=loader)
+        assert len(calls) == 1
+        assert index.get_stats()["warmups"] == 1
+
+    def test_recorded_ring_is_still_warmed(self, index):
+        now = datetime.utcnow()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{"role": "assistant", "content": "ans", "created_at": (now - timedelta(seconds=5)).isoformat()}]
+
+        # supabase_memory records the user turn before checking the assistant turn
+        index.record("c", "user", "q")
+        assert index.is_duplicate("c", "assistant", "ans", loader=loader)
+        assert index.is_duplicate("c", "user", "q", loader=loader)
+        assert len(calls) == 1
+
+    def test_loader_failure_fails_open(self, index):
+        def loader():
+            raise ConnectionError("down")
+
+        assert not index.is_duplicate("a", "assistant", "x", loader=loader)
+        assert index.get_stats()["warmup_errors"] == 1
+
+
+class FakeStorage:
+    def __init__(self, messages):
+        self.messages = messages
+        self.reads = 0
+
+    def get_conversation_messages(self, conv_id, limit=10):
+        self.reads += 1
+        return self.messages
+
+
+class FakeMapper:
+    def get_or_create_conversation(self, continuation_id, title=None, metadata=None):
+        return f"uuid-{continuation_id}"
+
+
+def test_is_duplicate_message_reads_storage_once():
+    memory = SupabaseConversationMemory.__new__(SupabaseConversationMemory)
+    memory.storage = FakeStorage([{"role": "assistant", "content": "answer",
+                                   "created_at": datetime.utcnow().isoformat()}])
+    memory.mapper = FakeMapper()
+    memory.recent_turns = RecentTurnIndex()
+
+    assert memory._is_duplicate_message("conv", "answer", "assistant")
+    assert not memory._is_duplicate_message("conv", "other", "assistant")
+    assert not memory._is_duplicate_message("conv", "answer", "user")
+    memory.recent_turns.record("conv", "assistant", "other")
+    assert memory._is_duplicate_message("conv", "other", "assistant")
+    assert memory.storage.reads == 1
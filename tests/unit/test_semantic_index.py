@@ -0,0 +1,94 @@
+"""
+Unit tests for SemanticPromptIndex
+
+Tests:
+- Near-duplicate prompts match above threshold, unrelated prompts do not
+- Partition and scope isolation
+- LSH candidate search on large partitions
+- LRU bound and TTL expiry
+- Persistence across instances
+"""
+
+import tempfile
+from pathlib import Path
+
+from utils.caching.semantic_index import HashedNgramEmbedder, SemanticPromptIndex
+
+
+PROMPT = "Analyze this Python module for security issues and explain each finding in detail"
+NEAR_DUPLICATE = "Please analyze this python module for security issues and explain every finding in detail"
+UNRELATED = "Write a haiku about autumn leaves falling on a quiet lake at dawn"
+
+
+class TestHashedNgramEmbedder:
+    """Test the hashed n-gram embedder."""
+
+    def test_embedding_is_deterministic_and_normalized(self):
+        embedder = HashedNgramEmbedder(dim=128)
+        a = embedder.embed(PROMPT)
+        b = embedder.embed(PROMPT)
+        assert a.shape == (128,)
+        assert (a == b).all()
+        assert abs(float((a * a).sum()) - 1.0) < 1e-5
+
+    def test_similar_texts_score_higher(self):
+        embedder = HashedNgramEmbedder()
+        base = embedder.embed(PROMPT)
+        assert float(base @ embedder.embed(NEAR_DUPLICATE)) > float(base @ embedder.embed(UNRELATED))
+
+
+class TestSemanticPromptIndex:
+    """Test the semantic index."""
+
+    def test_near_duplicate_matches(self):
+        index = SemanticPromptIndex()
+        index.add("k1", PROMPT, partition="balanced", scope="s", ttl=60)
+        index.add("k2", UNRELATED, partition="balanced", scope="s", ttl=60)
+
+        match = index.query(NEAR_DUPLICATE, partition="balanced", scope="s", threshold=0.7)
+        assert match is not None
+        assert match[0] == "k1"
+        assert index.query(NEAR_DUPLICATE, partition="balanced", scope="s", threshold=0.999) is None
+
+    def test_partition_and_scope_isolation(self):
+        index = SemanticPromptIndex()
+        index.add("k1", PROMPT, partition="fast", scope="s1", ttl=60)
+
+        assert index.query(PROMPT, partition="reasoning", scope="s1", threshold=0.5) is None
+        assert index.query(PROMPT, partition="fast", scope="s2", threshold=0.5) is None
+        assert index.query(PROMPT, partition="fast", scope="s1", threshold=0.5)[0] == "k1"
+
+    def test_lsh_search_on_large_partition(self):
+        index = SemanticPromptIndex(exact_search_limit=8)
+        for i in range(50):
+            index.add(f"filler{i}", f"unrelated filler prompt number {i} about topic {i * 7}", "balanced", "s", 60)
+        index.add("target", PROMPT, "balanced", "s", 60)
+
+        match = index.query(NEAR_DUPLICATE, partition="balanced", scope="s", threshold=0.7)
+        assert match is not None and match[0] == "target"
+        assert index.get_stats()["candidates_scored"] < 51
+
+    def test_lru_bound(self):
+        index = SemanticPromptIndex(max_entries_per_partition=3)
+        for i in range(5):
+            index.add(f"k{i}", f"prompt {i}", "balanced", "s", 60)
+        stats = index.get_stats()
+        assert stats["entries"] == 3
+        assert stats["evictions"] == 2
+
+    def test_expired_entries_do_not_match(self):
+        index = SemanticPromptIndex()
+        index.add("k1", PROMPT, "balanced", "s", ttl=-1)
+        assert index.query(PROMPT, "balanced", "s", threshold=0.5) is None
+        assert index.get_stats()["entries"] == 0
+
+    def test_persistence_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "index.npz"
+            index = SemanticPromptIndex(path=path, persist_every=0)
+            index.add("k1", PROMPT, "accurate", "s", ttl=60)
+            index.save()
+
+            restored = SemanticPromptIndex(path=path)
+            match = restored.query(NEAR_DUPLICATE, "accurate", "s", threshold=0.7)
+            assert match is not None and match[0] == "k1"
@@ -0,0 +1,176 @@
+"""
+Unit tests for the async streaming pipeline (src/streaming/streaming_adapter.py)
+
+Tests:
+- StreamSink coalesces tiny deltas into frames (by size and by time)
+- A slow client backs up the sink instead of growing memory without bound
+- Worker threads feed the sink on its own loop
+- astream_openai_chat_events with async and sync (thread-bridged) clients
+- Raw events are only retained when STREAM_DEBUG_EVENTS is set
+- A sync stream is not read far ahead of a slow consumer
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.streaming.streaming_adapter import (
+    StreamSink,
+    _aiter_in_thread,
+    _safe_call_chunk_callback,
+    astream_openai_chat_events,
+    stream_openai_chat_events,
+)
+
+
+def _event(content=None, reasoning=None):
+    delta = SimpleNamespace(content=content, reasoning_content=reasoning)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def _events():
+    return [_event(reasoning="think ")] * 3 + [_event(content=c) for c in "hello world"]
+
+
+class _SyncClient:
+    def __init__(self, events, fail_with=None):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._events = events
+        self._fail_with = fail_with
+
+    def _create(self, stream, **kwargs):
+        assert stream is True
+        yield from self._events
+        if self._fail_with:
+            raise self._fail_with
+
+
+class _AsyncClient:
+    def __init__(self, events):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._events = events
+
+    async def _create(self, stream, **kwargs):
+        async def stream_events():
+            for evt in self._events:
+                yield evt
+        return stream_events()
+
+
+class TestStreamSink:
+    """Test frame coalescing and backpressure."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_by_size_and_time(self):
+        frames = []
+        sink = StreamSink(frames.append, max_frame_chars=100, interval=0.02)
+
+        for _ in range(1000):
+            await sink("x")
+        await sink("tail")
+        await asyncio.sleep(0.05)  # Interval flush of the short tail
+
+        assert "".join(frames) == "x" * 1000 + "tail"
+        assert len(frames) <= 12
+        assert frames[-1].endswith("tail")
+        await sink.aclose()
+        assert sink.get_stats()["deltas"] == 1001
+
+    @pytest.mark.asyncio
+    async def test_slow_client_applies_backpressure(self):
+        frames = []
+
+        async def slow_send(frame):
+            await asyncio.sleep(0.01)
+            frames.append(frame)
+
+        sink = StreamSink(slow_send, max_frame_chars=10, interval=0.01,
+                          max_pending_chars=200, queue_frames=2)
+        max_pending = 0
+        for n in range(3000):
+            await sink("y")
+            max_pending = max(max_pending, sink._pending_chars)
+        await sink.aclose()
+
+        assert "".join(frames) == "y" * 3000
+        assert max_pending <= 200
+        assert sink.backpressure_waits > 0
+        assert len(frames) < 300  # Coalesced into bigger frames while backed up
+
+    @pytest.mark.asyncio
+    async def test_worker_thread_feeds_sink_loop(self):
+        received = []
+
+        async def send(frame):
+            assert threading.current_thread() is threading.main_thread()
+            received.append(frame)
+
+        sink = StreamSink(send, max_frame_chars=4, interval=0.01)
+
+        def produce():
+            for piece in ("ab", "cd", "ef"):
+                _safe_call_chunk_callback(sink, piece)
+
+        await asyncio.to_thread(produce)
+        await sink.aclose()
+        assert "".join(received) == "abcdef"
+
+
+class TestAsyncStreaming:
+    """Test the provider -> sink pipeline."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("client_cls", [_AsyncClient, _SyncClient])
+    async def test_stream_text_and_frames(self, client_cls, monkeypatch):
+        monkeypatch.delenv("STREAM_DEBUG_EVENTS", raising=False)
+        frames = []
+
+        text, raw = await astream_openai_chat_events(
+            client=client_cls(_events()), create_kwargs={"model": "m"},
+            on_chunk=frames.append, extract_reasoning=True,
+        )
+
+        assert text == "[Reasoning]\nthink think think \n\n[Response]\nhello world"
+        assert raw == []
+        assert "".join(frames) == "think " * 3 + "hello world"
+        assert len(frames) < 14
+
+    @pytest.mark.asyncio
+    async def test_raw_events_only_when_debugging(self, monkeypatch):
+        monkeypatch.setenv("STREAM_DEBUG_EVENTS", "true")
+        _, raw = await astream_openai_chat_events(client=_SyncClient(_events()), create_kwargs={})
+        assert len(raw) == 14
+
+    @pytest.mark.asyncio
+    async def test_partial_response_on_remote_close(self):
+        client = _SyncClient([_event(content="partial")], fail_with=httpx.RemoteProtocolError("closed"))
+        text, _ = await astream_openai_chat_events(client=client, create_kwargs={})
+        assert text == "partial"
+
+    @pytest.mark.asyncio
+    async def test_sync_stream_not_read_ahead(self):
+        produced = []
+
+        def open_stream():
+            for n in range(100):
+                produced.append(n)
+                yield n
+
+        consumed = 0
+        async for _ in _aiter_in_thread(open_stream, max_buffered=4):
+            consumed += 1
+            await asyncio.sleep(0.002)
+            assert len(produced) - consumed <= 6
+        assert consumed == 100
+
+
+def test_sync_adapter_keeps_legacy_contract():
+    deltas = []
+    text, raw = stream_openai_chat_events(
+        client=_SyncClient(_events()), create_kwargs={}, on_delta=deltas.append, extract_reasoning=False,
+    )
+    assert text == "hello world"
+    assert "".join(deltas) == "hello world"
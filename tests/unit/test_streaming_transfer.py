@@ -0,0 +1,264 @@
+"""
+Unit tests for streaming uploads/downloads (src/storage/streaming_transfer.py)
+
+Uses an in-process httpx.MockTransport that emulates Supabase Storage
+(single-request uploads, TUS resumable uploads, ranged downloads).
+
+Tests:
+- Single-pass upload hashes exactly what a separate full read would
+- Gzip uploads round-trip through a decompressing download
+- Resumable uploads continue from the server offset after a failed part
+- Interrupted downloads resume with a Range request; hash is verified
+- SupabaseUploadManager streams large files and dedups on the final hash
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import re
+from urllib.parse import unquote
+
+import httpx
+import pytest
+
+from src.storage.storage_exceptions import NonRetryableError
+from src.storage.streaming_transfer import StreamingTransfer
+
+
+class StorageStub:
+    """Handles storage requests for httpx.MockTransport."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}  # upload id -> {"key", "length", "data"}
+        self.fail_patches = 0
+        self.fail_download_after = None
+        self.requests = []
+        self.range_supported = True
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        path = unquote(request.url.path)
+        if path == "/storage/v1/upload/resumable" and request.method == "POST":
+            meta = dict(item.split(" ") for item in request.headers["Upload-Metadata"].split(","))
+            key = (base64.b64decode(meta["bucketName"]).decode(), base64.b64decode(meta["objectName"]).decode())
+            upload_id = str(len(self.uploads) + 1)
+            self.uploads[upload_id] = {"key": key, "length": int(request.headers["Upload-Length"]), "data": b""}
+            return httpx.Response(201, headers={"Location": f"http://stub/storage/v1/upload/resumable/{upload_id}"})
+        match = re.fullmatch(r"/storage/v1/upload/resumable/(\d+)", path)
+        if match:
+            upload = self.uploads[match.group(1)]
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Upload-Offset": str(len(upload["data"]))})
+            if self.fail_patches:
+                self.fail_patches -= 1
+                # The server kept half of the part before the connection dropped
+                body = request.read()
+                upload["data"] += body[:len(body) // 2]
+                return httpx.Response(503)
+            assert int(request.headers["Upload-Offset"]) == len(upload["data"])
+            upload["data"] += request.read()
+            if len(upload["data"]) == upload["length"]:
+                self.objects[upload["key"]] = upload["data"]
+            return httpx.Response(204, headers={"Upload-Offset": str(len(upload["data"]))})
+        if path == "/storage/v1/object/move":
+            move = json.loads(request.read())
+            src = (move["bucketId"], move["sourceKey"])
+            dst = (move["bucketId"], move["destinationKey"])
+            if dst in self.objects:
+                return httpx.Response(409, text="already exists")
+            self.objects[dst] = self.objects.pop(src)
+            return httpx.Response(200)
+        match = re.fullmatch(r"/storage/v1/object/([^/]+)/(.+)", path)
+        if match:
+            key = (match.group(1), match.group(2))
+            if request.method == "POST":
+                self.objects[key] = request.read()
+                return httpx.Response(200, json={"Key": "/".join(key)})
+            if request.method == "GET":
+                data = self.objects[key]
+                start = 0
+                if "Range" in request.headers and self.range_supported:
+                    start = int(request.headers["Range"].split("=")[1].rstrip("-"))
+                body = data[start:]
+                if self.fail_download_after is not None:
+                    cut, self.fail_download_after = self.fail_download_after, None
+                    return httpx.Response(206 if start else 200, stream=_Broken(body[:cut]))
+                return httpx.Response(206 if start and self.range_supported else 200, content=body)
+        match = re.fullmatch(r"/storage/v1/object/([^/]+)", path)
+        if match and request.method == "DELETE":
+            for prefix in json.loads(request.read())["prefixes"]:
+                self.objects.pop((match.group(1), prefix), None)
+            return httpx.Response(200, json=[])
+        return httpx.Response(404)
+
+
+class _Broken(httpx.SyncByteStream):
+    """Response body that drops the connection after some bytes."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def __iter__(self):
+        yield self.data
+        raise httpx.ReadError("connection reset")
+
+
+@pytest.fixture
+def stub():
+    return StorageStub()
+
+
+@pytest.fixture
+def transfer(stub):
+    with StreamingTransfer(url="http://stub", service_key="k", chunk_size=1000,
+                           resumable_threshold=5000, transport=httpx.MockTransport(stub)) as transfer:
+        yield transfer
+
+
+@pytest.fixture
+def payload(tmp_path):
+    data = os.urandom(1000) + b"compressible " * 300  # Under the resumable threshold
+    path = tmp_path / "payload.bin"
+    path.write_bytes(data)
+    return path, data
+
+
+class TestStreamingTransfer:
+    """Test single-pass uploads and downloads."""
+
+    def test_single_upload_hashes_in_same_pass(self, transfer, stub, payload):
+        path, data = payload
+        result = transfer.upload(path, "user-files", "a/b c.bin")
+
+        assert result.sha256 == hashlib.sha256(data).hexdigest()
+        assert stub.objects[("user-files", "a/b c.bin")] == data
+        assert (result.size, result.stored_size, result.upload_url) == (len(data), len(data), None)
+
+    def test_gzip_round_trip(self, transfer, stub, payload, tmp_path):
+        path, data = payload
+        result = transfer.upload(path, "user-files", "z.bin", compress=True)
+
+        stored = stub.objects[("user-files", "z.bin")]
+        assert gzip.decompress(stored) == data
+        assert result.stored_size == len(stored) < len(data)
+
+        downloaded = transfer.download("user-files", "z.bin", tmp_path / "out.bin",
+                                       expected_sha256=result.sha256, decompress=True)
+        assert (tmp_path / "out.bin").read_bytes() == data
+        assert downloaded.sha256 == result.sha256
+
+    def test_resumable_upload_resumes_from_server_offset(self, transfer, stub, tmp_path):
+        data = os.urandom(16_500)
+        path = tmp_path / "big.bin"
+        path.write_bytes(data)
+        stub.fail_patches = 2
+        progress = []
+
+        result = transfer.upload(path, "user-files", "big.bin", progress_callback=lambda d, t: progress.append(d))
+
+        assert stub.objects[("user-files", "big.bin")] == data
+        assert result.sha256 == hashlib.sha256(data).hexdigest()
+        assert result.resumes == 2
+        assert progress[-1] == len(data)
+
+    def test_resume_with_upload_url(self, transfer, stub, tmp_path):
+        data = os.urandom(12_000)
+        path = tmp_path / "big.bin"
+        path.write_bytes(data)
+        transfer.max_resumes = 0
+        stub.fail_patches = 1
+
+        with pytest.raises(Exception) as excinfo:
+            transfer.upload(path, "user-files", "big.bin")
+        upload_url = re.search(r"resume with (\S+)\)", str(excinfo.value)).group(1)
+
+        result = transfer.upload(path, "user-files", "big.bin", resume_url=upload_url)
+        assert stub.objects[("user-files", "big.bin")] == data
+        assert result.sha256 == hashlib.sha256(data).hexdigest()
+
+    def test_download_resumes_and_verifies(self, transfer, stub, tmp_path):
+        data = os.urandom(8000)
+        stub.objects[("user-files", "d.bin")] = data
+        stub.fail_download_after = 3000
+        dest = tmp_path / "d.bin"
+
+        result = transfer.download("user-files", "d.bin", dest, expected_sha256=hashlib.sha256(data).hexdigest())
+
+        assert dest.read_bytes() == data
+        assert result.resumes == 1
+        assert not (tmp_path / "d.bin.part").exists()
+
+        stub.range_supported = False
+        (tmp_path / "e.bin.part").write_bytes(data[:100])
+        transfer.download("user-files", "d.bin", tmp_path / "e.bin")
+        assert (tmp_path / "e.bin").read_bytes() == data
+
+        with pytest.raises(NonRetryableError):
+            transfer.download("user-files", "d.bin", tmp_path / "f.bin", expected_sha256="0" * 64)
+        assert not (tmp_path / "f.bin").exists()
+
+
+class FakeQuery:
+    """Chainable stand-in for a supabase-py table query."""
+
+    def __init__(self, client, table):
+        self.client, self.table, self.operation = client, table, "select"
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def insert(self, data):
+        self.operation = "insert"
+        return self
+
+    def update(self, data):
+        self.operation = "update"
+        return self
+
+    def execute(self):
+        if self.operation == "select":
+            existing = self.client.existing if self.table == "file_metadata" else None
+            return type("Result", (), {"data": [existing] if existing else []})()
+        return type("Result", (), {"data": [{"id": f"{self.table}-id"}]})()
+
+
+class FakeClient:
+    supabase_url = "http://stub"
+    supabase_key = "k"
+
+    def __init__(self, existing=None):
+        self.existing = existing
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def test_upload_manager_streams_large_files(stub, transfer, tmp_path):
+    from tools.supabase_upload import SupabaseUploadManager
+
+    data = os.urandom(20_000)
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+
+    manager = SupabaseUploadManager(FakeClient())
+    manager.streaming_threshold = 1000
+    manager._transfer = transfer
+    result = manager.upload_file(str(path), user_id="u1")
+
+    assert result["sha256_hash"] == digest
+    assert result["storage_path"] == f"u1/{digest[:2]}/{digest}/artifact.bin"
+    assert stub.objects == {("user-files", result["storage_path"]): data}
+
+    existing = {"file_id": "f", "path": "p", "file_size": 1, "content_type": "x", "bucket_id": "b", "sha256_hash": digest}
+    manager = SupabaseUploadManager(FakeClient(existing=existing))
+    manager.streaming_threshold = 1000
+    manager._transfer = transfer
+    assert manager.upload_file(str(path), user_id="u1")["deduplicated"]
+    assert len(stub.objects) == 1  # Staged copy removed
@@ -0,0 +1,104 @@
+"""
+Unit tests for memoized thread reconstruction in utils.conversation.threads
+
+Tests:
+- Repeated get_thread serves the memoized context without re-validation
+- add_turn appends to the memoized context
+- Turns appended by another writer are parsed incrementally
+- Returned contexts are independent copies
+- Supabase message dicts are converted only once per message
+"""
+
+import pytest
+
+from utils.conversation import threads
+from utils.conversation.turn_log import TurnLog
+from utils.infrastructure.storage_backend import InMemoryStorage
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = InMemoryStorage()
+    monkeypatch.setattr(threads, "get_storage", lambda: fake)
+    monkeypatch.setattr(threads, "_get_storage_backend", lambda: None)
+    threads.clear_thread_cache()
+    yield fake
+    threads.clear_thread_cache()
+    fake.shutdown()
+
+
+def _stats():
+    return threads.get_thread_cache_stats()
+
+
+class TestRedisPath:
+    """Test memoization over the Redis turn-log path."""
+
+    def test_add_turn_appends_to_memoized_thread(self, storage):
+        thread_id = threads.create_thread("chat", {"prompt": "hi"})
+        for i in range(5):
+            assert threads.add_turn(thread_id, "user", f"turn {i}")
+
+        context = threads.get_thread(thread_id)
+        assert [t.content for t in context.turns] == [f"turn {i}" for i in range(5)]
+        stats = _stats()
+        assert stats["misses"] == 0
+        assert stats["turns_parsed"] == 0
+
+    def test_external_append_is_parsed_incrementally(self, storage):
+        thread_id = threads.create_thread("chat", {})
+        threads.add_turn(thread_id, "user", "first")
+        threads.get_thread(thread_id)
+
+        # Another process appends a turn directly in storage
+        turn = threads.ConversationTurn(role="assistant", content="second", timestamp="t")
+        assert TurnLog(storage).append(thread_id, turn, "later") == 2
+
+        refreshed = threads.get_thread(thread_id)
+        assert [t.content for t in refreshed.turns] == ["first", "second"]
+        assert refreshed.last_updated_at == "later"
+        stats = _stats()
+        assert stats["incremental"] == 1
+        assert stats["turns_parsed"] == 1
+
+    def test_returned_context_is_a_copy(self, storage):
+        thread_id = threads.create_thread("chat", {})
+        threads.add_turn(thread_id, "user", "first")
+
+        context = threads.get_thread(thread_id)
+        context.turns.append(threads.ConversationTurn(role="user", content="local", timestamp="t"))
+
+        assert len(threads.get_thread(thread_id).turns) == 1
+
+    def test_missing_thread_is_dropped(self, storage):
+        thread_id = threads.create_thread("chat", {})
+        storage._store.clear()
+        assert threads.get_thread(thread_id) is None
+        assert _stats()["entries"] == 0
+
+
+class TestSupabasePath:
+    """Test memoized conversion of storage-factory dicts."""
+
+    def test_messages_converted_once(self, storage, monkeypatch):
+        thread_id = "5f0c5a8e-2f37-4e0c-9b8e-0e5a4f1d2c3b"
+        messages = [{"id": i, "role": "user", "content": f"m{i}", "created_at": f"t{i}"} for i in range(3)]
+        thread = {"id": thread_id, "messages": messages, "metadata": {"tool_name": "chat"},
+                  "created_at": "t0", "updated_at": "v1"}
+
+        class Backend:
+            def get_thread(self, _):
+                return dict(thread, messages=list(messages))
+
+        monkeypatch.setattr(threads, "_get_storage_backend", lambda: Backend())
+
+        assert len(threads.get_thread(thread_id).turns) == 3
+        assert len(threads.get_thread(thread_id).turns) == 3
+        messages.append({"id": 3, "role": "assistant", "content": "m3", "created_at": "t3"})
+        thread["updated_at"] = "v2"
+        context = threads.get_thread(thread_id)
+
+        assert [t.content for t in context.turns] == ["m0", "m1", "m2", "m3"]
+        stats = _stats()
+        assert (stats["misses"], stats["hits"], stats["incremental"]) == (1, 1, 1)
+        assert stats["turns_parsed"] == 4
@@ -0,0 +1,153 @@
+"""
+Unit tests for the token accounting service (utils/model/token_counter.py)
+
+Uses a whitespace "tokenizer" in place of tiktoken so tests don't need the
+BPE files.
+
+Tests:
+- Estimator: ASCII vs CJK weighting per model family
+- Exact counts are memoized by content and batched
+- fits() only tokenizes near the budget boundary
+- Calibration from exact counts
+- Degrades to estimates when no tokenizer can be loaded
+- Message-list counting and truncation
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import utils.model.token_counter as token_counter
+from utils.model.token_counter import TokenCounter, model_family
+
+
+class _WordEncoding:
+    name = "words"
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode_ordinary(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_ordinary_batch(self, texts):
+        return [self.encode_ordinary(t) for t in texts]
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    enc = _WordEncoding()
+    fake = SimpleNamespace(get_encoding=lambda name: enc, encoding_for_model=lambda model: enc)
+    monkeypatch.setattr(token_counter, "tiktoken", fake)
+    return enc
+
+
+def test_model_family():
+    assert model_family("kimi-k2-0905-preview").name == "kimi"
+    assert model_family("moonshot-v1-8k").name == "kimi"
+    assert model_family("glm-4.6").name == "glm"
+    assert model_family("gpt-4o").name == "openai"
+    assert model_family(None).name == "default"
+
+
+def test_estimate_weights_cjk_by_family():
+    counter = TokenCounter(calibrate=False)
+    assert counter.estimate("") == 0
+    assert counter.estimate("a" * 400) == 100
+
+    chinese = "你好世界" * 100
+    assert counter.estimate(chinese, "kimi-k2") == 240
+    assert counter.estimate(chinese, "gpt-4") == 400
+
+
+def test_exact_counts_are_memoized(encoding):
+    counter = TokenCounter(calibrate=False)
+    text = "one two three " * 100
+
+    assert counter.count(text, "glm-4.6") == 300
+    assert counter.count(text, "glm-4.6") == 300
+    assert counter.count_many([text, "a b", text], "glm-4.6") == [300, 2, 300]
+
+    assert encoding.encoded == [text, "a b"]
+    assert counter.get_stats()["memo_hits"] == 3
+    assert all(text not in key for key in counter._memo)  # Keyed by digest, not content
+
+
+def test_memo_is_bounded(encoding):
+    counter = TokenCounter(memo_size=2, calibrate=False)
+    for word in ("a", "b", "c"):
+        counter.count(word)
+    counter.count("a")
+    assert encoding.encoded == ["a", "b", "c", "a"]
+
+
+def test_fits_tokenizes_only_near_boundary(encoding):
+    counter = TokenCounter(exact_margin=0.1, calibrate=False)
+
+    assert counter.fits("x" * 400, 1000) == (True, 100)  # Far below
+    assert counter.fits("x" * 40_000, 1000) == (False, 10_000)  # Far above
+    assert encoding.encoded == []
+
+    near = "word " * 240  # Estimate 300 tokens, exactly 240 words
+    assert counter.fits(near, 290) == (True, 240)
+    assert encoding.encoded == [near]
+
+
+def test_calibration_from_exact_counts(encoding):
+    counter = TokenCounter(calibrate=True)
+    text = "ab " * 1000  # Estimate 750, exact 1000
+
+    before = counter.estimate(text)
+    for _ in range(5):
+        counter.count(text + " " * _)  # Distinct texts so each is tokenized
+    after = counter.estimate(text)
+
+    assert before == 750
+    assert before < after <= 1000
+    assert counter.get_stats()["calibration"]["default"] > 1.0
+
+
+def test_falls_back_to_estimates_without_tokenizer(monkeypatch):
+    calls = []
+
+    def broken(name):
+        calls.append(name)
+        raise OSError("no network")
+
+    monkeypatch.setattr(token_counter, "tiktoken", SimpleNamespace(get_encoding=broken, encoding_for_model=broken))
+    counter = TokenCounter(calibrate=False)
+
+    assert counter.count("a" * 400) == 100
+    assert counter.count("b" * 400) == 100
+    assert len(calls) == 1  # Failed load is not retried on every call
+    assert counter.get_stats()["exact_fallbacks"] == 2
+
+
+def test_count_messages(encoding):
+    counter = TokenCounter(calibrate=False)
+    messages = [
+        {"role": "system", "content": "be brief"},
+        {"role": "user", "content": [{"type": "text", "text": "hello there"}, {"type": "image_url"}]},
+        "plain string",
+    ]
+
+    # Content + role words, 4 tokens overhead per dict message
+    assert counter.count_messages(messages, exact=True) == (2 + 1) + (2 + 1) + 2 + 8
+    assert counter.count_messages(messages) > 8
+
+
+def test_truncate(encoding, monkeypatch):
+    counter = TokenCounter(calibrate=False)
+    text = "word " * 500
+
+    assert counter.truncate("short", 10) == "short"
+    assert counter.truncate(text, 50) == " ".join(["word"] * 50)
+
+    monkeypatch.setattr(token_counter, "tiktoken", None)
+    truncated = TokenCounter(calibrate=False).truncate(text, 50)
+    assert TokenCounter(calibrate=False).estimate(truncated) <= 50
+    assert text.startswith(truncated)
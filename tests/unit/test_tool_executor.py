@@ -0,0 +1,114 @@
+"""
+Unit tests for the WS daemon tool executor (src/daemon/ws/tool_executor.py)
+
+Tests:
+- _execute_tool_with_progress runs a tool end to end and streams frames
+- The same path works with debug logging enabled
+- Tool failures surface as ToolExecutionError carrying the tool name
+- execute_tool returns normalized outputs with latency metrics
+- Stream frames fan out to every single-flight subscriber
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from src.daemon.error_handling import ToolExecutionError
+from src.daemon.ws.tool_executor import ToolExecutor
+
+
+class _RecordingManager:
+    """Stands in for ResilientWebSocketManager and records every payload."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, ws, payload, critical=False):
+        self.sent.append(payload)
+        return True
+
+
+class _EchoTool:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def get_name(self):
+        return "echo"
+
+    async def execute(self, arguments, on_chunk=None):
+        if self.fail:
+            raise RuntimeError("boom")
+        if on_chunk is not None:
+            await on_chunk("partial")
+        return [{"type": "text", "text": arguments["prompt"]}]
+
+
+def _executor(tools):
+    executor = ToolExecutor(
+        server_tools=tools,
+        global_sem=asyncio.Semaphore(4),
+        provider_sems={},
+        call_timeout=5.0,
+        progress_interval=60.0,
+    )
+    executor.semantic_cache = None
+    return executor
+
+
+def _run_with_progress(executor, tool, manager):
+    return asyncio.run(
+        executor._execute_tool_with_progress(tool, {"prompt": "hi"}, None, "req-1", manager)
+    )
+
+
+@pytest.mark.parametrize("level", [logging.INFO, logging.DEBUG])
+def test_execute_tool_with_progress_end_to_end(level, caplog):
+    caplog.set_level(level, logger="src.daemon.ws.tool_executor")
+    manager = _RecordingManager()
+    success, outputs, error_msg = _run_with_progress(_executor({}), _EchoTool(), manager)
+
+    assert success is True
+    assert error_msg is None
+    assert outputs == [{"type": "text", "text": "hi"}]
+    ops = [p["op"] for p in manager.sent]
+    assert ops[-1] == "stream_complete"
+    assert "stream_chunk" in ops
+    if level == logging.DEBUG:
+        assert any("echo completed" in r.getMessage() for r in caplog.records)
+
+
+def test_execute_tool_with_progress_wraps_failures():
+    manager = _RecordingManager()
+    with pytest.raises(ToolExecutionError) as excinfo:
+        _run_with_progress(_executor({}), _EchoTool(fail=True), manager)
+    assert "echo" in str(excinfo.value)
+    assert all(p["op"] != "stream_complete" for p in manager.sent)
+
+
+def test_execute_tool_returns_outputs_with_latency_metrics():
+    executor = _executor({"echo": _EchoTool()})
+    success, outputs, error_msg = asyncio.run(
+        executor.execute_tool("echo", {"prompt": "hello"}, None, "req-2", _RecordingManager())
+    )
+
+    assert success is True
+    assert error_msg is None
+    assert outputs[0]["text"] == "hello"
+    assert "latency_ms" in outputs[0]["metadata"]["latency_metrics"]
+
+
+def test_stream_frames_fan_out_to_subscribers():
+    leader, follower = _RecordingManager(), _RecordingManager()
+    subscribers = [("ws-1", "req-1", leader), ("ws-2", "req-2", follower)]
+
+    success, _, _ = asyncio.run(
+        _executor({})._execute_tool_with_progress(
+            _EchoTool(), {"prompt": "hi"}, "ws-1", "req-1", leader, subscribers
+        )
+    )
+
+    assert success is True
+    for manager, req_id in ((leader, "req-1"), (follower, "req-2")):
+        assert [p["op"] for p in manager.sent] == ["stream_chunk", "stream_complete"]
+        assert {p["request_id"] for p in manager.sent} == {req_id}
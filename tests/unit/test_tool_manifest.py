@@ -0,0 +1,132 @@
+"""
+Unit tests for manifest-backed lazy tool loading (tools/manifest.py, tools/registry.py)
+
+Uses a throwaway tool module on sys.path so tests can observe exactly when a
+tool is imported and instantiated.
+
+Tests:
+- Eager build writes the manifest; next build serves it without importing
+- Lazy tool imports on first non-schema attribute access, once
+- Stale fingerprint (changed env) falls back to eager loading
+- Load failures are recorded and surfaced the same way as eager loading
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+import tools.registry as registry
+from tools.manifest import LazyTool, ToolManifest, compute_fingerprint
+
+_TOOL_SOURCE = textwrap.dedent(
+    '''
+    INSTANCES = []
+
+    class FakeTool:
+        def __init__(self):
+            INSTANCES.append(self)
+            self.name = "fake"
+            self.description = "A fake tool"
+
+        def get_name(self):
+            return "fake"
+
+        def get_description(self):
+            return "A fake tool"
+
+        def get_input_schema(self):
+            return {"type": "object", "properties": {"prompt": {"type": "string"}}}
+
+        def get_descriptor(self):
+            return {"name": "fake", "inputSchema": self.get_input_schema()}
+
+        def execute(self, arguments):
+            return ["ran", arguments]
+
+    class BrokenTool:
+        def __init__(self):
+            raise ValueError("boom")
+    '''
+)
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    (tmp_path / "fake_tool_mod.py").write_text(_TOOL_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop("fake_tool_mod", None)
+
+    monkeypatch.setattr(registry, "TOOL_MAP", {
+        "fake": ("fake_tool_mod", "FakeTool"),
+        "broken": ("fake_tool_mod", "BrokenTool"),
+    })
+    monkeypatch.setenv("ENABLED_TOOLS", "fake,broken")
+    monkeypatch.setenv("DISABLED_TOOLS", "version,listmodels")
+    monkeypatch.setenv("TOOL_LAZY_LOAD", "true")
+    monkeypatch.setenv("TOOL_MANIFEST_AUTOWRITE", "true")
+    monkeypatch.setenv("TOOL_MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    yield tmp_path / "manifest.json"
+    sys.modules.pop("fake_tool_mod", None)
+
+
+def _build():
+    reg = registry.ToolRegistry()
+    reg.build_tools()
+    return reg
+
+
+def test_eager_build_writes_manifest_then_lazy_build_skips_import(fake_tools):
+    reg = _build()
+    assert not isinstance(reg.list_tools()["fake"], LazyTool)
+    assert fake_tools.exists()
+
+    sys.modules.pop("fake_tool_mod", None)
+    reg = _build()
+    tool = reg.list_tools()["fake"]
+
+    assert isinstance(tool, LazyTool)
+    assert "fake_tool_mod" not in sys.modules
+    assert tool.name == "fake"
+    assert tool.description == "A fake tool"
+    assert tool.inputSchema["properties"] == {"prompt": {"type": "string"}}
+    assert reg.list_descriptors()["fake"]["name"] == "fake"
+    assert "fake_tool_mod" not in sys.modules
+
+
+def test_lazy_tool_loads_once_on_first_use(fake_tools):
+    _build()
+    sys.modules.pop("fake_tool_mod", None)
+    tool = _build().get_tool("fake")
+
+    assert not tool.is_loaded
+    assert tool.execute({"x": 1}) == ["ran", {"x": 1}]
+    assert tool.execute({"x": 2}) == ["ran", {"x": 2}]
+    assert tool.is_loaded
+    assert len(sys.modules["fake_tool_mod"].INSTANCES) == 1
+
+
+def test_stale_manifest_falls_back_to_eager(fake_tools, monkeypatch):
+    _build()
+    monkeypatch.setenv("DEFAULT_MODEL", "some-other-model")
+
+    assert ToolManifest.load(compute_fingerprint(registry.TOOL_MAP)) is None
+    reg = _build()
+    assert not isinstance(reg.list_tools()["fake"], LazyTool)
+    # Rewritten for the new settings
+    assert ToolManifest.load(compute_fingerprint(registry.TOOL_MAP)) is not None
+
+
+def test_load_errors_are_reported(fake_tools):
+    for _ in range(2):  # Eager, then from the manifest
+        reg = _build()
+        with pytest.raises(RuntimeError, match="Tool 'broken' failed to load: boom"):
+            reg.get_tool("broken")
+        assert "broken" not in reg.list_tools()
+
+
+def test_lazy_tool_surfaces_import_failure():
+    tool = LazyTool("ghost", "no_such_module_xyz", "Ghost", {"description": "d", "inputSchema": {}})
+    assert tool.get_description() == "d"
+    with pytest.raises(RuntimeError, match="Tool 'ghost' failed to load"):
+        tool.execute({})
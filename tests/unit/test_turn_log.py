@@ -0,0 +1,109 @@
+"""
+Unit tests for the append-only conversation turn log
+
+Tests:
+- Header + turn list layout and tail reads
+- Compare-and-append
+- Legacy whole-thread blobs are migrated on read
+- add_turn appends one record instead of rewriting the thread
+- A backend sharing the log does not cause duplicate turns
+"""
+
+import pytest
+
+from utils.conversation import threads
+from utils.conversation.models import ConversationTurn, ThreadContext
+from utils.conversation.turn_log import TurnLog, header_key, legacy_key, turns_key
+from utils.infrastructure.storage_backend import InMemoryStorage
+
+
+THREAD_ID = "0b7f9f0e-8a51-4c1e-9d4b-3f2a1e6c5d70"
+
+
+def _turn(i):
+    return ConversationTurn(role="user", content=f"turn {i}", timestamp=f"t{i}")
+
+
+def _context(n_turns=0):
+    return ThreadContext(
+        thread_id=THREAD_ID, created_at="c", last_updated_at="u", tool_name="chat",
+        turns=[_turn(i) for i in range(n_turns)], initial_context={"prompt": "hi"},
+    )
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = InMemoryStorage()
+    monkeypatch.setattr(threads, "get_storage", lambda: fake)
+    monkeypatch.setattr(threads, "_get_storage_backend", lambda: None)
+    threads.clear_thread_cache()
+    yield fake
+    threads.clear_thread_cache()
+    fake.shutdown()
+
+
+class TestTurnLog:
+    """Test the storage layout."""
+
+    def test_write_load_and_tail(self, storage):
+        log = TurnLog(storage)
+        log.write(_context(5))
+
+        assert storage.get_thread_header(header_key(THREAD_ID))["turn_count"] == "5"
+        assert log.load(THREAD_ID) == _context(5)
+        assert [t.content for t in log.load(THREAD_ID, tail=2).turns] == ["turn 3", "turn 4"]
+
+    def test_compare_and_append(self, storage):
+        log = TurnLog(storage)
+        log.write(_context(1))
+
+        assert log.append(THREAD_ID, _turn(1), "u2", expected_count=0) is None
+        assert log.append(THREAD_ID, _turn(1), "u2", expected_count=1) == 2
+        assert log.read_header(THREAD_ID)["last_updated_at"] == "u2"
+        assert log.append("missing", _turn(0), "u") is None
+
+    def test_legacy_blob_is_migrated(self, storage):
+        storage.setex(legacy_key(THREAD_ID), 60, _context(3).model_dump_json())
+        log = TurnLog(storage)
+
+        assert log.load(THREAD_ID) == _context(3)
+        assert log.read_header(THREAD_ID)["turn_count"] == 3
+        assert log.append(THREAD_ID, _turn(3), "u2", expected_count=3) == 4
+
+
+class TestThreadsOnTurnLog:
+    """Test threads.py writes through the turn log."""
+
+    def test_add_turn_appends_single_record(self, storage):
+        thread_id = threads.create_thread("chat", {"prompt": "hi"})
+        for i in range(3):
+            assert threads.add_turn(thread_id, "user", f"turn {i}")
+
+        records = storage.get_turn_records(turns_key(thread_id))
+        assert len(records) == 3
+        assert storage.get(legacy_key(thread_id)) is None
+        assert [t.content for t in threads.get_recent_turns(thread_id, 2)] == ["turn 1", "turn 2"]
+
+    def test_add_turn_on_legacy_thread(self, storage):
+        storage.setex(legacy_key(THREAD_ID), 60, _context(2).model_dump_json())
+
+        assert threads.add_turn(THREAD_ID, "assistant", "reply")
+        assert [t.content for t in threads.get_thread(THREAD_ID).turns] == ["turn 0", "turn 1", "reply"]
+
+    def test_backend_sharing_the_log_does_not_duplicate(self, storage, monkeypatch):
+        class SharingBackend:
+            """Appends the (rewritten) turn to the same log, like the dual backend."""
+
+            def get_thread(self, _):
+                return None
+
+            def add_turn(self, thread_id, role, content, **kwargs):
+                return TurnLog(storage).append(thread_id, ConversationTurn(
+                    role=role, content=content.upper(), timestamp="b"), "backend") is not None
+
+        thread_id = threads.create_thread("chat", {})
+        monkeypatch.setattr(threads, "_get_storage_backend", lambda: SharingBackend())
+
+        assert threads.add_turn(thread_id, "user", "hello")
+        assert [t.content for t in threads.get_thread(thread_id).turns] == ["HELLO"]
+        assert len(storage.get_turn_records(turns_key(thread_id))) == 1
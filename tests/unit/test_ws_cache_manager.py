@@ -0,0 +1,231 @@
+"""
+Unit tests for the WebSocket daemon CacheManager
+
+Tests:
+- Single-flight coalescing of identical concurrent calls
+- Cancellation only stops shared work when the last waiter leaves
+- Subscribers are attached to shared work only while their caller waits
+- Per-entry inflight TTL
+- Hit/miss/coalesce counters in get_stats()
+- BoundedResultStore LRU byte budget and lazy TTL expiry
+"""
+
+import asyncio
+
+import pytest
+
+from src.daemon.ws.cache_manager import BoundedResultStore, CacheManager
+
+
+class TestSingleFlight:
+    """Test single-flight coalescing by call_key."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_run_once(self):
+        cache = CacheManager()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        tasks = [asyncio.create_task(cache.run_single_flight("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert [r for r, _ in results] == ["result"] * 5
+        assert sum(1 for _, coalesced in results if coalesced) == 4
+
+        stats = cache.get_stats()
+        assert stats["inflight_started"] == 1
+        assert stats["inflight_coalesced"] == 4
+        assert stats["inflight_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        cache = CacheManager()
+
+        async def work():
+            return "ok"
+
+        (_, c1), (_, c2) = await asyncio.gather(
+            cache.run_single_flight("a", work),
+            cache.run_single_flight("b", work),
+        )
+        assert not c1 and not c2
+        assert cache.get_stats()["inflight_started"] == 2
+
+    @pytest.mark.asyncio
+    async def test_subscribers_follow_waiters(self):
+        cache = CacheManager()
+        release = asyncio.Event()
+        seen = []
+
+        async def work(subscribers):
+            await release.wait()
+            seen.append(list(subscribers))
+            return "done"
+
+        first = asyncio.create_task(cache.run_single_flight("key", work, subscriber="a"))
+        second = asyncio.create_task(cache.run_single_flight("key", work, subscriber="b"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        assert await second == ("done", True)
+        assert seen == [["b"]]
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_shared_work(self):
+        cache = CacheManager()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(cache.run_single_flight("key", work))
+        second = asyncio.create_task(cache.run_single_flight("key", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        result, coalesced = await second
+        assert result == "done"
+        assert coalesced
+        assert cache.get_stats()["inflight_cancelled"] == 0
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancels_shared_work(self):
+        cache = CacheManager()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(cache.run_single_flight("key", work))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+        assert cache.get_stats()["inflight_cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_inflight_entry_is_not_joined(self):
+        cache = CacheManager(inflight_ttl_secs=0)
+        release = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return calls
+
+        first = asyncio.create_task(cache.run_single_flight("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.run_single_flight("key", work))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert calls == 2
+        assert cache.get_stats()["inflight_expired"] == 1
+
+
+class TestResultCache:
+    """Test result cache counters."""
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_counters(self):
+        cache = CacheManager()
+        assert await cache.get_cached_result("key") is None
+        await cache.cache_result("key", ["value"])
+        assert await cache.get_cached_result("key") == ["value"]
+
+        stats = cache.get_stats()
+        assert stats["result_hits"] == 1
+        assert stats["result_misses"] == 1
+        assert stats["result_hit_rate"] == 0.5
+
+
+class TestBoundedResultStore:
+    """Test byte-bounded LRU result store."""
+
+    def _outputs(self, size):
+        return [{"type": "text", "text": "x" * size}]
+
+    def test_evicts_least_recently_used_over_budget(self):
+        store = BoundedResultStore(max_bytes=1000, ttl_secs=60)
+        store.set("a", self._outputs(300), now=0)
+        store.set("b", self._outputs(300), now=0)
+        # Touch "a" so "b" becomes least recently used
+        assert store.get("a", now=1) is not None
+        store.set("c", self._outputs(300), now=2)
+
+        assert "a" in store and "c" in store
+        assert "b" not in store
+        assert store.evictions == 1
+        assert store.current_bytes <= store.max_bytes
+
+    def test_max_entries_cap(self):
+        store = BoundedResultStore(max_bytes=10_000, ttl_secs=60, max_entries=2)
+        for key in ("a", "b", "c"):
+            store.set(key, self._outputs(10), now=0)
+        assert len(store) == 2
+        assert "a" not in store
+
+    def test_oversize_value_is_rejected(self):
+        store = BoundedResultStore(max_bytes=100, ttl_secs=60)
+        assert store.set("big", self._outputs(1000), now=0) is False
+        assert len(store) == 0
+        assert store.rejected_oversize == 1
+
+    def test_lazy_expiry(self):
+        store = BoundedResultStore(max_bytes=10_000, ttl_secs=10)
+        store.set("a", self._outputs(10), now=0)
+        store.set("b", self._outputs(10), now=5)
+
+        assert store.get("a", now=11) is None
+        assert store.get("b", now=11) is not None
+        assert store.expirations == 1
+        assert store.expire(now=20) == 1
+        assert store.current_bytes == 0
+
+    def test_overwrite_keeps_byte_accounting(self):
+        store = BoundedResultStore(max_bytes=10_000, ttl_secs=10)
+        store.set("a", self._outputs(100), now=0)
+        store.set("a", self._outputs(200), now=5)
+        assert len(store) == 1
+        # Stale heap item from the first write must not expire the new value
+        assert store.get("a", now=12) is not None
+        assert store.current_bytes == store.get_stats()["bytes"]
+
+    @pytest.mark.asyncio
+    async def test_cache_manager_reports_store_stats(self):
+        cache = CacheManager(result_max_bytes=500)
+        await cache.cache_result("a", self._outputs(300))
+        await cache.cache_result("b", self._outputs(300))
+
+        stats = cache.get_stats()
+        assert stats["cached_results_count"] == 1
+        assert stats["result_evictions"] == 1
+        assert 0 < stats["cached_results_bytes"] <= 500
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
 from typing import Any, Dict, List
 
+from src.utils.log_pipeline import is_binary_log, read_tail
 from tools.shared.base_tool import BaseTool
 from src.providers.registry import ModelProviderRegistry
 
@@ -53,6 +55,8 @@ class HealthTool(BaseTool):
         try:
             if not path.exists():
                 return []
+            if is_binary_log(path):
+                return [json.dumps(record, ensure_ascii=False) for record in read_tail(str(path), n)]
             # Simple, small-tail reader (files are expected to be small-local JSONL)
             with path.open("r", encoding="utf-8", errors="ignore") as f:
                 lines = f.readlines()
@@ -4,6 +4,7 @@ from typing import Any, Dict
 from pathlib import Path
 
 from mcp.types import TextContent
+from src.utils.log_pipeline import read_tail
 from tools.shared.base_tool import BaseTool
 
 
@@ -13,7 +14,7 @@ class ToolcallLogTail(BaseTool):
 
     def get_description(self) -> str:
         return (
-            "Return the last N tool-call events from EX_TOOLCALL_LOG_PATH JSONL file (sanitized)."
+            "Return the last N tool-call events from the EX_TOOLCALL_LOG_PATH log (JSONL or binary, sanitized)."
         )
 
     def get_input_schema(self) -> Dict[str, Any]:
@@ -40,12 +41,8 @@ class ToolcallLogTail(BaseTool):
                 "reason": "EX_TOOLCALL_LOG_PATH not set",
             }))]
         try:
-            lines: list[str] = []
-            with open(p, "r", encoding="utf-8") as f:
-                for line in f:
-                    lines.append(line.rstrip("\n"))
-            tail = lines[-n:]
-            events = [json.loads(x) for x in tail if x.strip()]
+            # JSONL or binary (EX_TOOLCALL_LOG_FORMAT), continuing into the last rotated file
+            events = read_tail(p, n)
             return [TextContent(type="text", text=json.dumps({
                 "status": "ok",
                 "count": len(events),
@@ -0,0 +1,290 @@
+"""Tool manifest: cached names, descriptions and schemas of every tool.
+
+Listing tools used to require importing every tool module (and with them the
+workflow engine and provider SDKs) and instantiating each class at startup.
+The manifest stores what list_tools needs on disk, so the registry can hand
+out LazyTool stand-ins and import a tool module only when it is first used.
+
+Build step (Dockerfile / CI / after changing tools):
+    python -m tools.manifest build      # import all tools, write manifest
+    python -m tools.manifest check      # exit 1 if missing or stale
+
+A manifest is only used while its fingerprint matches: the tool map, size and
+mtime of the tool/provider/config sources, and the env settings that shape
+schemas (default model, router sentinels, which provider keys are set). A
+missing or stale manifest makes the registry import tools eagerly, as before,
+and rewrite the manifest for the next start.
+
+Configuration:
+    TOOL_LAZY_LOAD=true                           (serve list_tools from the manifest)
+    TOOL_MANIFEST_PATH=.cache/tool_manifest.json
+    TOOL_MANIFEST_AUTOWRITE=true                  (rewrite a stale manifest after an eager build)
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Sources whose changes can alter a tool's description or schema
+_SOURCE_DIRS = ("tools", "src/providers", "config")
+
+# Env settings that change generated schemas (values are hashed)
+_SCHEMA_ENV_KEYS = ("DEFAULT_MODEL", "HIDDEN_MODEL_ROUTER_ENABLED", "ROUTER_SENTINEL_MODELS", "LOCALE")
+# Provider keys only matter by presence; never hash secret values
+_PRESENCE_ENV_KEYS = ("KIMI_API_KEY", "GLM_API_KEY", "OPENROUTER_API_KEY", "CUSTOM_API_URL")
+
+
+def _env_flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+def lazy_loading_enabled() -> bool:
+    return _env_flag("TOOL_LAZY_LOAD")
+
+
+def manifest_path() -> Path:
+    return Path(os.getenv("TOOL_MANIFEST_PATH", ".cache/tool_manifest.json"))
+
+
+def compute_fingerprint(tool_map: Dict[str, tuple[str, str]]) -> str:
+    """Fingerprint of everything a manifest entry is derived from."""
+    hasher = hashlib.sha256()
+    hasher.update(f"v{MANIFEST_VERSION}".encode())
+    hasher.update(json.dumps(sorted(tool_map.items())).encode())
+
+    for rel_dir in _SOURCE_DIRS:
+        base = _REPO_ROOT / rel_dir
+        if not base.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                if not filename.endswith(".py"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                rel = os.path.relpath(path, _REPO_ROOT)
+                hasher.update(f"{rel}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+
+    for key in _SCHEMA_ENV_KEYS:
+        hasher.update(f"{key}={os.getenv(key, '')}\n".encode())
+    for key in _PRESENCE_ENV_KEYS:
+        hasher.update(f"{key}:{bool(os.getenv(key))}\n".encode())
+    return hasher.hexdigest()
+
+
+def describe_tool(tool: Any) -> Dict[str, Any]:
+    """Manifest entry for a tool instance (everything list_tools/list_descriptors need)."""
+    entry: Dict[str, Any] = {
+        "description": tool.get_description(),
+        "inputSchema": tool.get_input_schema(),
+    }
+    for key, getter in (("annotations", "get_annotations"), ("descriptor", "get_descriptor")):
+        fn = getattr(tool, getter, None)
+        if fn is None:
+            continue
+        try:
+            value = fn()
+            json.dumps(value)
+        except Exception as e:
+            logger.debug(f"[TOOL_MANIFEST] Skipping {getter} for {tool.get_name()}: {e}")
+            continue
+        entry[key] = value
+    return entry
+
+
+class ToolManifest:
+    """In-memory view of the manifest file."""
+
+    def __init__(
+        self,
+        fingerprint: str,
+        tools: Optional[Dict[str, Dict[str, Any]]] = None,
+        errors: Optional[Dict[str, str]] = None,
+    ):
+        self.fingerprint = fingerprint
+        self.tools: Dict[str, Dict[str, Any]] = tools or {}
+        self.errors: Dict[str, str] = errors or {}
+
+    def covers(self, names: Iterable[str]) -> bool:
+        return all(name in self.tools or name in self.errors for name in names)
+
+    @classmethod
+    def load(cls, fingerprint: str, path: Optional[Path] = None) -> Optional["ToolManifest"]:
+        """Load the manifest if it exists and matches the fingerprint."""
+        path = path or manifest_path()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[TOOL_MANIFEST] Ignoring unreadable manifest {path}: {e}")
+            return None
+
+        if data.get("version") != MANIFEST_VERSION or data.get("fingerprint") != fingerprint:
+            logger.info(f"[TOOL_MANIFEST] Manifest {path} is stale")
+            return None
+        return cls(fingerprint, data.get("tools") or {}, data.get("errors") or {})
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Write atomically (readers never see a partial file)."""
+        path = path or manifest_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "fingerprint": self.fingerprint,
+                    "built_at": time.time(),
+                    "tools": self.tools,
+                    "errors": self.errors,
+                },
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp, path)
+        return path
+
+
+class LazyTool:
+    """
+    Stand-in for a tool instance, built from its manifest entry.
+
+    Name, description, schema, annotations and descriptor are served from the
+    manifest. Any other attribute (execute, get_system_prompt, ...) imports
+    and instantiates the real tool on first access and delegates to it.
+    """
+
+    def __init__(self, name: str, module_path: str, class_name: str, entry: Dict[str, Any]):
+        self._module_path = module_path
+        self._class_name = class_name
+        self._entry = entry
+        self._instance: Any = None
+        self._load_lock = threading.Lock()
+        self.name = name
+        self.description = entry.get("description", "")
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def load(self) -> Any:
+        """Import and instantiate the real tool (once)."""
+        if self._instance is None:
+            with self._load_lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    try:
+                        module = __import__(self._module_path, fromlist=[self._class_name])
+                        self._instance = getattr(module, self._class_name)()
+                    except Exception as e:
+                        raise RuntimeError(f"Tool '{self.name}' failed to load: {e}") from e
+                    logger.info(
+                        f"[TOOL_MANIFEST] Loaded tool {self.name} on first use "
+                        f"({(time.perf_counter() - start) * 1000:.0f}ms)"
+                    )
+        return self._instance
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_description(self) -> str:
+        return self.description
+
+    def get_input_schema(self) -> Dict[str, Any]:
+        return copy.deepcopy(self._entry.get("inputSchema") or {"type": "object", "properties": {}})
+
+    @property
+    def inputSchema(self) -> Dict[str, Any]:  # noqa: N802 - MCP field name
+        return self.get_input_schema()
+
+    def get_annotations(self) -> Optional[Dict[str, Any]]:
+        if "annotations" in self._entry:
+            return copy.deepcopy(self._entry["annotations"])
+        return self.load().get_annotations()
+
+    def get_descriptor(self) -> Dict[str, Any]:
+        if "descriptor" in self._entry:
+            return copy.deepcopy(self._entry["descriptor"])
+        return self.load().get_descriptor()
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for attributes not served from the manifest
+        if attr.startswith("__") or attr in ("_instance", "_entry", "_load_lock"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "lazy"
+        return f"<LazyTool {self.name} ({state})>"
+
+
+def build_manifest(names: Optional[Iterable[str]] = None, path: Optional[Path] = None) -> ToolManifest:
+    """Import tools and write their manifest (all tools in TOOL_MAP by default)."""
+    from tools.registry import TOOL_MAP
+
+    fingerprint = compute_fingerprint(TOOL_MAP)
+    manifest = ToolManifest(fingerprint)
+    for name in sorted(names or TOOL_MAP):
+        module_path, class_name = TOOL_MAP[name]
+        try:
+            module = __import__(module_path, fromlist=[class_name])
+            manifest.tools[name] = describe_tool(getattr(module, class_name)())
+        except Exception as e:
+            manifest.errors[name] = str(e)
+    manifest.save(path)
+    return manifest
+
+
+def _main(argv: Optional[list[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or check the tool schema manifest")
+    parser.add_argument("command", choices=("build", "check"))
+    parser.add_argument("--path", type=Path, default=None, help="Manifest path (default: TOOL_MANIFEST_PATH)")
+    args = parser.parse_args(argv)
+
+    from src.bootstrap import load_env
+
+    load_env()
+    path = args.path or manifest_path()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        manifest = build_manifest(path=path)
+        print(
+            f"Wrote {path}: {len(manifest.tools)} tools, {len(manifest.errors)} failed "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
+        for name, error in sorted(manifest.errors.items()):
+            print(f"  {name}: {error}")
+        return 0
+
+    from tools.registry import TOOL_MAP
+
+    manifest = ToolManifest.load(compute_fingerprint(TOOL_MAP), path)
+    print(f"{path}: {'fresh' if manifest else 'missing or stale'}")
+    return 0 if manifest else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -244,12 +244,8 @@ class KimiChatWithToolsTool(BaseTool):
                         # Only when no token is present yet
                         sid = arguments.get("_session_id")
                         if sid:
-                            import hashlib as _hash
-                            parts = []
-                            for m in norm_msgs[:6]:
-                                parts.append(str(m.get("role","")) + "\n" + str(m.get("content",""))[:2048])
-                            pf = _hash.sha256("\n".join(parts).encode("utf-8", errors="ignore")).hexdigest()
-                            existing = getattr(prov, "get_cache_token", lambda *a, **k: None)(sid, "kimi_chat_with_tools", pf)
+                            from src.providers import kimi_cache
+                            existing = kimi_cache.find_cache_token(sid, self.get_name(), norm_msgs)
                             if not existing:
                                 # Prime using provider wrapper (captures token via headers)
                                 _ = await _aio.to_thread(
@@ -267,8 +263,8 @@ class KimiChatWithToolsTool(BaseTool):
                 except Exception:
                     pass
 
-                # Handle streaming in a background thread via shared adapter; accumulate content (no tool_calls loop in stream mode)
-                def _stream_call():
+                # Stream via the shared async pipeline; accumulate content (no tool_calls loop in stream mode)
+                async def _stream_call():
                     extra_headers = {"Msh-Trace-Mode": "on"}
                     try:
                         # Defensive header length cap to avoid NGINX 400 on large headers
@@ -290,20 +286,15 @@ class KimiChatWithToolsTool(BaseTool):
                         if ck:
                             _safe_set("Idempotency-Key", str(ck))
                         sid = arguments.get("_session_id")
-                        ctok = getattr(prov, "get_cache_token", None)
-                        if ctok and sid:
-                            import hashlib
-                            parts = []
-                            for m in norm_msgs[:6]:
-                                parts.append(str(m.get("role","")) + "\n" + str(m.get("content",""))[:2048])
-                            pf = hashlib.sha256("\n".join(parts).encode("utf-8", errors="ignore")).hexdigest()
-                            t = prov.get_cache_token(sid, "kimi_chat_with_tools", pf)
+                        if sid:
+                            from src.providers import kimi_cache
+                            t = kimi_cache.find_cache_token(sid, self.get_name(), norm_msgs)
                             if t:
                                 _safe_set("Msh-Context-Cache-Token", t)
                     except Exception:
                         pass
                     # Use centralized adapter
-                    from src.streaming.streaming_adapter import stream_openai_chat_events
+                    from src.streaming.streaming_adapter import astream_openai_chat_events
                     # Build kwargs without None entries for provider compliance
                     _ckw = {
                         "model": model_used,
@@ -317,7 +308,7 @@ class KimiChatWithToolsTool(BaseTool):
                         _ckw["tool_choice"] = tool_choice
 
                     # NEW (2025-10-24): Pass streaming callback if provided
-                    return stream_openai_chat_events(
+                    return await astream_openai_chat_events(
                         client=prov.client,
                         create_kwargs=_ckw,
                         on_chunk=on_chunk,  # Forward callback for progressive streaming
@@ -329,7 +320,7 @@ class KimiChatWithToolsTool(BaseTool):
                 except Exception:
                     timeout_secs = 240.0
                 try:
-                    content_text, raw_stream = await _aio.wait_for(_aio.to_thread(_stream_call), timeout=timeout_secs)
+                    content_text, raw_stream = await _aio.wait_for(_stream_call(), timeout=timeout_secs)
                 except _aio.TimeoutError:
                     err = {"status": "execution_error", "error": f"Kimi streaming timed out after {int(timeout_secs)}s"}
                     return [TextContent(type="text", text=json.dumps(err, ensure_ascii=False))]
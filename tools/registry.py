@@ -15,11 +15,20 @@ Configuration logic:
 4. Apply DISABLED_TOOLS blacklist
 
 Always expose utility tools (listmodels, version) unless explicitly disabled.
+
+With TOOL_LAZY_LOAD=true (default) and a fresh tool manifest (see
+tools/manifest.py), tools are registered as LazyTool stand-ins: list_tools is
+served from the manifest and each tool module is imported on first use.
 """
 from __future__ import annotations
 
+import logging
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Set
+
+from tools import manifest
+
+logger = logging.getLogger(__name__)
 
 # Map tool names to import paths (module, class)
 TOOL_MAP: Dict[str, tuple[str, str]] = {
@@ -168,8 +177,7 @@ class ToolRegistry:
         except Exception as e:
             self._errors[name] = str(e)
 
-    def build_tools(self) -> None:
-        """Build tool set based on simplified configuration."""
+    def _active_tool_names(self) -> Set[str]:
         # Step 1: Determine base tool set
         enabled_tools_env = os.getenv("ENABLED_TOOLS", "").strip()
         if enabled_tools_env:
@@ -195,11 +203,53 @@ class ToolRegistry:
 
         # Step 3: Apply DISABLED_TOOLS blacklist
         disabled = {t.strip().lower() for t in os.getenv("DISABLED_TOOLS", "").split(",") if t.strip()}
-        active = {t for t in active if t not in disabled}
+        return {t for t in active if t not in disabled}
+
+    def build_tools(self) -> None:
+        """Build tool set based on simplified configuration."""
+        active = self._active_tool_names()
 
-        # Step 4: Load all active tools
+        if not manifest.lazy_loading_enabled():
+            for name in sorted(active):
+                self._load_tool(name)
+            return
+
+        # Step 4: Serve from the manifest when it is fresh and covers every active tool
+        fingerprint = manifest.compute_fingerprint(TOOL_MAP)
+        cached = manifest.ToolManifest.load(fingerprint)
+        if cached is not None and cached.covers(active):
+            for name in sorted(active):
+                if name in cached.tools:
+                    module_path, class_name = TOOL_MAP[name]
+                    self._tools[name] = manifest.LazyTool(name, module_path, class_name, cached.tools[name])
+                else:
+                    self._errors[name] = cached.errors[name]
+            logger.info(f"[TOOLS] Registered {len(self._tools)} tools from manifest (imported on first use)")
+            return
+
+        # Step 5: Missing/stale manifest - load eagerly, then refresh it for the next start
         for name in sorted(active):
             self._load_tool(name)
+        if os.getenv("TOOL_MANIFEST_AUTOWRITE", "true").strip().lower() in ("1", "true", "yes", "on"):
+            self._write_manifest(fingerprint, active)
+
+    def _write_manifest(self, fingerprint: str, active: Set[str]) -> None:
+        # Keep entries for tools outside this profile if the old manifest is still valid
+        refreshed = manifest.ToolManifest.load(fingerprint) or manifest.ToolManifest(fingerprint)
+        for name in active:
+            refreshed.tools.pop(name, None)
+            refreshed.errors.pop(name, None)
+        for name, tool in self._tools.items():
+            try:
+                refreshed.tools[name] = manifest.describe_tool(tool)
+            except Exception as e:
+                refreshed.errors[name] = str(e)
+        refreshed.errors.update({n: e for n, e in self._errors.items() if n in TOOL_MAP})
+        try:
+            path = refreshed.save()
+            logger.info(f"[TOOLS] Wrote tool manifest {path} ({len(refreshed.tools)} tools)")
+        except OSError as e:
+            logger.warning(f"[TOOLS] Could not write tool manifest: {e}")
 
     def get_tool(self, name: str) -> Any:
         if name in self._tools:
@@ -130,7 +130,7 @@ class FileHandlingMixin:
         
         return None
     
-    def _validate_token_limit(self, content: str, content_type: str = "Content") -> None:
+    def _validate_token_limit(self, content: str, content_type: str = "Content") -> int:
         """
         Validate that content doesn't exceed the MCP prompt size limit.
         
@@ -138,6 +138,9 @@ class FileHandlingMixin:
             content: The content to validate
             content_type: Description of the content type for error messages
         
+        Returns:
+            Token count of the content (estimated, exact near the limit)
+        
         Raises:
             ValueError: If content exceeds size limit
         """
@@ -148,6 +151,7 @@ class FileHandlingMixin:
             raise ValueError(f"{content_type} too large: {error_msg}")
         
         logger.debug(f"{self.name} tool {content_type.lower()} token validation passed: {token_count:,} tokens")
+        return token_count
     
     # ================================================================================
     # Conversation-Aware File Tracking
@@ -523,16 +527,12 @@ class FileHandlingMixin:
                     reserve_tokens=reserve_tokens,
                     include_line_numbers=self.wants_line_numbers_by_default(),
                 )
-                self._validate_token_limit(file_content, context_description)
+                content_tokens = self._validate_token_limit(file_content, context_description)
                 content_parts.append(file_content)
 
                 # Track the expanded files as actually processed
                 actually_processed_files.extend(expanded_files)
 
-                # Estimate tokens for debug logging
-                from utils.model.token_utils import estimate_tokens
-
-                content_tokens = estimate_tokens(file_content)
                 logger.debug(
                     f"{self.name} tool successfully embedded {len(files_to_embed)} files ({content_tokens:,} tokens)"
                 )
@@ -16,6 +16,7 @@ PHASE 1 ENHANCEMENT: Added provider adapters for unified upload workflow
 import os
 from src.providers.registry_core import get_registry_instance
 import hashlib
+import uuid
 from src.providers.registry_core import get_registry_instance
 from typing import Optional, Callable, Dict, Any, List
 from pathlib import Path
@@ -24,6 +25,8 @@ from src.providers.registry_core import get_registry_instance
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from src.storage.storage_exceptions import NonRetryableError
+
 # Load environment variables
 load_dotenv()
 
@@ -147,6 +150,9 @@ class SupabaseUploadManager:
         self.default_bucket = default_bucket
         self.chunk_size = 5 * 1024 * 1024  # 5MB chunks for large files
         self.large_file_threshold = 50 * 1024 * 1024  # 50MB threshold
+        # Files above this are streamed (hashed while uploading) instead of read into memory
+        self.streaming_threshold = int(os.getenv("STORAGE_STREAMING_THRESHOLD", str(8 * 1024 * 1024)))
+        self._transfer = None
     
     def upload_file(
         self,
@@ -192,25 +198,21 @@ class SupabaseUploadManager:
         filename = filename or os.path.basename(file_path)
         bucket = bucket or self.default_bucket
         
-        # Calculate SHA256 hash
-        logger.info(f"Calculating SHA256 for {filename} ({file_size} bytes)")
-        file_hash = self.calculate_sha256(file_path)
+        if file_size > self.streaming_threshold:
+            return self._upload_file_streaming(
+                file_path, user_id, filename, file_size, bucket, progress_callback, tags
+            )
+
+        # Small file: one read serves both hashing and the upload
+        with open(file_path, 'rb') as f:
+            file_data = f.read()
+        file_hash = hashlib.sha256(file_data).hexdigest()
         
         # Check for existing file with same hash
         existing_file = self.check_existing_file(file_hash, user_id)
         if existing_file:
             logger.info(f"File with hash {file_hash} already exists, creating reference")
-            metadata_id = self.create_metadata_reference(
-                existing_file, user_id, filename, tags
-            )
-            return {
-                'file_id': existing_file['file_id'],
-                'storage_path': existing_file['path'],
-                'sha256_hash': file_hash,
-                'file_size': file_size,
-                'deduplicated': True,
-                'metadata_id': metadata_id
-            }
+            return self._deduplicated_result(existing_file, user_id, filename, file_hash, file_size, tags)
         
         # Start operation tracking
         operation_id = self.track_operation(
@@ -226,48 +228,156 @@ class SupabaseUploadManager:
             
             # Upload to storage
             logger.info(f"Uploading {filename} to {storage_path}")
-            upload_result = self.upload_to_storage(
-                file_path, bucket, storage_path, progress_callback
+            self.upload_to_storage(
+                file_path, bucket, storage_path, progress_callback, file_data=file_data
             )
 
-            # Extract file ID from upload result
-            # Supabase returns UploadResponse object with 'path' attribute
-            file_id = storage_path  # Use storage path as file ID
-
-            # Create metadata record
-            metadata_id = self.create_metadata_record(
-                file_id=file_id,
-                user_id=user_id,
-                filename=filename,
-                file_size=file_size,
-                content_type=self._get_content_type(filename),
-                bucket_id=bucket,
-                path=storage_path,
-                sha256_hash=file_hash,
-                tags=tags or []
+            return self._complete_upload(
+                operation_id, user_id, filename, file_size, bucket, storage_path, file_hash, tags
             )
             
-            # Update operation status
-            self.update_operation(operation_id, 'completed', metadata={'metadata_id': metadata_id})
-            
-            logger.info(f"Upload completed: {filename} -> {storage_path}")
-
-            return {
-                'file_id': file_id,
-                'storage_path': storage_path,
-                'sha256_hash': file_hash,
-                'file_size': file_size,
-                'deduplicated': False,
-                'metadata_id': metadata_id,
-                'operation_id': operation_id
-            }
-            
         except Exception as e:
             logger.error(f"Upload failed: {e}")
             self.update_operation(operation_id, 'failed', error_message=str(e))
             # Cleanup partial upload if needed
             self.cleanup_on_failure(bucket, storage_path if 'storage_path' in locals() else None)
             raise UploadError(f"Upload failed: {str(e)}") from e
+
+    def _get_transfer(self):
+        """Streaming transfer client using this manager's Supabase credentials."""
+        if self._transfer is None:
+            from src.storage.streaming_transfer import StreamingTransfer
+            self._transfer = StreamingTransfer(
+                url=getattr(self.client, 'supabase_url', None),
+                service_key=getattr(self.client, 'supabase_key', None)
+            )
+        return self._transfer
+
+    def _upload_file_streaming(
+        self,
+        file_path: str,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        bucket: str,
+        progress_callback: Optional[Callable[[int, float], None]],
+        tags: Optional[list]
+    ) -> Dict[str, Any]:
+        """
+        Upload a large file in one read: hash while streaming to a staging path,
+        then dedup on the final hash and move the object to its content-addressed
+        path (server-side rename, no re-upload).
+        """
+        operation_id = self.track_operation(
+            user_id=user_id,
+            operation_type='upload',
+            status='processing',
+            metadata={'filename': filename, 'file_size': file_size, 'streaming': True}
+        )
+        staging_path = f"{user_id}/_staging/{uuid.uuid4().hex}/{filename}"
+        transfer = self._get_transfer()
+
+        def on_progress(done: int, total: int):
+            if progress_callback:
+                progress_callback(done, done / total * 100.0 if total else 100.0)
+
+        try:
+            logger.info(f"Streaming {filename} ({file_size} bytes) to {staging_path}")
+            result = transfer.upload(
+                file_path, bucket, staging_path,
+                content_type=self._get_content_type(filename),
+                progress_callback=on_progress
+            )
+            file_hash = result.sha256
+
+            existing_file = self.check_existing_file(file_hash, user_id)
+            if existing_file:
+                logger.info(f"File with hash {file_hash} already exists, creating reference")
+                transfer.remove(bucket, [staging_path])
+                self.update_operation(operation_id, 'completed', metadata={'deduplicated': True})
+                return self._deduplicated_result(existing_file, user_id, filename, file_hash, file_size, tags)
+
+            storage_path = self.get_storage_path(user_id, file_hash, filename)
+            try:
+                transfer.move(bucket, staging_path, storage_path)
+            except NonRetryableError as e:
+                # Same content already stored at the content-addressed path
+                if "409" not in str(e) and "exists" not in str(e).lower():
+                    raise
+                transfer.remove(bucket, [staging_path])
+
+            return self._complete_upload(
+                operation_id, user_id, filename, file_size, bucket, storage_path, file_hash, tags
+            )
+
+        except Exception as e:
+            logger.error(f"Streaming upload failed: {e}")
+            self.update_operation(operation_id, 'failed', error_message=str(e))
+            self.cleanup_on_failure(bucket, staging_path)
+            raise UploadError(f"Upload failed: {str(e)}") from e
+
+    def _deduplicated_result(
+        self,
+        existing_file: Dict[str, Any],
+        user_id: str,
+        filename: str,
+        file_hash: str,
+        file_size: int,
+        tags: Optional[list]
+    ) -> Dict[str, Any]:
+        metadata_id = self.create_metadata_reference(
+            existing_file, user_id, filename, tags
+        )
+        return {
+            'file_id': existing_file['file_id'],
+            'storage_path': existing_file['path'],
+            'sha256_hash': file_hash,
+            'file_size': file_size,
+            'deduplicated': True,
+            'metadata_id': metadata_id
+        }
+
+    def _complete_upload(
+        self,
+        operation_id: str,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        bucket: str,
+        storage_path: str,
+        file_hash: str,
+        tags: Optional[list]
+    ) -> Dict[str, Any]:
+        # Supabase returns UploadResponse object with 'path' attribute
+        file_id = storage_path  # Use storage path as file ID
+
+        # Create metadata record
+        metadata_id = self.create_metadata_record(
+            file_id=file_id,
+            user_id=user_id,
+            filename=filename,
+            file_size=file_size,
+            content_type=self._get_content_type(filename),
+            bucket_id=bucket,
+            path=storage_path,
+            sha256_hash=file_hash,
+            tags=tags or []
+        )
+        
+        # Update operation status
+        self.update_operation(operation_id, 'completed', metadata={'metadata_id': metadata_id})
+        
+        logger.info(f"Upload completed: {filename} -> {storage_path}")
+
+        return {
+            'file_id': file_id,
+            'storage_path': storage_path,
+            'sha256_hash': file_hash,
+            'file_size': file_size,
+            'deduplicated': False,
+            'metadata_id': metadata_id,
+            'operation_id': operation_id
+        }
     
     def calculate_sha256(self, file_path: str) -> str:
         """
@@ -329,7 +439,8 @@ class SupabaseUploadManager:
         file_path: str,
         bucket: str,
         storage_path: str,
-        progress_callback: Optional[Callable[[int, float], None]] = None
+        progress_callback: Optional[Callable[[int, float], None]] = None,
+        file_data: Optional[bytes] = None
     ) -> Dict[str, Any]:
         """
         Upload file to Supabase Storage.
@@ -339,14 +450,15 @@ class SupabaseUploadManager:
             bucket: Bucket name
             storage_path: Destination path in storage
             progress_callback: Optional progress callback
+            file_data: File content if the caller already read it
         
         Returns:
             Upload result from Supabase
         """
-        file_size = os.path.getsize(file_path)
-        
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
+        if file_data is None:
+            with open(file_path, 'rb') as f:
+                file_data = f.read()
+        file_size = len(file_data)
         
         # Upload to Supabase Storage
         result = self.client.storage.from_(bucket).upload(
@@ -20,6 +20,7 @@ import time
 from typing import Any, Optional, Dict, Set
 
 from tools.shared.base_models import ConsolidatedFindings
+from tools.workflow.expert_dispatch import async_client_available, call_provider
 from utils.progress import send_progress
 
 # Import TimeoutConfig for coordinated timeout hierarchy
@@ -322,36 +323,22 @@ class ExpertAnalysisMixin:
         profiler = PerformanceProfiler(f"expert_analysis_{self.get_name()}")
         profiler.checkpoint("start")
 
-        # CRITICAL DIAGNOSTIC: Log entry IMMEDIATELY
-        import sys
-        print(f"[EXPERT_ENTRY] ========== ENTERED _call_expert_analysis ==========", file=sys.stderr, flush=True)
-        print(f"[EXPERT_ENTRY] Tool: {self.get_name()}", file=sys.stderr, flush=True)
-        print(f"[EXPERT_ENTRY] Thread: {__import__('threading').current_thread().name}", file=sys.stderr, flush=True)
-        print(f"[EXPERT_ENTRY] ========================================", file=sys.stderr, flush=True)
-
-        print(f"[EXPERT_ENTRY] ENTERED _call_expert_analysis for {self.get_name()}")
         logger.info(f"[EXPERT_ENTRY] Expert analysis called for tool: {self.get_name()}")
-        print(f"[EXPERT_ENTRY] About to create cache key")
 
         # CRITICAL FIX: Duplicate call prevention
         # Create cache key from request_id and consolidated findings content
         # This ensures we don't call expert analysis twice for the same content
         # EXAI Fix #6 (2025-10-21): Use deterministic hash (hashlib.md5) instead of hash()
-        print(f"[EXPERT_ENTRY] Getting request_id from arguments")
         request_id = arguments.get("request_id", "unknown")
-        print(f"[EXPERT_ENTRY] request_id={request_id}")
-        print(f"[EXPERT_ENTRY] About to hash findings")
         import hashlib
         findings_str = str(self.consolidated_findings.findings)  # type: ignore
         findings_hash = hashlib.md5(findings_str.encode('utf-8')).hexdigest()[:16]  # First 16 chars
-        print(f"[EXPERT_ENTRY] findings_hash={findings_hash}")
-        print(f"[EXPERT_ENTRY] Creating cache_key string")
         cache_key = f"{self.get_name()}:{request_id}:{findings_hash}"
-        print(f"[EXPERT_ENTRY] cache_key created: {cache_key}")
 
-        logger.info(f"[EXPERT_DEDUP] Cache key: {cache_key}")
-        logger.info(f"[EXPERT_DEDUP] Cache size: {len(_expert_validation_cache)}")
-        logger.info(f"[EXPERT_DEDUP] In-progress size: {len(_expert_validation_in_progress)}")
+        logger.info(
+            f"[EXPERT_DEDUP] Cache key: {cache_key} (cached={len(_expert_validation_cache)}, "
+            f"in_progress={len(_expert_validation_in_progress)})"
+        )
 
         # SIMPLIFIED DUPLICATE PREVENTION (EXAI Fix #4 - 2025-10-21)
         # Single lock acquisition to check cache and mark in-progress
@@ -610,52 +597,42 @@ class ExpertAnalysisMixin:
             logger.warning(f"🔥 [EXPERT_ANALYSIS_START] Thinking Mode Selection Time: {thinking_mode_elapsed:.3f}s")
             logger.warning(f"🔥 [EXPERT_ANALYSIS_START] ========================================")
 
-            # PHASE 2: Async Provider Support
-            # Check if async providers are enabled via feature flag
-            import os
-            use_async_providers = os.getenv("USE_ASYNC_PROVIDERS", "false").strip().lower() in ("true", "1", "yes")
-
             start_time = time.time()
             max_wait = timeout_secs  # Use configured timeout (480s for expert analysis)
+            provider_type = provider.get_provider_type() if provider else None
 
             # CRITICAL: Log final model selection for unpredictability diagnosis (EXAI Fix #1 - 2025-10-21)
             logger.warning(
                 f"🎯 [MODEL_SELECTION] Tool: {self.get_name()}, "
                 f"Model: {model_name}, "
-                f"Provider: {provider.get_provider_type().value if provider else 'None'}, "
+                f"Provider: {provider_type.value if provider_type else 'None'}, "
                 f"Thinking Mode: {expert_thinking_mode}, "
                 f"Temperature: {validated_temperature}, "
                 f"Timeout: {max_wait}s"
             )
 
             # CRITICAL FIX (2025-11-05): Handle GLM thinking_mode incompatibility
-            # GLM provider (zai-sdk) doesn't accept thinking_mode parameter even for models marked as supporting it
-            # Auto-fallback to Kimi when thinking mode is requested with GLM provider
+            # The sync GLM provider (zai-sdk) doesn't accept thinking_mode; the async GLM client
+            # maps it to GLM's "thinking" parameter. Without the async client, fall back to Kimi.
             thinking_mode_requested = expert_thinking_mode and expert_thinking_mode != "disabled"
-            if thinking_mode_requested and provider and provider.get_provider_type() == ProviderType.GLM:
-                logger.warning(
-                    f"[EXPERT_ANALYSIS] GLM provider does not support thinking_mode parameter with zai-sdk. "
-                    f"Auto-fallback to Kimi provider for thinking mode support. "
-                    f"This may affect cost/performance."
-                )
-                # CRITICAL FIX (2025-11-05): Use SYNC Kimi provider for thinking mode fallback
-                # Problem: AsyncKimiProvider.chat_completions_create() returns coroutine when called sync
-                # Solution: Use sync Kimi provider instead to avoid coroutine error in sync execution path
-                from src.providers.kimi import KimiModelProvider
-                from src.providers.base import ProviderType
-                kimi_api_key = os.getenv("KIMI_API_KEY") or os.getenv("MOONSHOT_API_KEY")
-                if kimi_api_key:
-                    # Create SYNC Kimi provider (not async) to avoid coroutine issues in sync path
-                    provider = KimiModelProvider(
-                        api_key=kimi_api_key,
-                        base_url=os.getenv("KIMI_API_URL", "https://api.moonshot.ai/v1")
+            if (
+                thinking_mode_requested
+                and provider_type == ProviderType.GLM
+                and not async_client_available(ProviderType.GLM)
+            ):
+                if async_client_available(ProviderType.KIMI):
+                    logger.warning(
+                        f"[EXPERT_ANALYSIS] GLM provider does not support thinking_mode parameter with zai-sdk. "
+                        f"Auto-fallback to Kimi provider for thinking mode support. "
+                        f"This may affect cost/performance."
                     )
+                    provider, provider_type = None, ProviderType.KIMI
                     model_name = "kimi-thinking-preview"
                     # Update model context
                     from utils.model.context import ModelContext
                     self._model_context = ModelContext(model_name)
                     self._current_model_name = model_name
-                    logger.info(f"[EXPERT_ANALYSIS] Successfully switched to SYNC Kimi provider with {model_name}")
+                    logger.info(f"[EXPERT_ANALYSIS] Switched to async Kimi client with {model_name}")
                 else:
                     logger.error(
                         f"[EXPERT_ANALYSIS] Cannot fallback to Kimi: KIMI_API_KEY or MOONSHOT_API_KEY not configured. "
@@ -664,265 +641,50 @@ class ExpertAnalysisMixin:
                     # Disable thinking mode if Kimi is not available
                     expert_thinking_mode = "disabled"
 
-            if use_async_providers:
-                # PHASE 2: Native async provider path (no run_in_executor)
-                logger.info(f"[EXPERT_DEBUG] Using ASYNC providers for {self.get_name()}")
-                logger.info(
-                    f"[EXPERT_DEBUG] About to call async provider.generate_content() for {self.get_name()}: "
-                    f"prompt={len(prompt)} chars, model={model_name}, temp={validated_temperature}, "
-                    f"thinking_mode={expert_thinking_mode}"
-                )
-
-                # Create async provider based on provider type
-                from src.providers.base import ProviderType
-                provider_type = provider.get_provider_type()
-
-                async_provider = None
-                try:
-                    if provider_type == ProviderType.GLM:
-                        from src.providers.async_glm import AsyncGLMProvider
-                        async_provider = AsyncGLMProvider(
-                            api_key=os.getenv("GLM_API_KEY"),
-                            base_url=os.getenv("GLM_API_URL")
-                        )
-                    elif provider_type == ProviderType.KIMI:
-                        from src.providers.async_kimi import AsyncKimiProvider
-                        async_provider = AsyncKimiProvider(
-                            api_key=os.getenv("KIMI_API_KEY"),
-                            base_url=os.getenv("KIMI_API_URL")
-                        )
-                    else:
-                        logger.warning(f"[EXPERT_DEBUG] Async provider not available for {provider_type}, falling back to sync")
-                        use_async_providers = False  # Fall back to sync path
-                except Exception as e:
-                    logger.error(f"[EXPERT_DEBUG] Failed to create async provider: {e}, falling back to sync")
-                    use_async_providers = False  # Fall back to sync path
-
-                if use_async_providers and async_provider:
-                    try:
-                        # Use async context manager for proper resource cleanup
-                        async with async_provider:
-                            # PHASE 2 MIGRATION: Use message arrays when feature flag enabled
-                            if self.should_use_message_arrays():
-                                logger.info(f"[EXPERT_DEBUG] Using MESSAGE ARRAYS for async provider call")
-
-                                # Prepare message array
-                                messages = self.prepare_messages_for_expert_analysis(
-                                    system_prompt=system_prompt,
-                                    expert_context=expert_context,
-                                    consolidated_findings=self.consolidated_findings
-                                )
-
-                                logger.info(f"[EXPERT_DEBUG] Calling async provider.chat_completions_create() with {len(messages)} messages")
-
-                                # CRITICAL: Native async call with timeout wrapper
-                                raw_response = await asyncio.wait_for(
-                                    async_provider.chat_completions_create(
-                                        model=model_name,
-                                        messages=messages,
-                                        temperature=validated_temperature,
-                                        thinking_mode=expert_thinking_mode,
-                                        **provider_kwargs,
-                                    ),
-                                    timeout=max_wait
-                                )
-
-                                # CRITICAL FIX: Handle ModelResponse objects (which don't have .get() method)
-                                # Convert ModelResponse to dict-like object for compatibility
-                                from types import SimpleNamespace
-                                if hasattr(raw_response, 'content') and not isinstance(raw_response, dict):
-                                    # This is a ModelResponse object - convert to SimpleNamespace
-                                    model_response = SimpleNamespace(
-                                        content=raw_response.content,
-                                        model=getattr(raw_response, 'model', model_name),
-                                        usage=getattr(raw_response, 'usage', {})
-                                    )
-                                else:
-                                    # This is a dict response
-                                    model_response = SimpleNamespace(
-                                        content=raw_response.get('content', ''),
-                                        model=raw_response.get('model', model_name),
-                                        usage=raw_response.get('usage', {})
-                                    )
-
-                                logger.info(f"[EXPERT_DEBUG] Async provider.chat_completions_create() returned successfully (MESSAGE ARRAYS)")
-                            else:
-                                logger.info(f"[EXPERT_DEBUG] Using LEGACY TEXT PROMPTS for async provider call")
-                                logger.info(f"[EXPERT_DEBUG] Calling async provider.generate_content()")
-
-                                # LEGACY PATH: Use text-based prompts
-                                raw_response = await asyncio.wait_for(
-                                    async_provider.generate_content(
-                                        prompt=prompt,
-                                        model_name=model_name,
-                                        system_prompt=system_prompt,
-                                        temperature=validated_temperature,
-                                        thinking_mode=expert_thinking_mode,
-                                        images=list(set(self.consolidated_findings.images)) if self.consolidated_findings.images else None,  # type: ignore
-                                        **provider_kwargs,
-                                    ),
-                                    timeout=max_wait
-                                )
-
-                                # CRITICAL FIX: Handle ModelResponse objects (which don't have .get() method)
-                                # Convert ModelResponse to dict-like object for compatibility
-                                from types import SimpleNamespace
-                                if hasattr(raw_response, 'content') and not isinstance(raw_response, dict):
-                                    # This is a ModelResponse object - convert to SimpleNamespace
-                                    model_response = SimpleNamespace(
-                                        content=raw_response.content,
-                                        model=getattr(raw_response, 'model', model_name),
-                                        usage=getattr(raw_response, 'usage', {})
-                                    )
-                                else:
-                                    # This is a dict response
-                                    model_response = SimpleNamespace(
-                                        content=raw_response.get('content', '') if isinstance(raw_response, dict) else str(raw_response),
-                                        model=raw_response.get('model', model_name) if isinstance(raw_response, dict) else model_name,
-                                        usage=raw_response.get('usage', {}) if isinstance(raw_response, dict) else {}
-                                    )
-
-                                logger.info(f"[EXPERT_DEBUG] Async provider.generate_content() returned successfully (LEGACY)")
-
-                            duration = time.time() - start_time
-                            logger.warning(f"🔥 [EXPERT_ANALYSIS_COMPLETE] Tool: {self.get_name()}, Duration: {duration:.2f}s (ASYNC)")
-
-                    except asyncio.TimeoutError:
-                        # Timeout - return error result immediately
-                        duration = time.time() - start_time
-                        logger.error(f"🔥 [EXPERT_ANALYSIS_TIMEOUT] Tool: {self.get_name()}, Duration: {duration:.2f}s, Timeout: {max_wait}s (ASYNC)")
-
-                        return {
-                            "error": f"Expert analysis timed out after {max_wait}s",
-                            "status": "analysis_timeout",
-                            "raw_analysis": ""
-                        }
-                    except Exception as e:
-                        logger.error(f"[EXPERT_DEBUG] Async provider call failed: {e}, falling back to sync")
-                        use_async_providers = False  # Fall back to sync path
-
-            if not use_async_providers:
-                # PHASE 1: Sync provider path with run_in_executor (backward compatible)
-                logger.info(f"[EXPERT_DEBUG] Using SYNC providers for {self.get_name()}")
-
-                # PHASE 2 MIGRATION: Use message arrays when feature flag enabled
-                if self.should_use_message_arrays():
-                    logger.info(f"[EXPERT_DEBUG] Using MESSAGE ARRAYS for sync provider call")
-
-                    # Prepare message array
-                    messages = self.prepare_messages_for_expert_analysis(
+            # PHASE 2 MIGRATION: Use message arrays when feature flag enabled
+            if self.should_use_message_arrays():
+                method = "chat_completions_create"
+                call_kwargs = {
+                    "model": model_name,
+                    "messages": self.prepare_messages_for_expert_analysis(
                         system_prompt=system_prompt,
                         expert_context=expert_context,
                         consolidated_findings=self.consolidated_findings
-                    )
-
-                    logger.info(
-                        f"[EXPERT_DEBUG] About to call provider.chat_completions_create() for {self.get_name()}: "
-                        f"messages={len(messages)}, model={model_name}, temp={validated_temperature}, "
-                        f"thinking_mode={expert_thinking_mode}"
-                    )
-
-                    loop = asyncio.get_running_loop()
-                    def _invoke_provider():
-                        logger.info(f"[EXPERT_DEBUG] Inside _invoke_provider thread, about to call provider.chat_completions_create()")
-                        raw_response = provider.chat_completions_create(
-                            model=model_name,
-                            messages=messages,
-                            temperature=validated_temperature,
-                            thinking_mode=expert_thinking_mode,
-                            **provider_kwargs,
-                        )
-
-                        # CRITICAL FIX: Handle ModelResponse objects (which don't have .get() method)
-                        # Convert ModelResponse to dict-like object for compatibility
-                        if hasattr(raw_response, 'content') and not isinstance(raw_response, dict):
-                            # This is a ModelResponse object - convert to SimpleNamespace with .get() support
-                            from types import SimpleNamespace
-                            result = SimpleNamespace(
-                                content=raw_response.content,
-                                model=getattr(raw_response, 'model', model_name),
-                                usage=getattr(raw_response, 'usage', {})
-                            )
-                        else:
-                            # This is already a dict response
-                            from types import SimpleNamespace
-                            result = SimpleNamespace(
-                                content=raw_response.get('content', ''),
-                                model=raw_response.get('model', model_name),
-                                usage=raw_response.get('usage', {})
-                            )
-                        logger.info(f"[EXPERT_DEBUG] provider.chat_completions_create() returned successfully (MESSAGE ARRAYS)")
-                        return result
-
-                    logger.info(f"[EXPERT_DEBUG] About to submit _invoke_provider to executor")
-                    task = loop.run_in_executor(None, _invoke_provider)
-                    logger.info(f"[EXPERT_DEBUG] Task submitted to executor, using asyncio.wait_for for timeout")
-                else:
-                    logger.info(f"[EXPERT_DEBUG] Using LEGACY TEXT PROMPTS for sync provider call")
-                    logger.info(
-                        f"[EXPERT_DEBUG] About to call provider.generate_content() for {self.get_name()}: "
-                        f"prompt={len(prompt)} chars, model={model_name}, temp={validated_temperature}, "
-                        f"thinking_mode={expert_thinking_mode}"
-                    )
-                    logger.debug(f"Calling provider.generate_content() for {self.get_name()}: prompt={len(prompt)} chars, model={model_name}, temp={validated_temperature}")
-
-                    loop = asyncio.get_running_loop()
-                    def _invoke_provider():
-                        logger.info(f"[EXPERT_DEBUG] Inside _invoke_provider thread, about to call provider.generate_content()")
-                        logger.debug(f"Inside _invoke_provider, calling provider.generate_content()")
-                        result = provider.generate_content(
-                            prompt=prompt,
-                            model_name=model_name,
-                            system_prompt=system_prompt,
-                            temperature=validated_temperature,
-                            thinking_mode=expert_thinking_mode,  # Use pre-fetched thinking mode
-                            images=list(set(self.consolidated_findings.images)) if self.consolidated_findings.images else None,  # type: ignore
-                            **provider_kwargs,  # CRITICAL: Use adapter-validated kwargs instead of raw use_websearch
-                        )
-                        logger.info(f"[EXPERT_DEBUG] provider.generate_content() returned successfully (LEGACY)")
-                        # CRITICAL FIX: Handle ModelResponse objects (which don't have .get() method)
-                        # Convert ModelResponse to dict-like object for compatibility
-                        if hasattr(result, 'content') and not isinstance(result, dict):
-                            # This is a ModelResponse object - convert to SimpleNamespace with .get() support
-                            from types import SimpleNamespace
-                            return SimpleNamespace(
-                                content=result.content,
-                                model=getattr(result, 'model', model_name),
-                                usage=getattr(result, 'usage', {})
-                            )
-                        return result
-
-                    logger.info(f"[EXPERT_DEBUG] About to submit _invoke_provider to executor")
-                    task = loop.run_in_executor(None, _invoke_provider)
-                    logger.info(f"[EXPERT_DEBUG] Task submitted to executor, using asyncio.wait_for for timeout")
-
-                try:
-                    # Single async call with timeout - no polling needed!
-                    logger.info(f"[EXPERT_DEBUG] Waiting for task with {max_wait}s timeout")
-                    model_response = await asyncio.wait_for(task, timeout=max_wait)
-                    logger.info(f"[EXPERT_DEBUG] Task completed successfully")
-
-                    # Success - continue with existing response handling
-                    duration = time.time() - start_time
-                    logger.warning(f"🔥 [EXPERT_ANALYSIS_COMPLETE] Tool: {self.get_name()}, Duration: {duration:.2f}s (SYNC)")
-
-                except asyncio.TimeoutError:
-                    # Timeout - return error result immediately
-                    duration = time.time() - start_time
-                    logger.error(f"🔥 [EXPERT_ANALYSIS_TIMEOUT] Tool: {self.get_name()}, Duration: {duration:.2f}s, Timeout: {max_wait}s (SYNC)")
+                    ),
+                }
+            else:
+                # LEGACY PATH: Use text-based prompts
+                method = "generate_content"
+                call_kwargs = {
+                    "prompt": prompt,
+                    "model_name": model_name,
+                    "system_prompt": system_prompt,
+                    "images": list(set(self.consolidated_findings.images)) if self.consolidated_findings.images else None,  # type: ignore
+                }
+            call_kwargs.update(
+                temperature=validated_temperature,
+                thinking_mode=expert_thinking_mode,
+                **provider_kwargs,  # CRITICAL: Use adapter-validated kwargs instead of raw use_websearch
+            )
 
-                    # Try to cancel the task to free resources
-                    try:
-                        task.cancel()
-                    except Exception:
-                        pass
+            # Async clients for Kimi/GLM (a timeout aborts the HTTP request); other providers
+            # run on a bounded executor (tools/workflow/expert_dispatch.py)
+            try:
+                model_response = await call_provider(
+                    provider, method, timeout=max_wait, provider_type=provider_type, **call_kwargs
+                )
+            except asyncio.TimeoutError:
+                # Timeout - return error result immediately, skip response processing
+                duration = time.time() - start_time
+                logger.error(f"🔥 [EXPERT_ANALYSIS_TIMEOUT] Tool: {self.get_name()}, Duration: {duration:.2f}s, Timeout: {max_wait}s")
+                return {
+                    "error": f"Expert analysis timed out after {max_wait}s",
+                    "status": "analysis_timeout",
+                    "raw_analysis": ""
+                }
 
-                    # Return timeout error immediately - skip response processing
-                    return {
-                        "error": f"Expert analysis timed out after {max_wait}s",
-                        "status": "analysis_timeout",
-                        "raw_analysis": ""
-                    }
+            duration = time.time() - start_time
+            logger.warning(f"🔥 [EXPERT_ANALYSIS_COMPLETE] Tool: {self.get_name()}, Duration: {duration:.2f}s ({method})")
 
             # (Dead code block removed - see git history for old poll loop implementation)
 
@@ -0,0 +1,291 @@
+"""
+Provider call dispatch for expert analysis.
+
+Expert analysis used to run provider calls on the event loop's default
+executor via run_in_executor(). Under concurrency that shared pool became a
+hidden bottleneck, and a timed-out wait_for() only abandoned the future: the
+thread, its HTTP request and the provider quota kept going.
+
+Calls are now dispatched by provider:
+
+- Kimi and GLM go through the async clients (src/providers/async_kimi.py,
+  src/providers/async_glm.py). The request runs as a task on the event loop,
+  so a timeout cancels it and httpx closes the connection, aborting it.
+- Providers whose call methods are coroutines are awaited directly.
+- Anything else runs on a dedicated bounded executor
+  (EXPERT_ANALYSIS_MAX_WORKERS). A call still queued at its deadline never
+  starts; one already running can't be interrupted, but it only ties up a
+  worker of this pool, never the default executor.
+
+Every call records its queue wait (dispatch until it starts running) and
+runtime, labelled by path and outcome (src/monitoring/metrics.py).
+
+Configuration:
+    USE_ASYNC_PROVIDERS (default true): route Kimi/GLM through the async clients
+    EXPERT_ANALYSIS_MAX_WORKERS (default 4): bounded executor size for sync fallback
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from src.providers.base import ProviderType
+
+try:
+    from src.monitoring.metrics import record_expert_call
+except ImportError:
+    record_expert_call = None
+
+logger = logging.getLogger(__name__)
+
+# Async clients for these providers: (API key envs, base URL envs), first set wins
+_ASYNC_PROVIDER_ENV = {
+    ProviderType.KIMI: (("KIMI_API_KEY", "MOONSHOT_API_KEY"), ("KIMI_API_URL", "MOONSHOT_API_URL")),
+    ProviderType.GLM: (("GLM_API_KEY", "ZHIPUAI_API_KEY"), ("GLM_API_URL", "ZHIPUAI_API_URL")),
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_async_providers: Dict[ProviderType, Any] = {}
+_async_providers_lock = threading.Lock()
+
+
+def _async_enabled() -> bool:
+    return os.getenv("USE_ASYNC_PROVIDERS", "true").strip().lower() in ("true", "1", "yes")
+
+
+def _max_workers() -> int:
+    try:
+        return max(1, int(os.getenv("EXPERT_ANALYSIS_MAX_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def _first_env(names) -> Optional[str]:
+    for name in names:
+        value = os.getenv(name, "").strip()
+        if value:
+            return value
+    return None
+
+
+def get_expert_executor() -> ThreadPoolExecutor:
+    """Get the bounded executor used for sync provider fallback."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_max_workers(), thread_name_prefix="expert-analysis")
+    return _executor
+
+
+def reset_expert_executor() -> None:
+    """Shut down the executor, dropping queued calls (tests, shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_async_provider(provider_type: Any) -> Optional[Any]:
+    """Get the shared async client for a provider type, or None if unavailable."""
+    if provider_type not in _ASYNC_PROVIDER_ENV:
+        return None
+    provider = _async_providers.get(provider_type)
+    if provider is not None:
+        return provider
+    with _async_providers_lock:
+        provider = _async_providers.get(provider_type)
+        if provider is not None:
+            return provider
+        key_envs, url_envs = _ASYNC_PROVIDER_ENV[provider_type]
+        api_key = _first_env(key_envs)
+        if not api_key:
+            return None
+        try:
+            if provider_type == ProviderType.KIMI:
+                from src.providers.async_kimi import AsyncKimiProvider as provider_class
+            else:
+                from src.providers.async_glm import AsyncGLMProvider as provider_class
+            provider = provider_class(api_key=api_key, base_url=_first_env(url_envs))
+        except Exception as e:
+            logger.warning(f"[EXPERT_DISPATCH] Async {provider_type.value} client unavailable: {e}")
+            return None
+        _async_providers[provider_type] = provider
+        return provider
+
+
+def reset_async_providers() -> None:
+    """Forget cached async clients (tests). Their connections belong to the shared pool."""
+    with _async_providers_lock:
+        _async_providers.clear()
+
+
+def async_client_available(provider_type: Any) -> bool:
+    """Whether calls for provider_type will go through an async client."""
+    return _async_enabled() and get_async_provider(provider_type) is not None
+
+
+def normalize_response(raw: Any, model_name: str) -> SimpleNamespace:
+    """Normalize ModelResponse objects and dict responses to (content, model, usage)."""
+    if isinstance(raw, dict):
+        return SimpleNamespace(
+            content=raw.get("content", ""),
+            model=raw.get("model", model_name),
+            usage=raw.get("usage", {}),
+        )
+    if hasattr(raw, "content"):
+        return SimpleNamespace(
+            content=raw.content,
+            model=getattr(raw, "model", model_name),
+            usage=getattr(raw, "usage", {}),
+        )
+    return SimpleNamespace(content=str(raw) if raw is not None else "", model=model_name, usage={})
+
+
+class _CallTimer:
+    """Queue wait and runtime of one call, recorded once it settles."""
+
+    def __init__(self, path: str, provider: str):
+        self.path = path
+        self.provider = provider
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.outcome = "cancelled"
+
+    def start(self) -> None:
+        self.started = time.monotonic()
+
+    def finish(self) -> None:
+        now = time.monotonic()
+        started = self.started if self.started is not None else now
+        queue_wait, runtime = started - self.submitted, now - started
+        log = logger.warning if self.outcome != "success" else logger.info
+        log(
+            f"[EXPERT_DISPATCH] path={self.path} provider={self.provider} outcome={self.outcome} "
+            f"queue_wait={queue_wait:.3f}s runtime={runtime:.2f}s"
+        )
+        if record_expert_call is not None:
+            try:
+                record_expert_call(self.path, self.provider, self.outcome, queue_wait, runtime)
+            except Exception as e:
+                logger.debug(f"[EXPERT_DISPATCH] Failed to record metrics: {e}")
+
+
+async def _run_async(make_call: Callable[[], Any], timeout: float, provider: str) -> Any:
+    timer = _CallTimer("async", provider)
+
+    async def _timed():
+        timer.start()
+        return await make_call()
+
+    try:
+        # On timeout wait_for cancels the task, which aborts the in-flight request
+        result = await asyncio.wait_for(_timed(), timeout=timeout)
+        timer.outcome = "success"
+        return result
+    except asyncio.TimeoutError:
+        timer.outcome = "timeout"
+        raise
+    except Exception:
+        timer.outcome = "error"
+        raise
+    finally:
+        timer.finish()
+
+
+async def _run_in_executor(fn: Callable[..., Any], kwargs: dict, timeout: float, provider: str) -> Any:
+    timer = _CallTimer("executor", provider)
+
+    def _timed():
+        timer.start()
+        return fn(**kwargs)
+
+    future = get_expert_executor().submit(_timed)
+    try:
+        result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        timer.outcome = "success"
+        return result
+    except asyncio.TimeoutError:
+        timer.outcome = "timeout"
+        raise
+    except Exception:
+        timer.outcome = "error"
+        raise
+    finally:
+        # A queued call is dropped here; a running one can only finish on its own
+        if not future.cancel() and not future.done():
+            logger.warning(
+                f"[EXPERT_DISPATCH] {provider} call still running in executor after {timer.outcome}; "
+                f"its worker is released when the provider returns"
+            )
+        timer.finish()
+
+
+async def call_provider(
+    provider: Any,
+    method: str,
+    *,
+    timeout: float,
+    provider_type: Any = None,
+    **call_kwargs,
+) -> SimpleNamespace:
+    """
+    Make one expert analysis provider call within timeout.
+
+    Args:
+        provider: Sync provider (used when no async client applies; may be None
+            if provider_type has an async client)
+        method: "chat_completions_create" or "generate_content"
+        timeout: Seconds before the call is cancelled
+        provider_type: Provider type (defaults to provider.get_provider_type())
+        **call_kwargs: Arguments for the provider method
+
+    Returns:
+        SimpleNamespace with content, model and usage
+
+    Raises:
+        asyncio.TimeoutError: The call did not finish within timeout
+        RuntimeError: No API key is configured for a Kimi/GLM call
+    """
+    if provider_type is None:
+        provider_type = provider.get_provider_type()
+    label = str(getattr(provider_type, "value", provider_type))
+    model_name = call_kwargs.get("model") or call_kwargs.get("model_name") or ""
+    deadline = time.monotonic() + timeout
+
+    async_provider = None
+    if _async_enabled() and provider_type in _ASYNC_PROVIDER_ENV:
+        if not _first_env(_ASYNC_PROVIDER_ENV[provider_type][0]):
+            raise RuntimeError(f"{label} API key not configured")
+        async_provider = get_async_provider(provider_type)
+    if async_provider is not None:
+        try:
+            raw = await _run_async(lambda: getattr(async_provider, method)(**call_kwargs), timeout, label)
+            return normalize_response(raw, model_name)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            if provider is None:
+                raise
+            logger.warning(f"[EXPERT_DISPATCH] Async {label} call failed: {e}; falling back to sync provider")
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise asyncio.TimeoutError()
+
+    if provider is None:
+        raise RuntimeError(f"No provider available for {label} expert analysis")
+
+    fn = getattr(provider, method)
+    if inspect.iscoroutinefunction(fn):
+        raw = await _run_async(lambda: fn(**call_kwargs), timeout, label)
+    else:
+        raw = await _run_in_executor(fn, call_kwargs, timeout, label)
+    return normalize_response(raw, model_name)
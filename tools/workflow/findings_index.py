@@ -0,0 +1,159 @@
+"""
+Incremental findings index for workflow tools.
+
+Similarity and change-detection checks used to recompute everything from the
+full step history on every call (re-tokenizing texts for Jaccard similarity,
+re-concatenating and re-hashing all findings for content hashes). The index
+derives each step's data once, in add_step():
+
+- token set (lower-cased whitespace tokens, as used by the Jaccard check)
+- MinHash signature, for near-duplicate detection against earlier steps
+- rolling content hash (hash of the previous hash + this step)
+- running file sets/counters for sufficiency checks and summaries
+
+Adding a step is O(that step); reading the content hash, counters or file
+sets is O(1), and backtracking truncates to a stored prefix hash.
+"""
+
+import hashlib
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+NUM_PERM = 64
+_PRIME = (1 << 61) - 1
+_EMPTY_SIGNATURE = (_PRIME,) * NUM_PERM
+_ROOT_HASH = hashlib.sha256(b"findings-index-v1").hexdigest()
+
+# Fixed seed so signatures are stable across processes
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = tuple((_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM))
+
+
+@lru_cache(maxsize=1024)
+def tokenize(text: str) -> frozenset:
+    """Lower-cased whitespace token set (memoized: the same texts are compared repeatedly)."""
+    return frozenset(text.lower().split())
+
+
+def jaccard(tokens1: frozenset, tokens2: frozenset) -> float:
+    """Exact Jaccard similarity of two token sets."""
+    union = len(tokens1 | tokens2)
+    return len(tokens1 & tokens2) / union if union else 0.0
+
+
+def minhash(tokens: Iterable[str]) -> Tuple[int, ...]:
+    """MinHash signature of a token set."""
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big") for t in tokens]
+    if not hashes:
+        return _EMPTY_SIGNATURE
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimate_similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+    """Jaccard estimate from two MinHash signatures."""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / NUM_PERM
+
+
+@dataclass(frozen=True)
+class IndexedStep:
+    step_number: int
+    tokens: frozenset
+    signature: Tuple[int, ...]
+    content_hash: str
+    files_checked: Tuple[str, ...]
+    relevant_files: Tuple[str, ...]
+
+
+class FindingsIndex:
+    """
+    Per-step findings data, maintained incrementally.
+
+    Usage:
+        index = FindingsIndex()
+        index.add_step(1, "findings...", hypothesis="...", files_checked=[...])
+        index.content_hash          # changes iff steps/findings/hypotheses change
+        index.most_similar_to_latest()  # (step_number, estimated Jaccard)
+    """
+
+    def __init__(self):
+        self.steps: List[IndexedStep] = []
+        self.files_checked: set = set()
+        self.relevant_files: set = set()
+        self.steps_with_files_checked = 0
+        self.steps_with_relevant_files = 0
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of every step's number, findings and hypothesis, in order."""
+        return self.steps[-1].content_hash if self.steps else _ROOT_HASH
+
+    def add_step(
+        self,
+        step_number: int,
+        findings: str,
+        hypothesis: Optional[str] = None,
+        files_checked: Optional[Iterable[str]] = None,
+        relevant_files: Optional[Iterable[str]] = None,
+    ) -> IndexedStep:
+        """Index one step (cost proportional to this step only)."""
+        findings = findings or ""
+        hypothesis = hypothesis or ""
+        hasher = hashlib.sha256(self.content_hash.encode())
+        # Length-prefixed so field boundaries can't collide
+        for part in (str(step_number), findings, hypothesis):
+            data = part.encode("utf-8")
+            hasher.update(len(data).to_bytes(8, "big"))
+            hasher.update(data)
+
+        tokens = tokenize(findings)
+        step = IndexedStep(
+            step_number=step_number,
+            tokens=tokens,
+            signature=minhash(tokens),
+            content_hash=hasher.hexdigest(),
+            files_checked=tuple(files_checked or ()),
+            relevant_files=tuple(relevant_files or ()),
+        )
+        self.steps.append(step)
+        self._count(step)
+        return step
+
+    def truncate(self, num_steps: int) -> None:
+        """Keep only the first num_steps steps (backtracking)."""
+        if num_steps >= len(self.steps):
+            return
+        del self.steps[num_steps:]
+        self.files_checked = set()
+        self.relevant_files = set()
+        self.steps_with_files_checked = 0
+        self.steps_with_relevant_files = 0
+        for step in self.steps:
+            self._count(step)
+
+    def clear(self) -> None:
+        self.truncate(0)
+
+    def _count(self, step: IndexedStep) -> None:
+        self.files_checked.update(step.files_checked)
+        self.relevant_files.update(step.relevant_files)
+        self.steps_with_files_checked += bool(step.files_checked)
+        self.steps_with_relevant_files += bool(step.relevant_files)
+
+    def most_similar_to_latest(self) -> Tuple[Optional[int], float]:
+        """Earlier step whose findings most resemble the latest step's (MinHash estimate)."""
+        if len(self.steps) < 2:
+            return None, 0.0
+        latest = self.steps[-1]
+        if not latest.tokens:
+            return None, 0.0
+        best_step, best_score = None, 0.0
+        for step in self.steps[:-1]:
+            score = estimate_similarity(latest.signature, step.signature)
+            if score > best_score:
+                best_step, best_score = step.step_number, score
+        return best_step, best_score
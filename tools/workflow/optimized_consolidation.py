@@ -7,10 +7,11 @@ Expected improvement: 15-25% faster consolidation for multi-step workflows.
 Based on EXAI recommendations from continuation_id: 8b5fce66-a561-45ec-b412-68992147882c
 """
 
-import hashlib
 import logging
 from typing import Dict, List, Optional
 
+from tools.workflow.findings_index import FindingsIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +21,7 @@ class OptimizedConsolidatedFindings:
     
     Features:
     - Incremental updates (only consolidate new steps)
-    - Content hashing (detect unchanged data)
+    - Content hashing (detect unchanged data) via the rolling hash in FindingsIndex
     - Statistics tracking (consolidation time, steps processed)
     
     Usage:
@@ -32,7 +33,9 @@ class OptimizedConsolidatedFindings:
     def __init__(self):
         """Initialize optimized consolidation."""
         self.steps: List[Dict] = []
+        self.index = FindingsIndex()
         self.last_consolidated_step = 0
+        self._body_cache: Optional[str] = None  # Header + formatted steps, extended in place
         self._consolidated_cache: Optional[str] = None
         self._content_hash: Optional[str] = None
         
@@ -76,10 +79,14 @@ class OptimizedConsolidatedFindings:
         }
         
         self.steps.append(step_data)
-        
-        # Invalidate cache when new step is added
-        self._consolidated_cache = None
-        self._content_hash = None
+        # Hash, token set and file sets are updated for this step only
+        self.index.add_step(
+            step_number,
+            findings,
+            hypothesis=hypothesis,
+            files_checked=step_data['files_checked'],
+            relevant_files=step_data['relevant_files'],
+        )
         
         logger.debug(f"Added step {step_number} to consolidation")
     
@@ -100,8 +107,7 @@ class OptimizedConsolidatedFindings:
         
         # Check if we can use cached result
         if not force_full and self._consolidated_cache is not None:
-            current_hash = self._calculate_content_hash()
-            if current_hash == self._content_hash:
+            if self.index.content_hash == self._content_hash:
                 self.stats['cache_hits'] += 1
                 logger.debug("Using cached consolidation (content unchanged)")
                 return self._consolidated_cache
@@ -111,64 +117,43 @@ class OptimizedConsolidatedFindings:
             not force_full
             and self.last_consolidated_step > 0
             and self.last_consolidated_step < len(self.steps)
-            and self._consolidated_cache is not None
+            and self._body_cache is not None
         ):
             # Incremental consolidation
             self.stats['incremental_consolidations'] += 1
             logger.debug(f"Performing incremental consolidation from step {self.last_consolidated_step + 1}")
             
-            # Start with cached result
-            consolidated = self._consolidated_cache
-            
-            # Add only new steps
+            # Start with cached body, add only new steps
+            body = self._body_cache
             for step in self.steps[self.last_consolidated_step:]:
-                consolidated += self._format_step(step)
-            
-            self.last_consolidated_step = len(self.steps)
+                body += self._format_step(step)
         else:
             # Full consolidation
             self.stats['total_consolidations'] += 1
             logger.debug(f"Performing full consolidation of {len(self.steps)} steps")
             
-            consolidated = self._build_header()
-            
+            body = self._build_header()
             for step in self.steps:
-                consolidated += self._format_step(step)
-            
-            consolidated += self._build_footer()
-            
-            self.last_consolidated_step = len(self.steps)
+                body += self._format_step(step)
+        
+        self.last_consolidated_step = len(self.steps)
+        consolidated = body + self._build_footer()
         
         # Cache result
+        self._body_cache = body
         self._consolidated_cache = consolidated
-        self._content_hash = self._calculate_content_hash()
+        self._content_hash = self.index.content_hash
         
         return consolidated
     
     def _calculate_content_hash(self) -> str:
         """
-        Calculate hash of current content for cache validation.
-
-        EXAI QA Fix: Added hash caching to prevent redundant calculations.
+        Hash of current content for cache validation.
 
         Returns:
-            MD5 hash of step data
+            Rolling hash of step numbers, findings and hypotheses (O(1))
         """
-        # EXAI QA Fix: Cache hash calculations
-        if not hasattr(self, '_hash_cache'):
-            self._hash_cache = {}
-
-        content = ""
-        for step in self.steps:
-            content += f"{step['step_number']}:{step['findings']}:{step.get('hypothesis', '')}"
-
-        content_hash = hashlib.md5(content.encode()).hexdigest()
-
-        # Store in cache with timestamp
-        import time
-        self._hash_cache[content_hash] = time.time()
-
-        return content_hash
+        return self.index.content_hash
     
     def _build_header(self) -> str:
         """Build consolidated findings header."""
@@ -176,17 +161,8 @@ class OptimizedConsolidatedFindings:
     
     def _build_footer(self) -> str:
         """Build consolidated findings footer."""
-        total_files = len(set(
-            file
-            for step in self.steps
-            for file in step.get('files_checked', [])
-        ))
-        
-        total_relevant = len(set(
-            file
-            for step in self.steps
-            for file in step.get('relevant_files', [])
-        ))
+        total_files = len(self.index.files_checked)
+        total_relevant = len(self.index.relevant_files)
         
         return f"\n\n---\n**Summary:** {len(self.steps)} steps, {total_files} files checked, {total_relevant} relevant files\n"
     
@@ -239,7 +215,9 @@ class OptimizedConsolidatedFindings:
     def clear(self):
         """Clear all consolidation data."""
         self.steps.clear()
+        self.index.clear()
         self.last_consolidated_step = 0
+        self._body_cache = None
         self._consolidated_cache = None
         self._content_hash = None
         logger.debug("Consolidation data cleared")
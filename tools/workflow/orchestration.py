@@ -20,6 +20,7 @@ from mcp.types import TextContent
 
 from tools.shared.base_models import ConsolidatedFindings
 from tools.workflow.file_cache import get_file_cache
+from tools.workflow.findings_index import FindingsIndex, jaccard, tokenize
 from tools.workflow.performance_optimizer import get_performance_optimizer, normalize_path
 from utils.conversation.threads import create_thread
 from utils.progress import send_progress
@@ -776,8 +777,9 @@ class OrchestrationMixin:
             # Day 2.3: Enhanced sufficiency check - consider evidence quality
             # Day 2.6.2: EXAI Recommendation - Use ratio-based threshold instead of absolute numbers
             if hasattr(self, 'work_history'):
-                files_checked = sum(1 for step in self.work_history if step.get('files_checked'))
-                relevant_files = sum(1 for step in self.work_history if step.get('relevant_files'))
+                index = self._get_findings_index()
+                files_checked = index.steps_with_files_checked
+                relevant_files = index.steps_with_relevant_files
 
                 # Use ratio-based threshold (40%) for more accurate off-track detection
                 if files_checked > 0:
@@ -802,6 +804,14 @@ class OrchestrationMixin:
                 else:
                     logger.debug(f"{self.get_name()}: Hypothesis validation low (Jaccard similarity: {similarity:.1%})")
 
+        # Repeated findings: latest step nearly duplicates an earlier one (MinHash estimate)
+        similar_step, similar_score = self._get_findings_index().most_similar_to_latest()
+        if similar_score >= 0.9:
+            logger.info(
+                f"{self.get_name()}: Findings repeat step {similar_step} "
+                f"({similar_score:.0%} similar), investigation may be looping"
+            )
+
         # Continue execution
         return True
 
@@ -825,17 +835,8 @@ class OrchestrationMixin:
         if not text1 or not text2:
             return 0.0
 
-        # Convert to lowercase and split into word sets
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-
-        # Calculate Jaccard similarity
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-
-        similarity = intersection / union if union > 0 else 0.0
-
-        return similarity
+        # Lowercase word sets (memoized - findings were already tokenized when indexed)
+        return jaccard(tokenize(text1), tokenize(text2))
 
     def _calculate_dynamic_step_limit(self, request, arguments: dict) -> int:
         """
@@ -938,9 +939,8 @@ class OrchestrationMixin:
             f"discarded {discarded_steps} subsequent steps"
         )
 
-        # Reset consolidated findings to reflect the backtrack
-        if hasattr(self, '_consolidated_findings'):
-            self._consolidated_findings = self._consolidate_current_findings()
+        # Rebuild consolidated findings and the findings index from the kept steps
+        self._reprocess_consolidated_findings()
 
     def handle_work_continuation(self, response_data: dict, request) -> dict:
         """
@@ -1051,6 +1051,13 @@ class OrchestrationMixin:
         # Reprocess consolidated findings
         self._reprocess_consolidated_findings()
 
+    def _get_findings_index(self) -> FindingsIndex:
+        """Incremental index over consolidated findings (see findings_index.py)"""
+        index = getattr(self, "findings_index", None)
+        if index is None:
+            index = self.findings_index = FindingsIndex()
+        return index
+
     def _update_consolidated_findings(self, step_data: dict):
         """Update consolidated findings with new step data"""
         self.consolidated_findings.files_checked.update(step_data.get("files_checked", []))  # type: ignore
@@ -1072,10 +1079,18 @@ class OrchestrationMixin:
         # Update confidence to latest value from this step
         if step_data.get("confidence"):
             self.consolidated_findings.confidence = step_data["confidence"]  # type: ignore
+        self._get_findings_index().add_step(
+            step_data["step_number"],
+            step_data["findings"],
+            hypothesis=step_data.get("hypothesis"),
+            files_checked=step_data.get("files_checked"),
+            relevant_files=step_data.get("relevant_files"),
+        )
 
     def _reprocess_consolidated_findings(self):
         """Reprocess consolidated findings after backtracking"""
         self.consolidated_findings = ConsolidatedFindings()  # type: ignore
+        self.findings_index = FindingsIndex()
         for step in self.work_history:  # type: ignore
             self._update_consolidated_findings(step)
 
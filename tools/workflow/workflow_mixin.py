@@ -39,6 +39,7 @@ from tools.workflow.expert_analysis import ExpertAnalysisMixin
 from tools.workflow.orchestration import OrchestrationMixin
 
 from tools.shared.base_models import ConsolidatedFindings
+from tools.workflow.findings_index import FindingsIndex
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +93,7 @@ class BaseWorkflowMixin(
         super().__init__()
         self.work_history: list[dict[str, Any]] = []
         self.consolidated_findings: ConsolidatedFindings = ConsolidatedFindings()
+        self.findings_index: FindingsIndex = FindingsIndex()
         self.initial_request: Optional[str] = None
 
     # ================================================================================
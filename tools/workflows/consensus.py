@@ -11,14 +11,18 @@ Key features:
 - Context-aware file embedding
 - Support for stance-based analysis (for/against/neutral)
 - Final synthesis combining all perspectives
+- Optional parallel mode: all models consulted concurrently in step 1
 
 Refactored: Phase 2.1 - Extracted configuration, schema, and validation to separate modules
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import os
+import time
 from typing import TYPE_CHECKING, Any
 
 from pydantic import Field, model_validator
@@ -39,6 +43,45 @@ from .consensus_validation import validate_consensus_step_one
 
 logger = logging.getLogger(__name__)
 
+_SYNTHESIS_NEXT_STEPS = (
+    "CONSENSUS GATHERING IS COMPLETE. Synthesize all perspectives and present:\n"
+    "1. Key points of AGREEMENT across models\n"
+    "2. Key points of DISAGREEMENT and why they differ\n"
+    "3. Your final consolidated recommendation\n"
+    "4. Specific, actionable next steps for implementation\n"
+    "5. Critical risks or concerns that must be addressed"
+)
+
+# Default provider limits, matching the daemon's EXAI_WS_<PROVIDER>_MAX_INFLIGHT defaults
+_PROVIDER_MAX_INFLIGHT_DEFAULTS = {"KIMI": 6, "GLM": 4}
+
+
+def _parallel_by_default() -> bool:
+    return os.getenv("CONSENSUS_PARALLEL", "false").strip().lower() == "true"
+
+
+def _model_timeout_secs() -> float:
+    """Per-model deadline for parallel consultations (below WORKFLOW_TOOL_TIMEOUT_SECS)."""
+    return float(os.getenv("CONSENSUS_MODEL_TIMEOUT_SECS", "150"))
+
+
+def _provider_semaphore(provider) -> asyncio.BoundedSemaphore | None:
+    """The daemon's per-provider semaphore (shared with ToolExecutor), if this provider has one."""
+    key = provider.get_provider_type().value.upper()
+    if key not in _PROVIDER_MAX_INFLIGHT_DEFAULTS:
+        return None
+    from src.daemon.middleware.semaphores import get_port_semaphore_manager
+
+    port = int(os.getenv("EXAI_WS_PORT", "8079"))
+    limit = int(os.getenv(f"EXAI_WS_{key}_MAX_INFLIGHT", str(_PROVIDER_MAX_INFLIGHT_DEFAULTS[key])))
+    return get_port_semaphore_manager().get_provider_semaphore(port, key, limit)
+
+
+def _discard_result(task: asyncio.Task) -> None:
+    # Abandoned consultations finish in the background; retrieve errors so they aren't logged as unhandled
+    if not task.cancelled():
+        task.exception()
+
 
 class ConsensusRequest(WorkflowRequest):
     """Request model for consensus workflow steps"""
@@ -74,6 +117,8 @@ class ConsensusRequest(WorkflowRequest):
     # Optional images for visual debugging
     images: list[str] | None = Field(default=None, description=CONSENSUS_WORKFLOW_FIELD_DESCRIPTIONS["images"])
 
+    # Opt-in fan-out: consult every model concurrently in step 1 (default: CONSENSUS_PARALLEL)
+    parallel: bool | None = Field(None, description=CONSENSUS_WORKFLOW_FIELD_DESCRIPTIONS["parallel"])
 
     # Override inherited fields to exclude them from schema
     temperature: float | None = Field(default=None, exclude=True)
@@ -152,7 +197,8 @@ class ConsensusTool(WorkflowTool):
             "- Total steps = number of models (each step includes consultation + response)\n"
             "- Models can have stances (for/against/neutral) for structured debate\n"
             "- Same model can be used multiple times with different stances\n"
-            "- Each model + stance combination must be unique\n\n"
+            "- Each model + stance combination must be unique\n"
+            "- Set parallel=true in step 1 to consult all models at once and receive every response in one step\n\n"
             "Perfect for: complex decisions, architectural choices, feature proposals, "
             "technology evaluations, strategic planning."
         )
@@ -346,6 +392,10 @@ of the evidence, even when it strongly points in one direction.""",
             self.initial_prompt = request.step  # Keep for backward compatibility
             self.models_to_consult = request.models or []
             self.accumulated_responses = []
+
+            if self.models_to_consult and (request.parallel if request.parallel is not None else _parallel_by_default()):
+                return await self._execute_parallel_consensus(request)
+
             # Set total steps: len(models) (each step includes consultation + response)
             request.total_steps = len(self.models_to_consult)
 
@@ -393,14 +443,7 @@ of the evidence, even when it strongly points in one direction.""",
                         "total_responses": len(self.accumulated_responses),
                         "consensus_confidence": "high",
                     }
-                    response_data["next_steps"] = (
-                        "CONSENSUS GATHERING IS COMPLETE. Synthesize all perspectives and present:\n"
-                        "1. Key points of AGREEMENT across models\n"
-                        "2. Key points of DISAGREEMENT and why they differ\n"
-                        "3. Your final consolidated recommendation\n"
-                        "4. Specific, actionable next steps for implementation\n"
-                        "5. Critical risks or concerns that must be addressed"
-                    )
+                    response_data["next_steps"] = _SYNTHESIS_NEXT_STEPS
                 else:
                     response_data["next_steps"] = (
                         f"Model {model_response['model']} has provided its {model_response.get('stance', 'neutral')} "
@@ -431,6 +474,120 @@ of the evidence, even when it strongly points in one direction.""",
         # Otherwise, use standard workflow execution
         return await super().execute_workflow(arguments)
 
+    async def _execute_parallel_consensus(self, request) -> list:
+        """Step 1 in parallel mode: consult all models at once and return every response."""
+        responses = await self._consult_models_parallel(request)
+        self.accumulated_responses = responses
+
+        answered = [r for r in responses if r.get("status") == "success"]
+        missing = [r for r in responses if r.get("status") != "success"]
+        next_steps = _SYNTHESIS_NEXT_STEPS
+        if missing:
+            next_steps += "\n\nNot all models responded: " + ", ".join(
+                f"{r['model']}:{r.get('stance', 'neutral')} ({r['status']})" for r in missing
+            )
+
+        response_data = {
+            "status": "consensus_workflow_complete",
+            "step_number": request.step_number,
+            "total_steps": 1,
+            "next_step_required": False,
+            "consensus_complete": True,
+            "agent_analysis": {
+                "initial_analysis": request.step,
+                "findings": request.findings,
+            },
+            "accumulated_responses": responses,
+            "complete_consensus": {
+                "initial_prompt": self.original_proposal if self.original_proposal else self.initial_prompt,
+                "models_consulted": [f"{r['model']}:{r.get('stance', 'neutral')}" for r in answered],
+                "models_missing": [f"{r['model']}:{r.get('stance', 'neutral')}" for r in missing],
+                "total_responses": len(answered),
+                "consensus_confidence": "high" if not missing else "partial",
+            },
+            "next_steps": next_steps,
+            "metadata": {
+                "tool_name": self.get_name(),
+                "workflow_type": "multi_model_consensus",
+                "execution_mode": "parallel",
+                "models_consulted": [f"{m['model']}:{m.get('stance', 'neutral')}" for m in self.models_to_consult],
+            },
+        }
+        return [TextContent(type="text", text=json.dumps(response_data, indent=2, ensure_ascii=False))]
+
+    async def _consult_models_parallel(self, request) -> list[dict]:
+        """
+        Consult every model in models_to_consult concurrently.
+
+        Prompts are prepared one model at a time (file prep uses the per-instance
+        model context), and each model call is dispatched to a worker thread as
+        soon as its prompt is ready, under the daemon's per-provider semaphore.
+        Responses are merged in completion order. Models that miss their
+        deadline (CONSENSUS_MODEL_TIMEOUT_SECS from dispatch) are reported with
+        status "timeout" and the remaining results are returned.
+        """
+        timeout = _model_timeout_secs()
+        total = len(self.models_to_consult)
+        results: list[dict] = []
+        pending: dict[asyncio.Task, tuple[dict, float]] = {}
+        abandoned = False
+
+        async def consult(consultation: dict) -> dict | None:
+            semaphore = _provider_semaphore(consultation["provider"])
+            if semaphore is None:
+                return await asyncio.to_thread(self._call_model, consultation, request)
+            # Held until the provider call returns, even if the result is no longer awaited
+            async with semaphore:
+                if abandoned:
+                    return None
+                return await asyncio.to_thread(self._call_model, consultation, request)
+
+        try:
+            for model_config in self.models_to_consult:
+                try:
+                    consultation = self._prepare_consultation(model_config, request)
+                except Exception as e:
+                    results.append(self._consultation_error(model_config, e))
+                    continue
+                pending[asyncio.create_task(consult(consultation))] = (model_config, time.monotonic())
+
+            while pending:
+                now = time.monotonic()
+                for task in [t for t, (_, started) in pending.items() if now - started >= timeout]:
+                    model_config, _ = pending.pop(task)
+                    task.add_done_callback(_discard_result)
+                    results.append({
+                        "model": model_config.get("model", "unknown"),
+                        "stance": model_config.get("stance", "neutral"),
+                        "status": "timeout",
+                        "error": f"No response within {timeout:.0f}s; consensus returned without this model",
+                    })
+                    logger.warning(f"[CONSENSUS] {model_config.get('model')} timed out after {timeout:.0f}s")
+                if not pending:
+                    break
+
+                wait_for = min(started for _, started in pending.values()) + timeout - now
+                done, _ = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model_config, started = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = self._consultation_error(model_config, e)
+                    result["elapsed_secs"] = round(time.monotonic() - started, 2)
+                    results.append(result)
+                    logger.info(
+                        f"[CONSENSUS] {result['model']}:{result.get('stance', 'neutral')} {result['status']} "
+                        f"in {result['elapsed_secs']}s ({len(results)}/{total})"
+                    )
+        finally:
+            # Calls still queued on a provider semaphore are skipped once we stop waiting
+            abandoned = True
+            for task in pending:
+                task.add_done_callback(_discard_result)
+
+        return results
+
     async def _consult_model(self, model_config: dict, request) -> dict:
         """
         Consult a single model and return its response.
@@ -441,6 +598,13 @@ of the evidence, even when it strongly points in one direction.""",
         - Only original proposal + files
         - Proper cleanup to prevent context leakage
         """
+        try:
+            return self._call_model(self._prepare_consultation(model_config, request), request)
+        except Exception as e:
+            return self._consultation_error(model_config, e)
+
+    def _prepare_consultation(self, model_config: dict, request) -> dict:
+        """Resolve the provider and build the isolated prompt for one model (no model call)."""
         _temp_ctx = None  # Initialize to None for proper cleanup
 
         try:
@@ -480,50 +644,13 @@ of the evidence, even when it strongly points in one direction.""",
             # Get stance-specific system prompt
             stance = model_config.get("stance", "neutral")
             stance_prompt = model_config.get("stance_prompt")
-            system_prompt = self._get_stance_enhanced_prompt(stance, stance_prompt)
-
-            # Call the model - NO ModelContext should exist at this point
-            response = provider.generate_content(
-                prompt=prompt,
-                model_name=model_name,
-                system_prompt=system_prompt,
-                temperature=0.2,  # Low temperature for consistency
-                thinking_mode="medium",
-                images=request.images if request.images else None,
-            )
-
-            # Validate response before returning
-            if not response or not hasattr(response, 'content'):
-                raise ValueError(f"Invalid response from model {model_name}: missing content")
 
             return {
-                "model": model_name,
+                "model_name": model_name,
                 "stance": stance,
-                "status": "success",
-                "verdict": response.content,
-                "metadata": {
-                    "provider": provider.get_provider_type().value,
-                    "model_name": model_name,
-                },
-            }
-        except Exception as e:
-            # Friendly guidance for missing model context during blinded consensus
-            if "Model context not provided" in str(e):
-                return {
-                    "model": model_config.get("model", "unknown"),
-                    "stance": model_config.get("stance", "neutral"),
-                    "status": "error",
-                    "error": (
-                        "Model context not provided for file preparation. "
-                        "Please call this tool through the server wrapper so the model and context are pre-resolved."
-                    ),
-                }
-            logger.exception("Error consulting model %s", model_config)
-            return {
-                "model": model_config.get("model", "unknown"),
-                "stance": model_config.get("stance", "neutral"),
-                "status": "error",
-                "error": str(e),
+                "provider": provider,
+                "prompt": prompt,
+                "system_prompt": self._get_stance_enhanced_prompt(stance, stance_prompt),
             }
         finally:
             # FINAL CLEANUP: Ensure ModelContext is completely removed
@@ -536,6 +663,57 @@ of the evidence, even when it strongly points in one direction.""",
                 except Exception:
                     pass
 
+    def _call_model(self, consultation: dict, request) -> dict:
+        """Call the model for a prepared consultation (blocking; safe to run in a worker thread)."""
+        model_name = consultation["model_name"]
+        provider = consultation["provider"]
+
+        # Call the model - NO ModelContext should exist at this point
+        response = provider.generate_content(
+            prompt=consultation["prompt"],
+            model_name=model_name,
+            system_prompt=consultation["system_prompt"],
+            temperature=0.2,  # Low temperature for consistency
+            thinking_mode="medium",
+            images=request.images if request.images else None,
+        )
+
+        # Validate response before returning
+        if not response or not hasattr(response, 'content'):
+            raise ValueError(f"Invalid response from model {model_name}: missing content")
+
+        return {
+            "model": model_name,
+            "stance": consultation["stance"],
+            "status": "success",
+            "verdict": response.content,
+            "metadata": {
+                "provider": provider.get_provider_type().value,
+                "model_name": model_name,
+            },
+        }
+
+    def _consultation_error(self, model_config: dict, e: Exception) -> dict:
+        """Error entry for a failed consultation."""
+        # Friendly guidance for missing model context during blinded consensus
+        if "Model context not provided" in str(e):
+            return {
+                "model": model_config.get("model", "unknown"),
+                "stance": model_config.get("stance", "neutral"),
+                "status": "error",
+                "error": (
+                    "Model context not provided for file preparation. "
+                    "Please call this tool through the server wrapper so the model and context are pre-resolved."
+                ),
+            }
+        logger.error("Error consulting model %s", model_config, exc_info=e)
+        return {
+            "model": model_config.get("model", "unknown"),
+            "stance": model_config.get("stance", "neutral"),
+            "status": "error",
+            "error": str(e),
+        }
+
     def _preflight_validate_step_one(self, request) -> None:
         """Validate models, steps, and files for consensus step 1.
         Raises ValueError with a user-friendly message on problems.
@@ -55,6 +55,11 @@ CONSENSUS_WORKFLOW_FIELD_DESCRIPTIONS = {
         "Optional list of image paths or base64 data URLs for visual context. Useful for UI/UX discussions, "
         "architecture diagrams, mockups, or any visual references that help inform the consensus analysis."
     ),
+    "parallel": (
+        "Step 1 only. When true, all models are consulted concurrently and every response is returned in this "
+        "single step (total_steps becomes 1). Models that miss the per-model deadline are reported as timed out "
+        "and the consensus proceeds with the responses received."
+    ),
 }
 
 # Stance-specific prompts for consensus workflow
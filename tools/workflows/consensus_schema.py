@@ -82,6 +82,10 @@ def build_consensus_schema(tool_name: str, model_field_schema: dict[str, Any]) -
             "items": {"type": "string"},
             "description": CONSENSUS_WORKFLOW_FIELD_DESCRIPTIONS["images"],
         },
+        "parallel": {
+            "type": "boolean",
+            "description": CONSENSUS_WORKFLOW_FIELD_DESCRIPTIONS["parallel"],
+        },
     }
 
     # Define excluded fields for consensus workflow
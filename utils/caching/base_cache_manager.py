@@ -17,17 +17,28 @@ Performance Benefits:
 - L3 hit: 10-50ms (network call)
 - Cache miss: Full retrieval + population
 
+L2 values are written as compact binary frames (msgpack/json + optional
+zstd/lz4/zlib compression) via CacheCodec; legacy JSON entries still decode.
+
+Async API (aget/aset/amget/amset) uses redis.asyncio with a pooled connection
+shared per event loop, so callers on the daemon loop never block on Redis.
+Batch operations use MGET and non-transactional pipelines (one round-trip).
+
 Created: 2025-10-16
 Updated: 2025-10-31 (Phase 2: Implements CacheInterface)
 """
 
-import json
+import asyncio
+import enum
 import logging
 import os
 import threading
-from typing import Optional, Dict, Any, Callable, TYPE_CHECKING
+import time
+import weakref
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple, Union, TYPE_CHECKING
 from urllib.parse import urlparse
 
+from utils.caching.codecs import CacheCodec, CodecError
 from utils.caching.interface import CacheInterface
 
 if TYPE_CHECKING:
@@ -42,6 +53,39 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Shared redis.asyncio connection pools: event loop -> {redis_url: pool}.
+# Keyed weakly by the loop object itself, so a new loop can never inherit a
+# pool bound to a dead one; pools of closed loops are pruned on lookup.
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_async_pools_lock = threading.Lock()
+
+# Seconds to wait before retrying an unreachable async Redis
+_ASYNC_REDIS_RETRY_SECS = 30.0
+
+
+def _get_async_pool(redis_url: str, loop: asyncio.AbstractEventLoop):
+    """Get (or create) the redis.asyncio connection pool for this URL and event loop."""
+    import redis.asyncio as aioredis
+
+    with _async_pools_lock:
+        # Idle connections reference their loop, so a closed loop's pools would
+        # otherwise keep it (and themselves) alive
+        for closed in [l for l in _async_pools if l.is_closed()]:
+            del _async_pools[closed]
+
+        loop_pools = _async_pools.setdefault(loop, {})
+        pool = loop_pools.get(redis_url)
+        if pool is None:
+            pool = aioredis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=int(os.getenv("REDIS_ASYNC_MAX_CONNECTIONS", "32")),
+                socket_connect_timeout=2,
+                socket_timeout=2,
+                health_check_interval=30,
+            )
+            loop_pools[redis_url] = pool
+        return pool
+
 
 class BaseCacheManager(CacheInterface):
     """
@@ -51,8 +95,8 @@ class BaseCacheManager(CacheInterface):
 
     Subclasses should override:
     - _get_cache_prefix() - Return cache key prefix (e.g., "routing:", "conversation:")
-    - _serialize_value() - Custom serialization if needed (default: JSON)
-    - _deserialize_value() - Custom deserialization if needed (default: JSON)
+    - _serialize_value() - Custom serialization if needed (default: CacheCodec frame)
+    - _deserialize_value() - Custom deserialization if needed (default: CacheCodec frame)
     """
     
     _lock = threading.Lock()
@@ -64,7 +108,8 @@ class BaseCacheManager(CacheInterface):
         l2_ttl: int = 1800,
         enable_redis: bool = True,
         cache_prefix: str = "cache",
-        max_response_size: Optional[int] = None
+        max_response_size: Optional[int] = None,
+        codec: Optional[CacheCodec] = None
     ):
         """
         Initialize base cache manager.
@@ -76,12 +121,14 @@ class BaseCacheManager(CacheInterface):
             enable_redis: Whether to enable L2 Redis caching
             cache_prefix: Prefix for cache keys (e.g., "routing", "conversation")
             max_response_size: Maximum size of a single response in bytes (optional, for semantic caching)
+            codec: L2 value codec (default: CacheCodec configured from environment)
         """
         self._cache_prefix = cache_prefix
         self._l1_ttl = l1_ttl
         self._l2_ttl = l2_ttl
         self._enable_redis = enable_redis
         self._max_response_size = max_response_size
+        self._codec = codec or CacheCodec()
         
         # L1: In-memory cache
         try:
@@ -98,6 +145,11 @@ class BaseCacheManager(CacheInterface):
         # L2: Redis cache (lazy initialization)
         self._redis_client = None
         self._redis_enabled = False
+
+        # L2 async client (lazy, bound to the event loop that created it)
+        self._async_redis_client = None
+        self._async_redis_loop = None
+        self._async_redis_retry_at = 0.0
         
         # Statistics
         self._stats = {
@@ -134,7 +186,7 @@ class BaseCacheManager(CacheInterface):
                 port=parsed.port or 6379,
                 db=int(parsed.path.lstrip('/')) if parsed.path else 0,
                 password=parsed.password,
-                decode_responses=True,
+                decode_responses=False,  # Values are binary codec frames
                 socket_connect_timeout=2,
                 socket_timeout=2,
                 retry_on_timeout=True,
@@ -165,69 +217,71 @@ class BaseCacheManager(CacheInterface):
         """Create prefixed cache key."""
         return f"{self._cache_prefix}:{key}"
     
-    def _serialize_value(self, value: Any) -> str:
+    def _serialize_value(self, value: Any) -> bytes:
         """
         Serialize value for Redis storage with ModelResponse support.
 
         Handles:
         - ModelResponse objects (via to_dict method)
-        - Other dataclasses (generic conversion)
-        - Primitive types (standard JSON)
+        - Other dataclasses (type-tagged for deserialization)
+        - Primitive types (native codec encoding)
+
+        Nested objects are converted lazily by the codec's default hook, so
+        plain dict/list values never pay for a field-by-field walk.
 
         Returns:
-            JSON string representation of value
+            Framed bytes produced by CacheCodec
         """
         # Handle ModelResponse objects - explicit type check first
         # Phase 6.3 Fix (2025-11-01): Added explicit type check to ensure proper detection
         if value.__class__.__name__ == 'ModelResponse':
-            if hasattr(value, 'to_dict') and callable(getattr(value, 'to_dict')):
-                return json.dumps(value.to_dict())
-            else:
+            if not (hasattr(value, 'to_dict') and callable(getattr(value, 'to_dict'))):
                 # Fallback: ModelResponse without to_dict method (shouldn't happen)
                 logger.error(f"[{self._cache_prefix.upper()}_CACHE] ModelResponse missing to_dict method!")
 
         # Handle other objects with to_dict method
         if hasattr(value, 'to_dict') and callable(getattr(value, 'to_dict')):
-            return json.dumps(value.to_dict())
-
-        # Handle other dataclasses
-        if hasattr(value, '__dataclass_fields__'):
-            # Convert dataclass to dict, handling nested objects
-            result = {}
-            for field_name, field_def in value.__dataclass_fields__.items():
-                field_value = getattr(value, field_name)
+            value = value.to_dict()
 
-                # Handle enums
-                if hasattr(field_value, 'value'):
-                    result[field_name] = field_value.value
-                # Handle nested dataclasses
-                elif hasattr(field_value, '__dataclass_fields__'):
-                    result[field_name] = self._serialize_dataclass_to_dict(field_value)
-                else:
-                    result[field_name] = field_value
+        # Handle other dataclasses: add type marker for deserialization
+        elif hasattr(value, '__dataclass_fields__'):
+            fields = {name: getattr(value, name) for name in value.__dataclass_fields__}
+            fields["__type__"] = value.__class__.__name__
+            value = fields
 
-            # Add type marker for deserialization
-            result["__type__"] = value.__class__.__name__
-            return json.dumps(result)
+        return self._codec.encode(value, default=self._encode_object)
 
-        # Default JSON serialization for primitive types
-        return json.dumps(value)
+    @staticmethod
+    def _encode_object(obj: Any) -> Any:
+        """
+        Codec default hook for values the serializer cannot encode natively.
 
-    def _deserialize_value(self, data: str) -> Any:
+        Handles enums (by value), objects with to_dict, and nested dataclasses.
+        """
+        if isinstance(obj, enum.Enum):
+            return obj.value
+        if hasattr(obj, 'to_dict') and callable(getattr(obj, 'to_dict')):
+            return obj.to_dict()
+        if hasattr(obj, '__dataclass_fields__'):
+            return {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+        if isinstance(obj, (set, frozenset, tuple)):
+            return list(obj)
+        raise TypeError(f"Object of type {obj.__class__.__name__} is not cache-serializable")
+
+    def _deserialize_value(self, data: Union[bytes, str]) -> Any:
         """
         Deserialize value from Redis with ModelResponse support.
 
         Handles:
         - ModelResponse objects (via from_dict method)
         - Other typed objects (basic reconstruction)
-        - Primitive types (standard JSON)
-        - Backward compatibility (legacy cached data)
+        - Binary codec frames and legacy JSON entries
 
         Returns:
-            Deserialized value
+            Deserialized value, or None if the entry cannot be decoded
         """
         try:
-            parsed = json.loads(data)
+            parsed = self._codec.decode(data)
 
             # Handle typed objects with __type__ marker
             if isinstance(parsed, dict) and "__type__" in parsed:
@@ -248,36 +302,11 @@ class BaseCacheManager(CacheInterface):
 
             return parsed
 
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+        except (CodecError, ValueError, KeyError, AttributeError) as e:
             logger.warning(f"[{self._cache_prefix.upper()}_CACHE] Deserialization error: {e}")
-            # Return raw data if deserialization fails
-            return data
-
-    def _serialize_dataclass_to_dict(self, obj: Any) -> dict[str, Any]:
-        """
-        Helper to serialize nested dataclasses to dict.
-
-        Recursively handles nested dataclasses and enums.
-
-        Args:
-            obj: Dataclass instance to serialize
-
-        Returns:
-            Dictionary representation
-        """
-        result = {}
-        for field_name, field_def in obj.__dataclass_fields__.items():
-            field_value = getattr(obj, field_name)
-
-            if hasattr(field_value, 'value'):
-                result[field_name] = field_value.value
-            elif hasattr(field_value, '__dataclass_fields__'):
-                result[field_name] = self._serialize_dataclass_to_dict(field_value)
-            else:
-                result[field_name] = field_value
+            self._stats['errors'] += 1
+            return None
 
-        return result
-    
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache (L1 -> L2 -> miss).
@@ -300,8 +329,8 @@ class BaseCacheManager(CacheInterface):
             if redis_client:
                 try:
                     cached = redis_client.get(self._make_key(key))
-                    if cached:
-                        value = self._deserialize_value(cached)
+                    value = self._deserialize_value(cached) if cached else None
+                    if value is not None:
                         # Populate L1 cache
                         self._l1_cache[key] = value
                         self._stats['l2_hits'] += 1
@@ -375,6 +404,87 @@ class BaseCacheManager(CacheInterface):
         self._stats['writes'] += 1
         logger.debug(f"[{self._cache_prefix.upper()}_CACHE] WRITE: {key}")
     
+    def _split_l1(self, keys: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Resolve keys from L1; returns (hits, missing keys in order)."""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        seen = set()
+        for key in keys:
+            if key in seen:
+                continue
+            seen.add(key)
+            if key in self._l1_cache:
+                found[key] = self._l1_cache[key]
+                self._stats['l1_hits'] += 1
+            else:
+                missing.append(key)
+        return found, missing
+
+    def _absorb_l2(self, keys: List[str], raw_values: List[Any], found: Dict[str, Any]) -> List[str]:
+        """Decode L2 batch results into found (and L1); returns keys still missing."""
+        still_missing = []
+        for key, raw in zip(keys, raw_values):
+            value = self._deserialize_value(raw) if raw else None
+            if value is None:
+                still_missing.append(key)
+                continue
+            self._l1_cache[key] = value
+            found[key] = value
+            self._stats['l2_hits'] += 1
+        return still_missing
+
+    def mget(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values at once (L1, then one MGET round-trip for the rest).
+
+        Args:
+            keys: Cache keys (without prefix)
+
+        Returns:
+            Dictionary of key -> value for keys that were found
+        """
+        found, missing = self._split_l1(keys)
+
+        if missing and self._enable_redis:
+            redis_client = self._get_redis_client()
+            if redis_client:
+                try:
+                    raw_values = redis_client.mget([self._make_key(k) for k in missing])
+                    missing = self._absorb_l2(missing, raw_values, found)
+                except Exception as e:
+                    logger.warning(f"[{self._cache_prefix.upper()}_CACHE] L2 batch read error: {e}")
+                    self._stats['errors'] += 1
+
+        self._stats['misses'] += len(missing)
+        return found
+
+    def mset(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """
+        Set several values at once (L1, then one pipelined L2 round-trip).
+
+        Args:
+            items: Dictionary of key (without prefix) -> value
+            ttl: Optional TTL override (uses default if None)
+        """
+        accepted = {k: v for k, v in items.items() if self._validate_response_size(v)}
+        for key, value in accepted.items():
+            self._l1_cache[key] = value
+
+        if accepted and self._enable_redis:
+            redis_client = self._get_redis_client()
+            if redis_client:
+                try:
+                    redis_ttl = ttl if ttl is not None else self._l2_ttl
+                    pipe = redis_client.pipeline(transaction=False)
+                    for key, value in accepted.items():
+                        pipe.set(self._make_key(key), self._serialize_value(value), ex=redis_ttl)
+                    pipe.execute()
+                except Exception as e:
+                    logger.warning(f"[{self._cache_prefix.upper()}_CACHE] L2 batch write error: {e}")
+                    self._stats['errors'] += 1
+
+        self._stats['writes'] += len(accepted)
+
     def delete(self, key: str) -> None:
         """
         Delete value from all cache layers.
@@ -417,6 +527,119 @@ class BaseCacheManager(CacheInterface):
         
         logger.info(f"[{self._cache_prefix.upper()}_CACHE] All caches cleared")
     
+    # Async API (redis.asyncio)
+
+    async def _get_async_redis_client(self):
+        """Lazy initialization of the pooled redis.asyncio client for the running loop."""
+        if not self._enable_redis:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_redis_client is not None and self._async_redis_loop is not None and self._async_redis_loop() is loop:
+            return self._async_redis_client
+
+        if time.monotonic() < self._async_redis_retry_at:
+            return None
+
+        try:
+            import redis.asyncio as aioredis
+
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+            client = aioredis.Redis(connection_pool=_get_async_pool(redis_url, loop))
+            await client.ping()
+
+            self._async_redis_client = client
+            self._async_redis_loop = weakref.ref(loop)
+            logger.info(f"[{self._cache_prefix.upper()}_CACHE] L2 (async Redis) connected")
+            return client
+
+        except Exception as e:
+            logger.warning(
+                f"[{self._cache_prefix.upper()}_CACHE] L2 (async Redis) unavailable: {e}. "
+                f"Retrying in {_ASYNC_REDIS_RETRY_SECS:.0f}s, using L1 only."
+            )
+            self._async_redis_client = None
+            self._async_redis_retry_at = time.monotonic() + _ASYNC_REDIS_RETRY_SECS
+            return None
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Get value from cache without blocking the event loop (L1 -> L2 -> miss).
+
+        Args:
+            key: Cache key (without prefix)
+
+        Returns:
+            Cached value or None if not found
+        """
+        found = await self.amget([key])
+        return found.get(key)
+
+    async def amget(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values at once without blocking the event loop.
+
+        L1 is checked first; remaining keys are fetched with a single MGET.
+
+        Args:
+            keys: Cache keys (without prefix)
+
+        Returns:
+            Dictionary of key -> value for keys that were found
+        """
+        found, missing = self._split_l1(keys)
+
+        if missing and self._enable_redis:
+            client = await self._get_async_redis_client()
+            if client:
+                try:
+                    raw_values = await client.mget([self._make_key(k) for k in missing])
+                    missing = self._absorb_l2(missing, raw_values, found)
+                except Exception as e:
+                    logger.warning(f"[{self._cache_prefix.upper()}_CACHE] L2 async read error: {e}")
+                    self._stats['errors'] += 1
+
+        self._stats['misses'] += len(missing)
+        return found
+
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Set value in cache without blocking the event loop (write-through to L1 and L2).
+
+        Args:
+            key: Cache key (without prefix)
+            value: Value to cache
+            ttl: Optional TTL override (uses default if None)
+        """
+        await self.amset({key: value}, ttl=ttl)
+
+    async def amset(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """
+        Set several values at once with one pipelined L2 round-trip.
+
+        Args:
+            items: Dictionary of key (without prefix) -> value
+            ttl: Optional TTL override (uses default if None)
+        """
+        accepted = {k: v for k, v in items.items() if self._validate_response_size(v)}
+        for key, value in accepted.items():
+            self._l1_cache[key] = value
+
+        if accepted and self._enable_redis:
+            client = await self._get_async_redis_client()
+            if client:
+                try:
+                    redis_ttl = ttl if ttl is not None else self._l2_ttl
+                    async with client.pipeline(transaction=False) as pipe:
+                        for key, value in accepted.items():
+                            pipe.set(self._make_key(key), self._serialize_value(value), ex=redis_ttl)
+                        await pipe.execute()
+                except Exception as e:
+                    logger.warning(f"[{self._cache_prefix.upper()}_CACHE] L2 async write error: {e}")
+                    self._stats['errors'] += 1
+
+        self._stats['writes'] += len(accepted)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -445,6 +668,8 @@ class BaseCacheManager(CacheInterface):
             stats['size_rejections'] = self._stats['size_rejections']
             stats['max_response_size_bytes'] = self._max_response_size
 
+        stats['codec'] = self._codec.get_stats()
+
         return stats
 
     def stats(self) -> Dict[str, Any]:
@@ -0,0 +1,278 @@
+"""
+Cache Value Codecs
+
+Compact binary framing for L2 (Redis) cache values used by BaseCacheManager.
+
+Frame layout:
+    byte 0: FRAME_MAGIC (0xEC) - never a valid first byte of a JSON document
+    byte 1: FRAME_VERSION
+    byte 2: serializer id  (json / msgpack / pickle)
+    byte 3: compressor id  (none / zlib / zstd / lz4)
+    rest:   payload
+
+Values without the magic byte are treated as legacy JSON text, so entries
+written before framing was introduced still decode.
+
+Optional dependencies (msgpack, zstandard, lz4) are used when installed;
+json and zlib are always available. pickle is only used when explicitly
+requested because it must not be enabled against an untrusted Redis; pickle
+frames are rejected by codecs configured for any other serializer.
+
+Configuration:
+    CACHE_CODEC=msgpack|json|pickle      (default: msgpack if installed, else json)
+    CACHE_COMPRESSION=zstd|lz4|zlib|none (default: best available)
+    CACHE_COMPRESSION_THRESHOLD=4096     (bytes; smaller payloads are not compressed)
+"""
+
+import json
+import logging
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    _MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    _ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    _ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame as lz4_frame
+    _LZ4_AVAILABLE = True
+except ImportError:
+    lz4_frame = None
+    _LZ4_AVAILABLE = False
+
+
+FRAME_MAGIC = 0xEC
+FRAME_VERSION = 1
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+SERIALIZER_PICKLE = 3
+
+COMPRESSOR_NONE = 0
+COMPRESSOR_ZLIB = 1
+COMPRESSOR_ZSTD = 2
+COMPRESSOR_LZ4 = 3
+
+_SERIALIZER_NAMES = {SERIALIZER_JSON: "json", SERIALIZER_MSGPACK: "msgpack", SERIALIZER_PICKLE: "pickle"}
+_COMPRESSOR_NAMES = {COMPRESSOR_NONE: "none", COMPRESSOR_ZLIB: "zlib", COMPRESSOR_ZSTD: "zstd", COMPRESSOR_LZ4: "lz4"}
+
+
+class CodecError(Exception):
+    """Raised when a frame cannot be decoded."""
+
+
+def _serializer_id(name: Optional[str]) -> int:
+    name = (name or "").lower()
+    if name == "pickle":
+        return SERIALIZER_PICKLE
+    if name == "json":
+        return SERIALIZER_JSON
+    if name == "msgpack" and not _MSGPACK_AVAILABLE:
+        logger.warning("[CACHE_CODEC] msgpack requested but not installed, using json")
+        return SERIALIZER_JSON
+    return SERIALIZER_MSGPACK if _MSGPACK_AVAILABLE else SERIALIZER_JSON
+
+
+def _compressor_id(name: Optional[str]) -> int:
+    name = (name or "").lower()
+    if name == "none":
+        return COMPRESSOR_NONE
+    if name == "zlib":
+        return COMPRESSOR_ZLIB
+    if name == "zstd" and _ZSTD_AVAILABLE:
+        return COMPRESSOR_ZSTD
+    if name == "lz4" and _LZ4_AVAILABLE:
+        return COMPRESSOR_LZ4
+    if name in ("zstd", "lz4"):
+        logger.warning(f"[CACHE_CODEC] {name} requested but not installed, using best available")
+    if _ZSTD_AVAILABLE:
+        return COMPRESSOR_ZSTD
+    if _LZ4_AVAILABLE:
+        return COMPRESSOR_LZ4
+    return COMPRESSOR_ZLIB
+
+
+class CacheCodec:
+    """
+    Encodes values into versioned binary frames and decodes them back.
+
+    Tracks per-codec encode/decode counts, time and byte volume; codec names
+    are "<serializer>+<compressor>" (e.g. "msgpack+zstd", "json+none").
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        compression_threshold: Optional[int] = None,
+        compression_level: int = 3
+    ):
+        """
+        Initialize codec.
+
+        Args:
+            serializer: "msgpack", "json" or "pickle" (default: CACHE_CODEC env / best available)
+            compression: "zstd", "lz4", "zlib" or "none" (default: CACHE_COMPRESSION env / best available)
+            compression_threshold: Minimum payload size in bytes before compressing
+            compression_level: Compression level passed to the compressor
+        """
+        self.serializer = _serializer_id(serializer or os.getenv("CACHE_CODEC"))
+        self.compressor = _compressor_id(compression or os.getenv("CACHE_COMPRESSION"))
+        if compression_threshold is None:
+            compression_threshold = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", "4096"))
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if _ZSTD_AVAILABLE else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if _ZSTD_AVAILABLE else None
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def name(self) -> str:
+        return f"{_SERIALIZER_NAMES[self.serializer]}+{_COMPRESSOR_NAMES[self.compressor]}"
+
+    def _record(self, codec_name: str, op: str, elapsed: float, raw_bytes: int, frame_bytes: int) -> None:
+        s = self._stats.get(codec_name)
+        if s is None:
+            s = self._stats[codec_name] = {
+                "encode_count": 0, "encode_ms": 0.0, "decode_count": 0, "decode_ms": 0.0,
+                "raw_bytes": 0, "frame_bytes": 0,
+            }
+        s[f"{op}_count"] += 1
+        s[f"{op}_ms"] += elapsed * 1000
+        s["raw_bytes"] += raw_bytes
+        s["frame_bytes"] += frame_bytes
+
+    # Serialization -------------------------------------------------------
+
+    def _dumps(self, value: Any, default: Optional[Callable[[Any], Any]]) -> bytes:
+        if self.serializer == SERIALIZER_MSGPACK:
+            return msgpack.packb(value, default=default, use_bin_type=True)
+        if self.serializer == SERIALIZER_PICKLE:
+            return pickle.dumps(value, protocol=5)
+        return json.dumps(value, default=default, separators=(",", ":")).encode("utf-8")
+
+    def _loads(self, serializer: int, payload: bytes) -> Any:
+        if serializer == SERIALIZER_MSGPACK:
+            if not _MSGPACK_AVAILABLE:
+                raise CodecError("msgpack frame but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if serializer == SERIALIZER_PICKLE:
+            # Unpickling runs code: only trust pickle frames when this codec was
+            # explicitly configured for pickle, never because a frame says so
+            if self.serializer != SERIALIZER_PICKLE:
+                raise CodecError("pickle frame rejected: codec is not configured for pickle")
+            return pickle.loads(payload)
+        if serializer == SERIALIZER_JSON:
+            return json.loads(payload)
+        raise CodecError(f"Unknown serializer id {serializer}")
+
+    # Compression ---------------------------------------------------------
+
+    def _compress(self, payload: bytes) -> Tuple[int, bytes]:
+        if self.compressor == COMPRESSOR_NONE or len(payload) < self.compression_threshold:
+            return COMPRESSOR_NONE, payload
+        if self.compressor == COMPRESSOR_ZSTD:
+            return COMPRESSOR_ZSTD, self._zstd_compressor.compress(payload)
+        if self.compressor == COMPRESSOR_LZ4:
+            return COMPRESSOR_LZ4, lz4_frame.compress(payload, compression_level=self.compression_level)
+        return COMPRESSOR_ZLIB, zlib.compress(payload, self.compression_level)
+
+    def _decompress(self, compressor: int, payload: bytes) -> bytes:
+        if compressor == COMPRESSOR_NONE:
+            return payload
+        if compressor == COMPRESSOR_ZLIB:
+            return zlib.decompress(payload)
+        if compressor == COMPRESSOR_ZSTD:
+            if not _ZSTD_AVAILABLE:
+                raise CodecError("zstd frame but zstandard is not installed")
+            return self._zstd_decompressor.decompress(payload)
+        if compressor == COMPRESSOR_LZ4:
+            if not _LZ4_AVAILABLE:
+                raise CodecError("lz4 frame but lz4 is not installed")
+            return lz4_frame.decompress(payload)
+        raise CodecError(f"Unknown compressor id {compressor}")
+
+    # Public API ----------------------------------------------------------
+
+    def encode(self, value: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        Encode value into a versioned frame.
+
+        Args:
+            value: Value to encode
+            default: Hook converting unsupported objects to serializable ones
+
+        Returns:
+            Framed bytes
+        """
+        start = time.perf_counter()
+        payload = self._dumps(value, default)
+        compressor, body = self._compress(payload)
+        frame = bytes((FRAME_MAGIC, FRAME_VERSION, self.serializer, compressor)) + body
+        self._record(
+            f"{_SERIALIZER_NAMES[self.serializer]}+{_COMPRESSOR_NAMES[compressor]}",
+            "encode", time.perf_counter() - start, len(payload), len(frame)
+        )
+        return frame
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a frame, or a legacy JSON value written before framing.
+
+        Raises:
+            CodecError: If the frame is malformed or needs an unavailable dependency
+            ValueError: If legacy data is not valid JSON
+        """
+        start = time.perf_counter()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if not data or data[0] != FRAME_MAGIC:
+            value = json.loads(data)
+            self._record("legacy-json", "decode", time.perf_counter() - start, len(data), len(data))
+            return value
+
+        if len(data) < 4:
+            raise CodecError("Truncated cache frame")
+        version, serializer, compressor = data[1], data[2], data[3]
+        if version != FRAME_VERSION:
+            raise CodecError(f"Unsupported cache frame version {version}")
+
+        payload = self._decompress(compressor, data[4:])
+        value = self._loads(serializer, payload)
+        self._record(
+            f"{_SERIALIZER_NAMES.get(serializer, serializer)}+{_COMPRESSOR_NAMES.get(compressor, compressor)}",
+            "decode", time.perf_counter() - start, len(payload), len(data)
+        )
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-codec timing and size statistics."""
+        stats = {}
+        for codec_name, s in self._stats.items():
+            stats[codec_name] = {
+                **s,
+                "avg_encode_ms": s["encode_ms"] / s["encode_count"] if s["encode_count"] else 0.0,
+                "avg_decode_ms": s["decode_ms"] / s["decode_count"] if s["decode_count"] else 0.0,
+                "compression_ratio": s["frame_bytes"] / s["raw_bytes"] if s["raw_bytes"] else 1.0,
+            }
+        return {"active": self.name, "codecs": stats}
+
+
+__all__ = ["CacheCodec", "CodecError"]
@@ -8,7 +8,8 @@ intelligent cache hits.
 Created: 2025-11-09
 Features:
 - Hash-based exact prompt matching
-- Semantic similarity matching (configurable threshold)
+- Semantic similarity matching (configurable threshold) via a local
+  hashed n-gram TF-IDF index partitioned by model type (see semantic_index.py)
 - Configurable TTL per model type
 - Cost tracking and savings reporting
 - Multi-layer cache (L1 memory + L2 Redis)
@@ -17,7 +18,9 @@ Features:
 import hashlib
 import json
 import logging
+import os
 import re
+from pathlib import Path
 from typing import Optional, Dict, Any, Tuple, List
 from datetime import datetime, timedelta
 import statistics
@@ -28,6 +31,7 @@ except ImportError:
     TTLCache = dict
 
 from utils.caching.base_cache_manager import BaseCacheManager
+from utils.caching.semantic_index import SemanticPromptIndex
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +51,7 @@ class IntelligentPromptCache:
         semantic_threshold: float = 0.85,
         enable_semantic: bool = True,
         ttl_defaults: Optional[Dict[str, int]] = None,
+        semantic_index: Optional[SemanticPromptIndex] = None,
         **base_kwargs
     ):
         """
@@ -56,6 +61,8 @@ class IntelligentPromptCache:
             semantic_threshold: Similarity threshold (0.0-1.0) for semantic matches
             enable_semantic: Whether to use semantic similarity matching
             ttl_defaults: Default TTL per model type
+            semantic_index: Index for semantic matches (default: persisted under
+                PROMPT_CACHE_INDEX_PATH, empty string disables persistence)
             **base_kwargs: Passed to BaseCacheManager
         """
         self._semantic_threshold = semantic_threshold
@@ -80,6 +87,17 @@ class IntelligentPromptCache:
             **base_kwargs
         )
 
+        # Semantic tier: local ANN index partitioned by model type
+        self._semantic_index: Optional[SemanticPromptIndex] = None
+        if enable_semantic:
+            if semantic_index is None:
+                index_path = os.getenv("PROMPT_CACHE_INDEX_PATH", ".cache/prompt_semantic_index.npz")
+                semantic_index = SemanticPromptIndex(
+                    max_entries_per_partition=int(os.getenv("PROMPT_CACHE_SEMANTIC_MAX_ENTRIES", "2000")),
+                    path=Path(index_path) if index_path else None
+                )
+            self._semantic_index = semantic_index
+
         # Statistics
         self._stats = {
             "exact_hits": 0,
@@ -137,7 +155,7 @@ class IntelligentPromptCache:
             return self._exact_cache[cache_key]
 
         # Try semantic match if enabled
-        if self._enable_semantic:
+        if self._semantic_index is not None:
             semantic_result = self._get_semantic_match(prompt, model, context)
             if semantic_result:
                 self._stats["semantic_hits"] += 1
@@ -189,12 +207,20 @@ class IntelligentPromptCache:
             "response": response,
             "metadata": metadata or {},
             "cached_at": datetime.now().isoformat(),
-            "model_type": model_type,
-            "semantic_vector": self._generate_semantic_vector(prompt) if self._enable_semantic else None
+            "model_type": model_type
         }
 
         self._cache_manager.set(cache_key, cache_data, ttl=ttl)
 
+        if self._semantic_index is not None:
+            self._semantic_index.add(
+                cache_key,
+                self._normalize_prompt(prompt),
+                partition=model_type,
+                scope=self._get_semantic_scope(model, context),
+                ttl=ttl
+            )
+
         logger.debug(f"[PROMPT_CACHE] Stored response for key: {cache_key[:8]}")
 
     def _get_semantic_match(
@@ -203,28 +229,39 @@ class IntelligentPromptCache:
         model: str,
         context: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
-        """Find semantic match in L2 cache."""
-        # This is a simplified implementation
-        # In production, you'd use embeddings and vector similarity
-        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
-
-        # Get recent cached prompts
-        # For now, return None (semantic matching is complex)
-        # TODO: Implement proper vector similarity search
-
-        return None
-
-    def _generate_semantic_vector(self, prompt: str) -> List[float]:
-        """
-        Generate semantic vector for prompt (simplified).
-
-        In production, use proper embeddings (e.g., OpenAI, SentenceTransformers).
-        For now, return a simple hash-based vector.
-        """
-        # Simplified: Convert hash to vector of floats
-        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
-        vector = [int(prompt_hash[i:i+2], 16) / 255.0 for i in range(0, 32, 2)]
-        return vector
+        """Find the nearest cached prompt for the same model and context."""
+        model_type = self._get_model_type(model)
+        match = self._semantic_index.query(
+            self._normalize_prompt(prompt),
+            partition=model_type,
+            scope=self._get_semantic_scope(model, context),
+            threshold=self._semantic_threshold
+        )
+        if match is None:
+            return None
+
+        cache_key, similarity = match
+        entry = self._exact_cache.get(cache_key)
+        if entry is None:
+            cache_data = self._cache_manager.get(cache_key)
+            if not cache_data:
+                # Response evicted from both tiers; drop the stale index entry
+                self._semantic_index.remove(cache_key, model_type)
+                return None
+            entry = {
+                "response": cache_data.get("response"),
+                "metadata": cache_data.get("metadata", {}),
+                "cached_at": cache_data.get("cached_at"),
+                "model_type": cache_data.get("model_type", model_type)
+            }
+
+        logger.debug(f"[PROMPT_CACHE] Semantic match {cache_key[:8]} (similarity={similarity:.3f})")
+        return {**entry, "similarity": similarity}
+
+    def _get_semantic_scope(self, model: str, context: Dict[str, Any]) -> str:
+        """Semantic matches must share model and context exactly."""
+        content = f"{model}:{json.dumps(context, sort_keys=True)}"
+        return hashlib.sha256(content.encode()).hexdigest()[:32]
 
     def _get_model_type(self, model: str) -> str:
         """Determine model type for TTL selection."""
@@ -242,11 +279,14 @@ class IntelligentPromptCache:
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         total = self._stats["total_requests"]
+        stats = dict(self._stats)
+        if self._semantic_index is not None:
+            stats["semantic_index"] = self._semantic_index.get_stats()
         if total == 0:
-            return self._stats
+            return stats
 
         return {
-            **self._stats,
+            **stats,
             "hit_rate": (self._stats["exact_hits"] + self._stats["semantic_hits"]) / total,
             "exact_hit_rate": self._stats["exact_hits"] / total,
             "semantic_hit_rate": self._stats["semantic_hits"] / total
@@ -255,6 +295,9 @@ class IntelligentPromptCache:
     def clear(self) -> None:
         """Clear all caches."""
         self._exact_cache.clear()
+        if self._semantic_index is not None:
+            self._semantic_index.clear()
+            self._semantic_index.save()
         # L2 cache clearing would need cache manager support
         logger.info("[PROMPT_CACHE] Cache cleared")
 
@@ -0,0 +1,405 @@
+"""
+Local Semantic Index for Prompt Caching
+
+Offline near-duplicate lookup used by IntelligentPromptCache's semantic tier.
+No external embedding service is required.
+
+Features:
+- Hashed character n-gram TF-IDF embeddings (vectorized with NumPy)
+- Per-partition index (one partition per model type)
+- Random-hyperplane LSH candidate search for large partitions, exact
+  cosine scan for small ones
+- Bounded memory: per-partition entry cap with LRU eviction and TTL expiry
+- Optional persistence to a compressed .npz file across restarts
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Multiplier for the rolling n-gram hash (FNV prime); arithmetic wraps in uint64
+_HASH_PRIME = np.uint64(1099511628211)
+
+
+class HashedNgramEmbedder:
+    """
+    Embeds text as an L2-normalized hashed character n-gram TF-IDF vector.
+
+    Document frequencies are learned online from indexed documents, so the
+    IDF weighting adapts to the prompts actually seen by this daemon.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        ngram_sizes: Tuple[int, ...] = (3, 4, 5),
+        max_chars: int = 8192
+    ):
+        """
+        Initialize embedder.
+
+        Args:
+            dim: Number of hash buckets (embedding dimension)
+            ngram_sizes: Character n-gram lengths to hash
+            max_chars: Long texts are reduced to their head and tail within this budget
+        """
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.max_chars = max_chars
+        self.doc_freq = np.zeros(dim, dtype=np.float64)
+        self.n_docs = 0
+
+    def _prepare(self, text: str) -> np.ndarray:
+        text = re.sub(r"\s+", " ", text.strip().lower())
+        if len(text) > self.max_chars:
+            half = self.max_chars // 2
+            text = text[:half] + " " + text[-half:]
+        return np.frombuffer(f" {text} ".encode("utf-8", errors="replace"), dtype=np.uint8)
+
+    def term_counts(self, text: str) -> np.ndarray:
+        """Return raw hashed n-gram counts for text."""
+        data = self._prepare(text).astype(np.uint64)
+        counts = np.zeros(self.dim, dtype=np.float64)
+        for n in self.ngram_sizes:
+            windows = len(data) - n + 1
+            if windows <= 0:
+                continue
+            h = np.full(windows, n, dtype=np.uint64)
+            for j in range(n):
+                h = h * _HASH_PRIME + data[j:j + windows]
+            h ^= h >> np.uint64(29)
+            counts += np.bincount((h % np.uint64(self.dim)).astype(np.int64), minlength=self.dim)
+        return counts
+
+    def idf(self) -> np.ndarray:
+        return np.log((1.0 + self.n_docs) / (1.0 + self.doc_freq)) + 1.0
+
+    def embed(self, text: str, counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the normalized TF-IDF vector for text as float32."""
+        counts = self.term_counts(text) if counts is None else counts
+        tf = np.zeros_like(counts)
+        nz = counts > 0
+        tf[nz] = 1.0 + np.log(counts[nz])
+        vec = tf * self.idf()
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec.astype(np.float32)
+
+    def observe(self, counts: np.ndarray) -> None:
+        """Update document frequencies with one indexed document."""
+        self.doc_freq += counts > 0
+        self.n_docs += 1
+
+
+class _Partition:
+    """Growable vector matrix with LRU order and LSH buckets for one model type."""
+
+    def __init__(self, dim: int, max_entries: int):
+        self.dim = dim
+        self.max_entries = max_entries
+        self.vectors = np.zeros((min(64, max_entries), dim), dtype=np.float32)
+        self.expires_at = np.zeros(len(self.vectors), dtype=np.float64)
+        self.keys: List[Optional[str]] = [None] * len(self.vectors)
+        self.scopes: List[Optional[str]] = [None] * len(self.vectors)
+        self.signatures: List[Optional[Tuple[int, ...]]] = [None] * len(self.vectors)
+        self.slots: "OrderedDict[str, int]" = OrderedDict()
+        self.free: List[int] = list(range(len(self.vectors) - 1, -1, -1))
+        self.buckets: Dict[Tuple[int, int], Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _grow(self) -> None:
+        old = len(self.vectors)
+        new = min(old * 2, self.max_entries)
+        self.vectors = np.vstack([self.vectors, np.zeros((new - old, self.dim), dtype=np.float32)])
+        self.expires_at = np.concatenate([self.expires_at, np.zeros(new - old)])
+        self.keys.extend([None] * (new - old))
+        self.scopes.extend([None] * (new - old))
+        self.signatures.extend([None] * (new - old))
+        self.free.extend(range(new - 1, old - 1, -1))
+
+    def remove(self, key: str) -> bool:
+        slot = self.slots.pop(key, None)
+        if slot is None:
+            return False
+        for band in enumerate(self.signatures[slot] or ()):
+            bucket = self.buckets.get(band)
+            if bucket is not None:
+                bucket.discard(slot)
+                if not bucket:
+                    del self.buckets[band]
+        self.keys[slot] = None
+        self.scopes[slot] = None
+        self.signatures[slot] = None
+        self.vectors[slot] = 0.0
+        self.free.append(slot)
+        return True
+
+    def add(self, key: str, scope: str, vector: np.ndarray, signature: Tuple[int, ...], expires_at: float) -> Optional[str]:
+        """Insert or replace key; returns the evicted key, if any."""
+        evicted = None
+        self.remove(key)
+        if not self.free:
+            if len(self.vectors) < self.max_entries:
+                self._grow()
+            else:
+                evicted, _ = next(iter(self.slots.items()))
+                self.remove(evicted)
+        slot = self.free.pop()
+        self.vectors[slot] = vector
+        self.expires_at[slot] = expires_at
+        self.keys[slot] = key
+        self.scopes[slot] = scope
+        self.signatures[slot] = signature
+        self.slots[key] = slot
+        for band in enumerate(signature):
+            self.buckets.setdefault(band, set()).add(slot)
+        return evicted
+
+    def candidates(self, signature: Tuple[int, ...]) -> np.ndarray:
+        found: Set[int] = set()
+        for band in enumerate(signature):
+            found.update(self.buckets.get(band, ()))
+        return np.fromiter(found, dtype=np.int64, count=len(found))
+
+    def occupied(self) -> np.ndarray:
+        return np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+
+
+class SemanticPromptIndex:
+    """
+    Approximate nearest-neighbour index over prompt embeddings.
+
+    Entries are partitioned (by model type) and tagged with a scope (model +
+    context hash) so a match never crosses models or attached files.
+    """
+
+    def __init__(
+        self,
+        dim: int = 256,
+        max_entries_per_partition: int = 2000,
+        exact_search_limit: int = 512,
+        lsh_bands: int = 8,
+        lsh_band_bits: int = 4,
+        path: Optional[Path] = None,
+        persist_every: int = 25,
+        seed: int = 1337
+    ):
+        """
+        Initialize semantic index.
+
+        Args:
+            dim: Embedding dimension
+            max_entries_per_partition: LRU cap per partition
+            exact_search_limit: Partitions at or below this size are scanned exactly
+            lsh_bands: Number of LSH bands (a candidate must collide in at least one)
+            lsh_band_bits: Hyperplanes per band
+            path: Optional .npz path for persistence (None disables persistence)
+            persist_every: Save after this many inserts (0 saves only on save())
+            seed: Seed for the LSH hyperplanes (must be stable for persistence)
+        """
+        self.embedder = HashedNgramEmbedder(dim=dim)
+        self.dim = dim
+        self.max_entries_per_partition = max_entries_per_partition
+        self.exact_search_limit = exact_search_limit
+        self.lsh_bands = lsh_bands
+        self.lsh_band_bits = lsh_band_bits
+        self.path = Path(path) if path else None
+        self.persist_every = persist_every
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((lsh_bands * lsh_band_bits, dim)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(lsh_band_bits)).astype(np.int64)
+
+        self._partitions: Dict[str, _Partition] = {}
+        self._lock = threading.RLock()
+        self._dirty = 0
+        self._stats = {
+            "queries": 0,
+            "matches": 0,
+            "inserts": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "candidates_scored": 0,
+        }
+
+        if self.path is not None:
+            self.load()
+
+    def _signature(self, vector: np.ndarray) -> Tuple[int, ...]:
+        # Center on the uniform direction so non-negative TF-IDF vectors split evenly
+        centered = vector - vector.mean()
+        bits = (self._planes @ centered > 0).reshape(self.lsh_bands, self.lsh_band_bits)
+        return tuple(int(v) for v in bits.astype(np.int64) @ self._bit_weights)
+
+    def _partition(self, name: str) -> _Partition:
+        part = self._partitions.get(name)
+        if part is None:
+            part = _Partition(self.dim, self.max_entries_per_partition)
+            self._partitions[name] = part
+        return part
+
+    def add(self, key: str, text: str, partition: str, scope: str, ttl: float) -> None:
+        """
+        Index text under key.
+
+        Args:
+            key: Cache key the text maps to
+            text: Prompt text
+            partition: Partition name (model type)
+            scope: Exact-match tag required for a hit (model + context hash)
+            ttl: Seconds until the entry expires
+        """
+        counts = self.embedder.term_counts(text)
+        with self._lock:
+            self.embedder.observe(counts)
+            vector = self.embedder.embed(text, counts=counts)
+            evicted = self._partition(partition).add(
+                key, scope, vector, self._signature(vector), time.time() + ttl
+            )
+            self._stats["inserts"] += 1
+            if evicted is not None:
+                self._stats["evictions"] += 1
+            self._dirty += 1
+            should_save = self.persist_every and self._dirty >= self.persist_every
+        if should_save:
+            self.save()
+
+    def query(
+        self,
+        text: str,
+        partition: str,
+        scope: str,
+        threshold: float
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar live entry in partition with the same scope.
+
+        Returns:
+            (key, cosine similarity) if the best match reaches threshold, else None
+        """
+        with self._lock:
+            self._stats["queries"] += 1
+            part = self._partitions.get(partition)
+            if part is None or len(part) == 0:
+                return None
+
+            vector = self.embedder.embed(text)
+            if len(part) <= self.exact_search_limit:
+                slots = part.occupied()
+            else:
+                slots = part.candidates(self._signature(vector))
+            if len(slots) == 0:
+                return None
+
+            now = time.time()
+            expired = slots[part.expires_at[slots] <= now]
+            for slot in expired:
+                part.remove(part.keys[slot])
+            self._stats["expirations"] += len(expired)
+            slots = slots[part.expires_at[slots] > now]
+            slots = np.array([s for s in slots if part.scopes[s] == scope], dtype=np.int64)
+            if len(slots) == 0:
+                return None
+
+            self._stats["candidates_scored"] += len(slots)
+            scores = part.vectors[slots] @ vector
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity < threshold:
+                return None
+
+            key = part.keys[slots[best]]
+            part.slots.move_to_end(key)
+            self._stats["matches"] += 1
+            return key, similarity
+
+    def remove(self, key: str, partition: str) -> bool:
+        """Remove key from partition."""
+        with self._lock:
+            part = self._partitions.get(partition)
+            return part.remove(key) if part is not None else False
+
+    def clear(self) -> None:
+        """Drop all entries and learned document frequencies."""
+        with self._lock:
+            self._partitions.clear()
+            self.embedder.doc_freq[:] = 0
+            self.embedder.n_docs = 0
+            self._dirty += 1
+
+    def save(self) -> None:
+        """Persist live entries to self.path (atomic replace)."""
+        if self.path is None:
+            return
+        with self._lock:
+            arrays = {
+                "dim": np.array([self.dim]),
+                "doc_freq": self.embedder.doc_freq,
+                "n_docs": np.array([self.embedder.n_docs]),
+                "partitions": np.array(list(self._partitions), dtype=str),
+            }
+            for i, part in enumerate(self._partitions.values()):
+                slots = part.occupied()
+                arrays[f"p{i}_keys"] = np.array([part.keys[s] for s in slots], dtype=str)
+                arrays[f"p{i}_scopes"] = np.array([part.scopes[s] for s in slots], dtype=str)
+                arrays[f"p{i}_vectors"] = part.vectors[slots]
+                arrays[f"p{i}_expires_at"] = part.expires_at[slots]
+            self._dirty = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp.npz")
+            np.savez_compressed(tmp_path, **arrays)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"[SEMANTIC_INDEX] Failed to save index to {self.path}: {e}")
+            # Don't raise - persistence failures shouldn't break caching
+
+    def load(self) -> None:
+        """Load persisted entries from self.path, skipping expired ones."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if int(data["dim"][0]) != self.dim:
+                    logger.warning(f"[SEMANTIC_INDEX] Ignoring {self.path}: dimension mismatch")
+                    return
+                now = time.time()
+                with self._lock:
+                    self.embedder.doc_freq = data["doc_freq"].astype(np.float64)
+                    self.embedder.n_docs = int(data["n_docs"][0])
+                    for i, name in enumerate(data["partitions"]):
+                        part = self._partition(str(name))
+                        for key, scope, vector, expires_at in zip(
+                            data[f"p{i}_keys"], data[f"p{i}_scopes"],
+                            data[f"p{i}_vectors"], data[f"p{i}_expires_at"]
+                        ):
+                            if expires_at > now:
+                                part.add(str(key), str(scope), vector, self._signature(vector), float(expires_at))
+            logger.info(f"[SEMANTIC_INDEX] Loaded {self.size()} entries from {self.path}")
+        except Exception as e:
+            logger.warning(f"[SEMANTIC_INDEX] Failed to load index from {self.path}: {e}")
+
+    def size(self) -> int:
+        return sum(len(p) for p in self._partitions.values())
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get index statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": self.size(),
+                "partitions": {name: len(p) for name, p in self._partitions.items()},
+                "memory_bytes": sum(p.vectors.nbytes for p in self._partitions.values()),
+            }
@@ -134,9 +134,11 @@ from utils.conversation.threads import (
     create_thread,
     get_conversation_file_list,
     get_conversation_image_list,
+    get_recent_turns,
     get_thread,
     get_thread_chain,
 )
+from utils.conversation.turn_log import TurnLog
 
 # Context Engineering imports
 from utils.conversation.history_detection import HistoryDetector, DetectionMode
@@ -158,6 +160,7 @@ __all__ = [
     "get_thread",
     "add_turn",
     "get_thread_chain",
+    "get_recent_turns",
     # File/Image Collection
     "get_conversation_file_list",
     "get_conversation_image_list",
@@ -187,12 +190,20 @@ class InMemoryConversation:
     which would call the storage factory again → infinite loop!
 
     Instead, this class uses direct Redis storage access via get_storage().
+
+    Turns are appended to the shared turn log (see turn_log.py) rather than
+    rewriting the whole thread. Since threads.py reads that same log through
+    its memoized path, reads_turn_log tells it to skip this backend's
+    get_thread.
     """
 
+    reads_turn_log = True
+
     def __init__(self):
         """Initialize in-memory conversation storage with context engineering"""
         # Get direct access to Redis storage backend
         self.storage = get_storage()
+        self.turn_log = TurnLog(self.storage)
 
         # Initialize context engineering components
         self.config = CONTEXT_ENGINEERING
@@ -219,12 +230,7 @@ class InMemoryConversation:
             ThreadContext or None
         """
         # Use direct Redis storage access (not threads.py!)
-        thread_data = self.storage.get(continuation_id)
-        if not thread_data:
-            return None
-
-        # Convert to ThreadContext
-        return ThreadContext(**thread_data)
+        return self.turn_log.load(continuation_id)
 
     def add_turn(
         self,
@@ -258,15 +264,19 @@ class InMemoryConversation:
         """
         from datetime import datetime, timezone
 
-        # Get thread using direct storage (not threads.py!)
-        thread_data = self.storage.get(continuation_id)
-        if not thread_data:
-            return False
-
-        context = ThreadContext(**thread_data)
+        # Read only the thread header using direct storage (not threads.py!)
+        header = self.turn_log.read_header(continuation_id)
+        if header is None:
+            # Legacy whole-thread blob: migrate it into the turn log
+            context = self.turn_log.migrate_legacy(continuation_id)
+            if context is None:
+                return False
+            turn_count = len(context.turns)
+        else:
+            turn_count = header["turn_count"]
 
         # Check turn limit
-        if len(context.turns) >= MAX_CONVERSATION_TURNS:
+        if turn_count >= MAX_CONVERSATION_TURNS:
             return False
 
         # Apply context engineering: Strip embedded history BEFORE storage
@@ -297,16 +307,14 @@ class InMemoryConversation:
             files=files,
             images=images,
             tool_name=tool_name,
+            model_provider=(metadata or {}).get("provider_used") or (metadata or {}).get("model_provider"),
+            model_name=(metadata or {}).get("model_used") or (metadata or {}).get("model_name"),
             model_metadata=metadata,
         )
 
-        context.turns.append(turn)
-        context.last_updated_at = datetime.now(timezone.utc).isoformat()
-
-        # Save back to Redis using direct storage
-        key = f"thread:{continuation_id}"
-        self.storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())
-        return True
+        # Append to the turn log using direct storage (O(1), refreshes TTL)
+        count = self.turn_log.append(continuation_id, turn, datetime.now(timezone.utc).isoformat())
+        return count is not None
 
     def _strip_embedded_history(self, content: str) -> str:
         """
@@ -0,0 +1,227 @@
+"""
+Recent Turn Index (in-memory duplicate-turn detection)
+
+Keeps a bounded ring of recent (role, content-hash, timestamp) entries per
+conversation so duplicate turns - e.g. the same assistant response written
+twice after a slow provider call triggered a retry - are detected with a
+memory lookup instead of re-reading recent messages from Supabase.
+
+- Rings are filled on write (record), after the turn is persisted
+- The first check of a conversation that has a loader warms its ring once
+  from the loader (its recent persisted messages), merging them with any
+  turns recorded earlier in this process, so duplicates of turns written
+  before a restart are still caught
+- Conversations are evicted LRU beyond max_conversations
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (role, content digest, timestamp)
+_Entry = Tuple[str, bytes, float]
+
+
+def content_digest(content: str) -> bytes:
+    """Compact hash of a message body (ring entries never hold full content)."""
+    return hashlib.blake2b(content.encode("utf-8", errors="replace"), digest_size=16).digest()
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Parse a message created_at (epoch, datetime or ISO string) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if value.tzinfo is None:
+            # Naive timestamps are written as UTC (datetime.utcnow) by the storage layer
+            return (value - datetime(1970, 1, 1)).total_seconds()
+        return value.timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class RecentTurnIndex:
+    """
+    Per-conversation rings of recent turn hashes.
+
+    Args:
+        ring_size: Entries kept per conversation
+        window_seconds: Turns with identical role+content within this window are duplicates
+        max_conversations: Conversations tracked before least-recently-used ones are dropped
+    """
+
+    def __init__(
+        self,
+        ring_size: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        max_conversations: Optional[int] = None,
+    ):
+        self.ring_size = ring_size or int(os.getenv("CONVERSATION_DEDUP_RING_SIZE", "10"))
+        self.window_seconds = window_seconds or float(os.getenv("CONVERSATION_DEDUP_WINDOW_SECONDS", "60"))
+        self.max_conversations = max_conversations or int(
+            os.getenv("CONVERSATION_DEDUP_MAX_CONVERSATIONS", "10000")
+        )
+        self._rings: "OrderedDict[str, Deque[_Entry]]" = OrderedDict()
+        # Conversations whose ring has been warmed from a loader
+        self._warmed: set = set()
+        self._lock = threading.Lock()
+
+        self._checks = 0
+        self._duplicates_rejected = 0
+        self._warmups = 0
+        self._warmup_errors = 0
+        self._evictions = 0
+
+    # Internals -----------------------------------------------------------
+
+    def _ring(self, conversation_id: str) -> Optional[Deque[_Entry]]:
+        ring = self._rings.get(conversation_id)
+        if ring is not None:
+            self._rings.move_to_end(conversation_id)
+        return ring
+
+    def _new_ring(self, conversation_id: str, entries: Iterable[_Entry] = ()) -> Deque[_Entry]:
+        ring = deque(sorted(entries, key=lambda e: e[2]), maxlen=self.ring_size)
+        self._rings[conversation_id] = ring
+        while len(self._rings) > self.max_conversations:
+            evicted, _ = self._rings.popitem(last=False)
+            self._warmed.discard(evicted)
+            self._evictions += 1
+        return ring
+
+    def _warm(
+        self,
+        conversation_id: str,
+        loader: Optional[Callable[[], Iterable[Dict[str, Any]]]],
+    ) -> Deque[_Entry]:
+        """Return the conversation's ring, loading persisted turns on first warm-up."""
+        with self._lock:
+            ring = self._ring(conversation_id)
+            if loader is None or conversation_id in self._warmed:
+                return ring if ring is not None else self._new_ring(conversation_id)
+
+        # Load outside the lock: it is a network call
+        entries = []
+        try:
+            for message in loader() or ():
+                timestamp = _to_epoch(message.get("created_at"))
+                if timestamp is None or message.get("content") is None:
+                    continue
+                entries.append((message.get("role", ""), content_digest(message["content"]), timestamp))
+            self._warmups += 1
+        except Exception as e:
+            self._warmup_errors += 1
+            logger.warning(f"[DEDUP] Failed to warm recent turns for {conversation_id[:8]}: {e}")
+
+        with self._lock:
+            self._warmed.add(conversation_id)
+            ring = self._ring(conversation_id)
+            if ring is None:
+                return self._new_ring(conversation_id, entries)
+            # Turns were recorded (or another caller warmed) meanwhile: merge by time
+            return self._new_ring(conversation_id, set(ring).union(entries))
+
+    def _find(self, ring: Deque[_Entry], role: str, digest: bytes, now: float) -> Optional[float]:
+        """Age in seconds of a matching entry inside the window, else None."""
+        for entry_role, entry_digest, timestamp in ring:
+            if entry_digest == digest and entry_role == role and 0 <= now - timestamp < self.window_seconds:
+                return now - timestamp
+        return None
+
+    # Public API ------------------------------------------------------------
+
+    def is_duplicate(
+        self,
+        conversation_id: str,
+        role: str,
+        content: str,
+        now: Optional[float] = None,
+        loader: Optional[Callable[[], Iterable[Dict[str, Any]]]] = None,
+    ) -> bool:
+        """
+        Check whether an identical turn was recorded within the window.
+
+        Args:
+            conversation_id: Conversation identifier
+            role: Message role
+            content: Message content
+            now: Current time (default time.time())
+            loader: Returns recent persisted messages (dicts with role, content,
+                created_at); called only the first time a conversation is
+                checked with a loader, even if turns were recorded before
+
+        Returns:
+            True if the turn is a duplicate (counted as a reject)
+        """
+        now = time.time() if now is None else now
+        digest = content_digest(content)
+        ring = self._warm(conversation_id, loader)
+        with self._lock:
+            self._checks += 1
+            age = self._find(ring, role, digest, now)
+            if age is None:
+                return False
+            self._duplicates_rejected += 1
+        logger.warning(f"[DEDUP] Found duplicate {role} message from {age:.1f}s ago in {conversation_id[:8]}")
+        return True
+
+    def record(self, conversation_id: str, role: str, content: str, timestamp: Optional[float] = None) -> None:
+        """Add a written turn to the conversation's ring (a new ring stays unwarmed)."""
+        entry = (role, content_digest(content), time.time() if timestamp is None else timestamp)
+        with self._lock:
+            ring = self._ring(conversation_id)
+            if ring is None:
+                ring = self._new_ring(conversation_id)
+            ring.append(entry)
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop a conversation's ring (it is re-warmed on next access)."""
+        with self._lock:
+            self._rings.pop(conversation_id, None)
+            self._warmed.discard(conversation_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checks": self._checks,
+                "duplicates_rejected": self._duplicates_rejected,
+                "warmups": self._warmups,
+                "warmup_errors": self._warmup_errors,
+                "evictions": self._evictions,
+                "conversations": len(self._rings),
+            }
+
+
+_recent_turn_index: Optional[RecentTurnIndex] = None
+_recent_turn_index_lock = threading.Lock()
+
+
+def get_recent_turn_index() -> RecentTurnIndex:
+    """Get the process-wide recent turn index."""
+    global _recent_turn_index
+    if _recent_turn_index is None:
+        with _recent_turn_index_lock:
+            if _recent_turn_index is None:
+                _recent_turn_index = RecentTurnIndex()
+    return _recent_turn_index
+
+
+def reset_recent_turn_index() -> None:
+    """Drop the process-wide index (tests)."""
+    global _recent_turn_index
+    with _recent_turn_index_lock:
+        _recent_turn_index = None
+
+
+__all__ = ["RecentTurnIndex", "content_digest", "get_recent_turn_index", "reset_recent_turn_index"]
@@ -13,11 +13,18 @@ EMERGENCY HOTFIX (2025-10-19): Context pruning to fix 108K token issue
 - Remove file contents from messages older than 3 turns
 - Add token counting and logging
 Target: 90% token reduction (108K → <10K)
+
+WRITE-BEHIND (2025-11): Queued turns are flushed in batches - one conversation
+lookup and one file-link call per conversation, and a single bulk message
+insert per flush window. Duplicates are rejected in memory by content hash
+instead of re-reading recent messages from Supabase (see recent_turns.py).
 """
 
+import asyncio
 import logging
 import time
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 
 # Safe imports with fallback
 try:
@@ -41,6 +48,8 @@ try:
 except ImportError:
     get_cache_manager = None
 
+from .recent_turns import content_digest, get_recent_turn_index
+
 try:
     from utils.performance.timing import timing_decorator, log_operation_time
 except ImportError:
@@ -110,6 +119,9 @@ class SupabaseConversationMemory:
             self._use_async_queue = False
             logger.info("[ASYNC_SUPABASE] Synchronous writes enabled")
 
+        # Per-conversation ring of recent turn hashes (duplicate-turn detection)
+        self.recent_turns = get_recent_turn_index()
+
         # Import in-memory functions for fallback
         if fallback_to_memory:
             try:
@@ -292,6 +304,7 @@ class SupabaseConversationMemory:
             )
 
             if msg_id:
+                self.recent_turns.record(continuation_id, role, content)
                 # Invalidate cache after write
                 self.cache.invalidate(continuation_id)
                 logger.debug(f"[BACKGROUND_WRITE] Saved turn for {continuation_id}: {role} message")
@@ -301,64 +314,174 @@ class SupabaseConversationMemory:
         except Exception as e:
             logger.error(f"[BACKGROUND_WRITE] Error adding turn to {continuation_id}: {e}")
 
+    def _recent_messages_loader(self, continuation_id: str, limit: int = 10):
+        """Loader that warms the recent-turn ring from Supabase (first access only)."""
+        def load():
+            conv_id = self.mapper.get_or_create_conversation(continuation_id)
+            if not conv_id:
+                return []
+            return self.storage.get_conversation_messages(conv_id, limit=limit)
+        return load
+
+    def _write_messages_batch(self, items: List[Any]) -> None:
+        """
+        Write a window of queued turns with as few Supabase calls as possible.
+
+        Turns are grouped per conversation (arrival order preserved), so each
+        conversation costs one get_or_create_conversation and at most one
+        link_files_to_conversation_batch; all messages are then inserted with a
+        single save_messages_batch upsert.
+
+        Args:
+            items: QueueItems with conversation_id, update_data and timestamp
+
+        Raises:
+            Exception: If preparing or inserting the batch fails
+        """
+        rows, turns = self._prepare_messages_batch(items)
+        self._save_messages_batch(rows, turns)
+
+    def _prepare_messages_batch(self, items: List[Any]) -> Tuple[List[Dict[str, Any]], List[Tuple]]:
+        """
+        Drop duplicate turns and build the message rows for a batch insert.
+
+        Nothing is recorded in the duplicate ring here; turns are recorded by
+        _save_messages_batch once their insert succeeds, so a failed write does
+        not turn a legitimate re-send into a "duplicate".
+
+        Args:
+            items: QueueItems with conversation_id, update_data and timestamp
+
+        Returns:
+            (rows, turns): message rows and, per row, the
+            (continuation_id, role, content, timestamp) it was built from
+        """
+        from datetime import datetime
+
+        grouped: "OrderedDict[str, List[Any]]" = OrderedDict()
+        seen = set()
+        duplicates = 0
+        for item in items:
+            data = item.update_data
+            # Only assistant turns are deduplicated (see _is_duplicate_message)
+            if data['role'] == 'assistant':
+                key = (item.conversation_id, content_digest(data['content']))
+                if key in seen or self.recent_turns.is_duplicate(
+                    item.conversation_id, data['role'], data['content'], now=item.timestamp,
+                    loader=self._recent_messages_loader(item.conversation_id)
+                ):
+                    duplicates += 1
+                    continue
+                seen.add(key)
+            grouped.setdefault(item.conversation_id, []).append(item)
+
+        if duplicates:
+            logger.warning(f"[WRITE_BEHIND] Dropped {duplicates} duplicate turns")
+
+        rows = []
+        turns = []
+        for continuation_id, conv_items in grouped.items():
+            first = conv_items[0].update_data
+            conv_id = self.mapper.get_or_create_conversation(
+                continuation_id=continuation_id,
+                title=f"Conversation {continuation_id[:8]}",
+                metadata={'tool_name': first.get('tool_name')} if first.get('tool_name') else None
+            )
+            if not conv_id:
+                logger.error(f"[WRITE_BEHIND] Failed to get/create conversation for {continuation_id}")
+                continue
+
+            conv_file_ids = []
+            for item in conv_items:
+                data = item.update_data
+                file_ids = []
+                all_files = (data.get('files') or []) + (data.get('images') or [])
+                if all_files:
+                    processed_files = self.file_handler.process_files(
+                        file_paths=all_files,
+                        context_id=continuation_id,
+                        upload_immediately=True
+                    )
+                    file_ids = [f['file_id'] for f in processed_files if f.get('file_id')]
+                    conv_file_ids.extend(fid for fid in file_ids if fid not in conv_file_ids)
+
+                msg_metadata = dict(data.get('metadata') or {})
+                msg_metadata['file_ids'] = file_ids
+                msg_metadata['tool_name'] = data.get('tool_name')
+
+                # Enqueue time with microseconds keeps idempotency keys unique per turn
+                # and stable across retries of the same rows
+                rows.append({
+                    'conversation_id': conv_id,
+                    'role': data['role'],
+                    'content': data['content'],
+                    'metadata': msg_metadata,
+                    'created_at': datetime.utcfromtimestamp(item.timestamp).strftime('%Y-%m-%dT%H:%M:%S.%f')
+                })
+                turns.append((continuation_id, data['role'], data['content'], item.timestamp))
+
+            if conv_file_ids:
+                self.storage.link_files_to_conversation_batch(conv_id, conv_file_ids)
+
+        return rows, turns
+
+    def _save_messages_batch(self, rows: List[Dict[str, Any]], turns: List[Tuple]) -> None:
+        """
+        Insert prepared rows, then record them in the duplicate ring.
+
+        Args:
+            rows: Message rows from _prepare_messages_batch
+            turns: The (continuation_id, role, content, timestamp) of each row
+
+        Raises:
+            Exception: If the insert fails (nothing is recorded)
+        """
+        if rows:
+            start_time = time.time()
+            self.storage.save_messages_batch(rows)
+            log_operation_time("SupabaseMemory.save_messages_batch", start_time)
+
+        conversations = OrderedDict()
+        for continuation_id, role, content, timestamp in turns:
+            self.recent_turns.record(continuation_id, role, content, timestamp=timestamp)
+            conversations[continuation_id] = None
+        for continuation_id in conversations:
+            self.cache.invalidate(continuation_id)
+
+        logger.info(
+            f"[WRITE_BEHIND] Flushed {len(rows)} turns across {len(conversations)} conversations"
+        )
+
     def _is_duplicate_message(self, conversation_id: str, content: str, role: str, limit: int = 10) -> bool:
-        # CRITICAL FIX (2025-11-02): Only check for duplicates on assistant messages, never user messages
-        # User messages were being incorrectly flagged as duplicates, causing message imbalance in Supabase
-        if role != 'assistant':
-            return False
         """
         Check if this message was recently saved to prevent duplicates.
 
         CRITICAL FIX (2025-10-23): Prevents duplicate messages caused by race conditions
         during slow API responses (9+ minute Kimi responses triggering retries).
 
-        BUG FIX (2025-10-23): Fixed incorrect method call - use get_or_create_conversation()
-        instead of non-existent get_conversation_id() method.
+        CRITICAL FIX (2025-11-02): Only assistant messages are checked; user messages
+        were being incorrectly flagged as duplicates, causing message imbalance in Supabase.
+
+        Lookups go to the in-memory recent-turn ring; Supabase is only read the
+        first time a conversation is seen in this process (to warm the ring).
 
         Args:
             conversation_id: Conversation identifier (continuation_id)
             content: Message content to check
             role: Message role (user, assistant, system)
-            limit: Number of recent messages to check (default: 10)
+            limit: Number of recent messages loaded when warming (default: 10)
 
         Returns:
             True if duplicate found, False otherwise
         """
-        try:
-            # Get the database conversation UUID from the continuation_id
-            # BUG FIX: Use get_or_create_conversation() instead of get_conversation_id()
-            conv_id = self.mapper.get_or_create_conversation(conversation_id)
-            if not conv_id:
-                logger.debug(f"[DEDUP] No conversation found for {conversation_id[:8]}")
-                return False
-
-            # Get recent messages using the correct method name
-            # BUG FIX: Use get_conversation_messages() instead of get_messages()
-            recent_messages = self.storage.get_conversation_messages(conv_id, limit=limit)
-            if not recent_messages:
-                logger.debug(f"[DEDUP] No recent messages found for {conversation_id[:8]}")
-                return False
-
-            # Check for exact content match within last 60 seconds
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-
-            for msg in recent_messages:
-                if msg.get('role') == role and msg.get('content') == content:
-                    # Check timestamp - only consider duplicates within 60 seconds
-                    created_at = msg.get('created_at')
-                    if created_at:
-                        if isinstance(created_at, str):
-                            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-
-                        time_diff = (now - created_at).total_seconds()
-                        if time_diff < 60:
-                            logger.warning(f"[DEDUP] Found duplicate message from {time_diff:.1f}s ago in {conversation_id[:8]}")
-                            return True
-
-            logger.debug(f"[DEDUP] No duplicates found for {role} message in {conversation_id[:8]}")
+        if role != 'assistant':
             return False
 
+        try:
+            return self.recent_turns.is_duplicate(
+                conversation_id, role, content,
+                loader=self._recent_messages_loader(conversation_id, limit)
+            )
         except Exception as e:
             logger.error(f"[DEDUP] Error checking for duplicates: {e}", exc_info=True)
             # On error, allow the message through (fail open)
@@ -401,13 +524,6 @@ class SupabaseConversationMemory:
                 )
             return False
 
-        # CRITICAL FIX (2025-10-23): Prevent duplicate messages from race conditions
-        # Check if this exact message was recently saved (within last 60 seconds)
-        # This prevents duplicates caused by slow responses triggering retries
-        if self._is_duplicate_message(continuation_id, content, role):
-            logger.warning(f"[DEDUP] Preventing duplicate message: {role} in {continuation_id[:8]}")
-            return True
-
         # PHASE 1 (2025-10-24): Standardize metadata before storage
         # Extract and standardize metadata fields to match Supabase schema
         # DEBUG: Log incoming metadata
@@ -467,15 +583,25 @@ class SupabaseConversationMemory:
                     # Fallback to synchronous write if queue not available
                     logger.warning("[ASYNC_SUPABASE] Async queue not available, falling back to sync write")
                     # Continue to synchronous path below
-                else:
-                    queue.put_sync(item)
+                elif queue.put_sync(item):
+                    # Duplicates are dropped by the batch writer (in-memory hash check)
                     logger.info(f"[ASYNC_SUPABASE] Queued write for {continuation_id}")
                     # Return immediately without blocking
                     return True
+                else:
+                    # Backpressure: queue is full, write inline rather than lose the turn
+                    logger.warning("[ASYNC_SUPABASE] Async queue full, falling back to sync write")
             except Exception as e:
                 logger.error(f"[ASYNC_SUPABASE] Error submitting to async queue: {e}, falling back to sync write")
                 # Continue to synchronous path below
 
+        # CRITICAL FIX (2025-10-23): Prevent duplicate messages from race conditions
+        # Check if this exact message was recently saved (within last 60 seconds)
+        # This prevents duplicates caused by slow responses triggering retries
+        if self._is_duplicate_message(continuation_id, content, role):
+            logger.warning(f"[DEDUP] Preventing duplicate message: {role} in {continuation_id[:8]}")
+            return True
+
         # Synchronous path (original implementation)
         try:
             # Get or create conversation (TIMED)
@@ -544,6 +670,7 @@ class SupabaseConversationMemory:
             log_operation_time("SupabaseMemory.save_message", start_time)
 
             if msg_id:
+                self.recent_turns.record(continuation_id, role, content)
                 # PERFORMANCE FIX: Invalidate cache after write
                 self.cache.invalidate(continuation_id)
                 logger.debug(f"Saved turn for {continuation_id}: {role} message (cache invalidated)")
@@ -620,3 +747,46 @@ async def process_conversation_update(queue_item):
 
     except Exception as e:
         logger.error(f"[CONV_QUEUE] Error processing conversation update: {e}", exc_info=True)
+
+
+async def process_conversation_batch(queue_items):
+    """
+    Process a flush window of conversation updates from the async queue.
+
+    Called by the ConversationQueue batch consumer. The blocking Supabase
+    calls run in a worker thread so the event loop stays responsive. If the
+    bulk insert fails, the prepared rows are retried one at a time so one bad
+    row does not lose the whole window. Retried rows keep their original
+    created_at, so their idempotency keys match the failed batch and rows it
+    already committed are not inserted twice.
+
+    Args:
+        queue_items: List of QueueItems collected during one flush window
+    """
+    memory = get_supabase_memory()
+    try:
+        rows, turns = await asyncio.to_thread(memory._prepare_messages_batch, queue_items)
+    except Exception as e:
+        logger.error(
+            f"[CONV_QUEUE] Preparing batch of {len(queue_items)} items failed: {e}, retrying per item",
+            exc_info=True
+        )
+        for queue_item in queue_items:
+            try:
+                await asyncio.to_thread(memory._write_messages_batch, [queue_item])
+            except Exception as item_error:
+                logger.error(f"[CONV_QUEUE] Error processing conversation update: {item_error}", exc_info=True)
+        return
+
+    try:
+        await asyncio.to_thread(memory._save_messages_batch, rows, turns)
+    except Exception as e:
+        logger.error(
+            f"[CONV_QUEUE] Batch write of {len(rows)} rows failed: {e}, retrying per row",
+            exc_info=True
+        )
+        for row, turn in zip(rows, turns):
+            try:
+                await asyncio.to_thread(memory._save_messages_batch, [row], [turn])
+            except Exception as row_error:
+                logger.error(f"[CONV_QUEUE] Error writing row for {turn[0]}: {row_error}", exc_info=True)
@@ -8,16 +8,29 @@ collecting files and images from conversation history.
 Key Functions:
 - create_thread: Initialize new conversation thread
 - get_thread: Retrieve thread by ID
+- get_recent_turns: Fetch only the last N turns of a thread
 - add_turn: Add turn to existing thread
 - get_thread_chain: Traverse parent chain
 - get_conversation_file_list: Extract files with newest-first priority
 - get_conversation_image_list: Extract images with newest-first priority
 
+Threads are stored append-only (header hash + turn list, see turn_log.py):
+add_turn pushes one turn record instead of rewriting the whole thread.
+
+Reconstructed ThreadContext objects are memoized in-process, versioned by
+(thread_id, last_updated_at). add_turn appends to the memoized context, and
+when storage has moved on only turns not seen before are fetched and parsed,
+so long continuations no longer pay a full reconstruction on every step.
+
 For detailed architectural documentation, see utils/conversation_memory.py
 """
 
 import logging
+import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Optional
 
@@ -29,6 +42,7 @@ from utils.conversation.models import (
     _is_valid_uuid,
     get_storage,
 )
+from utils.conversation.turn_log import TurnLog
 
 # Storage factory will be imported lazily to avoid circular imports
 # (storage_factory imports from memory, which imports from threads)
@@ -85,6 +99,233 @@ def _get_storage_backend():
         return None
 
 
+# ================================================================================
+# Memoized Thread Reconstruction
+# ================================================================================
+
+
+class _ThreadCacheEntry:
+    """Memoized ThreadContext plus what is needed to extend it incrementally."""
+
+    __slots__ = ("context", "log_count", "turn_memo", "expires_at")
+
+    def __init__(self, context: ThreadContext, log_count: Optional[int], turn_memo: Optional[dict], expires_at: float):
+        self.context = context
+        self.log_count = log_count  # Turn-log length mirrored by context.turns (None if not from the log)
+        self.turn_memo = turn_memo  # Supabase message key -> ConversationTurn
+        self.expires_at = expires_at
+
+    @property
+    def version(self) -> str:
+        return self.context.last_updated_at
+
+
+class _ThreadCache:
+    """
+    Bounded LRU of reconstructed threads, versioned by last_updated_at.
+
+    Entries are never handed out directly: lookups return a copy with its own
+    turns list, so callers mutating the returned context cannot corrupt it.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _ThreadCacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "incremental": 0, "misses": 0, "evictions": 0, "turns_parsed": 0}
+
+    def lookup(self, thread_id: str) -> Optional[_ThreadCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(thread_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[thread_id]
+                return None
+            self._entries.move_to_end(thread_id)
+            return entry
+
+    def store(
+        self,
+        context: ThreadContext,
+        log_count: Optional[int] = None,
+        turn_memo: Optional[dict] = None
+    ) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            if turn_memo is None and context.thread_id in self._entries:
+                # Converted Supabase turns stay valid across versions
+                turn_memo = self._entries[context.thread_id].turn_memo
+            entry = _ThreadCacheEntry(context, log_count, turn_memo, time.monotonic() + self._ttl_seconds)
+            self._entries[context.thread_id] = entry
+            self._entries.move_to_end(context.thread_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def discard(self, thread_id: str) -> None:
+        with self._lock:
+            self._entries.pop(thread_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def record(self, outcome: str, turns_parsed: int = 0) -> None:
+        with self._lock:
+            self._stats[outcome] += 1
+            self._stats["turns_parsed"] += turns_parsed
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "max_entries": self._max_entries}
+
+
+_thread_cache = _ThreadCache(
+    max_entries=int(os.getenv("THREAD_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=CONVERSATION_TIMEOUT_SECONDS,
+)
+
+
+def _copy_context(context: ThreadContext) -> ThreadContext:
+    """Shallow copy with an independent turns list (turns themselves are immutable by convention)."""
+    return context.model_copy(update={"turns": list(context.turns)})
+
+
+def _message_key(msg: dict[str, Any]) -> tuple:
+    """Stable identity for a Supabase message row."""
+    return (msg.get("id"), msg.get("created_at"), msg.get("role"))
+
+
+def _turn_from_message(msg: dict[str, Any]) -> ConversationTurn:
+    """Convert a Supabase message row to a ConversationTurn."""
+    return ConversationTurn(
+        role=msg.get('role', 'user'),
+        content=msg.get('content', ''),
+        timestamp=msg.get('created_at', ''),
+        files=msg.get('files'),
+        images=msg.get('images'),
+        tool_name=msg.get('tool_name'),
+        model_provider=msg.get('model_provider'),
+        model_name=msg.get('model_name'),
+        model_metadata=msg.get('model_metadata')
+    )
+
+
+def _context_from_thread_dict(thread_id: str, thread_data: dict[str, Any]) -> ThreadContext:
+    """
+    Convert a storage-factory (Supabase) thread dict to ThreadContext.
+
+    Only messages not already converted for this thread are parsed; the
+    result is memoized under its updated_at version.
+    """
+    # Supabase returns: {'id', 'conversation_id', 'messages', 'metadata', 'storage', 'created_at', 'updated_at'}
+    # ThreadContext expects: {'thread_id', 'turns', 'tool_name', 'created_at', 'last_updated_at', ...}
+    messages = thread_data.get('messages', [])
+    version = thread_data.get('updated_at', '')
+
+    entry = _thread_cache.lookup(thread_id)
+    if entry is not None and entry.turn_memo is not None:
+        previous = entry.turn_memo
+        if (
+            entry.version == version
+            and len(entry.context.turns) == len(messages)
+            and all(_message_key(msg) in previous for msg in messages)
+        ):
+            _thread_cache.record("hits")
+            return _copy_context(entry.context)
+    else:
+        previous = {}
+
+    turn_memo = {}
+    turns = []
+    parsed = 0
+    for msg in messages:
+        key = _message_key(msg)
+        turn = previous.get(key)
+        if turn is None:
+            turn = _turn_from_message(msg)
+            parsed += 1
+        turn_memo[key] = turn
+        turns.append(turn)
+
+    metadata = thread_data.get('metadata', {})
+    context = ThreadContext(
+        thread_id=thread_data.get('id', thread_id),
+        parent_thread_id=metadata.get('parent_thread_id'),
+        created_at=thread_data.get('created_at', ''),
+        last_updated_at=version,
+        tool_name=metadata.get('tool_name', 'unknown'),
+        turns=turns,
+        initial_context=metadata.get('initial_context', {}),
+        session_fingerprint=metadata.get('session_fingerprint'),
+        client_friendly_name=metadata.get('client_friendly_name')
+    )
+    _thread_cache.record("incremental" if previous else "misses", parsed)
+    _thread_cache.store(context, turn_memo=turn_memo)
+    return _copy_context(context)
+
+
+def _context_from_turn_log(thread_id: str) -> Optional[ThreadContext]:
+    """
+    Load a thread from the append-only turn log.
+
+    Only the small header is read while the memoized version is current. When
+    the thread has gained turns since it was memoized, just the new turns are
+    fetched and validated instead of the whole history.
+    """
+    log = TurnLog(get_storage())
+    header = log.read_header(thread_id)
+    if header is None:
+        # Legacy whole-thread blob (migrated on read), or no such thread
+        context = log.migrate_legacy(thread_id)
+        if context is None:
+            _thread_cache.discard(thread_id)
+            return None
+        _thread_cache.record("misses", len(context.turns))
+        _thread_cache.store(context, log_count=len(context.turns))
+        return _copy_context(context)
+
+    entry = _thread_cache.lookup(thread_id)
+    if (
+        entry is not None
+        and entry.log_count is not None
+        and entry.context.created_at == header.get("created_at")
+        and header["turn_count"] >= entry.log_count
+    ):
+        if header["turn_count"] == entry.log_count and header.get("last_updated_at") == entry.version:
+            _thread_cache.record("hits")
+            return _copy_context(entry.context)
+        # Turns are append-only: fetch only the tail we have not seen
+        new_turns = log.read_turns(thread_id, entry.log_count, -1) if header["turn_count"] > entry.log_count else []
+        context = entry.context.model_copy(update={
+            "turns": entry.context.turns + new_turns,
+            "last_updated_at": header.get("last_updated_at", entry.version),
+        })
+        _thread_cache.record("incremental", len(new_turns))
+        _thread_cache.store(context, log_count=entry.log_count + len(new_turns))
+        return _copy_context(context)
+
+    turns = log.read_turns(thread_id)
+    context = log.build_context(header, turns)
+    _thread_cache.record("misses", len(turns))
+    _thread_cache.store(context, log_count=len(turns))
+    return _copy_context(context)
+
+
+def get_thread_cache_stats() -> dict[str, Any]:
+    """Get statistics for the in-process thread reconstruction cache."""
+    return _thread_cache.get_stats()
+
+
+def clear_thread_cache() -> None:
+    """Drop all memoized threads and reset statistics (e.g. after out-of-band storage changes)."""
+    _thread_cache.clear()
+
+
 # ================================================================================
 # Thread Lifecycle Management
 # ================================================================================
@@ -153,24 +394,19 @@ def create_thread(
             # Storage factory expects add_turn interface, so we'll use the old method for now
             # and add the thread creation to storage factory in next iteration
             # For now, use dual approach: Redis + storage factory
-            storage = get_storage()
-            key = f"thread:{thread_id}"
-            storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())
+            TurnLog(get_storage()).write(context)
 
             logger.debug(f"[THREAD] Created new thread {thread_id} with parent {parent_thread_id} (Redis)")
         except Exception as e:
             logger.error(f"[STORAGE_INTEGRATION] Failed to use storage factory: {e}, falling back to Redis")
-            storage = get_storage()
-            key = f"thread:{thread_id}"
-            storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())
+            TurnLog(get_storage()).write(context)
             logger.debug(f"[THREAD] Created new thread {thread_id} with parent {parent_thread_id} (Redis fallback)")
     else:
         # Fallback to original Redis storage
-        storage = get_storage()
-        key = f"thread:{thread_id}"
-        storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())
+        TurnLog(get_storage()).write(context)
         logger.debug(f"[THREAD] Created new thread {thread_id} with parent {parent_thread_id} (Redis only)")
 
+    _thread_cache.store(context, log_count=0)
     return thread_id
 
 
@@ -206,7 +442,8 @@ def get_thread(thread_id: str) -> Optional[ThreadContext]:
         # Try storage factory first (Supabase integration)
         # Use CACHED instance to avoid creating 60+ instances per request!
         storage_backend = _get_storage_backend()
-        if storage_backend:
+        # Backends reading the same turn log are served by the memoized path below
+        if storage_backend and not getattr(storage_backend, "reads_turn_log", False):
             try:
                 thread_data = storage_backend.get_thread(thread_id)
 
@@ -218,41 +455,9 @@ def get_thread(thread_id: str) -> Optional[ThreadContext]:
                     elif isinstance(thread_data, dict):
                         logger.debug(f"[STORAGE_INTEGRATION] Retrieved thread {thread_id} from storage factory (dict)")
                         # CRITICAL FIX (2025-10-19): Convert Supabase dict format to ThreadContext
-                        # Supabase returns: {'id', 'conversation_id', 'messages', 'metadata', 'storage', 'created_at', 'updated_at'}
-                        # ThreadContext expects: {'thread_id', 'turns', 'tool_name', 'created_at', 'last_updated_at', ...}
                         try:
-                            # Convert messages to turns
-                            turns = []
-                            for msg in thread_data.get('messages', []):
-                                turn = ConversationTurn(
-                                    role=msg.get('role', 'user'),
-                                    content=msg.get('content', ''),
-                                    timestamp=msg.get('created_at', ''),
-                                    files=msg.get('files'),
-                                    images=msg.get('images'),
-                                    tool_name=msg.get('tool_name'),
-                                    model_provider=msg.get('model_provider'),
-                                    model_name=msg.get('model_name'),
-                                    model_metadata=msg.get('model_metadata')
-                                )
-                                turns.append(turn)
-
-                            # Extract metadata
-                            metadata = thread_data.get('metadata', {})
-
-                            # Create ThreadContext
-                            context = ThreadContext(
-                                thread_id=thread_data.get('id', thread_id),
-                                parent_thread_id=metadata.get('parent_thread_id'),
-                                created_at=thread_data.get('created_at', ''),
-                                last_updated_at=thread_data.get('updated_at', ''),
-                                tool_name=metadata.get('tool_name', 'unknown'),
-                                turns=turns,
-                                initial_context=metadata.get('initial_context', {}),
-                                session_fingerprint=metadata.get('session_fingerprint'),
-                                client_friendly_name=metadata.get('client_friendly_name')
-                            )
-                            logger.debug(f"[STORAGE_INTEGRATION] Converted Supabase dict to ThreadContext ({len(turns)} turns)")
+                            context = _context_from_thread_dict(thread_id, thread_data)
+                            logger.debug(f"[STORAGE_INTEGRATION] Converted Supabase dict to ThreadContext ({len(context.turns)} turns)")
                             return context
                         except Exception as e:
                             logger.warning(f"[STORAGE_INTEGRATION] Failed to convert dict to ThreadContext: {e}")
@@ -262,21 +467,34 @@ def get_thread(thread_id: str) -> Optional[ThreadContext]:
             except Exception as e:
                 logger.debug(f"[STORAGE_INTEGRATION] Storage factory failed: {e}, falling back to Redis")
 
-        # Fallback to Redis storage (original behavior)
-        storage = get_storage()
-        key = f"thread:{thread_id}"
-        data = storage.get(key)
-
-        if data:
+        # Fallback to Redis storage (append-only turn log)
+        context = _context_from_turn_log(thread_id)
+        if context:
             logger.debug(f"[STORAGE_INTEGRATION] Retrieved thread {thread_id} from Redis")
-            return ThreadContext.model_validate_json(data)
-        return None
+        return context
     except Exception as e:
         # Silently handle errors to avoid exposing storage details
         logger.debug(f"[STORAGE_INTEGRATION] Error retrieving thread {thread_id}: {e}")
         return None
 
 
+def get_recent_turns(thread_id: str, limit: int) -> list[ConversationTurn]:
+    """
+    Return the last `limit` turns of a thread, oldest first.
+
+    Only that tail is fetched from the turn log, so callers that need recent
+    context do not pay for the whole history.
+    """
+    if not thread_id or not _is_valid_uuid(thread_id) or limit <= 0:
+        return []
+    try:
+        context = TurnLog(get_storage()).load(thread_id, tail=limit)
+    except Exception as e:
+        logger.debug(f"[STORAGE_INTEGRATION] Error retrieving recent turns for {thread_id}: {e}")
+        return []
+    return context.turns if context else []
+
+
 def add_turn(
     thread_id: str,
     role: str,
@@ -346,16 +564,25 @@ def add_turn(
         model_metadata=model_metadata,  # Additional model info
     )
 
+    previous_context = _copy_context(context)
     context.turns.append(turn)
     context.last_updated_at = datetime.now(timezone.utc).isoformat()
 
     # Save back to storage and refresh TTL
     # Use dual storage if available (Supabase + Redis)
     try:
+        # Snapshot the turn-log length first: the dual backend appends this same
+        # turn to the shared log, and the compare-and-append below must not add
+        # it twice
+        turn_log = TurnLog(get_storage())
+        expected_count = turn_log.ensure(previous_context)
+        backend_saved = False
+
         # Try storage factory first (Supabase integration)
         # Use CACHED instance to avoid creating multiple instances!
         storage_backend = _get_storage_backend()
-        if storage_backend:
+        # Backends sharing the turn log are written by the append below
+        if storage_backend and not getattr(storage_backend, "reads_turn_log", False):
             try:
                 # PHASE 1 (2025-10-24): Construct standardized metadata for storage
                 # Combine model_provider, model_name, and model_metadata into single dict
@@ -389,15 +616,36 @@ def add_turn(
                     tool_name=tool_name
                 )
                 if success:
+                    backend_saved = True
                     logger.debug(f"[STORAGE_INTEGRATION] Saved turn to storage factory for thread {thread_id}")
             except Exception as e:
                 logger.debug(f"[STORAGE_INTEGRATION] Storage factory add_turn failed: {e}")
 
-        # Always save to Redis (for backward compatibility and fallback)
-        storage = get_storage()
-        key = f"thread:{thread_id}"
-        storage.setex(key, CONVERSATION_TIMEOUT_SECONDS, context.model_dump_json())  # Refresh TTL to configured timeout
-        logger.debug(f"[STORAGE_INTEGRATION] Saved turn to Redis for thread {thread_id}")
+        # Always save to Redis (for backward compatibility and fallback): O(1) append, refreshes TTL
+        count = turn_log.append(thread_id, turn, context.last_updated_at, expected_count=expected_count)
+        mirrors_log = len(previous_context.turns) == expected_count
+
+        if count is None and not backend_saved:
+            # Another writer got in first and nobody stored this turn yet
+            count = turn_log.append(thread_id, turn, context.last_updated_at)
+            mirrors_log = False
+            if count is None:
+                logger.debug(f"[FLOW] Thread {thread_id} missing from Redis, turn not saved")
+                _thread_cache.discard(thread_id)
+                return False
+
+        if count is not None:
+            # Append to the memoized thread instead of invalidating it
+            _thread_cache.store(context, log_count=count if mirrors_log else None)
+            logger.debug(f"[STORAGE_INTEGRATION] Saved turn to Redis for thread {thread_id}")
+        elif mirrors_log:
+            # The storage backend already appended this turn (possibly with
+            # history stripped); the next read fetches it incrementally
+            _thread_cache.store(
+                previous_context.model_copy(update={"last_updated_at": ""}), log_count=expected_count
+            )
+        else:
+            _thread_cache.discard(thread_id)
         return True
     except Exception as e:
         logger.debug(f"[FLOW] Failed to save turn to storage: {type(e).__name__}")
@@ -6,10 +6,10 @@ for multiple model tokenizers (GPT, GLM, Kimi).
 """
 
 from typing import Dict, Optional, List, Any
-import tiktoken
-import functools
 import logging
 
+from utils.model.token_counter import get_token_counter
+
 logger = logging.getLogger(__name__)
 
 # Token limits (from EXAI recommendations)
@@ -24,41 +24,18 @@ class TokenCounter:
     Token counter with caching and multi-model support.
     
     Supports GPT, GLM, and Kimi models with appropriate tokenizers.
-    Uses LRU caching to avoid recalculation of token counts.
+    Delegates to the shared token service (utils/model/token_counter.py), so
+    tokenizers are loaded once and exact counts are memoized by content hash
+    across all instances.
     """
     
     def __init__(self):
-        self._tokenizers: Dict[str, any] = {}
-        self.cache_size_limit = 1000
-    
-    def _get_tokenizer(self, model_name: str):
-        """Get or create tokenizer for the specified model."""
-        if model_name not in self._tokenizers:
-            # Default to cl100k_base (GPT-4) if model not recognized
-            try:
-                if "gpt" in model_name.lower():
-                    self._tokenizers[model_name] = tiktoken.encoding_for_model(model_name)
-                elif "glm" in model_name.lower():
-                    # Use a generic tokenizer for GLM models
-                    self._tokenizers[model_name] = tiktoken.get_encoding("cl100k_base")
-                elif "kimi" in model_name.lower() or "moonshot" in model_name.lower():
-                    # Use a generic tokenizer for Kimi/Moonshot models
-                    self._tokenizers[model_name] = tiktoken.get_encoding("cl100k_base")
-                else:
-                    # Default fallback
-                    self._tokenizers[model_name] = tiktoken.get_encoding("cl100k_base")
-            except Exception as e:
-                logger.warning(f"Failed to get tokenizer for {model_name}: {e}. Using cl100k_base fallback.")
-                # Fallback to cl100k_base if model-specific encoding fails
-                self._tokenizers[model_name] = tiktoken.get_encoding("cl100k_base")
-        
-        return self._tokenizers[model_name]
+        self._counter = get_token_counter()
     
-    @functools.lru_cache(maxsize=1000)
     def count_tokens(self, text: str, model_name: str = "gpt-4") -> int:
         """
         Count tokens in text for the specified model.
-        Uses LRU cache to avoid recalculation.
+        Memoized by content hash in the shared token service.
         
         Args:
             text: Text to count tokens for
@@ -67,16 +44,7 @@ class TokenCounter:
         Returns:
             Number of tokens in the text
         """
-        if not text:
-            return 0
-        
-        try:
-            tokenizer = self._get_tokenizer(model_name)
-            return len(tokenizer.encode(text))
-        except Exception as e:
-            logger.error(f"Error counting tokens: {e}")
-            # Fallback: rough estimate (4 chars per token)
-            return len(text) // 4
+        return self._counter.count(text, model_name)
     
     def count_messages_tokens(self, messages: List[Any], model_name: str = "gpt-4") -> int:
         """
@@ -89,21 +57,7 @@ class TokenCounter:
         Returns:
             Total number of tokens across all messages
         """
-        total = 0
-        for message in messages:
-            if isinstance(message, dict):
-                # Handle message dict format
-                content = message.get("content", "")
-                role = message.get("role", "")
-                total += self.count_tokens(content, model_name)
-                total += self.count_tokens(role, model_name)
-                # Add some tokens for formatting (approximate)
-                total += 4
-            else:
-                # Handle string format
-                total += self.count_tokens(str(message), model_name)
-        
-        return total
+        return self._counter.count_messages(messages, model_name, exact=True)
 
 
 def validate_token_budget(content: str, history: List[Dict[str, Any]], 
@@ -128,11 +82,12 @@ def validate_token_budget(content: str, history: List[Dict[str, Any]],
     Raises:
         ValueError: If content alone exceeds max_total (circuit breaker)
     """
-    counter = TokenCounter()
-    content_tokens = counter.count_tokens(content, model_name)
+    counter = get_token_counter()
+    # Exact counts only when an estimate lands near the budget
+    content_fits, content_tokens = counter.fits(content, max_total, model_name)
     
     # Circuit breaker - fail fast if content exceeds budget
-    if content_tokens > max_total:
+    if not content_fits:
         raise ValueError(
             f"Content exceeds token budget: {content_tokens} > {max_total}. "
             f"This is a circuit breaker to prevent token explosion."
@@ -145,14 +100,21 @@ def validate_token_budget(content: str, history: List[Dict[str, Any]],
     current_tokens = 0
     
     for turn in reversed(history):
-        turn_tokens = turn.get('tokens', counter.count_tokens(turn.get('content', ''), model_name))
+        if 'tokens' in turn:
+            turn_tokens = turn['tokens']
+            turn_fits = current_tokens + turn_tokens <= remaining_tokens
+        else:
+            turn_fits, turn_tokens = counter.fits(
+                turn.get('content', ''), remaining_tokens - current_tokens, model_name
+            )
         
-        if current_tokens + turn_tokens <= remaining_tokens:
-            trimmed_history.insert(0, turn)
+        if turn_fits:
+            trimmed_history.append(turn)
             current_tokens += turn_tokens
         else:
             # Can't fit this turn, stop here
             break
+    trimmed_history.reverse()
     
     if len(trimmed_history) < len(history):
         logger.info(
@@ -175,27 +137,13 @@ def truncate_to_token_limit(text: str, max_tokens: int, model_name: str = "gpt-4
     Returns:
         Truncated text that fits within token limit
     """
-    counter = TokenCounter()
-    current_tokens = counter.count_tokens(text, model_name)
-    
-    if current_tokens <= max_tokens:
-        return text
-    
-    # Binary search to find the right truncation point
-    tokenizer = counter._get_tokenizer(model_name)
-    tokens = tokenizer.encode(text)
+    truncated_text = get_token_counter().truncate(text, max_tokens, model_name)
     
-    if len(tokens) <= max_tokens:
-        return text
-    
-    # Truncate tokens and decode
-    truncated_tokens = tokens[:max_tokens]
-    truncated_text = tokenizer.decode(truncated_tokens)
-    
-    logger.warning(
-        f"Truncated text from {current_tokens} to {max_tokens} tokens "
-        f"({len(text)} to {len(truncated_text)} chars)"
-    )
+    if truncated_text is not text:
+        logger.warning(
+            f"Truncated text to {max_tokens} tokens "
+            f"({len(text)} to {len(truncated_text)} chars)"
+        )
     
     return truncated_text
 
@@ -213,10 +161,7 @@ def validate_message_tokens(content: str, model_name: str = "gpt-4",
     Returns:
         Tuple of (is_valid, token_count)
     """
-    counter = TokenCounter()
-    token_count = counter.count_tokens(content, model_name)
-    
-    is_valid = token_count <= max_tokens
+    is_valid, token_count = get_token_counter().fits(content, max_tokens, model_name)
     
     if not is_valid:
         logger.warning(
@@ -226,13 +171,9 @@ def validate_message_tokens(content: str, model_name: str = "gpt-4",
     return is_valid, token_count
 
 
-# Global token counter instance for reuse
-_global_counter = TokenCounter()
-
-
 def count_tokens(text: str, model_name: str = "gpt-4") -> int:
     """
-    Convenience function for counting tokens using global counter.
+    Convenience function for counting tokens using the shared token service.
     
     Args:
         text: Text to count tokens for
@@ -241,5 +182,5 @@ def count_tokens(text: str, model_name: str = "gpt-4") -> int:
     Returns:
         Number of tokens in the text
     """
-    return _global_counter.count_tokens(text, model_name)
+    return get_token_counter().count(text, model_name)
 
@@ -0,0 +1,190 @@
+"""
+Append-only Conversation Turn Log
+
+Storage layout for conversation threads that avoids rewriting the whole
+thread on every turn:
+
+    thread:{id}:header  hash  thread metadata (JSON-encoded values) + turn_count
+    thread:{id}:turns   list  one JSON ConversationTurn record per turn
+
+Appending a turn is one RPUSH plus a small header update, and readers can
+fetch only the tail of the list (or only turns they have not seen yet).
+
+Appends can be conditional on the current turn_count (compare-and-append),
+which lets several writers sharing the log (threads.add_turn and the
+in-memory storage factory backend) avoid appending the same turn twice.
+
+Legacy threads stored as a single `thread:{id}` JSON blob are read through a
+migration shim: the first load copies them into the new layout.
+
+CRITICAL: This module must only depend on models.py so that both
+threads.py and memory.py can use it without circular imports.
+"""
+
+import json
+import logging
+from typing import Any, Optional
+
+from utils.conversation.models import (
+    CONVERSATION_TIMEOUT_SECONDS,
+    ConversationTurn,
+    ThreadContext,
+    get_storage,
+)
+
+logger = logging.getLogger(__name__)
+
+# ThreadContext fields kept in the header hash (turns live in the list)
+_HEADER_FIELDS = (
+    "thread_id",
+    "parent_thread_id",
+    "created_at",
+    "last_updated_at",
+    "tool_name",
+    "initial_context",
+    "session_fingerprint",
+    "client_friendly_name",
+)
+
+
+def header_key(thread_id: str) -> str:
+    return f"thread:{thread_id}:header"
+
+
+def turns_key(thread_id: str) -> str:
+    return f"thread:{thread_id}:turns"
+
+
+def legacy_key(thread_id: str) -> str:
+    return f"thread:{thread_id}"
+
+
+class TurnLog:
+    """
+    Thread header + turn list on top of the conversation storage backend.
+
+    Args:
+        storage: Storage backend (default: get_storage()); must provide
+            get_thread_header/get_turn_records/write_thread/append_turns
+        ttl_seconds: Expiry refreshed on every write
+    """
+
+    def __init__(self, storage=None, ttl_seconds: int = CONVERSATION_TIMEOUT_SECONDS):
+        self.storage = storage if storage is not None else get_storage()
+        self.ttl_seconds = ttl_seconds
+
+    # Encoding ------------------------------------------------------------
+
+    @staticmethod
+    def encode_header(context: ThreadContext) -> dict[str, str]:
+        return {field: json.dumps(getattr(context, field)) for field in _HEADER_FIELDS}
+
+    @staticmethod
+    def decode_header(header: dict[str, str]) -> dict[str, Any]:
+        """Decode header values; includes turn_count as int."""
+        decoded = {field: json.loads(header[field]) for field in _HEADER_FIELDS if field in header}
+        decoded["turn_count"] = int(header.get("turn_count", 0))
+        return decoded
+
+    @staticmethod
+    def build_context(header: dict[str, Any], turns: list[ConversationTurn]) -> ThreadContext:
+        """Build a ThreadContext from a decoded header and its turns."""
+        fields = {k: v for k, v in header.items() if k != "turn_count"}
+        return ThreadContext(**fields, turns=turns)
+
+    # Reads ---------------------------------------------------------------
+
+    def read_header(self, thread_id: str) -> Optional[dict[str, Any]]:
+        """Return the decoded header, or None if the thread is not in this layout."""
+        header = self.storage.get_thread_header(header_key(thread_id))
+        return self.decode_header(header) if header else None
+
+    def read_turns(self, thread_id: str, start: int = 0, end: int = -1) -> list[ConversationTurn]:
+        """Return turns in [start, end] (inclusive, negative indexes count from the tail)."""
+        records = self.storage.get_turn_records(turns_key(thread_id), start, end)
+        return [ConversationTurn.model_validate_json(r) for r in records]
+
+    def load(self, thread_id: str, tail: Optional[int] = None) -> Optional[ThreadContext]:
+        """
+        Load a thread, optionally with only its last `tail` turns.
+
+        Falls back to (and migrates) a legacy `thread:{id}` blob.
+        """
+        header = self.read_header(thread_id)
+        if header is None:
+            context = self.migrate_legacy(thread_id)
+            if context is not None and tail is not None:
+                context.turns = context.turns[-tail:] if tail > 0 else []
+            return context
+        if tail is not None and tail <= 0:
+            return self.build_context(header, [])
+        turns = self.read_turns(thread_id, -tail if tail else 0, -1)
+        return self.build_context(header, turns)
+
+    def migrate_legacy(self, thread_id: str) -> Optional[ThreadContext]:
+        """Copy a legacy whole-thread blob into the header + list layout."""
+        data = self.storage.get(legacy_key(thread_id))
+        if not data:
+            return None
+        context = ThreadContext.model_validate_json(data)
+        self.write(context)
+        logger.info(f"[TURN_LOG] Migrated legacy thread {thread_id} ({len(context.turns)} turns)")
+        return context
+
+    # Writes --------------------------------------------------------------
+
+    def write(self, context: ThreadContext) -> None:
+        """Write (or replace) a whole thread."""
+        self.storage.write_thread(
+            header_key(context.thread_id),
+            turns_key(context.thread_id),
+            self.ttl_seconds,
+            self.encode_header(context),
+            [turn.model_dump_json() for turn in context.turns],
+        )
+
+    def ensure(self, context: ThreadContext) -> int:
+        """
+        Make sure the thread exists in this layout and return its turn count.
+
+        Migrates a legacy blob if present, otherwise writes `context`.
+        """
+        header = self.read_header(context.thread_id)
+        if header is not None:
+            return header["turn_count"]
+        migrated = self.migrate_legacy(context.thread_id)
+        if migrated is not None:
+            return len(migrated.turns)
+        self.write(context)
+        return len(context.turns)
+
+    def append(
+        self,
+        thread_id: str,
+        turn: ConversationTurn,
+        last_updated_at: str,
+        expected_count: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Append one turn and bump last_updated_at.
+
+        Args:
+            thread_id: Thread to append to
+            turn: Turn to append
+            last_updated_at: New last_updated_at for the header
+            expected_count: Only append if the thread currently has this many turns
+
+        Returns:
+            New turn count, or None if the thread is missing or expected_count did not match
+        """
+        return self.storage.append_turns(
+            header_key(thread_id),
+            turns_key(thread_id),
+            self.ttl_seconds,
+            [turn.model_dump_json()],
+            {"last_updated_at": json.dumps(last_updated_at)},
+            expected_count,
+        )
+
+
+__all__ = ["TurnLog", "header_key", "turns_key", "legacy_key"]
@@ -3,10 +3,26 @@ Path expansion and directory walking utilities.
 
 This module handles expanding file paths and directories into individual files,
 with filtering and security checks.
+
+Directory listings are kept in a process-wide index that remembers each
+directory's mtime, so repeated expansions of the same root only rescan
+directories whose entries changed (a file added, removed or renamed bumps
+its parent directory's mtime). Extension filtering runs against the cached
+listing. When watchdog is installed and FILE_INDEX_WATCH is enabled, roots
+are also watched (inotify on Linux) and unchanged directories are not even
+stat-ed; otherwise directory mtimes are polled on each expansion.
+
+Configuration:
+    FILE_INDEX_ENABLED=true       (false = walk the tree on every call)
+    FILE_INDEX_MAX_DIRS=200000    (index is dropped when it grows past this)
+    FILE_INDEX_WATCH=false        (watch indexed roots for changes)
+    FILE_INDEX_MAX_WATCHES=16     (maximum number of watched roots)
 """
 
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -16,6 +32,250 @@ from utils.config.security import EXCLUDED_DIRS
 
 logger = logging.getLogger(__name__)
 
+# Optional file-system watching (inotify/FSEvents/ReadDirectoryChangesW)
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Directory mtimes this close to "now" may still change within the same
+# timestamp tick, so listings taken then are rescanned next time
+_RACY_MTIME_NS = 2_000_000_000
+
+
+class _DirEntry:
+    """Cached listing of one directory."""
+
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: Optional[int], files: list[tuple[str, str]], subdirs: list[str]):
+        self.mtime_ns = mtime_ns  # None = must be rescanned
+        self.files = files  # (full path, lowercased suffix), hidden files excluded
+        self.subdirs = subdirs  # full paths, hidden/excluded/MCP directories excluded
+
+
+class _DirtyHandler(FileSystemEventHandler):
+    """Marks the directories touched by file-system events as dirty."""
+
+    def __init__(self, index: "DirectoryIndex"):
+        super().__init__()
+        self._index = index
+
+    def on_any_event(self, event):
+        paths = [event.src_path, getattr(event, "dest_path", "") or ""]
+        dirty = {os.path.dirname(p) for p in paths if p}
+        if event.is_directory:
+            dirty.update(p for p in paths if p)
+        self._index.mark_dirty(dirty)
+
+
+class DirectoryIndex:
+    """
+    Process-wide cache of filtered directory listings.
+
+    Usage:
+        files = get_directory_index().list_files("/abs/project")
+        stats = get_directory_index().get_stats()
+    """
+
+    def __init__(self, max_dirs: Optional[int] = None, watch: Optional[bool] = None):
+        self.max_dirs = max_dirs if max_dirs is not None else int(os.getenv("FILE_INDEX_MAX_DIRS", "200000"))
+        self.watch = (watch if watch is not None else _env_flag("FILE_INDEX_WATCH", "false")) and WATCHDOG_AVAILABLE
+        self.max_watches = int(os.getenv("FILE_INDEX_MAX_WATCHES", "16"))
+        self._lock = threading.Lock()
+        self._dirs: dict[str, _DirEntry] = {}
+        self._dirty: set[str] = set()
+        self._watched: set[str] = set()
+        self._observer = None
+        self.stats = {
+            "expansions": 0,
+            "dirs_scanned": 0,  # Directories listed from disk
+            "dirs_revalidated": 0,  # Directories checked by stat only
+            "dirs_reused": 0,  # Directories trusted from the watcher
+        }
+
+    # Watching ----------------------------------------------------------
+
+    def mark_dirty(self, dirs: set[str]) -> None:
+        with self._lock:
+            self._dirty.update(dirs)
+
+    def _is_watched(self, path: str) -> bool:
+        return any(path == root or path.startswith(root + os.sep) for root in self._watched)
+
+    def _start_watch(self, root: str) -> None:
+        """Watch a root recursively (caller holds the lock); falls back to polling on failure."""
+        if not self.watch or self._is_watched(root) or len(self._watched) >= self.max_watches:
+            return
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._observer.schedule(_DirtyHandler(self), root, recursive=True)
+            self._watched.add(root)
+            logger.debug(f"[FILE_INDEX] Watching {root}")
+        except Exception as e:
+            # e.g. inotify watch limit reached - mtime polling still applies
+            logger.warning(f"[FILE_INDEX] Could not watch {root}, falling back to polling: {e}")
+
+    # Listing -----------------------------------------------------------
+
+    @staticmethod
+    def _scan(path: str) -> Optional[_DirEntry]:
+        """List one directory with the same filtering os.walk-based expansion used."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return None
+
+        files = []
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Skip hidden/excluded directories and symlinked directories (os.walk does not follow them)
+                if name.startswith(".") or name in EXCLUDED_DIRS or entry.is_symlink():
+                    continue
+                # Skip MCP directories found during traversal
+                if is_mcp_directory(Path(entry.path)):
+                    logger.debug(f"Skipping MCP directory during traversal: {entry.path}")
+                    continue
+                subdirs.append(entry.path)
+            elif not name.startswith("."):
+                # Skip hidden files (e.g., .DS_Store, .gitignore)
+                files.append((entry.path, os.path.splitext(name)[1].lower()))
+
+        if time.time_ns() - mtime_ns < _RACY_MTIME_NS:
+            mtime_ns = None
+        return _DirEntry(mtime_ns, files, subdirs)
+
+    def _fresh_entry(self, path: str, watched: bool) -> Optional[_DirEntry]:
+        """Return an up-to-date entry for path, rescanning only if it changed."""
+        with self._lock:
+            entry = self._dirs.get(path)
+            if entry is not None and entry.mtime_ns is not None and watched and path not in self._dirty:
+                self.stats["dirs_reused"] += 1
+                return entry
+            # Clear the dirty mark before scanning so events during the scan are kept
+            self._dirty.discard(path)
+
+        if entry is not None and entry.mtime_ns is not None:
+            try:
+                if os.stat(path).st_mtime_ns == entry.mtime_ns:
+                    with self._lock:
+                        self.stats["dirs_revalidated"] += 1
+                    return entry
+            except OSError:
+                pass
+
+        entry = self._scan(path)
+        with self._lock:
+            self.stats["dirs_scanned"] += 1
+            if entry is None:
+                self._dirs.pop(path, None)
+            else:
+                self._dirs[path] = entry
+        return entry
+
+    def list_files(self, root: str) -> list[tuple[str, str]]:
+        """Return (path, lowercased suffix) for every non-hidden file under root."""
+        with self._lock:
+            self.stats["expansions"] += 1
+            if len(self._dirs) > self.max_dirs:
+                logger.info(f"[FILE_INDEX] Index exceeded {self.max_dirs:,} directories, clearing")
+                self._dirs.clear()
+            self._start_watch(root)
+            watched = self._is_watched(root)
+
+        files: list[tuple[str, str]] = []
+        stack = [root]
+        while stack:
+            entry = self._fresh_entry(stack.pop(), watched)
+            if entry is not None:
+                files.extend(entry.files)
+                stack.extend(entry.subdirs)
+        return files
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dirs.clear()
+            self._dirty.clear()
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._observer is not None:
+                try:
+                    self._observer.stop()
+                except Exception:
+                    pass
+                self._observer = None
+            self._watched.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {**self.stats, "dirs_cached": len(self._dirs), "watched_roots": len(self._watched)}
+
+
+# Singleton index shared by all tools
+_directory_index: Optional[DirectoryIndex] = None
+_directory_index_lock = threading.Lock()
+
+
+def get_directory_index() -> DirectoryIndex:
+    """Get the shared directory index (thread-safe)."""
+    global _directory_index
+    if _directory_index is None:
+        with _directory_index_lock:
+            if _directory_index is None:
+                _directory_index = DirectoryIndex()
+    return _directory_index
+
+
+def reset_directory_index() -> None:
+    """Drop the shared directory index and stop its watcher (useful for testing)."""
+    global _directory_index
+    with _directory_index_lock:
+        if _directory_index is not None:
+            _directory_index.close()
+        _directory_index = None
+
+
+def _walk_files(root: Path) -> list[tuple[str, str]]:
+    """Uncached walk, used when FILE_INDEX_ENABLED is off."""
+    files = []
+    for dirpath, dirs, names in os.walk(root):
+        # Filter directories in-place to skip hidden and excluded directories
+        # This prevents descending into .git, .venv, __pycache__, node_modules, etc.
+        dirs[:] = [
+            d
+            for d in dirs
+            if not d.startswith(".") and d not in EXCLUDED_DIRS and not is_mcp_directory(Path(dirpath) / d)
+        ]
+        for name in names:
+            # Skip hidden files (e.g., .DS_Store, .gitignore)
+            if not name.startswith("."):
+                files.append((os.path.join(dirpath, name), os.path.splitext(name)[1].lower()))
+    return files
+
 
 def expand_paths(paths: list[str], extensions: Optional[set[str]] = None) -> list[str]:
     """
@@ -70,40 +330,18 @@ def expand_paths(paths: list[str], extensions: Optional[set[str]] = None) -> lis
                 seen.add(str(path_obj))
 
         elif path_obj.is_dir():
-            # Walk directory recursively to find all files
-            for root, dirs, files in os.walk(path_obj):
-                # Filter directories in-place to skip hidden and excluded directories
-                # This prevents descending into .git, .venv, __pycache__, node_modules, etc.
-                original_dirs = dirs[:]
-                dirs[:] = []
-                for d in original_dirs:
-                    # Skip hidden directories
-                    if d.startswith("."):
-                        continue
-                    # Skip excluded directories
-                    if d in EXCLUDED_DIRS:
-                        continue
-                    # Skip MCP directories found during traversal
-                    dir_path = Path(root) / d
-                    if is_mcp_directory(dir_path):
-                        logger.debug(f"Skipping MCP directory during traversal: {dir_path}")
-                        continue
-                    dirs.append(d)
-
-                for file in files:
-                    # Skip hidden files (e.g., .DS_Store, .gitignore)
-                    if file.startswith("."):
-                        continue
-
-                    file_path = Path(root) / file
-
-                    # Filter by extension if specified
-                    if not extensions or file_path.suffix.lower() in extensions:
-                        full_path = str(file_path)
-                        # Use set to prevent duplicates
-                        if full_path not in seen:
-                            expanded_files.append(full_path)
-                            seen.add(full_path)
+            # Recursively list the directory (from the index when enabled)
+            if _env_flag("FILE_INDEX_ENABLED", "true"):
+                listing = get_directory_index().list_files(str(path_obj))
+            else:
+                listing = _walk_files(path_obj)
+
+            for full_path, suffix in listing:
+                # Filter by extension if specified
+                # Use set to prevent duplicates
+                if (not extensions or suffix in extensions) and full_path not in seen:
+                    expanded_files.append(full_path)
+                    seen.add(full_path)
 
     # Sort for consistent ordering across different runs
     # This makes output predictable and easier to debug
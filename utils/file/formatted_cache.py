@@ -0,0 +1,323 @@
+"""
+Persistent cache of formatted file blocks.
+
+Workflow tools (debug, codereview, ...) embed the same files on every step,
+and every embed re-reads, re-decodes and re-line-numbers them. This cache
+stores the formatted file body (line-numbered or normalized) together with
+its token estimate in an SQLite file shared by all tools and processes.
+
+Entries are keyed by (resolved path, mtime_ns, size, line_numbers), so any
+modification to a file produces a new key; superseded entries for the same
+path are dropped on store. The store is bounded by a byte budget with LRU
+eviction on last use. Each thread uses its own connection to the WAL-mode
+database, so parallel file reads do not queue behind each other on lookups.
+
+Configuration:
+    FORMATTED_FILE_CACHE_ENABLED=true
+    FORMATTED_FILE_CACHE_PATH=.cache/formatted_files.sqlite3
+    FORMATTED_FILE_CACHE_MAX_BYTES=268435456   (256 MiB)
+    FORMATTED_FILE_CACHE_MIN_BYTES=1024        (smaller files are not cached)
+
+Cache failures never break file reading: errors are logged and the cache
+disables itself for the rest of the process.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import performance metrics (optional)
+try:
+    from utils.infrastructure.performance_metrics import record_cache_hit, record_cache_miss
+    _METRICS_AVAILABLE = True
+except ImportError:
+    _METRICS_AVAILABLE = False
+    def record_cache_hit(cache_name: str): pass
+    def record_cache_miss(cache_name: str): pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS formatted_files (
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    line_numbers INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (path, mtime_ns, size, line_numbers)
+);
+CREATE INDEX IF NOT EXISTS formatted_files_last_used ON formatted_files (last_used);
+"""
+
+
+class FormattedFileCache:
+    """
+    SQLite-backed LRU of formatted file bodies.
+
+    Usage:
+        cache = get_formatted_file_cache()
+        hit = cache.get(path, st.st_mtime_ns, st.st_size, line_numbers)
+        if hit is None:
+            body = ...
+            cache.put(path, st.st_mtime_ns, st.st_size, line_numbers, body, tokens)
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: Optional[int] = None, min_file_bytes: Optional[int] = None):
+        self.path = Path(path or os.getenv("FORMATTED_FILE_CACHE_PATH", ".cache/formatted_files.sqlite3"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.getenv("FORMATTED_FILE_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+        )
+        self.min_file_bytes = min_file_bytes if min_file_bytes is not None else int(
+            os.getenv("FORMATTED_FILE_CACHE_MIN_BYTES", "1024")
+        )
+        # Each thread gets its own connection (WAL lets them read concurrently)
+        # and drops it with the thread; _state_lock only guards the counters
+        # and is never held across a SQLite call
+        self._local = threading.local()
+        self._state_lock = threading.Lock()
+        self._generation = 0
+        self._total_loaded = False
+        self._disabled = False
+        self._total_bytes = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,  # Source bytes not re-read thanks to hits
+            "errors": 0,
+        }
+
+    # Connection --------------------------------------------------------
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Return this thread's connection, opening it on first use."""
+        if self._disabled:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            if self._local.generation == self._generation:
+                return conn
+            # close() or a failure since this thread last connected
+            self._close_local()
+        conn = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None)
+            # WAL lets threads and server processes share the file without blocking readers
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            total = None
+            if not self._total_loaded:
+                total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM formatted_files").fetchone()[0]
+        except Exception as e:
+            if conn is not None:
+                conn.close()
+            self._fail("open", e)
+            return None
+
+        with self._state_lock:
+            if total is not None and not self._total_loaded:
+                self._total_bytes = total
+                self._total_loaded = True
+                logger.info(f"[FORMATTED_FILE_CACHE] Opened {self.path} ({total:,} bytes cached)")
+            self._local.conn = conn
+            self._local.generation = self._generation
+        return conn
+
+    def _close_local(self) -> None:
+        """Close this thread's connection, if any."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _close_all(self) -> None:
+        """Retire every thread's connection; each is closed on its thread's next use."""
+        with self._state_lock:
+            self._generation += 1
+        self._close_local()
+
+    def _fail(self, operation: str, error: Exception) -> None:
+        """Disable the cache after a storage error."""
+        with self._state_lock:
+            self.stats["errors"] += 1
+            self._disabled = True
+        logger.warning(f"[FORMATTED_FILE_CACHE] {operation} failed, disabling cache: {error}")
+        self._close_all()
+
+    # Operations --------------------------------------------------------
+
+    def get(self, path: str, mtime_ns: int, size: int, line_numbers: bool) -> Optional[tuple[str, int]]:
+        """Return (body, tokens) for an unchanged file, or None on a miss."""
+        if size < self.min_file_bytes:
+            return None
+        conn = self._connect()
+        if conn is None:
+            return None
+        key = (path, mtime_ns, size, int(line_numbers))
+        try:
+            row = conn.execute(
+                "SELECT body, tokens FROM formatted_files "
+                "WHERE path = ? AND mtime_ns = ? AND size = ? AND line_numbers = ?",
+                key,
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE formatted_files SET last_used = ? "
+                    "WHERE path = ? AND mtime_ns = ? AND size = ? AND line_numbers = ?",
+                    (time.time(), *key),
+                )
+        except Exception as e:
+            self._fail("get", e)
+            return None
+
+        with self._state_lock:
+            if row is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["hits"] += 1
+                self.stats["bytes_saved"] += size
+
+        if _METRICS_AVAILABLE:
+            if row is None:
+                record_cache_miss("formatted_file_cache")
+            else:
+                record_cache_hit("formatted_file_cache")
+        return (row[0], row[1]) if row is not None else None
+
+    def put(self, path: str, mtime_ns: int, size: int, line_numbers: bool, body: str, tokens: int) -> None:
+        """Store a formatted body, replacing older versions of the same file."""
+        if size < self.min_file_bytes:
+            return
+        nbytes = len(body.encode("utf-8"))
+        if nbytes > self.max_bytes:
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                # Take the write lock up front: a deferred read-then-write
+                # transaction cannot wait for a concurrent writer in WAL mode
+                conn.execute("BEGIN IMMEDIATE")
+                # Older mtimes/sizes of this file can never be hit again
+                stale = conn.execute(
+                    "SELECT COALESCE(SUM(nbytes), 0) FROM formatted_files WHERE path = ? AND line_numbers = ?",
+                    (path, int(line_numbers)),
+                ).fetchone()[0]
+                conn.execute(
+                    "DELETE FROM formatted_files WHERE path = ? AND line_numbers = ?",
+                    (path, int(line_numbers)),
+                )
+                conn.execute(
+                    "INSERT INTO formatted_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, mtime_ns, size, int(line_numbers), body, tokens, nbytes, time.time()),
+                )
+            with self._state_lock:
+                self._total_bytes += nbytes - stale
+                self.stats["stores"] += 1
+                over_budget = self._total_bytes > self.max_bytes
+            if over_budget:
+                self._evict(conn)
+        except Exception as e:
+            self._fail("put", e)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries until under the byte budget."""
+        target = int(self.max_bytes * 0.9)  # Leave headroom so we don't evict on every store
+        evicted = []
+        freed = 0
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Other threads and processes share the file, so re-read the real total first
+            total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM formatted_files").fetchone()[0]
+            if total > self.max_bytes:
+                for rowid, nbytes in conn.execute("SELECT rowid, nbytes FROM formatted_files ORDER BY last_used"):
+                    if total - freed <= target:
+                        break
+                    evicted.append((rowid,))
+                    freed += nbytes
+                conn.executemany("DELETE FROM formatted_files WHERE rowid = ?", evicted)
+        with self._state_lock:
+            self._total_bytes = total - freed
+            self.stats["evictions"] += len(evicted)
+        if evicted:
+            logger.debug(f"[FORMATTED_FILE_CACHE] Evicted {len(evicted)} entries ({freed:,} bytes)")
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        conn = self._connect()
+        if conn is not None:
+            try:
+                conn.execute("DELETE FROM formatted_files")
+            except Exception as e:
+                self._fail("clear", e)
+        with self._state_lock:
+            self._total_bytes = 0
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def close(self) -> None:
+        self._close_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, stores, evictions, bytes_saved,
+            errors, hit_rate, total_bytes and max_bytes
+        """
+        with self._state_lock:
+            total_requests = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": self.stats["hits"] / total_requests if total_requests > 0 else 0.0,
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "enabled": not self._disabled,
+            }
+
+
+# Singleton instance shared by all tools
+_formatted_file_cache: Optional[FormattedFileCache] = None
+_formatted_file_cache_lock = threading.Lock()
+
+
+def get_formatted_file_cache() -> Optional[FormattedFileCache]:
+    """Get the shared formatted-file cache, or None if disabled by configuration."""
+    global _formatted_file_cache
+    if os.getenv("FORMATTED_FILE_CACHE_ENABLED", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if _formatted_file_cache is None:
+        with _formatted_file_cache_lock:
+            if _formatted_file_cache is None:
+                _formatted_file_cache = FormattedFileCache()
+    return _formatted_file_cache
+
+
+def reset_formatted_file_cache() -> None:
+    """Close and drop the shared cache (useful for testing)."""
+    global _formatted_file_cache
+    with _formatted_file_cache_lock:
+        if _formatted_file_cache is not None:
+            _formatted_file_cache.close()
+        _formatted_file_cache = None
+
+
+__all__ = ["FormattedFileCache", "get_formatted_file_cache", "reset_formatted_file_cache"]
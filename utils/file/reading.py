@@ -3,19 +3,56 @@ File reading and content formatting utilities.
 
 This module handles reading file content, formatting it for AI consumption,
 and managing line numbers and token budgets.
+
+read_files stats all candidates up front, plans which files fit the token
+budget from their byte size, reads those concurrently on a shared thread pool
+(mmap-ing large files) and assembles the output in the original order.
+Formatted file bodies are shared across tools and processes through the
+persistent cache in formatted_cache.py.
+
+Configuration:
+    FILE_READ_WORKERS=8               (thread pool size for parallel reads)
+    FILE_READ_MMAP_THRESHOLD=262144   (bytes; larger files are read via mmap)
 """
 
 import logging
+import mmap
+import operator
+import os
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 from .types import BINARY_EXTENSIONS, IMAGE_EXTENSIONS, TEXT_EXTENSIONS
 from .expansion import expand_paths
+from .formatted_cache import get_formatted_file_cache
 from .security import resolve_and_validate_path
 from utils.model.token_utils import DEFAULT_CONTEXT_WINDOW, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+_READ_WORKERS = max(1, int(os.getenv("FILE_READ_WORKERS", "8")))
+_MMAP_THRESHOLD = int(os.getenv("FILE_READ_MMAP_THRESHOLD", str(256 * 1024)))
+
+# Rough average used to estimate line-number overhead before reading
+_ESTIMATED_BYTES_PER_LINE = 40
+
+_read_executor: Optional[ThreadPoolExecutor] = None
+_read_executor_lock = threading.Lock()
+
+
+def _get_read_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for parallel file reads (created on first use)."""
+    global _read_executor
+    if _read_executor is None:
+        with _read_executor_lock:
+            if _read_executor is None:
+                _read_executor = ThreadPoolExecutor(max_workers=_READ_WORKERS, thread_name_prefix="file-read")
+    return _read_executor
+
 
 def detect_file_type(file_path: str) -> str:
     """
@@ -110,10 +147,149 @@ def _add_line_numbers(content: str) -> str:
     width = len(str(total_lines))
     width = max(width, 4)  # Minimum padding for readability
 
-    # Format with dynamic width and clear separator
-    numbered_lines = [f"{i + 1:{width}d}│ {line}" for i, line in enumerate(lines)]
+    # Format with dynamic width and clear separator in a single pass: prefixes
+    # and lines are combined by C-level map/join, no per-line Python code
+    prefix = f"{{:{width}d}}│ ".format
+    return "\n".join(map(operator.add, map(prefix, range(1, total_lines + 1)), lines))
+
+
+@dataclass
+class _FileCandidate:
+    """A file to read: validated path and size, or a pre-formatted error."""
+
+    file_path: str
+    path: Optional[Path] = None
+    size: int = 0
+    mtime_ns: int = 0
+    content: Optional[str] = None
+    tokens: int = 0
+
+
+def _error_candidate(file_path: str, content: str) -> _FileCandidate:
+    return _FileCandidate(file_path=file_path, content=content, tokens=estimate_tokens(content))
+
+
+def _stat_file(file_path: str, max_size: int) -> _FileCandidate:
+    """
+    Validate and stat a file without reading it.
+
+    Returns a candidate with path/size set, or with formatted error content
+    (same messages as read_file_content) if it cannot be read.
+    """
+    try:
+        # Validate path security before any file operations
+        path = resolve_and_validate_path(file_path)
+    except (ValueError, PermissionError) as e:
+        # Return error in a format that provides context to the AI
+        logger.debug(f"[FILES] Path validation failed for {file_path}: {type(e).__name__}: {e}")
+        return _error_candidate(
+            file_path, f"\n--- ERROR ACCESSING FILE: {file_path} ---\nError: {str(e)}\n--- END FILE ---\n"
+        )
+
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        logger.debug(f"[FILES] File does not exist: {file_path}")
+        return _error_candidate(
+            file_path, f"\n--- FILE NOT FOUND: {file_path} ---\nError: File does not exist\n--- END FILE ---\n"
+        )
+    except Exception as e:
+        return _error_candidate(
+            file_path, f"\n--- ERROR READING FILE: {file_path} ---\nError: {str(e)}\n--- END FILE ---\n"
+        )
+
+    if not stat.S_ISREG(st.st_mode):
+        logger.debug(f"[FILES] Path is not a file: {file_path}")
+        return _error_candidate(
+            file_path, f"\n--- NOT A FILE: {file_path} ---\nError: Path is not a file\n--- END FILE ---\n"
+        )
+
+    # Check file size to prevent memory exhaustion
+    if st.st_size > max_size:
+        logger.debug(f"[FILES] File too large: {file_path} ({st.st_size:,} > {max_size:,} bytes)")
+        return _error_candidate(
+            file_path,
+            f"\n--- FILE TOO LARGE: {file_path} ---\nFile size: {st.st_size:,} bytes (max: {max_size:,})\n--- END FILE ---\n",
+        )
+
+    return _FileCandidate(file_path=file_path, path=path, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+def _read_text(path: Path, size: int) -> str:
+    """Read a file as UTF-8 (invalid bytes replaced), via mmap for large files."""
+    if size >= _MMAP_THRESHOLD:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Decode straight from the mapping, without an intermediate bytes copy
+            with memoryview(mm) as view:
+                return str(view, "utf-8", "replace")
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", "replace")
+
+
+def _format_body(file_content: str, add_line_numbers: bool) -> str:
+    """Line-number (or just normalize) file content."""
+    # Add line numbers if requested or auto-detected
+    if add_line_numbers:
+        return _add_line_numbers(file_content)
+    # Still normalize line endings for consistency
+    return _normalize_line_endings(file_content)
+
+
+def _wrap_file(file_path: str, body: str, body_tokens: int) -> tuple[str, int]:
+    """
+    Wrap a formatted body in delimiters; returns (formatted_content, estimated_tokens).
+
+    The token count is the body's (cached alongside it) plus the delimiters',
+    so a cache hit never re-estimates the whole body.
+    """
+    # Format with clear delimiters that help the AI understand file boundaries
+    # Using consistent markers makes it easier for the model to parse
+    # NOTE: These markers ("--- BEGIN FILE: ... ---") are distinct from git diff markers
+    # ("--- BEGIN DIFF: ... ---") to allow AI to distinguish between complete file content
+    # vs. partial diff content when files appear in both sections
+    begin = f"\n--- BEGIN FILE: {file_path} ---\n"
+    end = f"\n--- END FILE: {file_path} ---\n"
+    return f"{begin}{body}{end}", body_tokens + estimate_tokens(begin + end)
+
+
+def _read_candidate(candidate: _FileCandidate, add_line_numbers: bool) -> tuple[str, int]:
+    """
+    Read and format a stat-ed candidate (errors are returned as formatted content).
+
+    Formatted bodies and their token counts are served from / stored in the
+    persistent formatted-file cache when it is enabled, keyed by the stat
+    taken in _stat_file.
+    """
+    if candidate.content is not None:
+        return candidate.content, candidate.tokens
+    try:
+        cache = get_formatted_file_cache()
+        cache_key = (str(candidate.path), candidate.mtime_ns, candidate.size, add_line_numbers)
+        cached = cache.get(*cache_key) if cache is not None else None
+        if cached is not None:
+            return _wrap_file(candidate.file_path, *cached)
+
+        body = _format_body(_read_text(candidate.path, candidate.size), add_line_numbers)
+        body_tokens = estimate_tokens(body)
+        if cache is not None:
+            cache.put(*cache_key, body, body_tokens)
+        return _wrap_file(candidate.file_path, body, body_tokens)
+    except Exception as e:
+        logger.debug(f"[FILES] Exception reading file {candidate.file_path}: {type(e).__name__}: {e}")
+        content = f"\n--- ERROR READING FILE: {candidate.file_path} ---\nError: {str(e)}\n--- END FILE ---\n"
+        return content, estimate_tokens(content)
+
 
-    return "\n".join(numbered_lines)
+def _estimate_candidate_tokens(candidate: _FileCandidate, add_line_numbers: bool) -> int:
+    """Estimate formatted tokens from byte size, before reading the file."""
+    if candidate.content is not None:
+        return candidate.tokens
+    # Delimiters repeat the path twice; UTF-8 never has fewer bytes than characters
+    chars = candidate.size + 2 * len(candidate.file_path) + 40
+    if add_line_numbers:
+        lines = candidate.size // _ESTIMATED_BYTES_PER_LINE + 1
+        chars += lines * (max(len(str(lines)), 4) + 2)
+    return chars // 4
 
 
 def read_file_content(
@@ -136,75 +312,85 @@ def read_file_content(
         Content is wrapped with clear delimiters for AI parsing
     """
     logger.debug(f"[FILES] read_file_content called for: {file_path}")
-    try:
-        # Validate path security before any file operations
-        path = resolve_and_validate_path(file_path)
-        logger.debug(f"[FILES] Path validated and resolved: {path}")
-    except (ValueError, PermissionError) as e:
-        # Return error in a format that provides context to the AI
-        logger.debug(f"[FILES] Path validation failed for {file_path}: {type(e).__name__}: {e}")
-        error_msg = str(e)
-        content = f"\n--- ERROR ACCESSING FILE: {file_path} ---\nError: {error_msg}\n--- END FILE ---\n"
-        tokens = estimate_tokens(content)
-        logger.debug(f"[FILES] Returning error content for {file_path}: {tokens} tokens")
-        return content, tokens
+    candidate = _stat_file(file_path, max_size)
+    if candidate.content is not None:
+        logger.debug(f"[FILES] Returning error content for {file_path}: {candidate.tokens} tokens")
+        return candidate.content, candidate.tokens
 
-    try:
-        # Validate file existence and type
-        if not path.exists():
-            logger.debug(f"[FILES] File does not exist: {file_path}")
-            content = f"\n--- FILE NOT FOUND: {file_path} ---\nError: File does not exist\n--- END FILE ---\n"
-            return content, estimate_tokens(content)
-
-        if not path.is_file():
-            logger.debug(f"[FILES] Path is not a file: {file_path}")
-            content = f"\n--- NOT A FILE: {file_path} ---\nError: Path is not a file\n--- END FILE ---\n"
-            return content, estimate_tokens(content)
-
-        # Check file size to prevent memory exhaustion
-        file_size = path.stat().st_size
-        logger.debug(f"[FILES] File size for {file_path}: {file_size:,} bytes")
-        if file_size > max_size:
-            logger.debug(f"[FILES] File too large: {file_path} ({file_size:,} > {max_size:,} bytes)")
-            content = f"\n--- FILE TOO LARGE: {file_path} ---\nFile size: {file_size:,} bytes (max: {max_size:,})\n--- END FILE ---\n"
-            return content, estimate_tokens(content)
-
-        # Determine if we should add line numbers
-        add_line_numbers = should_add_line_numbers(file_path, include_line_numbers)
-        logger.debug(f"[FILES] Line numbers for {file_path}: {'enabled' if add_line_numbers else 'disabled'}")
-
-        # Read the file with UTF-8 encoding, replacing invalid characters
-        # This ensures we can handle files with mixed encodings
-        logger.debug(f"[FILES] Reading file content for {file_path}")
-        with open(path, encoding="utf-8", errors="replace") as f:
-            file_content = f.read()
-
-        logger.debug(f"[FILES] Successfully read {len(file_content)} characters from {file_path}")
-
-        # Add line numbers if requested or auto-detected
-        if add_line_numbers:
-            file_content = _add_line_numbers(file_content)
-            logger.debug(f"[FILES] Added line numbers to {file_path}")
-        else:
-            # Still normalize line endings for consistency
-            file_content = _normalize_line_endings(file_content)
-
-        # Format with clear delimiters that help the AI understand file boundaries
-        # Using consistent markers makes it easier for the model to parse
-        # NOTE: These markers ("--- BEGIN FILE: ... ---") are distinct from git diff markers
-        # ("--- BEGIN DIFF: ... ---") to allow AI to distinguish between complete file content
-        # vs. partial diff content when files appear in both sections
-        formatted = f"\n--- BEGIN FILE: {file_path} ---\n{file_content}\n--- END FILE: {file_path} ---\n"
-        tokens = estimate_tokens(formatted)
-        logger.debug(f"[FILES] Formatted content for {file_path}: {len(formatted)} chars, {tokens} tokens")
-        return formatted, tokens
+    logger.debug(f"[FILES] File size for {file_path}: {candidate.size:,} bytes")
 
-    except Exception as e:
-        logger.debug(f"[FILES] Exception reading file {file_path}: {type(e).__name__}: {e}")
-        content = f"\n--- ERROR READING FILE: {file_path} ---\nError: {str(e)}\n--- END FILE ---\n"
-        tokens = estimate_tokens(content)
-        logger.debug(f"[FILES] Returning error content for {file_path}: {tokens} tokens")
-        return content, tokens
+    # Determine if we should add line numbers
+    add_line_numbers = should_add_line_numbers(file_path, include_line_numbers)
+    logger.debug(f"[FILES] Line numbers for {file_path}: {'enabled' if add_line_numbers else 'disabled'}")
+
+    formatted, tokens = _read_candidate(candidate, add_line_numbers)
+    logger.debug(f"[FILES] Formatted content for {file_path}: {len(formatted)} chars, {tokens} tokens")
+    return formatted, tokens
+
+
+def _map_parallel(func, items: list) -> list:
+    """Run func over items on the shared read pool (inline for a single item)."""
+    if len(items) <= 1:
+        return [func(item) for item in items]
+    return list(_get_read_executor().map(func, items))
+
+
+def _read_files_within_budget(
+    all_files: list[str], budget: int, include_line_numbers: bool
+) -> tuple[list[str], int, list[str]]:
+    """
+    Read as many files as fit the token budget, in parallel, preserving order.
+
+    Candidates are stat-ed up front, then read in waves: each wave is the next
+    run of files in original order, sized by their byte-size estimates so it
+    roughly spends the remaining budget. Files are accepted in original order
+    by their actual token count and reading stops once the budget is spent,
+    so the result matches a sequential read. A file whose estimate exceeds
+    the remaining budget is still read and counted (estimates are not exact),
+    and ends its wave so later files are planned against the actual spend.
+
+    Returns:
+        (formatted parts in original order, tokens used, skipped file paths)
+    """
+    candidates = _map_parallel(lambda path: _stat_file(path, 1_000_000), all_files)
+    accepted: dict[int, str] = {}
+    used = 0
+    next_idx = 0
+
+    while next_idx < len(candidates) and used < budget:
+        # Plan the next run of files from byte-size estimates
+        wave = []
+        projected = used
+        for idx in range(next_idx, len(candidates)):
+            if projected >= budget:
+                break
+            wave.append(idx)
+            estimate = _estimate_candidate_tokens(candidates[idx], include_line_numbers)
+            if projected + estimate > budget:
+                # Boundary file: read it, but decide it before planning further
+                break
+            projected += estimate
+        next_idx = wave[-1] + 1
+
+        results = _map_parallel(lambda idx: _read_candidate(candidates[idx], include_line_numbers), wave)
+        for idx, (content, tokens) in zip(wave, results):
+            if used >= budget:
+                # Budget spent: a sequential read would not have read the rest of the wave
+                break
+            logger.debug(f"[FILES] File {all_files[idx]}: {tokens:,} tokens")
+            if used + tokens <= budget:
+                accepted[idx] = content
+                used += tokens
+            else:
+                # File too large for remaining budget
+                logger.debug(
+                    f"[FILES] File {all_files[idx]} too large for remaining budget ({tokens:,} tokens, {budget - used:,} remaining)"
+                )
+
+    skipped = [path for idx, path in enumerate(all_files) if idx not in accepted]
+    if skipped:
+        logger.debug(f"[FILES] Token budget exhausted or exceeded, skipping {len(skipped)} files")
+    return [accepted[idx] for idx in sorted(accepted)], used, skipped
 
 
 def read_files(
@@ -270,28 +456,12 @@ def read_files(
             logger.debug("[FILES] No files found from provided paths")
             content_parts.append(f"\n--- NO FILES FOUND ---\nProvided paths: {', '.join(file_paths)}\n--- END ---\n")
         else:
-            # Read files sequentially until token limit is reached
             logger.debug(f"[FILES] Reading {len(all_files)} files with token budget {available_tokens:,}")
-            for i, file_path in enumerate(all_files):
-                if total_tokens >= available_tokens:
-                    logger.debug(f"[FILES] Token budget exhausted, skipping remaining {len(all_files) - i} files")
-                    files_skipped.extend(all_files[i:])
-                    break
-
-                file_content, file_tokens = read_file_content(file_path, include_line_numbers=include_line_numbers)
-                logger.debug(f"[FILES] File {file_path}: {file_tokens:,} tokens")
-
-                # Check if adding this file would exceed limit
-                if total_tokens + file_tokens <= available_tokens:
-                    content_parts.append(file_content)
-                    total_tokens += file_tokens
-                    logger.debug(f"[FILES] Added file {file_path}, total tokens: {total_tokens:,}")
-                else:
-                    # File too large for remaining budget
-                    logger.debug(
-                        f"[FILES] File {file_path} too large for remaining budget ({file_tokens:,} tokens, {available_tokens - total_tokens:,} remaining)"
-                    )
-                    files_skipped.append(file_path)
+            file_parts, file_tokens, files_skipped = _read_files_within_budget(
+                all_files, available_tokens - total_tokens, include_line_numbers
+            )
+            content_parts.extend(file_parts)
+            total_tokens += file_tokens
 
     # Add informative note about skipped files to help users understand
     # what was omitted and why
@@ -5,6 +5,8 @@ Purpose:
 - Centralize httpx POST/GET JSON calls
 - Apply base URL and API key headers consistently
 - Keep dependency surface minimal (no proxies config)
+- Share the pooled keep-alive connection per provider origin
+  (utils/http_transport.py) instead of opening a private pool per instance
 """
 from __future__ import annotations
 
@@ -14,6 +16,8 @@ from typing import Any, Dict, Optional
 
 import httpx
 
+from utils.http_transport import get_transport_manager
+
 
 class HttpClient:
     def __init__(
@@ -35,7 +39,8 @@ class HttpClient:
         except Exception:
             _env_timeout = timeout
         self._timeout = _env_timeout
-        self._client = httpx.Client(timeout=self._timeout, follow_redirects=True)
+        # Shared per-origin pool; the timeout is applied per request
+        self._client = get_transport_manager().get_client(self.base_url)
 
     @property
     def client(self) -> httpx.Client:
@@ -60,20 +65,20 @@ class HttpClient:
 
     def post_json(self, path: str, payload: Any, *, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         url = self._url(path)
-        resp = self._client.post(url, headers=self._headers(headers), content=json.dumps(payload))
+        resp = self._client.post(url, headers=self._headers(headers), content=json.dumps(payload), timeout=self._timeout)
         resp.raise_for_status()
         # Some APIs may return empty body with 204; normalize to {}
         return resp.json() if resp.content else {}
 
     def get_json(self, path: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         url = self._url(path)
-        resp = self._client.get(url, headers=self._headers(headers), params=params)
+        resp = self._client.get(url, headers=self._headers(headers), params=params, timeout=self._timeout)
         resp.raise_for_status()
         return resp.json() if resp.content else {}
 
     def delete_json(self, path: str, *, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         url = self._url(path)
-        resp = self._client.delete(url, headers=self._headers(headers))
+        resp = self._client.delete(url, headers=self._headers(headers), timeout=self._timeout)
         resp.raise_for_status()
         return resp.json() if resp.content else {}
 
@@ -123,7 +128,7 @@ class HttpClient:
                 h["Accept"] = "text/event-stream"
         except Exception:
             pass
-        with self._client.stream("POST", url, headers=h, content=json.dumps(payload)) as resp:
+        with self._client.stream("POST", url, headers=h, content=json.dumps(payload), timeout=self._timeout) as resp:
             resp.raise_for_status()
             for chunk in resp.iter_text():
                 if not chunk:
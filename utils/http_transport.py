@@ -0,0 +1,559 @@
+"""
+Shared HTTP transport for provider clients.
+
+Every provider client (HttpClient, the OpenAI-compatible SDK clients used for
+Kimi and GLM, the async providers) used to build its own httpx client, so
+each one paid its own DNS lookup and TCP/TLS handshake and kept a private
+pool that nobody could see. This module owns one tuned keep-alive pool per
+origin (scheme://host:port) and hands out shared clients over it:
+
+- HTTP/2 when h2 is installed (PROVIDER_HTTP2), so concurrent calls to one
+  provider multiplex over a single connection
+- Long keep-alive (PROVIDER_HTTP_KEEPALIVE_EXPIRY) so connections survive
+  idle periods between tool calls; one SSLContext is shared by all pools
+  (CA bundle parsed once)
+- Async clients keep a separate pool per event loop, so a client created at
+  import time is safe to use from asyncio.run() / worker loops
+- warmup() opens connections at startup (src/daemon/warmup.py) and
+  keep_warm() can re-touch them periodically (PROVIDER_HTTP_KEEPWARM_INTERVAL)
+- Connection setup (TCP connect, TLS handshake) latency, new vs reused
+  connections and pool occupancy are tracked per origin and exported to
+  Prometheus (src/monitoring/metrics.py) and get_stats()
+
+Shared clients ignore close()/aclose() from their users; the pools are
+closed once, by close_transport_manager() at shutdown.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.infrastructure.latency_sketch import LatencySketch
+
+try:
+    import h2  # noqa: F401  # Enables HTTP/2 in httpx
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+try:
+    import certifi
+except ImportError:
+    certifi = None
+
+try:
+    from src.monitoring.metrics import (
+        record_provider_connection,
+        record_provider_request,
+        update_provider_pool,
+    )
+except ImportError:
+    record_provider_connection = record_provider_request = update_provider_pool = None
+
+logger = logging.getLogger(__name__)
+
+# Provider endpoints warmed at startup: (key env, URL envs, default URL), with
+# the same defaults as the registered providers (src/providers/kimi.py,
+# src/providers/glm_provider.py)
+_DEFAULT_PROVIDER_URLS = {
+    "KIMI": ("KIMI_API_KEY", ("KIMI_API_URL", "MOONSHOT_API_URL"), "https://api.moonshot.cn/v1/"),
+    "GLM": ("GLM_API_KEY", ("GLM_API_URL",), "https://open.bigmodel.cn/api/paas/v4/"),
+}
+
+
+def origin_of(url: str) -> str:
+    """Normalize a URL to its origin (scheme://host:port) - the pool key."""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = (parts.scheme or "https").lower()
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{(parts.hostname or '').lower()}:{port}"
+
+
+def configured_provider_urls() -> List[str]:
+    """Base URLs of the providers that have an API key configured."""
+    urls = []
+    for key_env, url_envs, default in _DEFAULT_PROVIDER_URLS.values():
+        if not os.getenv(key_env):
+            continue
+        urls.append(next((os.getenv(e) for e in url_envs if os.getenv(e)), default))
+    return urls
+
+
+class _OriginStats:
+    """Connection-level counters for one origin (guarded by the manager lock)."""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.connect_errors = 0
+        self.setup_ms = LatencySketch()
+        self.tcp_ms = LatencySketch()
+        self.tls_ms = LatencySketch()
+        self.last_new_connection: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p95, p99 = self.setup_ms.quantiles((0.50, 0.95, 0.99))
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": max(0, self.requests - self.new_connections),
+            "reuse_ratio": round(1 - self.new_connections / self.requests, 3) if self.requests else 0.0,
+            "connect_errors": self.connect_errors,
+            "setup_ms": {"p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1),
+                         "mean": round(self.setup_ms.mean, 1),
+                         "max": round(self.setup_ms.max, 1) if self.setup_ms.count else 0.0},
+            "tcp_ms_mean": round(self.tcp_ms.mean, 1),
+            "tls_ms_mean": round(self.tls_ms.mean, 1),
+            "last_new_connection": self.last_new_connection,
+        }
+
+
+class _ConnectionTrace:
+    """
+    httpcore trace callback for one request.
+
+    httpcore reports connection.connect_tcp / connection.start_tls events only
+    when the request opens a new connection, so their presence tells a cold
+    request from a reused one.
+    """
+
+    __slots__ = ("manager", "origin", "_started", "tcp_ms", "tls_ms")
+
+    def __init__(self, manager: "ProviderTransportManager", origin: str):
+        self.manager = manager
+        self.origin = origin
+        self._started: Dict[str, float] = {}
+        self.tcp_ms: Optional[float] = None
+        self.tls_ms: Optional[float] = None
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        if name.endswith(".started"):
+            self._started[name[:-8]] = time.perf_counter()
+            return
+        phase, _, outcome = name.rpartition(".")
+        started = self._started.pop(phase, None)
+        if phase.endswith("connect_tcp"):
+            if outcome == "failed":
+                self.manager._record_connect_error(self.origin)
+            elif started is not None:
+                self.tcp_ms = (time.perf_counter() - started) * 1000
+        elif phase.endswith("start_tls") and outcome == "complete" and started is not None:
+            self.tls_ms = (time.perf_counter() - started) * 1000
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        self(name, info)
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """Async transport that keeps one connection pool per running event loop."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _current(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = self._factory()
+            return transport
+
+    def transports(self) -> List[httpx.AsyncHTTPTransport]:
+        with self._lock:
+            return list(self._transports.values())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._current().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # Pools of other loops can only be closed from their own loop; they are
+        # dropped here and their sockets are released with the loop
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            transports, self._transports = dict(self._transports), weakref.WeakKeyDictionary()
+        if loop in transports:
+            await transports[loop].aclose()
+
+
+class _SharedClient(httpx.Client):
+    """Pooled client shared by several providers; only the manager closes it."""
+
+    def close(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def _close_shared(self) -> None:
+        super().close()
+
+
+class _SharedAsyncClient(httpx.AsyncClient):
+    """Pooled async client shared by several providers; only the manager closes it."""
+
+    async def aclose(self) -> None:
+        pass
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def _aclose_shared(self) -> None:
+        await super().aclose()
+
+
+class ProviderTransportManager:
+    """
+    Owns the pooled provider clients, keyed by origin.
+
+    Args:
+        max_connections: Pool size per origin (and per event loop for async clients)
+        max_keepalive: Idle connections kept open per origin
+        keepalive_expiry: Seconds an idle connection is kept
+        http2: Negotiate HTTP/2 (requires h2)
+        connect_retries: Retries of failed connection attempts (never of requests)
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        connect_retries: Optional[int] = None,
+    ):
+        self.max_connections = max_connections or int(os.getenv("PROVIDER_HTTP_MAX_CONNECTIONS", "100"))
+        self.max_keepalive = max_keepalive or int(os.getenv("PROVIDER_HTTP_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = keepalive_expiry or float(os.getenv("PROVIDER_HTTP_KEEPALIVE_EXPIRY", "120"))
+        if http2 is None:
+            http2 = os.getenv("PROVIDER_HTTP2", "true").strip().lower() in ("1", "true", "yes")
+        self.http2 = http2 and _HTTP2_AVAILABLE
+        self.connect_retries = (
+            connect_retries if connect_retries is not None
+            else int(os.getenv("PROVIDER_HTTP_CONNECT_RETRIES", "2"))
+        )
+        self.default_timeout = httpx.Timeout(
+            float(os.getenv("EX_HTTP_TIMEOUT_SECONDS", "300")),
+            connect=float(os.getenv("PROVIDER_HTTP_CONNECT_TIMEOUT", "10")),
+        )
+
+        self._clients: Dict[Tuple[str, bool], _SharedClient] = {}
+        self._async_clients: Dict[Tuple[str, bool], _SharedAsyncClient] = {}
+        self._stats: Dict[str, _OriginStats] = {}
+        self._lock = threading.Lock()
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._keep_warm_task: Optional[asyncio.Task] = None
+
+    # ========================================================================
+    # CLIENTS
+    # ========================================================================
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            cafile = os.getenv("SSL_CERT_FILE") or (certifi.where() if certifi else None)
+            self._ssl_context = ssl.create_default_context(cafile=cafile)
+        return self._ssl_context
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _stats_for(self, origin: str) -> _OriginStats:
+        stats = self._stats.get(origin)
+        if stats is None:
+            stats = self._stats[origin] = _OriginStats()
+        return stats
+
+    def get_client(self, base_url: str, *, trust_env: bool = True) -> httpx.Client:
+        """
+        Shared sync client for a provider base URL.
+
+        Callers pass full URLs (or use an SDK that does) and per-request
+        timeouts; the client itself carries no base_url or auth headers.
+
+        Args:
+            base_url: Any URL on the provider's origin
+            trust_env: Honour proxy environment variables (False for clients
+                that must bypass proxies)
+        """
+        key = (origin_of(base_url), trust_env)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                origin = key[0]
+                self._stats_for(origin)
+                client = self._clients[key] = _SharedClient(
+                    transport=httpx.HTTPTransport(
+                        verify=self._get_ssl_context(),
+                        http2=self.http2,
+                        limits=self._limits(),
+                        retries=self.connect_retries,
+                        trust_env=trust_env,
+                    ),
+                    timeout=self.default_timeout,
+                    follow_redirects=True,
+                    trust_env=trust_env,
+                    event_hooks={
+                        "request": [lambda request: self._on_request(origin, request)],
+                        "response": [lambda response: self._on_response(origin, response)],
+                    },
+                )
+                logger.info(f"[TRANSPORT] Pool created for {origin} (http2={self.http2}, "
+                            f"max_connections={self.max_connections}, keepalive={self.keepalive_expiry}s)")
+        return client
+
+    def get_async_client(self, base_url: str, *, trust_env: bool = True) -> httpx.AsyncClient:
+        """
+        Shared async client for a provider base URL.
+
+        Safe to create outside a running loop: each event loop that uses the
+        client gets its own pool.
+        """
+        key = (origin_of(base_url), trust_env)
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None:
+                origin = key[0]
+                self._stats_for(origin)
+
+                async def on_request(request):
+                    self._on_request(origin, request, asynchronous=True)
+
+                async def on_response(response):
+                    self._on_response(origin, response)
+
+                client = self._async_clients[key] = _SharedAsyncClient(
+                    transport=_LoopLocalTransport(lambda: httpx.AsyncHTTPTransport(
+                        verify=self._get_ssl_context(),
+                        http2=self.http2,
+                        limits=self._limits(),
+                        retries=self.connect_retries,
+                        trust_env=trust_env,
+                    )),
+                    timeout=self.default_timeout,
+                    follow_redirects=True,
+                    trust_env=trust_env,
+                    event_hooks={"request": [on_request], "response": [on_response]},
+                )
+                logger.info(f"[TRANSPORT] Async pool created for {origin} (http2={self.http2}, "
+                            f"max_connections={self.max_connections}, keepalive={self.keepalive_expiry}s)")
+        return client
+
+    # ========================================================================
+    # INSTRUMENTATION
+    # ========================================================================
+
+    def _on_request(self, origin: str, request: httpx.Request, asynchronous: bool = False) -> None:
+        if "trace" in request.extensions:
+            return  # Caller traces itself
+        trace = _ConnectionTrace(self, origin)
+        request.extensions["trace"] = trace.atrace if asynchronous else trace
+
+    def _on_response(self, origin: str, response: httpx.Response) -> None:
+        trace = response.request.extensions.get("trace")
+        trace = getattr(trace, "__self__", trace)
+        if not isinstance(trace, _ConnectionTrace):
+            return
+        new_connection = trace.tcp_ms is not None
+        with self._lock:
+            stats = self._stats_for(origin)
+            stats.requests += 1
+            if new_connection:
+                setup_ms = trace.tcp_ms + (trace.tls_ms or 0.0)
+                stats.new_connections += 1
+                stats.last_new_connection = time.time()
+                stats.setup_ms.record(setup_ms)
+                stats.tcp_ms.record(trace.tcp_ms)
+                if trace.tls_ms is not None:
+                    stats.tls_ms.record(trace.tls_ms)
+        if new_connection:
+            logger.debug(f"[TRANSPORT] New connection to {origin}: tcp={trace.tcp_ms:.1f}ms"
+                         + (f" tls={trace.tls_ms:.1f}ms" if trace.tls_ms is not None else ""))
+        try:
+            if record_provider_request is not None:
+                record_provider_request(origin, reused=not new_connection)
+            if new_connection and record_provider_connection is not None:
+                record_provider_connection(origin, trace.tcp_ms / 1000,
+                                           None if trace.tls_ms is None else trace.tls_ms / 1000)
+            if update_provider_pool is not None:
+                occupancy = self.pool_occupancy(origin)
+                update_provider_pool(origin, occupancy["active"], occupancy["idle"])
+        except Exception as e:
+            logger.debug(f"[TRANSPORT] Failed to export metrics for {origin}: {e}")
+
+    def _record_connect_error(self, origin: str) -> None:
+        with self._lock:
+            self._stats_for(origin).connect_errors += 1
+
+    def _pools(self, origin: str) -> Iterable[Any]:
+        with self._lock:
+            transports = [c._transport for (o, _), c in self._clients.items() if o == origin]
+            for (o, _), client in self._async_clients.items():
+                if o == origin:
+                    transports.extend(client._transport.transports())
+        for transport in transports:
+            pool = getattr(transport, "_pool", None)
+            if pool is not None:
+                yield pool
+
+    def pool_occupancy(self, origin: str) -> Dict[str, int]:
+        """Open connections for an origin across its pools, split active/idle."""
+        active = idle = 0
+        for pool in self._pools(origin):
+            for connection in list(getattr(pool, "connections", ())):
+                try:
+                    if connection.is_closed():
+                        continue
+                    if connection.is_idle():
+                        idle += 1
+                    else:
+                        active += 1
+                except Exception:
+                    continue
+        return {"active": active, "idle": idle}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-origin connection reuse, setup latency and pool occupancy."""
+        with self._lock:
+            origins = {origin: stats.to_dict() for origin, stats in self._stats.items()}
+        for origin, stats in origins.items():
+            stats["pool"] = dict(self.pool_occupancy(origin), max_connections=self.max_connections)
+        return {
+            "http2": self.http2,
+            "keepalive_expiry": self.keepalive_expiry,
+            "origins": origins,
+        }
+
+    # ========================================================================
+    # WARMUP
+    # ========================================================================
+
+    async def _touch(self, url: str) -> Tuple[str, Optional[float]]:
+        """Open (or reuse) a connection to url's origin; any HTTP status counts."""
+        origin = origin_of(url)
+        started = time.perf_counter()
+        try:
+            await self.get_async_client(url).head(url, timeout=httpx.Timeout(10.0))
+        except httpx.HTTPError as e:
+            logger.warning(f"[TRANSPORT] Warmup of {origin} failed: {e}")
+            return origin, None
+        return origin, (time.perf_counter() - started) * 1000
+
+    async def warmup(self, urls: Optional[Iterable[str]] = None, include_sync: bool = True) -> Dict[str, Optional[float]]:
+        """
+        Establish connections to provider origins ahead of the first call.
+
+        Args:
+            urls: URLs to warm (default: configured providers plus every origin
+                that already has a pool)
+            include_sync: Also warm the sync pools (used from worker threads)
+
+        Returns:
+            Origin -> warmup round-trip in ms (None if it failed)
+        """
+        if urls is None:
+            with self._lock:
+                known = [origin for origin, _ in list(self._clients) + list(self._async_clients)]
+            urls = configured_provider_urls() + known
+        targets = {origin_of(u): u for u in urls}
+
+        def touch_sync(url: str) -> None:
+            try:
+                self.get_client(url).head(url, timeout=httpx.Timeout(10.0))
+            except httpx.HTTPError:
+                pass  # Reported by the async touch
+
+        tasks = [self._touch(url) for url in targets.values()]
+        if include_sync:
+            tasks += [asyncio.to_thread(touch_sync, url) for url in targets.values()]
+        results = await asyncio.gather(*tasks)
+        timings = {origin: ms for origin, ms in results[:len(targets)]}
+        for origin, ms in timings.items():
+            if ms is not None:
+                logger.info(f"[TRANSPORT] Warmed {origin} ({ms:.0f}ms)")
+        return timings
+
+    async def keep_warm(self, interval: float) -> None:
+        """Re-touch known origins every interval seconds so connections outlive idle periods."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.warmup(include_sync=False)
+            except Exception as e:
+                logger.debug(f"[TRANSPORT] Keep-warm pass failed: {e}")
+
+    def start_keep_warm(self, interval: Optional[float] = None) -> Optional[asyncio.Task]:
+        """Start keep_warm() on the running loop (PROVIDER_HTTP_KEEPWARM_INTERVAL, 0 = off)."""
+        if interval is None:
+            interval = float(os.getenv("PROVIDER_HTTP_KEEPWARM_INTERVAL", "0"))
+        if interval <= 0 or (self._keep_warm_task and not self._keep_warm_task.done()):
+            return self._keep_warm_task
+        self._keep_warm_task = asyncio.get_running_loop().create_task(self.keep_warm(interval))
+        return self._keep_warm_task
+
+    # ========================================================================
+    # SHUTDOWN
+    # ========================================================================
+
+    async def aclose(self) -> None:
+        """Close every pool (daemon shutdown)."""
+        if self._keep_warm_task is not None:
+            self._keep_warm_task.cancel()
+            self._keep_warm_task = None
+        with self._lock:
+            clients, self._clients = self._clients, {}
+            async_clients, self._async_clients = self._async_clients, {}
+        for client in clients.values():
+            client._close_shared()
+        for client in async_clients.values():
+            await client._aclose_shared()
+
+
+_transport_manager: Optional[ProviderTransportManager] = None
+_transport_manager_lock = threading.Lock()
+
+
+def get_transport_manager() -> ProviderTransportManager:
+    """Get the process-wide provider transport manager."""
+    global _transport_manager
+    if _transport_manager is None:
+        with _transport_manager_lock:
+            if _transport_manager is None:
+                _transport_manager = ProviderTransportManager()
+    return _transport_manager
+
+
+async def close_transport_manager() -> None:
+    """Close all provider pools (daemon shutdown)."""
+    global _transport_manager
+    with _transport_manager_lock:
+        manager, _transport_manager = _transport_manager, None
+    if manager is not None:
+        await manager.aclose()
+
+
+__all__ = [
+    "ProviderTransportManager",
+    "configured_provider_urls",
+    "origin_of",
+    "get_transport_manager",
+    "close_transport_manager",
+]
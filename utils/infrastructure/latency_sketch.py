@@ -0,0 +1,277 @@
+"""
+Mergeable Latency Sketches
+
+DDSketch-style histograms for latency percentiles with constant memory:
+
+- Values are mapped to logarithmic buckets so that every reported quantile
+  is within a relative error `alpha` (default 1%) of the true value.
+- Buckets live in a fixed array covering [min_trackable, max_trackable]
+  (values outside are clamped), so record() is O(1) and memory does not
+  grow with the number of samples.
+- Sketches with the same parameters merge by adding bucket counts, which
+  makes them combinable across processes (via to_dict/from_dict) and across
+  time windows (WindowedLatencySketch).
+
+Used by utils.infrastructure.performance_metrics for per-tool p50/p95/p99.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+_DEFAULT_ALPHA = 0.01
+_DEFAULT_MIN_MS = 0.01
+_DEFAULT_MAX_MS = 24 * 3600 * 1000.0  # One day
+
+
+class LatencySketch:
+    """
+    Fixed-size logarithmic histogram with relative-error quantiles.
+
+    Args:
+        alpha: Relative accuracy of quantiles (0 < alpha < 1)
+        min_trackable: Smallest distinguishable value; smaller values (incl. 0) share one bucket
+        max_trackable: Largest distinguishable value; larger values are clamped into the last bucket
+    """
+
+    __slots__ = ("alpha", "min_trackable", "max_trackable", "_gamma_log", "_offset",
+                 "_size", "_counts", "zero_count", "count", "total", "min", "max")
+
+    def __init__(
+        self,
+        alpha: float = _DEFAULT_ALPHA,
+        min_trackable: float = _DEFAULT_MIN_MS,
+        max_trackable: float = _DEFAULT_MAX_MS,
+    ):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alpha must be in (0, 1), got {alpha}")
+        if not 0 < min_trackable < max_trackable:
+            raise ValueError("expected 0 < min_trackable < max_trackable")
+        self.alpha = alpha
+        self.min_trackable = min_trackable
+        self.max_trackable = max_trackable
+        self._gamma_log = math.log((1 + alpha) / (1 - alpha))
+        self._offset = self._key(min_trackable)
+        self._size = self._key(max_trackable) - self._offset + 1
+        self._counts: Optional[array] = None  # Allocated on first non-zero value
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._gamma_log)
+
+    def _value(self, index: int) -> float:
+        """Representative value of a bucket (relative error <= alpha for all values in it)."""
+        key = index + self._offset
+        return 2 * math.exp(key * self._gamma_log) / (1 + math.exp(self._gamma_log))
+
+    # Recording ---------------------------------------------------------
+
+    def record(self, value: float) -> None:
+        """Add one sample (O(1))."""
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        index = self.bucket_index(value)
+        if index is None:
+            self.zero_count += 1
+            return
+        if self._counts is None:
+            self._counts = array("Q", bytes(8 * self._size))
+        self._counts[index] += 1
+
+    def bucket_index(self, value: float) -> Optional[int]:
+        """Array index a value is counted in, or None for the below-min_trackable bucket."""
+        if value < self.min_trackable:
+            return None
+        return self._key(min(value, self.max_trackable)) - self._offset
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        """Add another sketch's samples into this one (in place); returns self."""
+        if (other.alpha, other.min_trackable, other.max_trackable) != (
+            self.alpha, self.min_trackable, self.max_trackable
+        ):
+            raise ValueError("cannot merge sketches with different parameters")
+        if other.count == 0:
+            return self
+        if other._counts is not None:
+            if self._counts is None:
+                self._counts = array("Q", other._counts)
+            else:
+                counts = self._counts
+                for i, c in enumerate(other._counts):
+                    if c:
+                        counts[i] += c
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def copy(self) -> "LatencySketch":
+        return self.empty_like().merge(self)
+
+    def empty_like(self) -> "LatencySketch":
+        return LatencySketch(self.alpha, self.min_trackable, self.max_trackable)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # Queries -----------------------------------------------------------
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """
+        Return the values at quantiles `qs` (each in [0, 1]) in one pass.
+
+        Results are clamped to the exact observed min/max, so q=0 and q=1
+        are exact. Returns 0.0 for every quantile of an empty sketch.
+        """
+        qs = list(qs)
+        if self.count == 0:
+            return [0.0] * len(qs)
+
+        # Rank (0-based) of each requested quantile, visited in ascending order
+        order = sorted(range(len(qs)), key=lambda i: qs[i])
+        results = [0.0] * len(qs)
+        pos = 0
+        cumulative = self.zero_count
+        while pos < len(order) and qs[order[pos]] * (self.count - 1) < cumulative:
+            results[order[pos]] = self.min
+            pos += 1
+        if pos < len(order) and self._counts is not None:
+            for index, c in enumerate(self._counts):
+                if not c:
+                    continue
+                cumulative += c
+                while pos < len(order) and qs[order[pos]] * (self.count - 1) < cumulative:
+                    results[order[pos]] = self._value(index)
+                    pos += 1
+                if pos == len(order):
+                    break
+        while pos < len(order):
+            results[order[pos]] = self.max
+            pos += 1
+        results = [self.min if q <= 0 else self.max if q >= 1 else v for q, v in zip(qs, results)]
+        return [min(max(v, self.min), self.max) for v in results]
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    # Serialization -----------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (sparse bucket counts) for cross-process merging."""
+        counts = {}
+        if self._counts is not None:
+            counts = {str(i): c for i, c in enumerate(self._counts) if c}
+        return {
+            "alpha": self.alpha,
+            "min_trackable": self.min_trackable,
+            "max_trackable": self.max_trackable,
+            "counts": counts,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        sketch = cls(data["alpha"], data["min_trackable"], data["max_trackable"])
+        if data.get("counts"):
+            sketch._counts = array("Q", bytes(8 * sketch._size))
+            for index, c in data["counts"].items():
+                sketch._counts[int(index)] = c
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+    @classmethod
+    def from_counts(cls, counts: Dict[int, int], zero_count: int = 0, **kwargs) -> "LatencySketch":
+        """
+        Build a sketch from bucket counts only (e.g. counts accumulated elsewhere
+        with bucket_index). Exact min/max/total are unknown, so min/max are
+        approximated by the outermost non-empty buckets and total by bucket values.
+        """
+        sketch = cls(**kwargs)
+        counts = {int(i): int(c) for i, c in counts.items() if int(c) > 0}
+        sketch.zero_count = zero_count
+        sketch.count = zero_count + sum(counts.values())
+        if counts:
+            sketch._counts = array("Q", bytes(8 * sketch._size))
+            for index, c in counts.items():
+                sketch._counts[index] = c
+            sketch.total = sum(sketch._value(i) * c for i, c in counts.items())
+            sketch.max = sketch._value(max(counts))
+            sketch.min = 0.0 if zero_count else sketch._value(min(counts))
+        elif zero_count:
+            sketch.min = sketch.max = 0.0
+        return sketch
+
+
+class WindowedLatencySketch:
+    """
+    Sliding time window of latency sketches.
+
+    The window is split into `slots` sub-sketches of window_seconds/slots
+    each; recording goes to the current slot and expired slots are reset,
+    so memory stays constant. snapshot() merges the live slots.
+
+    Args:
+        window_seconds: Length of the window
+        slots: Number of sub-sketches (window granularity)
+        clock: Time source (for tests)
+    """
+
+    def __init__(self, window_seconds: float = 300.0, slots: int = 5, clock=time.monotonic, **sketch_kwargs):
+        self.window_seconds = window_seconds
+        self.slots = max(1, slots)
+        self._slot_seconds = window_seconds / self.slots
+        self._clock = clock
+        self._sketches = [LatencySketch(**sketch_kwargs) for _ in range(self.slots)]
+        self._epochs = [-1] * self.slots  # Slot-interval number each sketch holds
+
+    def _slot(self, now: float) -> LatencySketch:
+        epoch = int(now // self._slot_seconds)
+        i = epoch % self.slots
+        if self._epochs[i] != epoch:
+            self._sketches[i] = self._sketches[i].empty_like()
+            self._epochs[i] = epoch
+        return self._sketches[i]
+
+    def record(self, value: float) -> None:
+        self._slot(self._clock()).record(value)
+
+    def snapshot(self) -> LatencySketch:
+        """Merged sketch of all samples within the window."""
+        current = int(self._clock() // self._slot_seconds)
+        merged = self._sketches[0].empty_like()
+        for epoch, sketch in zip(self._epochs, self._sketches):
+            if current - self.slots < epoch <= current:
+                merged.merge(sketch)
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.snapshot())
+
+
+__all__ = ["LatencySketch", "WindowedLatencySketch"]
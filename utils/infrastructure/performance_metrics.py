@@ -8,7 +8,8 @@ This module provides detailed performance tracking for:
 - System-wide metrics (sessions, concurrent requests, memory)
 
 Features:
-- Percentile calculations (p50, p95, p99) using sliding windows
+- Percentile calculations (p50, p95, p99) from mergeable latency sketches
+  over a sliding time window (constant memory per tool)
 - Thread-safe metric collection
 - JSON metrics endpoint for real-time monitoring
 - Integration with existing Prometheus metrics
@@ -23,15 +24,17 @@ import time
 import threading
 import logging
 from typing import Dict, List, Any, Optional
-from collections import deque, defaultdict
+from collections import defaultdict
 from dataclasses import dataclass, field, asdict
-import statistics
+
+from utils.infrastructure.latency_sketch import LatencySketch, WindowedLatencySketch
 
 logger = logging.getLogger(__name__)
 
 # Environment configuration
 _ENABLED = os.getenv("PERFORMANCE_METRICS_ENABLED", "true").lower() == "true"
-_WINDOW_SIZE = int(os.getenv("METRICS_WINDOW_SIZE", "1000"))
+_WINDOW_SECONDS = float(os.getenv("METRICS_WINDOW_SECONDS", "300"))
+_WINDOW_SLOTS = int(os.getenv("METRICS_WINDOW_SLOTS", "5"))
 _JSON_ENDPOINT_ENABLED = os.getenv("METRICS_JSON_ENDPOINT_ENABLED", "true").lower() == "true"
 
 
@@ -43,7 +46,12 @@ class ToolMetrics:
     successful_calls: int = 0
     failed_calls: int = 0
     total_latency_ms: float = 0.0
-    latency_samples: deque = field(default_factory=lambda: deque(maxlen=_WINDOW_SIZE))
+    # Sketch of latencies in the recent window (len() = samples in window)
+    latency_samples: WindowedLatencySketch = field(
+        default_factory=lambda: WindowedLatencySketch(_WINDOW_SECONDS, _WINDOW_SLOTS)
+    )
+    # Sketch of all latencies since start/reset
+    latency_lifetime: LatencySketch = field(default_factory=LatencySketch)
     error_types: Dict[str, int] = field(default_factory=dict)
     
     def record_call(self, success: bool, latency_ms: float, error_type: Optional[str] = None):
@@ -57,40 +65,21 @@ class ToolMetrics:
                 self.error_types[error_type] = self.error_types.get(error_type, 0) + 1
         
         self.total_latency_ms += latency_ms
-        self.latency_samples.append(latency_ms)
+        self.latency_samples.record(latency_ms)
+        self.latency_lifetime.record(latency_ms)
+    
+    def export_sketches(self) -> Dict[str, Any]:
+        """Serialized window/lifetime sketches, mergeable across processes."""
+        return {
+            "window": self.latency_samples.snapshot().to_dict(),
+            "lifetime": self.latency_lifetime.to_dict(),
+        }
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get statistics for this tool."""
-        if not self.latency_samples:
-            return {
-                "tool_name": self.tool_name,
-                "total_calls": self.total_calls,
-                "successful_calls": self.successful_calls,
-                "failed_calls": self.failed_calls,
-                "success_rate": 0.0,
-                "avg_latency_ms": 0.0,
-                "p50_latency_ms": 0.0,
-                "p95_latency_ms": 0.0,
-                "p99_latency_ms": 0.0,
-                "min_latency_ms": 0.0,
-                "max_latency_ms": 0.0,
-                "error_types": self.error_types
-            }
-        
-        samples = list(self.latency_samples)
+        """Get statistics for this tool (percentiles/min/max over the recent window)."""
+        window = self.latency_samples.snapshot()
         success_rate = (self.successful_calls / self.total_calls * 100) if self.total_calls > 0 else 0.0
-        
-        # Calculate percentiles
-        try:
-            if len(samples) >= 2:
-                p50, p95, p99 = statistics.quantiles(samples, n=100, method='inclusive')
-                p50 = samples[49] if len(samples) > 49 else samples[len(samples)//2]
-                p95 = samples[94] if len(samples) > 94 else samples[-1]
-                p99 = samples[98] if len(samples) > 98 else samples[-1]
-            else:
-                p50 = p95 = p99 = samples[0]
-        except Exception:
-            p50 = p95 = p99 = statistics.median(samples) if samples else 0.0
+        p50, p95, p99 = window.quantiles((0.50, 0.95, 0.99))
         
         return {
             "tool_name": self.tool_name,
@@ -102,8 +91,11 @@ class ToolMetrics:
             "p50_latency_ms": round(p50, 2),
             "p95_latency_ms": round(p95, 2),
             "p99_latency_ms": round(p99, 2),
-            "min_latency_ms": round(min(samples), 2),
-            "max_latency_ms": round(max(samples), 2),
+            "min_latency_ms": round(window.min, 2) if window.count else 0.0,
+            "max_latency_ms": round(window.max, 2) if window.count else 0.0,
+            "window_calls": window.count,
+            "window_seconds": self.latency_samples.window_seconds,
+            "lifetime_p99_latency_ms": round(self.latency_lifetime.quantile(0.99), 2),
             "error_types": dict(self.error_types)
         }
 
@@ -188,7 +180,7 @@ class PerformanceMetricsCollector:
             "start_time": time.time()
         }
         
-        logger.info(f"Performance metrics collector initialized (enabled={self._enabled}, window_size={_WINDOW_SIZE})")
+        logger.info(f"Performance metrics collector initialized (enabled={self._enabled}, window_seconds={_WINDOW_SECONDS})")
     
     def is_enabled(self) -> bool:
         """Check if metrics collection is enabled."""
@@ -220,6 +212,24 @@ class PerformanceMetricsCollector:
             
             return {name: metrics.get_stats() for name, metrics in self._tool_metrics.items()}
     
+    def get_latency_sketches(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get serialized latency sketches per tool.
+        
+        Sketches from several processes can be combined with merge_latency_sketches
+        to compute fleet-wide percentiles.
+        """
+        with self._lock:
+            return {name: metrics.export_sketches() for name, metrics in self._tool_metrics.items()}
+    
+    def get_overall_latency(self) -> LatencySketch:
+        """Merged recent-window latency sketch across all tools."""
+        with self._lock:
+            merged = LatencySketch()
+            for metrics in self._tool_metrics.values():
+                merged.merge(metrics.latency_samples.snapshot())
+            return merged
+    
     # ================================================================================
     # Cache Metrics
     # ================================================================================
@@ -358,6 +368,28 @@ def get_all_metrics() -> Dict[str, Any]:
     return _collector.get_all_metrics()
 
 
+def merge_latency_sketches(exports: List[Dict[str, Dict[str, Any]]], kind: str = "window") -> Dict[str, LatencySketch]:
+    """
+    Merge per-tool sketches exported by several processes (get_latency_sketches()).
+    
+    Args:
+        exports: One get_latency_sketches() result per process
+        kind: "window" or "lifetime"
+    
+    Returns:
+        Dict of tool name -> merged LatencySketch
+    """
+    merged: Dict[str, LatencySketch] = {}
+    for export in exports:
+        for tool_name, sketches in export.items():
+            sketch = LatencySketch.from_dict(sketches[kind])
+            if tool_name in merged:
+                merged[tool_name].merge(sketch)
+            else:
+                merged[tool_name] = sketch
+    return merged
+
+
 def get_collector() -> PerformanceMetricsCollector:
     """Get the global collector instance."""
     return _collector
@@ -154,35 +154,17 @@ class SemanticCacheManager(BaseCacheManager):
         # Generate hash
         return hashlib.sha256(cache_str.encode()).hexdigest()
     
-    def get(
+    def _prepare_get(
         self,
-        prompt: Optional[str] = None,
-        model: Optional[str] = None,
-        temperature: Optional[float] = None,
-        thinking_mode: Optional[str] = None,
-        use_websearch: bool = False,
-        system_prompt_hash: Optional[str] = None,
-        **kwargs
-    ) -> Optional[Any]:
-        """
-        Get cached response if available and not expired.
-
-        This method supports TWO calling conventions:
-        1. Direct: get(prompt="...", model="glm-4.5", temperature=0.5)
-        2. Dict unpacking: get(**{'prompt': '...', 'model': 'glm-4.5', 'temperature': 0.5})
-
-        Args:
-            prompt: The prompt text (can be None if passed via kwargs)
-            model: Model name (can be None if passed via kwargs)
-            temperature: Temperature value
-            thinking_mode: Thinking mode
-            use_websearch: Whether web search is enabled
-            system_prompt_hash: Hash of system prompt
-            **kwargs: Additional parameters (also used for prompt/model if not passed directly)
-
-        Returns:
-            Cached response if available, None otherwise
-        """
+        prompt: Optional[str],
+        model: Optional[str],
+        temperature: Optional[float],
+        thinking_mode: Optional[str],
+        use_websearch: bool,
+        system_prompt_hash: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Resolve get() arguments (both calling conventions) into a cache key, or None to skip."""
         # Handle both calling conventions
         # If prompt is None, try to extract from kwargs (dict unpacking)
         if prompt is None:
@@ -205,16 +187,13 @@ class SemanticCacheManager(BaseCacheManager):
             logger.debug(f"[SEMANTIC_CACHE] No model provided for prompt, skipping cache")
             return None
 
-        # Start timing for metrics (Week 2-3 Monitoring Phase - 2025-10-31)
-        start_time = time.time()
-
-        cache_key = self._generate_cache_key(
+        return self._generate_cache_key(
             prompt, model, temperature, thinking_mode, use_websearch,
             system_prompt_hash, **kwargs
         )
 
-        result = super().get(cache_key)
-
+    def _record_get(self, cache_key: str, result: Optional[Any], start_time: float) -> None:
+        """Record hit/miss metrics for a lookup."""
         # Calculate response time
         response_time_ms = int((time.time() - start_time) * 1000)
         cache_size = self._l1_cache.currsize if hasattr(self._l1_cache, 'currsize') else 0
@@ -233,7 +212,7 @@ class SemanticCacheManager(BaseCacheManager):
                     cache_size=cache_size
                 )
 
-            logger.debug(f"Semantic cache HIT for model={model} (key={cache_key[:8]}..., {response_time_ms}ms)")
+            logger.debug(f"Semantic cache HIT (key={cache_key[:8]}..., {response_time_ms}ms)")
         else:
             if _METRICS_AVAILABLE:
                 record_cache_miss("semantic_cache")
@@ -247,40 +226,88 @@ class SemanticCacheManager(BaseCacheManager):
                     cache_size=cache_size
                 )
 
-            logger.debug(f"Semantic cache MISS for model={model} (key={cache_key[:8]}..., {response_time_ms}ms)")
+            logger.debug(f"Semantic cache MISS (key={cache_key[:8]}..., {response_time_ms}ms)")
 
-        return result
-    
-    def set(
+    def get(
         self,
         prompt: Optional[str] = None,
         model: Optional[str] = None,
-        response: Optional[Any] = None,
         temperature: Optional[float] = None,
         thinking_mode: Optional[str] = None,
         use_websearch: bool = False,
         system_prompt_hash: Optional[str] = None,
-        ttl_override: Optional[int] = None,
         **kwargs
-    ) -> None:
+    ) -> Optional[Any]:
         """
-        Cache a response with TTL.
+        Get cached response if available and not expired.
 
         This method supports TWO calling conventions:
-        1. Direct: set(prompt="...", model="glm-4.5", response=..., temperature=0.5)
-        2. Dict unpacking: set(**{'prompt': '...', 'model': 'glm-4.5', 'response': ..., 'temperature': 0.5})
+        1. Direct: get(prompt="...", model="glm-4.5", temperature=0.5)
+        2. Dict unpacking: get(**{'prompt': '...', 'model': 'glm-4.5', 'temperature': 0.5})
 
         Args:
             prompt: The prompt text (can be None if passed via kwargs)
             model: Model name (can be None if passed via kwargs)
-            response: The response to cache (can be None if passed via kwargs)
             temperature: Temperature value
             thinking_mode: Thinking mode
             use_websearch: Whether web search is enabled
             system_prompt_hash: Hash of system prompt
-            ttl_override: Override default TTL for this entry
-            **kwargs: Additional parameters (also used for prompt/model/response if not passed directly)
+            **kwargs: Additional parameters (also used for prompt/model if not passed directly)
+
+        Returns:
+            Cached response if available, None otherwise
+        """
+        cache_key = self._prepare_get(
+            prompt, model, temperature, thinking_mode, use_websearch, system_prompt_hash, kwargs
+        )
+        if cache_key is None:
+            return None
+
+        # Start timing for metrics (Week 2-3 Monitoring Phase - 2025-10-31)
+        start_time = time.time()
+        result = super().get(cache_key)
+        self._record_get(cache_key, result, start_time)
+        return result
+
+    async def aget(
+        self,
+        prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        thinking_mode: Optional[str] = None,
+        use_websearch: bool = False,
+        system_prompt_hash: Optional[str] = None,
+        **kwargs
+    ) -> Optional[Any]:
+        """
+        Async variant of get() that never blocks the event loop on Redis.
+
+        Accepts the same arguments and calling conventions as get().
         """
+        cache_key = self._prepare_get(
+            prompt, model, temperature, thinking_mode, use_websearch, system_prompt_hash, kwargs
+        )
+        if cache_key is None:
+            return None
+
+        start_time = time.time()
+        result = await super().aget(cache_key)
+        self._record_get(cache_key, result, start_time)
+        return result
+
+    def _prepare_set(
+        self,
+        prompt: Optional[str],
+        model: Optional[str],
+        response: Optional[Any],
+        temperature: Optional[float],
+        thinking_mode: Optional[str],
+        use_websearch: bool,
+        system_prompt_hash: Optional[str],
+        ttl_override: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """Resolve set() arguments into (cache_key, response, ttl_override), or None to skip."""
         # Handle both calling conventions
         # If prompt is None, try to extract from kwargs (dict unpacking)
         if prompt is None:
@@ -301,22 +328,19 @@ class SemanticCacheManager(BaseCacheManager):
         # Handle missing model - use a placeholder or skip caching
         if not model:
             logger.debug(f"[SEMANTIC_CACHE] No model provided for prompt, skipping cache")
-            return
+            return None
 
         if response is None:
             raise TypeError("set() missing required argument: 'response'")
 
-        # Start timing for metrics (Week 2-3 Monitoring Phase - 2025-10-31)
-        start_time = time.time()
-
         cache_key = self._generate_cache_key(
             prompt, model, temperature, thinking_mode, use_websearch,
             system_prompt_hash, **kwargs
         )
+        return cache_key, response, ttl_override
 
-        # BaseCacheManager.set() will validate response size
-        super().set(cache_key, response, ttl_override)
-
+    def _record_set(self, cache_key: str, response: Any, ttl_override: Optional[int], start_time: float) -> None:
+        """Record metrics for a write."""
         import sys
         response_size = sys.getsizeof(response)
 
@@ -334,10 +358,84 @@ class SemanticCacheManager(BaseCacheManager):
             )
 
         logger.debug(
-            f"Cached response for model={model} "
+            f"Cached response "
             f"(TTL={ttl_override or self._l1_ttl}s, size={response_size} bytes, key={cache_key[:8]}..., {response_time_ms}ms)"
         )
-    
+
+    def set(
+        self,
+        prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        response: Optional[Any] = None,
+        temperature: Optional[float] = None,
+        thinking_mode: Optional[str] = None,
+        use_websearch: bool = False,
+        system_prompt_hash: Optional[str] = None,
+        ttl_override: Optional[int] = None,
+        **kwargs
+    ) -> None:
+        """
+        Cache a response with TTL.
+
+        This method supports TWO calling conventions:
+        1. Direct: set(prompt="...", model="glm-4.5", response=..., temperature=0.5)
+        2. Dict unpacking: set(**{'prompt': '...', 'model': 'glm-4.5', 'response': ..., 'temperature': 0.5})
+
+        Args:
+            prompt: The prompt text (can be None if passed via kwargs)
+            model: Model name (can be None if passed via kwargs)
+            response: The response to cache (can be None if passed via kwargs)
+            temperature: Temperature value
+            thinking_mode: Thinking mode
+            use_websearch: Whether web search is enabled
+            system_prompt_hash: Hash of system prompt
+            ttl_override: Override default TTL for this entry
+            **kwargs: Additional parameters (also used for prompt/model/response if not passed directly)
+        """
+        prepared = self._prepare_set(
+            prompt, model, response, temperature, thinking_mode, use_websearch,
+            system_prompt_hash, ttl_override, kwargs
+        )
+        if prepared is None:
+            return
+        cache_key, response, ttl_override = prepared
+
+        # Start timing for metrics (Week 2-3 Monitoring Phase - 2025-10-31)
+        start_time = time.time()
+
+        # BaseCacheManager.set() will validate response size
+        super().set(cache_key, response, ttl_override)
+        self._record_set(cache_key, response, ttl_override, start_time)
+
+    async def aset(
+        self,
+        prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        response: Optional[Any] = None,
+        temperature: Optional[float] = None,
+        thinking_mode: Optional[str] = None,
+        use_websearch: bool = False,
+        system_prompt_hash: Optional[str] = None,
+        ttl_override: Optional[int] = None,
+        **kwargs
+    ) -> None:
+        """
+        Async variant of set() that never blocks the event loop on Redis.
+
+        Accepts the same arguments and calling conventions as set().
+        """
+        prepared = self._prepare_set(
+            prompt, model, response, temperature, thinking_mode, use_websearch,
+            system_prompt_hash, ttl_override, kwargs
+        )
+        if prepared is None:
+            return
+        cache_key, response, ttl_override = prepared
+
+        start_time = time.time()
+        await super().aset(cache_key, response, ttl_override)
+        self._record_set(cache_key, response, ttl_override, start_time)
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics with semantic-specific metrics.
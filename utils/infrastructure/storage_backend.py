@@ -17,13 +17,15 @@ Key Features:
 - Background cleanup thread for memory management
 - Singleton pattern for consistent state within a single process
 - Drop-in replacement for Redis storage (for single-process scenarios)
+- Thread header + turn list primitives for append-only conversation storage
+  (layout documented in utils/conversation/turn_log.py)
 """
 
 import logging
 import os
 import threading
 import time
-from typing import Optional
+from typing import Optional, Sequence
 
 # PHASE 3 (2025-10-18): Import monitoring utilities
 from utils.monitoring import record_redis_event
@@ -42,6 +44,14 @@ except Exception:
     _redis_available = False
 
 
+def _list_range(values: list, start: int, end: int) -> list:
+    """Slice with Redis LRANGE semantics (inclusive end, negative indexes from the tail)."""
+    n = len(values)
+    start = max(n + start, 0) if start < 0 else start
+    end = n + end if end < 0 else end
+    return values[start:end + 1]
+
+
 class InMemoryStorage:
     """Thread-safe in-memory storage for conversation threads"""
 
@@ -145,6 +155,70 @@ class InMemoryStorage:
         """Redis-compatible setex method"""
         self.set_with_ttl(key, ttl_seconds, value)
 
+    # Thread header + turn list layout
+
+    def _get_live(self, key: str):
+        """Return the unexpired value for key (caller holds the lock)."""
+        item = self._store.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if time.time() >= expires_at:
+            del self._store[key]
+            return None
+        return value
+
+    def get_thread_header(self, header_key: str) -> Optional[dict[str, str]]:
+        """Return the thread header hash, or None if missing/expired"""
+        with self._lock:
+            header = self._get_live(header_key)
+            return dict(header) if header is not None else None
+
+    def get_turn_records(self, turns_key: str, start: int = 0, end: int = -1) -> list[str]:
+        """Return turn records in [start, end] (LRANGE semantics)"""
+        with self._lock:
+            return _list_range(self._get_live(turns_key) or [], start, end)
+
+    def write_thread(
+        self, header_key: str, turns_key: str, ttl_seconds: int, header: dict[str, str], records: Sequence[str]
+    ) -> None:
+        """Replace a thread's header and turn list"""
+        with self._lock:
+            expires_at = time.time() + ttl_seconds
+            self._store[header_key] = ({**header, "turn_count": str(len(records))}, expires_at)
+            self._store[turns_key] = (list(records), expires_at)
+
+    def append_turns(
+        self,
+        header_key: str,
+        turns_key: str,
+        ttl_seconds: int,
+        records: Sequence[str],
+        header_updates: Optional[dict[str, str]] = None,
+        expected_count: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Append turn records, update header fields and refresh TTL atomically.
+
+        Returns the new turn count, or None if the header is missing or its
+        turn_count differs from expected_count (nothing is written then).
+        """
+        with self._lock:
+            header = self._get_live(header_key)
+            if header is None:
+                return None
+            count = int(header.get("turn_count", 0))
+            if expected_count is not None and count != expected_count:
+                return None
+            turns = self._get_live(turns_key) or []
+            turns.extend(records)
+            header.update(header_updates or {})
+            header["turn_count"] = str(count + len(records))
+            expires_at = time.time() + ttl_seconds
+            self._store[header_key] = (header, expires_at)
+            self._store[turns_key] = (turns, expires_at)
+            return count + len(records)
+
     def _cleanup_worker(self):
         """Background thread that periodically cleans up expired entries"""
         while not self._shutdown:
@@ -292,6 +366,99 @@ class RedisStorage:
     def setex(self, key: str, ttl_seconds: int, value: str) -> None:
         self.set_with_ttl(key, ttl_seconds, value)
 
+    # Thread header + turn list layout
+
+    def get_thread_header(self, header_key: str) -> Optional[dict[str, str]]:
+        try:
+            header = self._breaker.call(self._client.hgetall, header_key)
+        except pybreaker.CircuitBreakerError:
+            logger.warning(f"Redis circuit breaker {self._breaker.current_state.name} - cannot get header: {header_key}")
+            return None
+        return header or None
+
+    def get_turn_records(self, turns_key: str, start: int = 0, end: int = -1) -> list[str]:
+        try:
+            return self._breaker.call(self._client.lrange, turns_key, start, end)
+        except pybreaker.CircuitBreakerError:
+            logger.warning(f"Redis circuit breaker {self._breaker.current_state.name} - cannot get turns: {turns_key}")
+            return []
+
+    def write_thread(
+        self, header_key: str, turns_key: str, ttl_seconds: int, header: dict[str, str], records: Sequence[str]
+    ) -> None:
+        start_time = time.time()
+        data_size = sum(len(r) for r in records)
+
+        def _write():
+            pipe = self._client.pipeline(transaction=True)
+            pipe.delete(header_key, turns_key)
+            pipe.hset(header_key, mapping={**header, "turn_count": len(records)})
+            if records:
+                pipe.rpush(turns_key, *records)
+            pipe.expire(header_key, ttl_seconds)
+            pipe.expire(turns_key, ttl_seconds)
+            pipe.execute()
+
+        try:
+            self._breaker.call(_write)
+        except pybreaker.CircuitBreakerError:
+            logger.error(f"Redis circuit breaker {self._breaker.current_state.name} - cannot write thread: {header_key}")
+            return
+        record_redis_event(
+            direction="send",
+            function_name="RedisStorage.write_thread",
+            data_size=data_size,
+            response_time_ms=(time.time() - start_time) * 1000,
+            metadata={"key": header_key, "turns": len(records), "timestamp": log_timestamp()}
+        )
+
+    def append_turns(
+        self,
+        header_key: str,
+        turns_key: str,
+        ttl_seconds: int,
+        records: Sequence[str],
+        header_updates: Optional[dict[str, str]] = None,
+        expected_count: Optional[int] = None,
+    ) -> Optional[int]:
+        start_time = time.time()
+        data_size = sum(len(r) for r in records)
+
+        def _append():
+            with self._client.pipeline(transaction=True) as pipe:
+                while True:
+                    try:
+                        # WATCH the header so a concurrent append aborts this one
+                        pipe.watch(header_key)
+                        current = pipe.hget(header_key, "turn_count")
+                        if current is None or (expected_count is not None and int(current) != expected_count):
+                            pipe.unwatch()
+                            return None
+                        pipe.multi()
+                        pipe.rpush(turns_key, *records)
+                        if header_updates:
+                            pipe.hset(header_key, mapping=header_updates)
+                        pipe.hincrby(header_key, "turn_count", len(records))
+                        pipe.expire(header_key, ttl_seconds)
+                        pipe.expire(turns_key, ttl_seconds)
+                        return pipe.execute()[-3]
+                    except redis.WatchError:
+                        continue
+
+        try:
+            count = self._breaker.call(_append)
+        except pybreaker.CircuitBreakerError:
+            logger.error(f"Redis circuit breaker {self._breaker.current_state.name} - cannot append turns: {turns_key}")
+            return None
+        record_redis_event(
+            direction="send",
+            function_name="RedisStorage.append_turns",
+            data_size=data_size,
+            response_time_ms=(time.time() - start_time) * 1000,
+            metadata={"key": turns_key, "appended": count is not None, "timestamp": log_timestamp()}
+        )
+        return count
+
 # Global singleton instance
 _storage_instance = None
 _storage_lock = threading.Lock()
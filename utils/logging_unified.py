@@ -1,7 +1,7 @@
 """Unified logging infrastructure for all tools.
 
 This module provides a centralized logging system that:
-1. Logs all tool executions to structured JSONL format
+1. Logs all tool executions to structured JSONL (or compact binary) format
 2. Integrates with existing logging infrastructure (tool_events.py, observability.py)
 3. Provides consistent logging interface for simple and workflow tools
 4. Tracks request_id for correlation across tool calls
@@ -15,7 +15,7 @@ Usage:
     logger.log_tool_complete("chat", "req-123", {"status": "success"})
 """
 
-import json
+import os
 import time
 import logging
 import traceback
@@ -24,24 +24,44 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
+from src.utils.log_pipeline import dumps, get_file_pipeline
+
 # Standard logger for this module
 _module_logger = logging.getLogger(__name__)
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
 class UnifiedLogger:
     """Unified logging for all tools with structured output."""
     
-    def __init__(self, log_file: str = ".logs/toolcalls.jsonl"):
+    def __init__(self, log_file: Optional[str] = None, log_format: Optional[str] = None):
         """
         Initialize unified logger.
         
         Args:
-            log_file: Path to log file (JSONL format)
+            log_file: Path to log file (default: EX_TOOLCALL_LOG_PATH or .logs/toolcalls.jsonl)
+            log_format: "jsonl" or "binary" (default: EX_TOOLCALL_LOG_FORMAT or jsonl)
         """
-        self.log_file = Path(log_file)
+        self.log_file = Path(log_file or os.getenv("EX_TOOLCALL_LOG_PATH", ".logs/toolcalls.jsonl"))
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self.log_format = (log_format or os.getenv("EX_TOOLCALL_LOG_FORMAT", "jsonl")).strip().lower()
+        # Entries are serialized as they are logged; the buffer holds JSON bytes
         self.buffer = []
         self.buffer_size = 10  # Flush after 10 entries
+        # Shared per file: batching, rotation and the file write happen on the pipeline's writer thread
+        self.pipeline = get_file_pipeline(
+            str(self.log_file),
+            fmt=self.log_format,
+            max_bytes=_env_int("EX_TOOLCALL_LOG_MAX_BYTES", 50 * 1024 * 1024),
+            max_age_secs=_env_int("EX_TOOLCALL_LOG_ROTATE_SECS", 0),
+            backup_count=_env_int("EX_TOOLCALL_LOG_BACKUPS", 5),
+        )
         
     def _write_log(self, entry: Dict[str, Any]):
         """
@@ -52,24 +72,31 @@ class UnifiedLogger:
         """
         try:
             # Add to buffer
-            self.buffer.append(entry)
+            self.buffer.append(dumps(entry))
             
-            # Flush if buffer is full
+            # Hand off to the writer thread if buffer is full
             if len(self.buffer) >= self.buffer_size:
-                self._flush()
+                self._flush(wait=False)
         except Exception as e:
             _module_logger.warning(f"Failed to write log entry: {e}")
             
-    def _flush(self):
-        """Flush buffered log entries to file."""
+    def _flush(self, wait: bool = True):
+        """
+        Flush buffered log entries to file.
+        
+        Args:
+            wait: Write before returning; otherwise the pipeline writes them
+                on its next batch
+        """
         if not self.buffer:
             return
             
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                for entry in self.buffer:
-                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
-            self.buffer.clear()
+            self.pipeline.sink.open()
+            entries, self.buffer = self.buffer, []
+            self.pipeline.submit_many(entries)
+            if wait:
+                self.pipeline.flush()
         except Exception as e:
             _module_logger.warning(f"Failed to flush log buffer: {e}")
             
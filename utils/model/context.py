@@ -203,14 +203,14 @@ class ModelContext:
 
     def estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count for text using model-specific tokenizer.
+        Estimate token count for text using this model's estimator family.
 
-        For now, uses simple estimation. Can be enhanced with model-specific
-        tokenizers (tiktoken for OpenAI, etc.) in the future.
+        Uses the shared token service estimator (no tokenizer run); use
+        get_token_counter().fits() when the exact count matters near a limit.
         """
-        # TODO: Integrate model-specific tokenizers
-        # For now, use conservative estimation
-        return len(text) // 3  # Conservative estimate
+        from utils.model.token_counter import get_token_counter
+
+        return get_token_counter().estimate(text, self.model_name)
 
     @classmethod
     def from_arguments(cls, arguments: dict[str, Any]) -> "ModelContext":
@@ -0,0 +1,410 @@
+"""
+Token accounting service shared by budget checks, file embedding and conversation memory.
+
+Two tiers:
+- estimate(): calibrated char/byte estimator per model family. One pass at C
+  speed (isascii / utf-8 length), no tokenizer, used for every budget check.
+- count(): exact tiktoken count, memoized in an LRU keyed by content hash.
+  fits() only falls through to it when the estimate lands within
+  TOKEN_EXACT_MARGIN of the budget, so megabytes of file content are not
+  tokenized just to learn they are far below (or far above) the limit.
+
+Exact counts also calibrate the estimator: each family keeps a running
+exact/estimate ratio that is applied to later estimates.
+
+Tokenizer encodings are loaded once per process. If tiktoken is missing or an
+encoding cannot be loaded (e.g. no network to fetch the BPE file), counting
+degrades to the estimator and the load is retried after TOKENIZER_RETRY_SECS.
+
+Configuration:
+    TOKEN_EXACT_MARGIN=0.1          (fraction of the budget where exact counts are used)
+    TOKEN_COUNT_MEMO_SIZE=2048      (exact counts memoized)
+    TOKEN_ESTIMATE_CALIBRATE=true   (learn estimator ratios from exact counts)
+    TOKENIZER_RETRY_SECS=300        (retry a failed tokenizer load after this long)
+"""
+
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Texts shorter than this don't move the calibration ratio
+_CALIBRATION_MIN_CHARS = 512
+_CALIBRATION_WEIGHT = 0.1
+_CALIBRATION_BOUNDS = (0.5, 2.0)
+
+# Formatting overhead per chat message (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@dataclass(frozen=True)
+class FamilyProfile:
+    """Estimator parameters and tokenizer for a model family."""
+
+    name: str
+    chars_per_token: float  # ASCII / Latin text and code
+    tokens_per_wide_char: float  # CJK and other multi-byte characters
+    encoding: str  # tiktoken encoding used for exact counts
+
+
+FAMILY_PROFILES = {
+    "openai": FamilyProfile("openai", 4.0, 1.0, "cl100k_base"),
+    # Kimi and GLM tokenizers are trained on Chinese and pack CJK tighter
+    "kimi": FamilyProfile("kimi", 4.0, 0.6, "cl100k_base"),
+    "glm": FamilyProfile("glm", 4.0, 0.6, "cl100k_base"),
+    "default": FamilyProfile("default", 4.0, 1.0, "cl100k_base"),
+}
+
+
+def model_family(model_name: Optional[str]) -> FamilyProfile:
+    """Map a model name to its family profile."""
+    name = (model_name or "").lower()
+    if "kimi" in name or "moonshot" in name:
+        return FAMILY_PROFILES["kimi"]
+    if "glm" in name or "zhipu" in name:
+        return FAMILY_PROFILES["glm"]
+    if "gpt" in name or name.startswith(("o1", "o3", "o4")):
+        return FAMILY_PROFILES["openai"]
+    return FAMILY_PROFILES["default"]
+
+
+def _message_text(message: Any) -> tuple[str, str]:
+    """(role, text) of a chat message; multimodal content parts contribute their text."""
+    if not isinstance(message, dict):
+        return "", str(message)
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        content = "\n".join(
+            str(part.get("text", "")) if isinstance(part, dict) else str(part) for part in content
+        )
+    return str(message.get("role") or ""), str(content)
+
+
+class TokenCounter:
+    """
+    Token counter with a fast estimator tier and a memoized exact tier.
+
+    Thread-safe; use get_token_counter() for the shared instance so the memo
+    and calibration are shared across tools.
+    """
+
+    def __init__(
+        self,
+        memo_size: Optional[int] = None,
+        exact_margin: Optional[float] = None,
+        calibrate: Optional[bool] = None,
+    ):
+        self.memo_size = memo_size or int(os.getenv("TOKEN_COUNT_MEMO_SIZE", "2048"))
+        self.exact_margin = exact_margin if exact_margin is not None else float(os.getenv("TOKEN_EXACT_MARGIN", "0.1"))
+        if calibrate is None:
+            calibrate = os.getenv("TOKEN_ESTIMATE_CALIBRATE", "true").strip().lower() in ("1", "true", "yes")
+        self.calibrate = calibrate
+        self._retry_secs = float(os.getenv("TOKENIZER_RETRY_SECS", "300"))
+
+        self._memo: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._encodings: dict[str, Any] = {}
+        self._encoding_failed_at: dict[str, float] = {}
+        self._ratios: dict[str, float] = {}  # family -> exact/estimate
+
+        self.estimates = 0
+        self.exact_counts = 0
+        self.memo_hits = 0
+        self.exact_fallbacks = 0
+
+    # ------------------------------------------------------------------
+    # Estimator tier
+    # ------------------------------------------------------------------
+
+    def _raw_estimate(self, text: str, profile: FamilyProfile) -> float:
+        chars = len(text)
+        if text.isascii():
+            return chars / profile.chars_per_token
+        # Every non-ASCII char adds 1-3 utf-8 bytes; CJK adds 2
+        wide = min(chars, (len(text.encode("utf-8", errors="ignore")) - chars) // 2)
+        return (chars - wide) / profile.chars_per_token + wide * profile.tokens_per_wide_char
+
+    def estimate(self, text: str, model_name: Optional[str] = None) -> int:
+        """
+        Fast calibrated token estimate (no tokenizer).
+
+        Args:
+            text: Text to estimate
+            model_name: Model name used to pick the family profile
+
+        Returns:
+            Estimated token count (0 for empty text)
+        """
+        if not text:
+            return 0
+        self.estimates += 1
+        profile = model_family(model_name)
+        raw = self._raw_estimate(text, profile) * self._ratios.get(profile.name, 1.0)
+        return max(1, math.ceil(raw))
+
+    def _calibrate(self, profile: FamilyProfile, text: str, exact: int) -> None:
+        if not self.calibrate or len(text) < _CALIBRATION_MIN_CHARS:
+            return
+        raw = self._raw_estimate(text, profile)
+        if raw <= 0:
+            return
+        low, high = _CALIBRATION_BOUNDS
+        observed = min(high, max(low, exact / raw))
+        current = self._ratios.get(profile.name, 1.0)
+        self._ratios[profile.name] = current + _CALIBRATION_WEIGHT * (observed - current)
+
+    # ------------------------------------------------------------------
+    # Exact tier
+    # ------------------------------------------------------------------
+
+    def _get_encoding(self, profile: FamilyProfile, model_name: Optional[str]):
+        """Loaded tiktoken encoding for the family, or None if unavailable."""
+        if tiktoken is None:
+            return None
+        key = profile.encoding
+        if profile.name == "openai" and model_name:
+            key = model_name
+        encoding = self._encodings.get(key)
+        if encoding is not None:
+            return encoding
+        failed_at = self._encoding_failed_at.get(key)
+        if failed_at is not None and time.time() - failed_at < self._retry_secs:
+            return None
+
+        with self._lock:
+            encoding = self._encodings.get(key)
+            if encoding is not None:
+                return encoding
+            try:
+                if profile.name == "openai" and model_name:
+                    try:
+                        encoding = tiktoken.encoding_for_model(model_name)
+                    except KeyError:
+                        encoding = tiktoken.get_encoding(profile.encoding)
+                else:
+                    encoding = tiktoken.get_encoding(profile.encoding)
+            except Exception as e:
+                self._encoding_failed_at[key] = time.time()
+                logger.warning(f"[TOKENS] Tokenizer {key} unavailable, using estimates: {e}")
+                return None
+            self._encodings[key] = encoding
+            self._encoding_failed_at.pop(key, None)
+            return encoding
+
+    def _memo_get(self, key: tuple) -> Optional[int]:
+        with self._lock:
+            tokens = self._memo.get(key)
+            if tokens is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+            return tokens
+
+    def _memo_put(self, key: tuple, tokens: int) -> None:
+        with self._lock:
+            self._memo[key] = tokens
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    @staticmethod
+    def _memo_key(encoding_name: str, text: str) -> tuple:
+        # A 128-bit content digest: collision-safe without the memo holding full texts
+        digest = hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+        return (encoding_name, digest)
+
+    def count(self, text: str, model_name: Optional[str] = None) -> int:
+        """
+        Exact token count (memoized); falls back to the estimate without a tokenizer.
+
+        Args:
+            text: Text to count
+            model_name: Model name for tokenizer selection
+
+        Returns:
+            Token count (0 for empty text)
+        """
+        if not text:
+            return 0
+        return self.count_many([text], model_name)[0]
+
+    def count_many(self, texts: Iterable[str], model_name: Optional[str] = None) -> list[int]:
+        """
+        Exact token counts for several texts; memo misses are encoded in one batch.
+
+        Args:
+            texts: Texts to count
+            model_name: Model name for tokenizer selection
+
+        Returns:
+            Token counts in input order
+        """
+        texts = [t or "" for t in texts]
+        profile = model_family(model_name)
+        encoding = self._get_encoding(profile, model_name)
+        if encoding is None:
+            self.exact_fallbacks += len(texts)
+            return [self.estimate(t, model_name) for t in texts]
+
+        results: list[Optional[int]] = []
+        missing: dict[tuple, list[int]] = {}
+        for idx, text in enumerate(texts):
+            if not text:
+                results.append(0)
+                continue
+            key = self._memo_key(encoding.name, text)
+            tokens = self._memo_get(key)
+            results.append(tokens)
+            if tokens is None:
+                missing.setdefault(key, []).append(idx)
+
+        if missing:
+            keys = list(missing)
+            batch = [texts[missing[key][0]] for key in keys]
+            try:
+                if len(batch) == 1:
+                    encoded = [encoding.encode_ordinary(batch[0])]
+                else:
+                    encoded = encoding.encode_ordinary_batch(batch)
+            except Exception as e:
+                logger.warning(f"[TOKENS] Tokenizer failed, using estimates: {e}")
+                self.exact_fallbacks += len(batch)
+                encoded = None
+            for n, key in enumerate(keys):
+                text = batch[n]
+                if encoded is None:
+                    tokens = self.estimate(text, model_name)
+                else:
+                    tokens = len(encoded[n])
+                    self.exact_counts += 1
+                    self._memo_put(key, tokens)
+                    self._calibrate(profile, text, tokens)
+                for idx in missing[key]:
+                    results[idx] = tokens
+        return results  # type: ignore[return-value]
+
+    # ------------------------------------------------------------------
+    # Budget checks and message lists
+    # ------------------------------------------------------------------
+
+    def fits(self, text: str, budget: int, model_name: Optional[str] = None) -> tuple[bool, int]:
+        """
+        Check text against a token budget, tokenizing only near the boundary.
+
+        Args:
+            text: Text to check
+            budget: Token budget
+            model_name: Model name for estimation/tokenizer selection
+
+        Returns:
+            (fits, tokens) - tokens is the estimate unless an exact count was needed
+        """
+        estimated = self.estimate(text, model_name)
+        if estimated <= budget * (1 - self.exact_margin) or estimated > budget * (1 + self.exact_margin):
+            return estimated <= budget, estimated
+        exact = self.count(text, model_name)
+        return exact <= budget, exact
+
+    def count_messages(
+        self, messages: Iterable[Any], model_name: Optional[str] = None, *, exact: bool = False
+    ) -> int:
+        """
+        Total tokens for a chat message list (content + role + per-message overhead).
+
+        Args:
+            messages: Message dicts (or plain strings)
+            model_name: Model name for estimation/tokenizer selection
+            exact: Use exact (memoized) counts instead of estimates
+
+        Returns:
+            Total token count
+        """
+        texts: list[str] = []
+        overhead = 0
+        for message in messages:
+            role, content = _message_text(message)
+            texts.append(content)
+            if isinstance(message, dict):
+                texts.append(role)
+                overhead += MESSAGE_OVERHEAD_TOKENS
+        if exact:
+            return sum(self.count_many(texts, model_name)) + overhead
+        return sum(self.estimate(t, model_name) for t in texts) + overhead
+
+    def truncate(self, text: str, max_tokens: int, model_name: Optional[str] = None) -> str:
+        """
+        Truncate text to at most max_tokens.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Token limit
+            model_name: Model name for tokenizer selection
+
+        Returns:
+            Text that fits the limit (unchanged if it already fits)
+        """
+        if max_tokens <= 0:
+            return ""
+        fits, _ = self.fits(text, max_tokens, model_name)
+        if fits:
+            return text
+
+        encoding = self._get_encoding(model_family(model_name), model_name)
+        if encoding is not None:
+            try:
+                return encoding.decode(encoding.encode_ordinary(text)[:max_tokens])
+            except Exception as e:
+                logger.warning(f"[TOKENS] Tokenizer failed during truncation, using estimates: {e}")
+
+        cut = len(text)
+        while cut > 0:
+            estimated = self.estimate(text[:cut], model_name)
+            if estimated <= max_tokens:
+                break
+            cut = min(cut - 1, int(cut * max_tokens / estimated))
+        return text[:max(cut, 0)]
+
+    def get_stats(self) -> dict:
+        """Get counter statistics"""
+        return {
+            "estimates": self.estimates,
+            "exact_counts": self.exact_counts,
+            "memo_hits": self.memo_hits,
+            "memo_entries": len(self._memo),
+            "exact_fallbacks": self.exact_fallbacks,
+            "calibration": dict(self._ratios),
+            "tokenizers": sorted(self._encodings),
+        }
+
+
+# Global counter instance
+_token_counter: Optional[TokenCounter] = None
+_token_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """Get the process-wide token counter."""
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = TokenCounter()
+    return _token_counter
+
+
+def reset_token_counter() -> None:
+    """Drop the global counter (tests, config reload)."""
+    global _token_counter
+    with _token_counter_lock:
+        _token_counter = None
@@ -1,16 +1,23 @@
 from __future__ import annotations
 import math
-from typing import Iterable
+from typing import Optional
+
+from .token_counter import get_token_counter
 
 
 def _word_count(text: str) -> int:
     return len((text or "").strip().split())
 
 
-def estimate_tokens(text: str, token_per_word: float = 1.33) -> int:
+def estimate_tokens(text: str, token_per_word: Optional[float] = None) -> int:
     """
-    Rough token estimator: ~1.33 tokens per English word (heuristic).
+    Rough token estimator.
+
+    Uses the shared token service estimator unless token_per_word is given,
+    in which case the legacy ~tokens-per-word heuristic is applied.
     """
+    if token_per_word is None:
+        return get_token_counter().estimate(text or "")
     wc = _word_count(text)
     return int(math.ceil(wc * token_per_word))
 
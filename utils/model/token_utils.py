@@ -2,35 +2,37 @@
 Token counting utilities for managing API context limits
 
 This module provides functions for estimating token counts to ensure
-requests stay within the Gemini API's context window limits.
+requests stay within the model's context window limits.
 
-Note: The estimation uses a simple character-to-token ratio which is
-approximate. For production systems requiring precise token counts,
-consider using the actual tokenizer for the specific model.
+Both functions use the shared token service (utils/model/token_counter.py):
+estimates come from its calibrated char/byte estimator, and check_token_limit
+only tokenizes exactly when the estimate is close to the limit.
 """
 
+from typing import Optional
+
+from .token_counter import get_token_counter
+
 # Default fallback for token limit (conservative estimate)
 DEFAULT_CONTEXT_WINDOW = 200_000  # Conservative fallback for unknown models
 
 
-def estimate_tokens(text: str) -> int:
+def estimate_tokens(text: str, model_name: Optional[str] = None) -> int:
     """
-    Estimate token count using a character-based approximation.
+    Estimate token count without running a tokenizer.
 
-    This uses a rough heuristic where 1 token ≈ 4 characters, which is
-    a reasonable approximation for English text. The actual token count
-    may vary based on:
-    - Language (non-English text may have different ratios)
-    - Code vs prose (code often has more tokens per character)
-    - Special characters and formatting
+    Uses the per-family estimator of the shared token service: ~4 characters
+    per token for ASCII text and code, with multi-byte (CJK) characters
+    weighted per model family, corrected by ratios learned from exact counts.
 
     Args:
         text: The text to estimate tokens for
+        model_name: Optional model name to pick the estimator family
 
     Returns:
         int: Estimated number of tokens
     """
-    return len(text) // 4
+    return get_token_counter().estimate(text, model_name)
 
 
 def check_token_limit(text: str, context_window: int = DEFAULT_CONTEXT_WINDOW) -> tuple[bool, int]:
@@ -48,7 +50,6 @@ def check_token_limit(text: str, context_window: int = DEFAULT_CONTEXT_WINDOW) -
     Returns:
         Tuple[bool, int]: (is_within_limit, estimated_tokens)
         - is_within_limit: True if the text fits within context_window
-        - estimated_tokens: The estimated token count
+        - estimated_tokens: The estimated token count (exact near the limit)
     """
-    estimated = estimate_tokens(text)
-    return estimated <= context_window, estimated
+    return get_token_counter().fits(text, context_window)
@@ -17,6 +17,14 @@ Each connection point reports:
 Created: 2025-10-18
 Updated: 2025-10-23 - Added Redis persistence with dual-write pattern
 Updated: 2025-10-23 - Added Melbourne/Australia timezone support
+
+Time-series rollups: _flush_to_redis also folds each batch into per-minute
+and per-hour buckets (count, errors, bytes, latency sum and latency-sketch
+bucket counts) using HINCRBY, so get_time_series_data reads O(buckets)
+small hashes instead of re-parsing every raw event. Minute buckets expire
+after REDIS_ROLLUP_MINUTE_RETENTION_HOURS; hour buckets (the downsampled
+history) after REDIS_ROLLUP_HOUR_RETENTION_HOURS.
+
 Purpose: Centralized monitoring for easier bug fixing with persistent storage
 """
 
@@ -33,9 +41,24 @@ from threading import Lock
 import json
 
 from utils.timezone_helper import melbourne_now_iso, to_aedt, UTC_TZ
+from utils.infrastructure.latency_sketch import LatencySketch
 
 logger = logging.getLogger(__name__)
 
+# Rollup resolutions: name -> bucket size in seconds
+_ROLLUP_RESOLUTIONS = {"minute": 60, "hour": 3600}
+
+# Shared bucket mapping for rollup latency histograms (default sketch parameters)
+_ROLLUP_SKETCH = LatencySketch()
+
+
+def _rollup_key(connection_type: str, resolution: str, bucket: int) -> str:
+    return f"connection_monitor:{connection_type}:rollup:{resolution}:{bucket}"
+
+
+def _rollup_index_key(connection_type: str, resolution: str) -> str:
+    return f"connection_monitor:{connection_type}:rollup:{resolution}:index"
+
 
 @dataclass
 class ConnectionEvent:
@@ -128,6 +151,10 @@ class ConnectionMonitor:
         self._redis_flush_interval = int(os.getenv('REDIS_FLUSH_INTERVAL', '5'))
         self._redis_queue_size = int(os.getenv('REDIS_QUEUE_SIZE', '1000'))
         self._redis_retention_hours = int(os.getenv('REDIS_RETENTION_HOURS', '24'))
+        self._rollup_retention_seconds = {
+            "minute": int(os.getenv('REDIS_ROLLUP_MINUTE_RETENTION_HOURS', '24')) * 3600,
+            "hour": int(os.getenv('REDIS_ROLLUP_HOUR_RETENTION_HOURS', str(30 * 24))) * 3600,
+        }
 
         # Redis persistence components
         self._redis_queue: queue.Queue = queue.Queue(maxsize=self._redis_queue_size)
@@ -272,6 +299,7 @@ class ConnectionMonitor:
                     pipe.hset(stats_key, mapping=event_data['stats'])
                     pipe.expire(stats_key, retention_seconds)
 
+            self._write_rollups(pipe, batch)
             pipe.execute()
 
             # Reset circuit breaker on success
@@ -284,6 +312,61 @@ class ConnectionMonitor:
             logger.error(f"[CONNECTION_MONITOR] Failed to write to Redis: {e}")
             self._handle_redis_error(e)
 
+    @staticmethod
+    def _aggregate_rollups(
+        batch: List[Tuple[str, Dict[str, Any]]]
+    ) -> Dict[Tuple[str, str, int], Dict[str, float]]:
+        """
+        Fold a batch of events into per-bucket counter increments.
+
+        Returns:
+            {(connection_type, resolution, bucket_start): {field: increment}}
+            Fields: count, errors, bytes, rt_count, rt_sum and one "l:<index>"
+            (or "l:z" for ~0ms) latency-sketch bucket count per latency bucket.
+        """
+        rollups: Dict[Tuple[str, str, int], Dict[str, float]] = defaultdict(lambda: defaultdict(int))
+        for connection_type, event_data in batch:
+            timestamp = event_data['timestamp']
+            response_time = event_data.get('response_time_ms')
+            latency_field = None
+            if response_time is not None:
+                index = _ROLLUP_SKETCH.bucket_index(response_time)
+                latency_field = "l:z" if index is None else f"l:{index}"
+
+            for resolution, seconds in _ROLLUP_RESOLUTIONS.items():
+                fields = rollups[(connection_type, resolution, int(timestamp // seconds) * seconds)]
+                fields['count'] += 1
+                fields['bytes'] += event_data.get('data_size_bytes', 0) or 0
+                if event_data.get('error'):
+                    fields['errors'] += 1
+                if latency_field is not None:
+                    fields['rt_count'] += 1
+                    fields['rt_sum'] += response_time
+                    fields[latency_field] += 1
+        return rollups
+
+    def _write_rollups(self, pipe, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Queue rollup increments, expiry and index trimming on a pipeline"""
+        now = time.time()
+        indexes = set()
+        for (connection_type, resolution, bucket), fields in self._aggregate_rollups(batch).items():
+            key = _rollup_key(connection_type, resolution, bucket)
+            retention = self._rollup_retention_seconds[resolution]
+            for name, value in fields.items():
+                if name == 'rt_sum':
+                    pipe.hincrbyfloat(key, name, value)
+                else:
+                    pipe.hincrby(key, name, int(value))
+            # Expire relative to the bucket end so late events don't extend retention
+            pipe.expireat(key, int(bucket + _ROLLUP_RESOLUTIONS[resolution] + retention))
+            index_key = _rollup_index_key(connection_type, resolution)
+            pipe.zadd(index_key, {str(bucket): bucket})
+            indexes.add((index_key, retention))
+
+        for index_key, retention in indexes:
+            pipe.zremrangebyscore(index_key, '-inf', now - retention)
+            pipe.expire(index_key, retention)
+
     def _handle_redis_error(self, error: Exception) -> None:
         """Handle Redis errors with circuit breaker pattern"""
         cb = self._redis_circuit_breaker
@@ -695,56 +778,71 @@ class ConnectionMonitor:
             hours: Number of hours of history to retrieve
 
         Returns:
-            Dictionary mapping timestamps to aggregated metrics
+            Dictionary mapping timestamps to aggregated metrics (count, errors,
+            total_bytes, avg/p95/p99 response time), read from the rollups
         """
         if not self._redis_enabled or not self._redis_storage:
             logger.debug("[CONNECTION_MONITOR] Redis not enabled - returning empty time-series data")
             return {}
 
         try:
-            cutoff_time = time.time() - (hours * 3600)
-            event_key = f"connection_monitor:{connection_type}:events"
-
-            events = self._redis_storage.zrangebyscore(
-                event_key, cutoff_time, '+inf', withscores=True
-            )
-
-            # Aggregate by time interval
-            buckets = defaultdict(lambda: {
-                'count': 0,
-                'errors': 0,
-                'total_bytes': 0,
-                'avg_response_time': 0.0,
-                'response_times': []
-            })
-
+            now = time.time()
+            cutoff_time = now - (hours * 3600)
             interval_seconds = interval_minutes * 60
 
-            for event_json, timestamp in events:
-                try:
-                    event_data = json.loads(event_json)
-                    bucket_time = int(timestamp // interval_seconds) * interval_seconds
-                    bucket = buckets[bucket_time]
-
-                    bucket['count'] += 1
-                    bucket['total_bytes'] += event_data.get('data_size_bytes', 0)
-
-                    if event_data.get('error'):
-                        bucket['errors'] += 1
-
-                    if event_data.get('response_time_ms') is not None:
-                        bucket['response_times'].append(event_data['response_time_ms'])
-
-                except json.JSONDecodeError:
-                    continue
+            # Use minute rollups unless the interval is whole hours or the range
+            # reaches past minute retention (then hourly, downsampled history)
+            resolution = "minute"
+            if interval_seconds % 3600 == 0 or hours * 3600 > self._rollup_retention_seconds["minute"]:
+                resolution = "hour"
+            resolution_seconds = _ROLLUP_RESOLUTIONS[resolution]
+
+            # Include the partial bucket containing the cutoff, as raw scans did
+            first_bucket = int(cutoff_time // resolution_seconds) * resolution_seconds
+            bucket_starts = self._redis_storage.zrangebyscore(
+                _rollup_index_key(connection_type, resolution), first_bucket, '+inf'
+            )
+            pipe = self._redis_storage.pipeline(transaction=False)
+            for bucket in bucket_starts:
+                pipe.hgetall(_rollup_key(connection_type, resolution, int(float(bucket))))
+            rollups = pipe.execute() if bucket_starts else []
+
+            # Merge rollup buckets into the requested interval
+            buckets: Dict[int, Dict[str, Any]] = {}
+            for bucket, fields in zip(bucket_starts, rollups):
+                if not fields:
+                    continue  # Expired between index read and fetch
+                fields = {
+                    (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                    for k, v in fields.items()
+                }
+                bucket_time = int(int(float(bucket)) // interval_seconds) * interval_seconds
+                acc = buckets.setdefault(bucket_time, {
+                    'count': 0, 'errors': 0, 'total_bytes': 0, 'rt_count': 0, 'rt_sum': 0.0, 'latency': defaultdict(int)
+                })
+                acc['count'] += int(fields.get('count', 0))
+                acc['errors'] += int(fields.get('errors', 0))
+                acc['total_bytes'] += int(fields.get('bytes', 0))
+                acc['rt_count'] += int(fields.get('rt_count', 0))
+                acc['rt_sum'] += float(fields.get('rt_sum', 0.0))
+                for name, value in fields.items():
+                    if name.startswith('l:'):
+                        acc['latency'][name[2:]] += int(value)
 
-            # Calculate averages
             result = {}
-            for bucket_time, bucket in buckets.items():
-                if bucket['response_times']:
-                    bucket['avg_response_time'] = sum(bucket['response_times']) / len(bucket['response_times'])
-                del bucket['response_times']  # Remove raw data
-                result[str(bucket_time)] = bucket
+            for bucket_time in sorted(buckets):
+                acc = buckets[bucket_time]
+                zero_count = acc['latency'].pop('z', 0)
+                sketch = LatencySketch.from_counts(acc['latency'], zero_count)
+                p95, p99 = sketch.quantiles((0.95, 0.99))
+                result[str(bucket_time)] = {
+                    'count': acc['count'],
+                    'errors': acc['errors'],
+                    'total_bytes': acc['total_bytes'],
+                    'avg_response_time': acc['rt_sum'] / acc['rt_count'] if acc['rt_count'] else 0.0,
+                    'p95_response_time': round(p95, 2),
+                    'p99_response_time': round(p99, 2),
+                }
 
             return result
 